@@ -48,6 +48,7 @@ AN_EDIT_RUN = "edit"
 
 sys.path.insert(0, str(REPO / "mcp-server" / "src"))
 
+from ollama_mcp import calllog  # noqa: E402
 from ollama_mcp.oficina.drift import measure  # noqa: E402
 from ollama_mcp.oficina.judge import default_judge, judge_deliverable, load_rubric  # noqa: E402
 from ollama_mcp.oficina.ledger import Ledger  # noqa: E402
@@ -205,16 +206,17 @@ def run_a5():
         )
 
         call_id = iteration.get("call_id")
-        logged = {json.loads(line).get("call_id") for line in CALLS.read_text().splitlines()[-400:]}
+        # The log is written off-thread and may have rotated mid-run: flush, then read
+        # across every segment rather than the active file alone.
+        calllog.flush()
+        recent = list(calllog.iter_records(CALLS))[-400:]
+        logged = {record.get("call_id") for record in recent}
         ok &= _check(
             "the iteration's call_id names a real calls.jsonl record",
             bool(call_id) and call_id in logged,
             f"call_id={call_id}",
         )
-        judge_calls = [
-            json.loads(line) for line in CALLS.read_text().splitlines()[-400:]
-            if json.loads(line).get("run_id") == run_id
-        ]
+        judge_calls = [record for record in recent if record.get("run_id") == run_id]
         ok &= _check(
             "both the coder's and the judge's calls are attributable to the run",
             len(judge_calls) >= 2,
@@ -0,0 +1,123 @@
+"""Micro-benchmark: pooled keep-alive connections vs a fresh httpx client per call.
+
+Run it with `make bench-pool` (or `uv run python scripts/bench_http_pool.py`). By default it
+needs nothing running: it serves canned `/api/chat` replies from an in-process HTTP/1.1 stub,
+so what it measures is exactly the per-call client and connection overhead the shared pool
+(`client._HostPool`) removed — not model time, which would drown it. `--url` points it at a
+real Ollama instead (`--model` must then be a loaded model; `num_predict` is pinned to 1).
+
+The "fresh" mode reproduces the old `chat` transport: `async with httpx.AsyncClient(...)`
+around every POST. The "pooled" mode is `OllamaClient.chat` as it now ships. The gate is
+disabled for the run — it is a separate cost, measured by its own `queue_wait_ms`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ["OLLAMA_GATE_SOCKET"] = ""
+os.environ.setdefault("OLLAMA_CALL_LOG", "")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import httpx  # noqa: E402
+
+from ollama_mcp.client import OllamaClient  # noqa: E402
+
+_REPLY = json.dumps(
+    {"model": "stub", "message": {"content": "ok"}, "done": True, "eval_count": 1}
+).encode()
+
+
+async def _stub_server() -> tuple[asyncio.AbstractServer, str]:
+    """A keep-alive HTTP/1.1 server that answers every request with `_REPLY`."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(_REPLY), _REPLY)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+def _payload(model: str) -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": "."}],
+        "stream": False,
+        "options": {"num_predict": 1},
+    }
+
+
+async def _fresh(url: str, model: str, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        async with httpx.AsyncClient(base_url=url, timeout=None) as fresh_client:
+            (await fresh_client.post("/api/chat", json=_payload(model), timeout=60)).raise_for_status()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+async def _pooled(url: str, model: str, calls: int) -> list[float]:
+    samples = []
+    async with OllamaClient(url) as client:
+        for _ in range(calls):
+            t0 = time.perf_counter()
+            await client.chat(".", model=model, num_predict=1, timeout=60)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _row(name: str, samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{name:<8} {statistics.median(ordered):>9.3f} {p95:>9.3f} {statistics.mean(ordered):>9.3f}"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--url", help="real Ollama base URL (default: in-process stub)")
+    parser.add_argument("--model", default="stub")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = await _stub_server()
+    try:
+        await _pooled(url, args.model, 5)  # warm imports and the first connection
+        fresh = await _fresh(url, args.model, args.calls)
+        pooled = await _pooled(url, args.model, args.calls)
+    finally:
+        if server is not None:
+            server.close()
+
+    print(f"{args.calls} calls against {url}  (ms per call)")
+    print(f"{'mode':<8} {'p50':>9} {'p95':>9} {'mean':>9}")
+    print(_row("fresh", fresh))
+    print(_row("pooled", pooled))
+    print(f"pooled saves {statistics.median(fresh) - statistics.median(pooled):.3f} ms/call at p50")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""Benchmark: how long `import ollama_mcp.server` takes, with a budget that fails the run.
+
+Run it with `make bench-import` (or `uv run python scripts/bench_import.py`). Every Claude Code
+session spawns its own bridge, so this import is paid on every session start. Each run is a
+fresh interpreter with ``-X importtime``, and the script reports two figures:
+
+- **total**: wall time of the import, the FastMCP/pydantic/httpx stack included. It varies a
+  lot from machine to machine, so it is reported but not budgeted.
+- **own**: the summed self-time of the ``ollama_mcp.*`` modules. This is the part this repo
+  controls, and ``--budget-ms`` applies to its median.
+
+The run also fails if a module that must load on first use shows up at import time: yaml,
+anything under ``ollama_mcp.oficina``, or a subprocess being spawned. ``--top`` lists the
+slowest of our own modules, for finding the regression.
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parents[1] / "src"
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+_DEFERRED = ("yaml", "ollama_mcp.oficina")
+_PROBE = (
+    "import subprocess, sys, time\n"
+    "spawned = []\n"
+    "real = subprocess.Popen.__init__\n"
+    "def watch(self, *a, **k):\n"
+    "    spawned.append(a[0] if a else k.get('args'))\n"
+    "    real(self, *a, **k)\n"
+    "subprocess.Popen.__init__ = watch\n"
+    "t0 = time.perf_counter()\n"
+    "import ollama_mcp.server\n"
+    "print('WALL', (time.perf_counter() - t0) * 1000)\n"
+    "print('MODULES', ' '.join(sorted(sys.modules)))\n"
+    "print('SPAWNED', len(spawned))\n"
+)
+
+
+def _run_once() -> tuple[float, dict[str, float], list[str], int]:
+    """One fresh interpreter: (wall ms, own module → self ms, loaded modules, spawns)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": str(_SRC), "PATH": "/usr/bin:/bin"},
+        check=True,
+    )
+    own = {}
+    for match in _LINE.finditer(proc.stderr):
+        name = match.group(4)
+        if name.startswith("ollama_mcp"):
+            own[name] = int(match.group(1)) / 1000
+    fields = dict(line.split(" ", 1) for line in proc.stdout.splitlines() if " " in line)
+    return float(fields["WALL"]), own, fields["MODULES"].split(), int(fields["SPAWNED"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters (default 7)")
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="fail when the median own-module time exceeds this (default 150)")
+    parser.add_argument("--top", type=int, default=8, help="slowest own modules to list")
+    args = parser.parse_args()
+
+    walls, owns, per_module = [], [], {}
+    loaded, spawned = set(), 0
+    for _ in range(args.runs):
+        wall, own, modules, spawns = _run_once()
+        walls.append(wall)
+        owns.append(sum(own.values()))
+        for name, ms in own.items():
+            per_module.setdefault(name, []).append(ms)
+        loaded.update(modules)
+        spawned = max(spawned, spawns)
+
+    own_ms = statistics.median(owns)
+    print(f"runs: {args.runs}")
+    print(f"total import (median): {statistics.median(walls):8.1f} ms")
+    print(f"own modules (median):  {own_ms:8.1f} ms   budget {args.budget_ms:.0f} ms")
+    print("slowest own modules (median self time):")
+    slowest = sorted(per_module.items(), key=lambda kv: -statistics.median(kv[1]))
+    for name, samples in slowest[:args.top]:
+        print(f"  {statistics.median(samples):7.1f} ms  {name}")
+
+    failures = []
+    if own_ms > args.budget_ms:
+        failures.append(f"own import time {own_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    early = sorted(m for m in loaded if any(m == d or m.startswith(d + ".") for d in _DEFERRED))
+    if early:
+        failures.append(f"loaded at import time, should load on first use: {', '.join(early)}")
+    if spawned:
+        failures.append(f"{spawned} subprocess(es) spawned at import time")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
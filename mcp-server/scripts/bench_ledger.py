@@ -0,0 +1,88 @@
+"""Benchmark: oficina ledger appends stay constant-time as the ledger grows.
+
+Run it with `make bench-ledger` (or `uv run python scripts/bench_ledger.py`). It appends
+``--events`` (default 100k) worker-sized events to a fresh ``events.jsonl`` through one
+``Ledger`` and reports the per-append cost for each tenth of the run: flat is the point. The
+worker ledger under ``ledger: forever`` is the case this guards, since it never stops growing.
+
+More figures:
+
+- **reopen**: the first append from a NEW ``Ledger`` on the full file, which has to read the
+  tail to learn its offset (what a restarted worker pays once).
+- **rescan**: the old per-append cost (repair the tail by scanning, then count every line) at
+  the full length, for comparison.
+- **poll**: ``read(since_offset)`` for the last 10 events, which seeks through the offset
+  index — what a ``run_status`` watcher pays per tick — against a full ``read()``.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ollama_mcp.oficina.ledger import (  # noqa: E402
+    Ledger,
+    _read_valid_events,
+    _valid_prefix_bytes,
+)
+
+_PAYLOAD = {"run_id": "r-0000000000", "pid": 12345, "detail": "x" * 120}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000, help="events to append")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "worker-events.jsonl"
+        ledger = Ledger(path)
+        block = max(1, args.events // 10)
+        per_block = []
+        start = time.perf_counter()
+        for n in range(args.events):
+            ledger.worker_started(_PAYLOAD)
+            if (n + 1) % block == 0:
+                now = time.perf_counter()
+                per_block.append((now - start) / block * 1e6)
+                start = now
+
+        t0 = time.perf_counter()
+        envelope = Ledger(path).worker_stopped(_PAYLOAD)
+        reopen_ms = (time.perf_counter() - t0) * 1000
+        assert envelope["offset"] == args.events, envelope["offset"]
+
+        t0 = time.perf_counter()
+        _valid_prefix_bytes(path)
+        len(_read_valid_events(path))
+        rescan_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        polled = Ledger(path).read(since_offset=args.events - 9)
+        poll_ms = (time.perf_counter() - t0) * 1000
+        assert len(polled) == 10, len(polled)
+
+        t0 = time.perf_counter()
+        Ledger(path).read()
+        full_ms = (time.perf_counter() - t0) * 1000
+
+        size_mb = path.stat().st_size / 1e6
+
+    print(f"events: {args.events}  ledger: {size_mb:.1f} MB")
+    print("append cost by tenth of the run (µs/append):")
+    print("  " + "  ".join(f"{us:6.1f}" for us in per_block))
+    growth = per_block[-1] / statistics.median(per_block[:3])
+    print(f"last tenth vs first tenths: {growth:.2f}x")
+    print(f"reopen (first append, new Ledger): {reopen_ms:8.2f} ms")
+    print(f"rescan (old per-append cost):      {rescan_ms:8.2f} ms")
+    print(f"poll (read last 10 via index):     {poll_ms:8.2f} ms")
+    print(f"full read():                       {full_ms:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Load benchmark: concurrent bridge calls against the fake Ollama — throughput and tail latency.
+
+Run it with `make bench-load` (or `uv run python scripts/bench_load.py`). It needs no GPU: it
+starts `fake_ollama.FakeOllama` in-process, one model resident at a time, and drives
+``--callers`` concurrent `OllamaClient` loops, each making ``--calls`` calls over a mix of
+``--models``. Every caller keeps a stable prompt prefix and varies its tail, as oficina's
+repair loop does, so the fake's prefix cache is exercised. ``--url`` points it at any
+Ollama-compatible server instead (a `make fake-ollama` in another shell, or a real one).
+
+Delays run at ``--time-scale`` of the fake's model speeds (default 0.05: a 8 s cold load
+takes 0.4 s) — compare runs at one scale, not across scales. The gate is disabled: this
+measures the client and the server's scheduling, not cross-process admission.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ["OLLAMA_GATE_SOCKET"] = ""
+os.environ.setdefault("OLLAMA_CALL_LOG", "")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ollama_mcp.client import OllamaClient  # noqa: E402
+from ollama_mcp.fake_ollama import FakeOllama, ModelSpec  # noqa: E402
+
+
+def _pct(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _caller(
+    client: OllamaClient,
+    idx: int,
+    models: list[str],
+    calls: int,
+    num_predict: int,
+    stream: bool,
+    latencies: list[float],
+    ttfts: list[float],
+) -> None:
+    rng = random.Random(idx)
+    prefix = f"caller {idx} spec. " + "context line. " * 200
+    for n in range(calls):
+        model = rng.choice(models)
+        prompt = f"{prefix}attempt {n}"
+        t0 = time.perf_counter()
+        if stream:
+            first = None
+            async for _ in client.chat_stream(prompt, model=model, num_predict=num_predict):
+                if first is None:
+                    first = time.perf_counter()
+            ttfts.append(((first or time.perf_counter()) - t0) * 1000)
+        else:
+            await client.chat(prompt, model=model, num_predict=num_predict, cache=False)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=10, help="calls per caller")
+    parser.add_argument("--models", default="coder,judge", help="comma-separated model mix")
+    parser.add_argument("--num-predict", type=int, default=64)
+    parser.add_argument("--stream", action="store_true", help="stream replies (reports TTFT)")
+    parser.add_argument("--parallel", type=int, default=1, help="fake: calls per loaded model")
+    parser.add_argument("--max-loaded", type=int, default=1, help="fake: models resident at once")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="fake: delay multiplier")
+    parser.add_argument("--url", help="an already-running server (default: in-process fake)")
+    args = parser.parse_args()
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    fake = None
+    url = args.url
+    if url is None:
+        fake = FakeOllama(
+            [ModelSpec(name=m if ":" in m else f"{m}:latest") for m in models],
+            max_loaded=args.max_loaded,
+            parallel=args.parallel,
+            time_scale=args.time_scale,
+        )
+        url = await fake.start()
+
+    latencies: list[float] = []
+    ttfts: list[float] = []
+    t0 = time.perf_counter()
+    try:
+        async with OllamaClient(url) as client:
+            await asyncio.gather(*(
+                _caller(client, i, models, args.calls, args.num_predict, args.stream,
+                        latencies, ttfts)
+                for i in range(args.callers)
+            ))
+    finally:
+        if fake is not None:
+            await fake.close()
+    wall = time.perf_counter() - t0
+
+    ordered = sorted(latencies)
+    print(f"{len(ordered)} calls, {args.callers} callers, models {models} against {url}")
+    print(f"throughput  {len(ordered) / wall:8.2f} calls/s  ({wall:.2f}s wall)")
+    print(f"{'latency ms':<12} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    print(
+        f"{'call':<12} {_pct(ordered, 0.5):>9.1f} {_pct(ordered, 0.95):>9.1f} "
+        f"{_pct(ordered, 0.99):>9.1f} {ordered[-1]:>9.1f}"
+    )
+    if ttfts:
+        t = sorted(ttfts)
+        print(
+            f"{'first token':<12} {_pct(t, 0.5):>9.1f} {_pct(t, 0.95):>9.1f} "
+            f"{_pct(t, 0.99):>9.1f} {t[-1]:>9.1f}"
+        )
+    if fake is not None:
+        s = fake.stats
+        reuse = s.prefix_tokens_reused / max(1, s.prefix_tokens_reused + s.prompt_tokens_evaluated)
+        print(
+            f"fake: {s.loads} loads, {s.evictions} evictions, "
+            f"prefix reuse {reuse:.0%}, mean {statistics.mean(ordered):.1f} ms/call"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Benchmark: chars/4 and `tokens.approximate` against the real tokenizer, plus count speed.
+
+Run it with `make bench-tokens` (or `uv run python scripts/bench_tokens.py`). The corpus is the
+repo's own Python and Markdown, which is what the budgets actually size: oficina prompts are
+code plus a spec, overlay merges are Markdown. For every file it counts tokens three ways —
+``len // 4``, the pre-token approximation, and the exact tokenizer from ``OLLAMA_TOKENIZER``
+(or ``--tokenizer``) — and reports each estimate's error against the exact count. Without
+tokenizer files only throughput is reported: there is nothing exact to compare to.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ollama_mcp.tokens import TokenCounter, approximate  # noqa: E402
+
+_REPO = Path(__file__).resolve().parents[2]
+
+
+def _corpus(root: Path, limit: int) -> list[tuple[str, str]]:
+    files = sorted(
+        p for pattern in ("*.py", "*.md") for p in root.rglob(pattern)
+        if ".git" not in p.parts and ".venv" not in p.parts
+    )
+    return [(p.suffix, p.read_text(encoding="utf-8", errors="replace")) for p in files[:limit]]
+
+
+def _error_row(name: str, errors: list[float]) -> str:
+    ordered = sorted(abs(e) for e in errors)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    under = sum(1 for e in errors if e < 0) / len(errors)
+    return (
+        f"{name:<12} {statistics.mean(errors):>+8.1%} {statistics.median(ordered):>8.1%} "
+        f"{p95:>8.1%} {under:>8.0%}"
+    )
+
+
+def _throughput(fn, texts: list[str]) -> float:
+    """Megabytes of text counted per second."""
+    size = sum(len(t.encode("utf-8")) for t in texts)
+    t0 = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return size / (time.perf_counter() - t0) / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokenizer", help="tokenizer.json or its directory (default: config)")
+    parser.add_argument("--root", type=Path, default=_REPO, help="corpus root (default: repo)")
+    parser.add_argument("--limit", type=int, default=400, help="max files in the corpus")
+    args = parser.parse_args()
+
+    exact = TokenCounter(args.tokenizer) if args.tokenizer else TokenCounter()
+    corpus = [(kind, text) for kind, text in _corpus(args.root, args.limit) if text.strip()]
+    texts = [text for _, text in corpus]
+    print(f"{len(corpus)} files under {args.root}; tokenizer backend: {exact.backend}")
+
+    if exact.exact:
+        for kind in (".py", ".md"):
+            chars4, approx = [], []
+            for _, text in (c for c in corpus if c[0] == kind):
+                truth = exact._count(text)  # unmemoized, so the timing below is honest too
+                chars4.append((len(text) // 4 - truth) / truth)
+                approx.append((approximate(text) - truth) / truth)
+            if not chars4:
+                continue
+            print(f"\n{kind} ({len(chars4)} files) — error vs exact")
+            print(f"{'estimate':<12} {'mean':>8} {'p50|e|':>8} {'p95|e|':>8} {'under':>8}")
+            print(_error_row("chars/4", chars4))
+            print(_error_row("approximate", approx))
+
+    print("\nthroughput (MB/s)")
+    print(f"  approximate  {_throughput(approximate, texts):8.2f}")
+    if exact.exact:
+        print(f"  {exact.backend:<11}  {_throughput(exact._count, texts):8.2f}")
+    print(f"  memoized     {_throughput(exact.count, texts + texts):8.2f}  (each file twice)")
+
+
+if __name__ == "__main__":
+    main()
@@ -50,8 +50,18 @@ for pid in "${LIVE_PIDS[@]}"; do
     if [[ -n $line ]]; then
         ppid=$(jget "$line" ppid)
         client=$(jget "$line" client_id)
-        git=$(jget "$line" git)
-        branch=$(jget "$line" branch)
+        # git/branch come from server_build, logged once the background
+        # start-up checks have run (two git subprocesses, off the start path).
+        build=$(grep -F "\"pid\": $pid," "$LOG" 2>/dev/null \
+            | grep '"ev": "server_build"' \
+            | tail -n 1)
+        if [[ -n $build ]]; then
+            git=$(jget "$build" git)
+            branch=$(jget "$build" branch)
+        else
+            git="?"
+            branch="?"
+        fi
         level=$(jget "$line" log_level)
         started=$(jget "$line" t)
     else
@@ -0,0 +1,333 @@
+"""calls.jsonl writer and reader — batched off the event loop, rotated into segments.
+
+`OllamaClient._log_call` used to ``mkdir``, open, ``json.dumps`` and write on the event loop
+for every call, and ``calls.jsonl`` grew without bound even though it is the raw material for
+DPO export and verdict capture. Now the client only builds the record and hands it to `submit`;
+everything that touches the disk happens on one daemon thread per log path:
+
+- **Bounded queue, never blocks.** `submit` is a ``put_nowait``. When the queue is full the
+  record is dropped and counted (`stats`) — logging must not add latency to a tool call, and
+  it was always allowed to fail.
+- **Batched flushes.** The thread drains whatever is queued (up to ``CALL_LOG_BATCH``) and
+  writes it with one ``write`` under an ``flock`` on ``<log>.lock`` — every bridge, the oficina
+  worker and the scripts append to the same file, so a batch must land whole.
+  ``OLLAMA_CALL_LOG_FSYNC=batch`` adds an ``fsync`` per batch; the default leaves it to the OS.
+- **Rotation with a manifest.** The active segment keeps the configured name, so anything
+  tailing ``calls.jsonl`` still sees the newest calls. Past ``CALL_LOG_ROTATE_MB`` (``size``)
+  or on the first write of a new UTC day (``daily``) it is sealed as ``calls.00001.jsonl``,
+  ``calls.00002.jsonl``, … and recorded in ``calls.manifest.json`` with its record count,
+  byte size and first/last ``ts``.
+
+Readers walk every segment as one logical log with `iter_records` (sealed segments in manifest
+order, then the active one) — never by opening ``calls.jsonl`` alone, which after the first
+rotation is only the tail.
+
+Pending records are flushed at interpreter exit, and by `close` (the bridge's lifespan).
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import datetime
+import fcntl
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ollama_mcp.config import (
+    CALL_LOG_BATCH,
+    CALL_LOG_FLUSH_S,
+    CALL_LOG_FSYNC,
+    CALL_LOG_QUEUE_MAX,
+    CALL_LOG_ROTATE,
+    CALL_LOG_ROTATE_MB,
+)
+
+
+# Fills in a record's deferred fields on the writer thread (see `CallLogWriter.submit`).
+Finalizer = Callable[[Dict[str, Any]], None]
+
+
+def _sibling(active: Path, suffix: str) -> Path:
+    return active.with_name(active.stem + suffix)
+
+
+def manifest_path(active: Path) -> Path:
+    """``calls.jsonl`` → ``calls.manifest.json``."""
+    return _sibling(active, ".manifest.json")
+
+
+def _read_manifest(active: Path) -> List[Dict[str, Any]]:
+    try:
+        return json.loads(manifest_path(active).read_text(encoding="utf-8"))["segments"]
+    except Exception:
+        return []
+
+
+class CallLogWriter:
+    """One background thread appending batched records to one log path."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        max_queue: int = CALL_LOG_QUEUE_MAX,
+        batch: int = CALL_LOG_BATCH,
+        flush_s: float = CALL_LOG_FLUSH_S,
+        fsync: str = CALL_LOG_FSYNC,
+        rotate: str = CALL_LOG_ROTATE,
+        rotate_bytes: int = int(CALL_LOG_ROTATE_MB * 1024 * 1024),
+    ) -> None:
+        self.path = Path(path)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._batch = batch
+        self._flush_s = flush_s
+        self._fsync = fsync == "batch"
+        self._rotate = rotate
+        self._rotate_bytes = rotate_bytes
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self._thread = threading.Thread(
+            target=self._drain, name=f"calllog:{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    # -- producer side (any thread, including the event loop) ---------------------------
+
+    def submit(self, entry: Dict[str, Any], finalize: Optional[Finalizer] = None) -> None:
+        """Queue ``entry`` for writing; drop it (counted) if the queue is full or closed.
+
+        ``finalize(entry)``, if given, runs on the writer thread just before the record is
+        serialized — for fields too costly to compute on the caller's event loop.
+        """
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((entry, finalize))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued before this call is on disk (False on timeout)."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush, then stop the thread. Later submits are dropped."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "rotations": self.rotations,
+        }
+
+    # -- writer thread -------------------------------------------------------------------
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            deadline = time.monotonic() + self._flush_s
+            batch: List[Tuple[Dict[str, Any], Optional[Finalizer]]] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self._batch:
+                    break
+                # A pending flush() writes now; otherwise gather until the batch interval ends.
+                wait = 0.0 if waiters else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=wait)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], Optional[Finalizer]]]) -> None:
+        try:
+            for entry, finalize in batch:
+                if finalize is not None:
+                    with contextlib.suppress(Exception):
+                        finalize(entry)
+            data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e, _ in batch)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(_sibling(self.path, ".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                self._maybe_rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(data)
+                    if self._fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            self.written += len(batch)
+            self.batches += 1
+        except Exception:
+            self.dropped += len(batch)  # Never let logging break anything
+
+    def _maybe_rotate(self) -> None:
+        """Seal the active segment if it is due. Caller holds the lock."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return
+        if st.st_size == 0:
+            return
+        if self._rotate == "size":
+            due = self._rotate_bytes > 0 and st.st_size >= self._rotate_bytes
+        elif self._rotate == "daily":
+            last = datetime.datetime.fromtimestamp(st.st_mtime, tz=datetime.timezone.utc)
+            due = last.date() != datetime.datetime.now(tz=datetime.timezone.utc).date()
+        else:
+            due = False
+        if due:
+            self._seal(st.st_size)
+
+    def _seal(self, size: int) -> None:
+        segments = _read_manifest(self.path)
+        seq = 1 + max((s.get("seq", 0) for s in segments), default=0)
+        sealed = _sibling(self.path, f".{seq:05d}{self.path.suffix}")
+        os.replace(self.path, sealed)
+
+        records, first_ts, last_ts = 0, None, None
+        with open(sealed, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    ts = json.loads(line).get("ts")
+                except ValueError:
+                    continue
+                records += 1
+                first_ts = first_ts or ts
+                last_ts = ts or last_ts
+        segments.append(
+            {
+                "seq": seq,
+                "file": sealed.name,
+                "records": records,
+                "bytes": size,
+                "first_ts": first_ts,
+                "last_ts": last_ts,
+            }
+        )
+        manifest = manifest_path(self.path)
+        tmp = manifest.with_name(manifest.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"active": self.path.name, "segments": segments}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp, manifest)
+        self.rotations += 1
+
+
+_WRITERS: Dict[str, CallLogWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def writer_for(path: str | os.PathLike) -> CallLogWriter:
+    """The process-wide writer for ``path``, started on first use."""
+    key = str(path)
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None or writer._closed:
+            writer = _WRITERS[key] = CallLogWriter(key)
+        return writer
+
+
+def submit(
+    path: str | os.PathLike, entry: Dict[str, Any], finalize: Optional[Finalizer] = None
+) -> None:
+    """Queue one call record for ``path``. Never raises, never blocks."""
+    try:
+        writer_for(path).submit(entry, finalize)
+    except Exception:
+        pass
+
+
+def flush(timeout: float = 5.0) -> None:
+    """Wait until every writer in this process has written what it was given."""
+    for writer in list(_WRITERS.values()):
+        writer.flush(timeout)
+
+
+@atexit.register
+def close(timeout: float = 5.0) -> None:
+    """Flush and stop every writer (runs at exit; the bridge also calls it on shutdown)."""
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.close(timeout)
+
+
+# ---------------------------------------------------------------------------
+# Reading — the whole log, across segments
+# ---------------------------------------------------------------------------
+
+
+def segments(path: str | os.PathLike) -> List[Path]:
+    """Every segment of the log at ``path``, oldest first, the active one last.
+
+    The manifest is the order of record. Without one (a log never rotated, or a manifest
+    lost) sealed segments are found by name, which sorts the same way.
+    """
+    active = Path(path)
+    listed = [active.with_name(s["file"]) for s in _read_manifest(active) if "file" in s]
+    if not listed:
+        listed = sorted(active.parent.glob(f"{active.stem}.[0-9]*{active.suffix}"))
+    found = [p for p in listed if p.exists()]
+    if active.exists():
+        found.append(active)
+    return found
+
+
+def iter_records(path: Optional[str | os.PathLike] = None) -> Iterator[Dict[str, Any]]:
+    """Every record of the log, oldest first, as one logical stream.
+
+    ``path`` defaults to the configured ``CALL_LOG_PATH``. Lines that do not parse — a
+    torn final line from a crashed writer — are skipped, as the old single-file readers did.
+    """
+    if path is None:
+        from ollama_mcp.config import CALL_LOG_PATH
+
+        path = CALL_LOG_PATH
+    if not path:
+        return
+    for segment in segments(path):
+        with open(segment, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
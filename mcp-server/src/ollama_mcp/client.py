@@ -6,28 +6,39 @@ testing or scripting.
 
 Key design choices:
 - Uses httpx.AsyncClient for non-blocking HTTP (MCP server is async)
-- Single shared client instance for connection pooling (reuses TCP connections)
+- One keep-alive pool per Ollama host per event loop, shared by every OllamaClient
+  on that loop, with a health check after a cancelled or timed-out request
 - Returns a structured dict, not raw JSON, so callers get consistent fields
+- `chat` waits for the whole reply; `chat_stream` yields it as it is generated,
+  for long generations where silence until the end is indistinguishable from a hang
 """
 
+import asyncio
+import contextlib
+import dataclasses
 import datetime
 import hashlib
 import json
 import time
 import uuid
-from dataclasses import dataclass
-from pathlib import Path
+import weakref
+from dataclasses import dataclass, field
+from typing import AsyncIterator
 
 import httpx
 
-from ollama_mcp import debug_log
+from ollama_mcp import calllog, debug_log, gate, metrics, residency, response_cache, tokens
 from ollama_mcp.config import (
     CALL_LOG_PATH,
+    COALESCE,
     DEFAULT_MODEL,
     DEFAULT_THINK,
     DEFAULT_TIMEOUT,
+    EMBED_MODEL,
     LOG_FULL_CONTENT,
     OLLAMA_BASE_URL,
+    POOL_KEEPALIVE_S,
+    POOL_MAX_CONNECTIONS,
 )
 
 
@@ -65,6 +76,23 @@ class ChatResponse:
     # Minted in `chat`, not in `_log_call`, so identity does not depend on logging being
     # enabled or succeeding — that function swallows its own failures by design.
     call_id: str = ""
+    # Where the model-call gate (gate.py, T-88) put this call and how long it waited there
+    # before reaching Ollama. Both 0 when the call went through ungated. Kept apart from
+    # total_duration_ms, which is Ollama's own clock and never sees the queue.
+    queue_position: int = 0
+    queue_wait_ms: float = 0.0
+    # Streamed calls only (`chat_stream`): time from request to the first content delta,
+    # and each delta's arrival offset from the request, in ms. TTFT is what a cold load or
+    # a long prompt-eval costs the caller; the offsets show where a generation stalled.
+    # None / empty for a non-streamed call — Ollama's totals cannot recover either.
+    ttft_ms: float | None = None
+    chunk_offsets_ms: list[float] = field(default_factory=list)
+    # Served from the response cache (response_cache.py) instead of a generation. The eval
+    # figures are then the ORIGINAL call's; call_id is still this call's own.
+    cached: bool = False
+    # Set when this call was coalesced onto an identical one already in flight: the call_id
+    # of the call that actually generated the reply (whose eval figures these are).
+    coalesced_with: str | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -83,6 +111,183 @@ class OllamaTimeoutError(Exception):
     """Raised when Ollama takes too long to respond."""
 
 
+class OllamaStreamError(Exception):
+    """Raised when a streamed reply reports an error or ends before its final chunk."""
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+class _HostPool:
+    """One keep-alive connection pool to one Ollama host, shared on one event loop.
+
+    Replaces the fresh-client-per-call workaround. That workaround existed because a
+    cancelled or timed-out request could leave its pooled connection half-read, and the
+    next call to reuse it failed in confusing ways. httpcore already drops the connection
+    a failed request was using; what was missing is noticing the OTHER case — a keep-alive
+    socket Ollama closed while it sat idle — and a way back if the whole pool is wedged:
+
+    - a call that times out or is cancelled marks the pool *suspect*; the next call first
+      runs a cheap ``GET /api/version`` and rebuilds the pool if that fails at transport
+      level (`ensure_healthy`);
+    - a request that dies with "server disconnected without sending a response" on a
+      reused socket is retried once (`OllamaClient._post_pooled`) — nothing was generated.
+
+    Pools are per event loop because an httpx client is bound to the loop it first ran on.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.http = self._new_client()
+        self.users = 0
+        self.suspect = False
+        self.rebuilds = 0
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=None,
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_CONNECTIONS,
+                keepalive_expiry=POOL_KEEPALIVE_S,
+            ),
+        )
+
+    def mark_suspect(self) -> None:
+        """A request on this pool timed out or was cancelled — check before trusting it."""
+        self.suspect = True
+
+    async def ensure_healthy(self) -> None:
+        """If suspect, probe the host; rebuild the pool when the probe fails at transport level."""
+        if not self.suspect:
+            return
+        self.suspect = False
+        try:
+            await self.http.get("/api/version", timeout=2)
+        except httpx.TransportError as exc:
+            debug_log.info("http_pool_rebuild", base_url=self.base_url, reason=type(exc).__name__)
+            await self.rebuild()
+
+    async def rebuild(self) -> None:
+        """Swap in a fresh pool and close the old one's sockets."""
+        old, self.http = self.http, self._new_client()
+        self.rebuilds += 1
+        with contextlib.suppress(Exception):
+            await old.aclose()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+
+# event loop → base_url → pool. Weak on the loop so a finished `asyncio.run` takes its
+# pools with it instead of the registry pinning dead loops.
+_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _HostPool]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _pool_for(base_url: str) -> _HostPool:
+    """The shared pool for ``base_url`` on the running event loop (created on first use)."""
+    pools = _POOLS.setdefault(asyncio.get_running_loop(), {})
+    pool = pools.get(base_url)
+    if pool is None:
+        pool = pools[base_url] = _HostPool(base_url)
+    return pool
+
+
+async def _release_pool(pool: _HostPool) -> None:
+    """Drop one user's claim on ``pool``; the last one out closes its sockets."""
+    pool.users -= 1
+    if pool.users > 0:
+        return
+    for pools in list(_POOLS.values()):
+        if pools.get(pool.base_url) is pool:
+            del pools[pool.base_url]
+    await pool.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Model digests (response-cache keys)
+# ---------------------------------------------------------------------------
+
+# base_url → ({model name: digest}, fetched_at). The cache is keyed by digest so a rebuilt
+# persona stops matching its old replies; a short TTL bounds how long a rebuild goes unseen
+# without putting an /api/tags round trip in front of every cached call.
+_DIGESTS: dict[str, tuple[dict[str, str], float]] = {}
+_DIGEST_TTL_S = 60.0
+
+
+def _digest_in(digests: dict[str, str], model: str) -> str | None:
+    """Look ``model`` up tolerating Ollama's implicit ``:latest`` tag."""
+    return digests.get(model) or digests.get(f"{model}:latest")
+
+
+# ---------------------------------------------------------------------------
+# Single-flight coalescing
+# ---------------------------------------------------------------------------
+
+# event loop → request key → the future of the call generating it. Per loop for the same
+# reason as `_POOLS`: a future belongs to the loop that made it.
+_FLIGHTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class _LeaderCancelled(Exception):
+    """The call followers were waiting on was cancelled by its own caller."""
+
+
+def _flights() -> dict[str, asyncio.Future]:
+    return _FLIGHTS.setdefault(asyncio.get_running_loop(), {})
+
+
+def _settle(future: asyncio.Future, exc: BaseException) -> None:
+    """Hand a leader's failure to its followers (cancellation becomes `_LeaderCancelled`)."""
+    if future.done():
+        return
+    if isinstance(exc, asyncio.CancelledError):
+        exc = _LeaderCancelled()
+    future.set_exception(exc)
+    future.exception()  # retrieved: no "never retrieved" warning when nobody followed
+
+
+# ---------------------------------------------------------------------------
+# Streamed reply
+# ---------------------------------------------------------------------------
+
+class ChatStream:
+    """A reply being streamed from Ollama: iterate for content deltas, then read `response`.
+
+    Usage:
+        stream = client.chat_stream("Write a parser for ...")
+        async for delta in stream:
+            out.write(delta)
+        print(stream.response.ttft_ms)
+
+    `response` is None until the iteration has run to completion, and stays None if it
+    raised or was abandoned — a partial reply has no honest eval counts to report.
+    """
+
+    def __init__(self) -> None:
+        self.response: ChatResponse | None = None
+        self._deltas: AsyncIterator[str] | None = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._deltas
+
+    async def collect(self) -> ChatResponse:
+        """Drain the stream and return the final response."""
+        async for _ in self:
+            pass
+        return self.response
+
+    async def aclose(self) -> None:
+        """Abandon the stream early, releasing the connection and the gate slot."""
+        await self._deltas.aclose()
+
+
 # ---------------------------------------------------------------------------
 # Client class
 # ---------------------------------------------------------------------------
@@ -95,15 +300,16 @@ class OllamaClient:
         response = await client.chat("Explain Python decorators in 3 sentences.")
         print(response.content)
 
-    The client maintains a persistent httpx.AsyncClient for connection pooling.
-    Call close() or use as an async context manager when done.
+    Every client on the same event loop shares one keep-alive pool per Ollama host
+    (`_HostPool`), claimed on first use. Call close() or use as an async context
+    manager when done; the last client to close a pool closes its connections.
     """
 
     def __init__(self, base_url: str = OLLAMA_BASE_URL) -> None:
-        # httpx.AsyncClient reuses TCP connections across requests, which
-        # avoids the overhead of a new TLS/TCP handshake per call.
+        # The pool is claimed lazily: an httpx client belongs to the event loop it
+        # first runs on, and a client may be constructed before any loop is running.
         self._base_url = base_url.rstrip("/")
-        self._http = httpx.AsyncClient(base_url=self._base_url, timeout=None)
+        self._pool: _HostPool | None = None
 
         # In-flight request tracking. Counts active requests per model.
         # Used by warm_model to avoid evicting a model mid-generation.
@@ -137,6 +343,42 @@ class OllamaClient:
         """Return a copy of the in-flight request counts."""
         return dict(self._inflight)
 
+    # -- Connection pool ---------------------------------------------------
+
+    def _host_pool(self) -> _HostPool:
+        """This client's claim on the shared pool for its host (claimed on first use)."""
+        if self._pool is None:
+            self._pool = _pool_for(self._base_url)
+            self._pool.users += 1
+        return self._pool
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        """The pooled httpx client for this host (for the short admin endpoints)."""
+        return self._host_pool().http
+
+    async def _post_pooled(self, url: str, *, json: dict, timeout: float) -> httpx.Response:
+        """POST on the shared pool, with its health check and one stale-socket retry.
+
+        The retry covers exactly one failure: a reused keep-alive socket that Ollama had
+        already closed, which surfaces as "server disconnected without sending a
+        response" — the request never reached a model, so sending it again is safe.
+        Timeouts and cancellation are NOT retried; they mark the pool suspect instead.
+        """
+        pool = self._host_pool()
+        await pool.ensure_healthy()
+        for attempt in (1, 2):
+            try:
+                return await pool.http.post(url, json=json, timeout=timeout)
+            except httpx.RemoteProtocolError:
+                if attempt == 2:
+                    raise
+                debug_log.info("http_pool_stale_retry", base_url=self._base_url, url=url)
+            except (httpx.TimeoutException, asyncio.CancelledError):
+                pool.mark_suspect()
+                raise
+        raise AssertionError("unreachable")
+
     async def chat(
         self,
         prompt: str,
@@ -146,11 +388,13 @@ class OllamaClient:
         temperature: float | None = None,
         think: bool = DEFAULT_THINK,
         format: dict | None = None,  # JSON schema for structured output
-        keep_alive: str = "15m",
+        keep_alive: str | None = None,  # None: residency policy (residency.keep_alive_for)
         timeout: int = DEFAULT_TIMEOUT,
         run_id: str | None = None,  # oficina: tags the call-log record (acceptance #6)
         num_predict: int | None = None,  # oficina/T-91: bound generation (floor + cap)
         tool: str | None = None,  # T-105: originating MCP tool, for the judgeable denominator
+        priority: str = "interactive",  # T-88: gate class — "interactive" or "batch"
+        cache: bool | None = None,  # response cache: None = configured default
     ) -> ChatResponse:
         """Send a chat completion request to Ollama.
 
@@ -163,8 +407,15 @@ class OllamaClient:
             format: JSON schema dict for structured output. None = free text.
             keep_alive: How long Ollama keeps the model (and its KV state) in VRAM
                 after this call. Longer values enable prefix KV reuse for retries
-                and follow-up calls with the same context. Default "15m".
-            timeout: Max seconds to wait for a response.
+                and follow-up calls with the same context. Default: the residency
+                policy (``OLLAMA_KEEP_ALIVE``, "15m") — override only with reason,
+                since residency reads LRU order off uniform expiries.
+            timeout: Max seconds to wait for a response, queue time at the gate included.
+            priority: Admission class at the model-call gate — "interactive" for a
+                caller that is waiting on the answer, "batch" for background work.
+            cache: Serve/store this call through the response cache. None follows
+                ``OLLAMA_RESPONSE_CACHE``; False forces a fresh generation — neither
+                cached nor coalesced onto an identical call already in flight.
 
         Returns:
             ChatResponse with the model's reply and performance metrics.
@@ -174,6 +425,365 @@ class OllamaClient:
             OllamaModelNotFoundError: The requested model isn't pulled/created.
             OllamaTimeoutError: Ollama didn't respond within the timeout.
         """
+        payload = self._build_payload(
+            prompt, model, system, temperature, think, format, keep_alive, num_predict,
+            stream=False,
+        )
+
+        # A cache hit never reaches the gate or Ollama, but is still a call of its own.
+        key = await self._response_cache_key(payload, model, cache)
+        if key is not None:
+            stored = await asyncio.to_thread(response_cache.get_cache().get, key)
+            if stored is not None:
+                result = ChatResponse(**stored, call_id=uuid.uuid4().hex[:12], cached=True)
+                self._log_call(
+                    prompt, system, model, temperature, think, format is not None, result,
+                    run_id, tool,
+                )
+                return result
+
+        # Single-flight: an identical request already in flight on this loop is awaited,
+        # not repeated. cache=False opts out of this too — it asks for a generation.
+        flight = None
+        if COALESCE and cache is not False:
+            flight = key or response_cache.cache_key(f"name:{model}", payload)
+            leader = _flights().get(flight)
+            if leader is not None:
+                shared = await self._follow(leader, model, timeout)
+                if shared is not None:
+                    result = dataclasses.replace(
+                        shared, call_id=uuid.uuid4().hex[:12], coalesced_with=shared.call_id
+                    )
+                    self._log_call(
+                        prompt, system, model, temperature, think, format is not None, result,
+                        run_id, tool,
+                    )
+                    return result
+            owned = _flights()[flight] = asyncio.get_running_loop().create_future()
+
+        try:
+            result = await self._generate(payload, model, timeout, priority)
+        except BaseException as exc:
+            if flight is not None:
+                _settle(owned, exc)
+            raise
+        finally:
+            if flight is not None and _flights().get(flight) is owned:
+                del _flights()[flight]
+        if flight is not None:
+            owned.set_result(result)
+
+        # Log the call for distillation / training data collection.
+        self._log_call(
+            prompt, system, model, temperature, think, format is not None, result, run_id, tool
+        )
+        if key is not None:
+            await asyncio.to_thread(response_cache.get_cache().put, key, result)
+
+        return result
+
+    async def _follow(
+        self, leader: "asyncio.Future[ChatResponse]", model: str, timeout: float
+    ) -> ChatResponse | None:
+        """Await an identical in-flight call's result; None if its caller gave up on it.
+
+        A leader that was CANCELLED says nothing about the request, so its followers fall
+        back to generating for themselves. Any other failure is the request's own (the model
+        is missing, Ollama is down or too slow) and is shared. ``timeout`` is still this
+        caller's deadline.
+        """
+        debug_log.debug("chat_coalesced", model=model)
+        try:
+            return await asyncio.wait_for(asyncio.shield(leader), timeout)
+        except _LeaderCancelled:
+            return None
+        except asyncio.TimeoutError:
+            raise OllamaTimeoutError(
+                f"Ollama did not respond within {timeout:g}s. "
+                "The model may be loading (cold start) — try again."
+            )
+
+    async def _generate(
+        self, payload: dict, model: str, timeout: float, priority: str
+    ) -> ChatResponse:
+        """One non-streamed generation: gate admission, the POST, and the parsed reply."""
+        # Track in-flight requests so warm_model can check before evicting.
+        self.mark_inflight(model)
+        t0 = time.perf_counter()
+        try:
+            async with self._admission(model, priority, timeout) as admission:
+                http_timeout = max(1.0, timeout - admission.wait_ms / 1000)
+                response = await self._post_chat(payload, model, http_timeout, t0)
+        finally:
+            self.mark_complete(model)
+
+        # Check for HTTP errors. Ollama returns 404 when a model isn't found.
+        if response.status_code == 404:
+            raise OllamaModelNotFoundError(
+                f"Model '{model}' not found in Ollama. "
+                f"Available models: ollama list"
+            )
+        response.raise_for_status()
+
+        # Parse the response JSON into our structured dataclass.
+        data = response.json()
+        # Identity is a property of the CALL, not of the log record (P4-T3) — mint it
+        # here so it survives logging being disabled or failing.
+        call_id = uuid.uuid4().hex[:12]
+        result = ChatResponse(
+            call_id=call_id,
+            content=data["message"]["content"],
+            model=data.get("model", model),
+            prompt_eval_count=data.get("prompt_eval_count", 0),
+            eval_count=data.get("eval_count", 0),
+            eval_duration_ms=data.get("eval_duration", 0) / 1_000_000,
+            total_duration_ms=data.get("total_duration", 0) / 1_000_000,
+            prompt_eval_duration_ms=data.get("prompt_eval_duration", 0) / 1_000_000,
+            queue_position=admission.position,
+            queue_wait_ms=admission.wait_ms,
+        )
+
+        return result
+
+    async def embed(
+        self,
+        texts: list[str],
+        *,
+        model: str = EMBED_MODEL,
+        timeout: int = DEFAULT_TIMEOUT,
+        priority: str = "interactive",
+    ) -> list[list[float]]:
+        """Embed ``texts`` with one /api/embed request; one vector per text, in order.
+
+        Admitted through the gate like a chat call: loading the embedding model can evict
+        a chat model, so it takes its turn. Not logged to calls.jsonl (no generation).
+
+        Raises:
+            OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError: as `chat`.
+        """
+        payload = {
+            "model": model,
+            "input": texts,
+            "keep_alive": residency.keep_alive_for(model),
+        }
+        self.mark_inflight(model)
+        t0 = time.perf_counter()
+        try:
+            async with self._admission(model, priority, timeout) as admission:
+                http_timeout = max(1.0, timeout - admission.wait_ms / 1000)
+                response = await self._post_chat(
+                    payload, model, http_timeout, t0, path="/api/embed"
+                )
+        finally:
+            self.mark_complete(model)
+        if response.status_code == 404:
+            raise OllamaModelNotFoundError(
+                f"Model '{model}' not found in Ollama. "
+                f"Pull it with: ollama pull {model}"
+            )
+        response.raise_for_status()
+        return response.json().get("embeddings", [])
+
+    def chat_stream(
+        self,
+        prompt: str,
+        *,
+        model: str = DEFAULT_MODEL,
+        system: str | None = None,
+        temperature: float | None = None,
+        think: bool = DEFAULT_THINK,
+        format: dict | None = None,
+        keep_alive: str | None = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        run_id: str | None = None,
+        num_predict: int | None = None,
+        tool: str | None = None,
+        priority: str = "interactive",
+    ) -> ChatStream:
+        """Like `chat`, but stream the reply: returns a `ChatStream` of content deltas.
+
+        Same arguments and the same calls.jsonl record as `chat`, plus TTFT and per-chunk
+        arrival offsets. The request is not sent until iteration starts.
+
+        ``timeout`` means something different here, deliberately: it bounds SILENCE — the
+        wait for the first token (cold load and prompt eval included) and then the gap
+        between any two chunks — not the whole generation. A 150s generation that keeps
+        producing tokens is alive and is not cut off at 120s; one that stalls is.
+
+        Raises (from iteration):
+            OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError: as `chat`.
+            OllamaStreamError: Ollama reported an error mid-stream, or the stream ended
+                without its final ``done`` chunk.
+        """
+        payload = self._build_payload(
+            prompt, model, system, temperature, think, format, keep_alive, num_predict,
+            stream=True,
+        )
+        stream = ChatStream()
+        stream._deltas = self._stream_deltas(
+            stream, payload, prompt, system, model, temperature, think, format is not None,
+            timeout, run_id, tool, priority,
+        )
+        return stream
+
+    async def _stream_deltas(
+        self,
+        stream: ChatStream,
+        payload: dict,
+        prompt: str,
+        system: str | None,
+        model: str,
+        temperature: float | None,
+        think: bool,
+        had_format: bool,
+        timeout: float,
+        run_id: str | None,
+        tool: str | None,
+        priority: str,
+    ) -> AsyncIterator[str]:
+        """Send a streamed /api/chat request and yield content deltas as they arrive.
+
+        Ollama's NDJSON is parsed line by line as it lands — never buffered whole — and the
+        final ``done`` line carries the same counters a non-streamed reply does, which is
+        where the ChatResponse's eval counts come from.
+        """
+        self.mark_inflight(model)
+        parts: list[str] = []
+        offsets: list[float] = []
+        final: dict | None = None
+        try:
+            async with self._admission(model, priority, timeout) as admission:
+                t0 = time.perf_counter()
+                debug_log.debug(
+                    "http_stream_start",
+                    model=model,
+                    url="/api/chat",
+                    timeout=timeout,
+                    payload_chars=len(json.dumps(payload)),
+                )
+                pool = self._host_pool()
+                await pool.ensure_healthy()
+                try:
+                    async with pool.http.stream(
+                        "POST", "/api/chat", json=payload, timeout=timeout
+                    ) as response:
+                        if response.status_code == 404:
+                            raise OllamaModelNotFoundError(
+                                f"Model '{model}' not found in Ollama. "
+                                f"Available models: ollama list"
+                            )
+                        if response.is_error:
+                            await response.aread()
+                            response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.strip():
+                                continue
+                            data = json.loads(line)
+                            if "error" in data:
+                                raise OllamaStreamError(
+                                    f"Ollama error mid-stream: {data['error']}"
+                                )
+                            delta = (data.get("message") or {}).get("content", "")
+                            if delta:
+                                offsets.append((time.perf_counter() - t0) * 1000)
+                                parts.append(delta)
+                                yield delta
+                            if data.get("done"):
+                                final = data
+                                break
+                except (asyncio.CancelledError, GeneratorExit):
+                    # Abandoned mid-reply: the socket may hold unread chunks.
+                    pool.mark_suspect()
+                    raise
+                except httpx.ConnectError:
+                    debug_log.error("http_stream_error", model=model, reason="ConnectError")
+                    raise OllamaConnectionError(
+                        f"Cannot connect to Ollama at {self._base_url}. "
+                        "Is Ollama running? Start it with: ollama serve"
+                    )
+                except httpx.TimeoutException:
+                    pool.mark_suspect()
+                    debug_log.error(
+                        "http_stream_error",
+                        model=model,
+                        reason="TimeoutException",
+                        chunks=len(offsets),
+                    )
+                    raise OllamaTimeoutError(
+                        f"Ollama went silent for {timeout}s "
+                        f"({'before the first token' if not offsets else f'after {len(offsets)} chunks'}). "
+                        "The model may be loading (cold start) — try again."
+                    )
+                debug_log.debug(
+                    "http_stream_done",
+                    model=model,
+                    ms=round((time.perf_counter() - t0) * 1000, 2),
+                    chunks=len(offsets),
+                    ttft_ms=round(offsets[0], 2) if offsets else None,
+                )
+        finally:
+            self.mark_complete(model)
+
+        if final is None:
+            raise OllamaStreamError(
+                f"Stream from {model} ended after {len(parts)} chunks without a final chunk."
+            )
+        result = ChatResponse(
+            call_id=uuid.uuid4().hex[:12],
+            content="".join(parts),
+            model=final.get("model", model),
+            prompt_eval_count=final.get("prompt_eval_count", 0),
+            eval_count=final.get("eval_count", 0),
+            eval_duration_ms=final.get("eval_duration", 0) / 1_000_000,
+            total_duration_ms=final.get("total_duration", 0) / 1_000_000,
+            prompt_eval_duration_ms=final.get("prompt_eval_duration", 0) / 1_000_000,
+            queue_position=admission.position,
+            queue_wait_ms=admission.wait_ms,
+            ttft_ms=offsets[0] if offsets else None,
+            chunk_offsets_ms=offsets,
+        )
+        self._log_call(prompt, system, model, temperature, think, had_format, result, run_id, tool)
+        stream.response = result
+
+    async def _model_digest(self, model: str) -> str | None:
+        """``model``'s digest from /api/tags (memoized briefly); None if unknown or unreachable."""
+        digests, fetched_at = _DIGESTS.get(self._base_url, ({}, 0.0))
+        found = _digest_in(digests, model)
+        if found and time.monotonic() - fetched_at < _DIGEST_TTL_S:
+            return found
+        try:
+            models = await self.list_models()
+        except Exception:
+            return None
+        digests = {m["name"]: m["digest"] for m in models if m.get("name") and m.get("digest")}
+        _DIGESTS[self._base_url] = (digests, time.monotonic())
+        return _digest_in(digests, model)
+
+    async def _response_cache_key(
+        self, payload: dict, model: str, cache: bool | None
+    ) -> str | None:
+        """The cache key for this request, or None when it is not to be cached."""
+        if cache is False or (cache is None and not response_cache.get_cache().enabled):
+            return None
+        digest = await self._model_digest(model)
+        if digest is None:
+            return None
+        return response_cache.cache_key(digest, payload)
+
+    def _build_payload(
+        self,
+        prompt: str,
+        model: str,
+        system: str | None,
+        temperature: float | None,
+        think: bool,
+        format: dict | None,
+        keep_alive: str | None,
+        num_predict: int | None,
+        *,
+        stream: bool,
+    ) -> dict:
+        """The /api/chat request body shared by `chat` and `chat_stream`."""
         # Build the messages list. Ollama's /api/chat expects an array of
         # {"role": "...", "content": "..."} objects, similar to OpenAI's format.
         messages: list[dict[str, str]] = []
@@ -181,14 +791,14 @@ class OllamaClient:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
-        # Build the request payload. "stream: false" means Ollama returns
-        # the complete response in one JSON blob instead of streaming tokens.
+        # "stream: false" means Ollama returns the complete response in one JSON
+        # blob; "stream: true" sends one NDJSON line per generated chunk.
         payload: dict = {
             "model": model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
             "think": think,
-            "keep_alive": keep_alive,
+            "keep_alive": keep_alive or residency.keep_alive_for(model),
             "options": {},
         }
         if temperature is not None:
@@ -199,29 +809,51 @@ class OllamaClient:
             payload["options"]["num_predict"] = num_predict
         if format is not None:
             payload["format"] = format
+        return payload
 
-        # Track in-flight requests so warm_model can check before evicting.
-        self.mark_inflight(model)
-        t0 = time.perf_counter()
+    @contextlib.asynccontextmanager
+    async def _admission(
+        self, model: str, priority: str, timeout: float
+    ) -> AsyncIterator[gate.Admission]:
+        """Hold a model-call gate slot for the request (T-88); a queue timeout is a timeout.
+
+        The queue wait is spent out of the caller's budget — `timeout` is the caller's
+        deadline, not a per-stage allowance — so the HTTP leg gets only what is left of it.
+        """
+        try:
+            async with gate.admit(model, priority=priority, timeout=timeout) as admission:
+                if admission.gated:
+                    debug_log.debug(
+                        "gate_admitted",
+                        model=model,
+                        priority=priority,
+                        position=admission.position,
+                        wait_ms=admission.wait_ms,
+                    )
+                yield admission
+        except gate.GateTimeoutError as exc:
+            debug_log.error("gate_timeout", model=model, priority=priority, reason=str(exc))
+            raise OllamaTimeoutError(
+                f"Call to {model} did not reach Ollama within {timeout}s: {exc}. "
+                "Other sessions are using the GPU — try again or raise the timeout."
+            )
+
+    async def _post_chat(
+        self, payload: dict, model: str, timeout: float, t0: float, path: str = "/api/chat"
+    ) -> httpx.Response:
+        """POST one /api/chat (or ``path``) request, mapping transport failures to ours."""
         debug_log.debug(
             "http_post_start",
             model=model,
-            url="/api/chat",
+            url=path,
             timeout=timeout,
             payload_chars=len(json.dumps(payload)),
         )
         try:
-            # Use a fresh client per call to avoid stale connection state from
-            # previously cancelled or timed-out requests.  The TCP handshake
-            # overhead is negligible relative to model generation time (30–150s).
-            async with httpx.AsyncClient(
-                base_url=self._base_url, timeout=None
-            ) as fresh_client:
-                response = await fresh_client.post(
-                    "/api/chat",
-                    json=payload,
-                    timeout=timeout,
-                )
+            # The shared pool, not a fresh client per call: the stale-connection state a
+            # cancelled or timed-out request used to leave behind is now detected and
+            # recovered by the pool itself (see `_HostPool`).
+            response = await self._post_pooled(path, json=payload, timeout=timeout)
             debug_log.debug(
                 "http_post_done",
                 model=model,
@@ -248,42 +880,10 @@ class OllamaClient:
                 ms=round((time.perf_counter() - t0) * 1000, 2),
             )
             raise OllamaTimeoutError(
-                f"Ollama did not respond within {timeout}s. "
+                f"Ollama did not respond within {timeout:g}s. "
                 "The model may be loading (cold start) — try again."
             )
-        finally:
-            self.mark_complete(model)
-
-        # Check for HTTP errors. Ollama returns 404 when a model isn't found.
-        if response.status_code == 404:
-            raise OllamaModelNotFoundError(
-                f"Model '{model}' not found in Ollama. "
-                f"Available models: ollama list"
-            )
-        response.raise_for_status()
-
-        # Parse the response JSON into our structured dataclass.
-        data = response.json()
-        # Identity is a property of the CALL, not of the log record (P4-T3) — mint it
-        # here so it survives logging being disabled or failing.
-        call_id = uuid.uuid4().hex[:12]
-        result = ChatResponse(
-            call_id=call_id,
-            content=data["message"]["content"],
-            model=data.get("model", model),
-            prompt_eval_count=data.get("prompt_eval_count", 0),
-            eval_count=data.get("eval_count", 0),
-            eval_duration_ms=data.get("eval_duration", 0) / 1_000_000,
-            total_duration_ms=data.get("total_duration", 0) / 1_000_000,
-            prompt_eval_duration_ms=data.get("prompt_eval_duration", 0) / 1_000_000,
-        )
-
-        # Log the call for distillation / training data collection.
-        self._log_call(
-            prompt, system, model, temperature, think, format is not None, result, run_id, tool
-        )
-
-        return result
+        return response
 
     def _log_call(
         self,
@@ -297,34 +897,37 @@ class OllamaClient:
         run_id: str | None = None,
         tool: str | None = None,
     ) -> None:
-        """Append a JSONL record for this call to CALL_LOG_PATH.
+        """Queue a JSONL record for this call to CALL_LOG_PATH.
 
-        Runs synchronously — file I/O is fast (~1ms) vs the Ollama call (~1s),
-        so the overhead is negligible. Failures are silently swallowed so a
-        log error never breaks the actual tool call.
+        Only builds the record: serializing and writing it happen on the call
+        log's background thread (`calllog`), so no disk I/O runs on the event
+        loop. Failures are silently swallowed so a log error never breaks the
+        actual tool call.
 
         The log is the raw material for future distillation / fine-tuning:
         - prompt_hash allows deduplication without storing sensitive text
         - Full prompt/response stored by default (LOG_FULL_CONTENT=true)
         - Set OLLAMA_LOG_FULL_CONTENT=false to store 200-char previews only
         - Set OLLAMA_CALL_LOG="" to disable logging entirely
+
+        Every completed call passes through here, so it also feeds the metrics
+        (`metrics.observe_call`) — whether or not the log is enabled.
         """
+        metrics.observe_call(response, tool)
         if not CALL_LOG_PATH:
             return
         try:
-            log_path = Path(CALL_LOG_PATH)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-
             prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()[:12]
 
-            # Rough estimate of how many Claude API tokens the same task would cost.
-            # Formula: (prompt + system + response chars) / 4 — the standard
-            # chars-per-token approximation for English/code content. Intentionally
-            # imprecise; good enough for ballpark 2/1 (accepted/improved) savings reports.
-            system_chars = len(system) if system else 0
-            claude_tokens_est = (
-                len(prompt) + system_chars + len(response.content)
-            ) // 4
+            # Rough estimate of how many Claude API tokens the same task would cost:
+            # prompt + system + response counted with the local tokenizer (tokens.py) as a
+            # proxy — Claude's own is not available offline. Good enough for ballpark 2/1
+            # (accepted/improved) savings reports. Counted on the log's writer thread, so
+            # tokenizing a long reply never costs the event loop.
+            texts = (prompt, system or "", response.content)
+
+            def _count_tokens(record: dict) -> None:
+                record["claude_tokens_est"] = sum(tokens.count(t) for t in texts)
 
             entry = {
                 "ts": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
@@ -358,18 +961,32 @@ class OllamaClient:
                 "eval_count": response.eval_count,
                 "eval_duration_ms": round(response.eval_duration_ms),
                 "total_duration_ms": round(response.total_duration_ms),
-                "claude_tokens_est": claude_tokens_est,
+                "claude_tokens_est": None,  # filled in by _count_tokens
                 "temperature": temperature,
                 "think": think,
                 "had_format": had_format,
+                # T-88: the gate's share of the latency, separate from Ollama's clock.
+                "queue_position": response.queue_position,
+                "queue_wait_ms": round(response.queue_wait_ms),
             }
             # oficina: additive, dict.get()-safe field (plan open-items note);
             # only present for runs, so the existing DPO readers ignore it.
             if run_id is not None:
                 entry["run_id"] = run_id
+            # Streamed calls only, same additive contract: TTFT plus every chunk's
+            # arrival offset (ms from request), so a stall is locatable after the fact.
+            if response.ttft_ms is not None:
+                entry["ttft_ms"] = round(response.ttft_ms, 1)
+                entry["chunk_offsets_ms"] = [round(o) for o in response.chunk_offsets_ms]
+            # Cache hits only: the reply was not generated by this call, so latency readers
+            # must skip it, while verdict joins still see a record under its own call_id.
+            if response.cached:
+                entry["cached"] = True
+            # Coalesced calls only: the record of the call whose generation this one shared.
+            if response.coalesced_with is not None:
+                entry["coalesced_with"] = response.coalesced_with
 
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            calllog.submit(CALL_LOG_PATH, entry, _count_tokens)
         except Exception:
             pass  # Never let logging break a tool call
 
@@ -457,8 +1074,10 @@ class OllamaClient:
             )
 
     async def close(self) -> None:
-        """Close the underlying HTTP client and release connections."""
-        await self._http.aclose()
+        """Release this client's claim on the shared pool (the last one closes it)."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await _release_pool(pool)
 
     # Async context manager support: `async with OllamaClient() as client:`
     async def __aenter__(self) -> "OllamaClient":
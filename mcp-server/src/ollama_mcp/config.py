@@ -16,6 +16,12 @@ import pathlib
 # runs on a different host/port (e.g., inside Docker on a custom port).
 OLLAMA_BASE_URL: str = os.environ.get("OLLAMA_URL", "http://localhost:11434")
 
+# Keep-alive pool per Ollama host (see client._HostPool). Idle sockets are dropped
+# after POOL_KEEPALIVE_S — comfortably below the idle timeouts that close them on the
+# server side, which is what made reused sockets go stale.
+POOL_MAX_CONNECTIONS: int = int(os.environ.get("OLLAMA_POOL_MAX_CONNECTIONS", "8"))
+POOL_KEEPALIVE_S: float = float(os.environ.get("OLLAMA_POOL_KEEPALIVE_S", "30"))
+
 # ---------------------------------------------------------------------------
 # Model defaults
 # ---------------------------------------------------------------------------
@@ -39,6 +45,34 @@ DEFAULT_TIMEOUT: int = int(os.environ.get("OLLAMA_TIMEOUT", "120"))
 # on simple tasks. Escalate to True for complex reasoning or retries.
 DEFAULT_THINK: bool = os.environ.get("OLLAMA_THINK", "false").lower() == "true"
 
+# ---------------------------------------------------------------------------
+# VRAM residency (see residency.py)
+# ---------------------------------------------------------------------------
+
+# How long Ollama keeps a model loaded after a call. ONE value for every caller: residency
+# reads least-recently-used order off Ollama's expires_at, which needs uniform extensions.
+KEEP_ALIVE: str = os.environ.get("OLLAMA_KEEP_ALIVE", "15m")
+
+# The card's memory, less what is never ours (display, CUDA context). Residency evicts only
+# enough to fit the next model into this budget.
+VRAM_MB: float = float(os.environ.get("OLLAMA_VRAM_MB", "12288"))
+VRAM_RESERVE_MB: float = float(os.environ.get("OLLAMA_VRAM_RESERVE_MB", "512"))
+
+# Weights-to-VRAM factor for a model never yet seen loaded (KV cache + runtime buffers).
+VRAM_OVERHEAD: float = float(os.environ.get("OLLAMA_VRAM_OVERHEAD", "1.2"))
+
+# ---------------------------------------------------------------------------
+# Token counting (see tokens.py)
+# ---------------------------------------------------------------------------
+
+# Tokenizer files for the Qwen2.5/Qwen3 family (one shared vocabulary): a directory holding
+# tokenizer.json, or vocab.json + merges.txt, or the tokenizer.json itself. Absent files
+# fall back to an approximate count.
+_default_tokenizer = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "ollama-bridge", "tokenizers", "qwen"
+)
+TOKENIZER_PATH: str = os.environ.get("OLLAMA_TOKENIZER", _default_tokenizer)
+
 # ---------------------------------------------------------------------------
 # Temperature presets
 # ---------------------------------------------------------------------------
@@ -52,6 +86,78 @@ TEMPS: dict[str, float] = {
     "creative": 0.7,   # More varied output for brainstorming, writing
 }
 
+# ---------------------------------------------------------------------------
+# Context-file cache (see filecache.py)
+# ---------------------------------------------------------------------------
+
+# Total bytes of context_files content kept in memory, per process. Entries are keyed by
+# path + mtime + size, so an edited file is always re-read.
+CONTEXT_CACHE_MB: float = float(os.environ.get("OLLAMA_CONTEXT_CACHE_MB", "64"))
+
+# ---------------------------------------------------------------------------
+# Map-reduce summarize (see mapreduce.py)
+# ---------------------------------------------------------------------------
+
+# Tokens per map chunk. 0 (default) derives it from the model: a quarter of its num_ctx.
+SUMMARIZE_CHUNK_TOKENS: int = int(os.environ.get("OLLAMA_SUMMARIZE_CHUNK_TOKENS", "0"))
+
+# num_ctx assumed for a model the persona registry does not know (Ollama's own default).
+SUMMARIZE_FALLBACK_CTX: int = int(os.environ.get("OLLAMA_SUMMARIZE_FALLBACK_CTX", "4096"))
+
+# ---------------------------------------------------------------------------
+# classify_text embedding fast path (see embedindex.py)
+# ---------------------------------------------------------------------------
+
+# Embedding model for new category indexes (an index keeps the model it was built with).
+EMBED_MODEL: str = os.environ.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+
+# Built indexes, one JSON file per category set.
+EMBED_INDEX_DIR: str = os.environ.get(
+    "OLLAMA_EMBED_INDEX_DIR",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "ollama-bridge", "embed-index"),
+)
+
+# Cosine lead the top category needs over the runner-up to be answered without a
+# generation. Raise it if fast answers disagree with the model; lower it for more of them.
+EMBED_MARGIN: float = float(os.environ.get("OLLAMA_EMBED_MARGIN", "0.05"))
+
+# ---------------------------------------------------------------------------
+# Translation memory (see transmem.py)
+# ---------------------------------------------------------------------------
+
+# SQLite file of segment translations, shared by every bridge. "" disables the memory
+# (translate then sends the whole text in one call, as it always did).
+TM_PATH: str = os.environ.get(
+    "OLLAMA_TM_PATH",
+    os.path.join(
+        os.path.expanduser("~"), ".local", "share", "ollama-bridge", "translation-memory.db"
+    ),
+)
+# Bytes of stored translations kept; past it the least recently used are deleted.
+TM_MB: float = float(os.environ.get("OLLAMA_TM_MB", "64"))
+# Tokens of untranslated segments sent in one prompt.
+TM_BATCH_TOKENS: int = int(os.environ.get("OLLAMA_TM_BATCH_TOKENS", "1500"))
+
+# ---------------------------------------------------------------------------
+# Ref index (see refindex.py)
+# ---------------------------------------------------------------------------
+
+# Resolve <!-- ref:KEY --> blocks from an in-process index instead of spawning
+# ref-lookup.sh per key. Set OLLAMA_REF_INDEX=false to go back to the script (an explicit
+# OFICINA_REF_LOOKUP script path also takes precedence over the index).
+REF_INDEX: bool = os.environ.get("OLLAMA_REF_INDEX", "true").lower() == "true"
+
+# ---------------------------------------------------------------------------
+# Prometheus metrics (see metrics.py)
+# ---------------------------------------------------------------------------
+
+# Port of the bridge's /metrics listener; 0 (default) disables it. Every Claude Code
+# session runs its own bridge, so a busy port is not an error: the bridge takes the next
+# free one of METRICS_PORT_SPAN ports — scrape the whole range.
+METRICS_PORT: int = int(os.environ.get("OLLAMA_METRICS_PORT", "0"))
+METRICS_PORT_SPAN: int = int(os.environ.get("OLLAMA_METRICS_PORT_SPAN", "8"))
+METRICS_HOST: str = os.environ.get("OLLAMA_METRICS_HOST", "127.0.0.1")
+
 # ---------------------------------------------------------------------------
 # Available models (informational)
 # ---------------------------------------------------------------------------
@@ -113,6 +219,69 @@ CALL_LOG_PATH: str = os.environ.get("OLLAMA_CALL_LOG", _default_log)
 # latency and error analysis. Default True to start collecting training data.
 LOG_FULL_CONTENT: bool = os.environ.get("OLLAMA_LOG_FULL_CONTENT", "true").lower() == "true"
 
+# The log is written by a background thread (see calllog.py), never on the event loop.
+# Records wait in a bounded queue — full means dropped, not blocked — and are written in
+# batches of up to CALL_LOG_BATCH, at most CALL_LOG_FLUSH_S after the first one queued.
+CALL_LOG_QUEUE_MAX: int = int(os.environ.get("OLLAMA_CALL_LOG_QUEUE", "1024"))
+CALL_LOG_BATCH: int = int(os.environ.get("OLLAMA_CALL_LOG_BATCH", "64"))
+CALL_LOG_FLUSH_S: float = float(os.environ.get("OLLAMA_CALL_LOG_FLUSH_S", "1.0"))
+
+# "batch" fsyncs after every batch; "none" (default) leaves durability to the OS.
+CALL_LOG_FSYNC: str = os.environ.get("OLLAMA_CALL_LOG_FSYNC", "none").lower()
+
+# Segment rotation: "size" (seal past CALL_LOG_ROTATE_MB), "daily" (seal on the first write
+# of a new UTC day) or "off". Sealed segments are listed in calls.manifest.json.
+CALL_LOG_ROTATE: str = os.environ.get("OLLAMA_CALL_LOG_ROTATE", "size").lower()
+CALL_LOG_ROTATE_MB: float = float(os.environ.get("OLLAMA_CALL_LOG_ROTATE_MB", "64"))
+
+# ---------------------------------------------------------------------------
+# Response cache (content-addressed replies — see response_cache.py)
+# ---------------------------------------------------------------------------
+
+# "on" caches every chat reply keyed by model digest + request content; "off" (default)
+# leaves it to callers that pass chat(..., cache=True).
+RESPONSE_CACHE: str = os.environ.get("OLLAMA_RESPONSE_CACHE", "off").lower()
+
+# Disk tier, shared by every process on this machine. Entries expire after the TTL; past
+# the size bound the oldest are evicted. The memory tier is a per-process LRU.
+_default_cache_dir = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "ollama-bridge", "cache"
+)
+RESPONSE_CACHE_DIR: str = os.environ.get("OLLAMA_RESPONSE_CACHE_DIR", _default_cache_dir)
+RESPONSE_CACHE_TTL_S: float = float(os.environ.get("OLLAMA_RESPONSE_CACHE_TTL_S", "604800"))
+RESPONSE_CACHE_MB: float = float(os.environ.get("OLLAMA_RESPONSE_CACHE_MB", "256"))
+RESPONSE_CACHE_MEM_ENTRIES: int = int(os.environ.get("OLLAMA_RESPONSE_CACHE_MEM", "256"))
+
+# Single-flight: a chat call identical to one already in flight in this process awaits
+# that call's reply instead of generating its own. Set OLLAMA_COALESCE=false to disable.
+COALESCE: bool = os.environ.get("OLLAMA_COALESCE", "true").lower() == "true"
+
+# ---------------------------------------------------------------------------
+# Model-call gate (cross-process admission — see gate.py, T-88)
+# ---------------------------------------------------------------------------
+
+# Unix socket of the gate daemon every Ollama call asks for admission. Shared by all
+# bridges, the oficina worker and the benchmark scripts on this machine, which is the point.
+# Override with OLLAMA_GATE_SOCKET; set to "" to disable gating (calls go straight through).
+_default_gate_socket = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "ollama-bridge", "gate.sock"
+)
+GATE_SOCKET: str = os.environ.get("OLLAMA_GATE_SOCKET", _default_gate_socket)
+
+# Concurrent calls one loaded model serves, and models admitted at once. They mirror
+# Ollama's own knobs so the gate never admits more than the server will actually run —
+# a call admitted past those limits would just queue again, invisibly, inside Ollama.
+GATE_SLOTS_PER_MODEL: int = int(os.environ.get("OLLAMA_NUM_PARALLEL", "1"))
+GATE_MAX_MODELS: int = int(os.environ.get("OLLAMA_MAX_LOADED_MODELS", "1"))
+
+# Longest a call for another model may wait while the loaded model's queue drains.
+# Past it the gate swaps anyway — draining saves swaps, it must not starve anyone.
+GATE_MAX_HOLD_S: float = float(os.environ.get("OLLAMA_GATE_MAX_HOLD_S", "120"))
+
+# Seconds the daemon stays up with nothing queued or running before it exits; the next
+# caller respawns it.
+GATE_IDLE_EXIT_S: float = float(os.environ.get("OLLAMA_GATE_IDLE_EXIT_S", "600"))
+
 # ---------------------------------------------------------------------------
 # Available models (informational)
 # ---------------------------------------------------------------------------
@@ -75,6 +75,12 @@ def setup() -> dict:
         "client_id": CLIENT_ID,
         "pid": PID,
         "ppid": os.getppid(),
+    }
+
+
+def build_info() -> dict:
+    """The checkout the bridge runs from. Two git subprocesses — keep off the start-up path."""
+    return {
         "git": _git_field("rev-parse", "--short", "HEAD"),
         "branch": _git_field("rev-parse", "--abbrev-ref", "HEAD"),
     }
@@ -0,0 +1,182 @@
+"""Embedding fast path for `classify_text`: a per-category-set index of labelled examples.
+
+Every `classify_text` call was a full grammar-constrained generation — seconds per item —
+even for category sets that never change, like the expense categories. Most of those items
+are easy, and an embedding says so in milliseconds. `build_category_index` embeds labelled
+examples once (Ollama ``/api/embed``); afterwards `classify_text` embeds the item, scores it
+against the index and answers directly when the answer is clear:
+
+- **One index per category set** (order-insensitive), with the embedding model recorded in
+  it. Rows are unit vectors: each category's centroid, then every exemplar. A category's
+  score is its best row's cosine — the centroid for the typical item, an exemplar for a
+  category with several distinct kinds of member.
+- **Answer or defer.** The top category is returned only when it beats the runner-up by at
+  least ``EMBED_MARGIN``; anything closer goes to the generative path exactly as before, as
+  does any failure here (no index, embedding model missing, Ollama unreachable).
+- **Persisted** as one JSON file per set under ``EMBED_INDEX_DIR``, loaded on first use.
+
+Scoring is one matrix-vector product with NumPy when it is installed (optional), else the
+same arithmetic in pure Python — fine at a few hundred rows, just slower.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ollama_mcp.config import EMBED_INDEX_DIR
+
+
+@functools.lru_cache(maxsize=1)
+def _numpy() -> Any:
+    """The numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def index_id(categories: Sequence[str]) -> str:
+    """File stem for a category set: the same set in any order gives the same index."""
+    return hashlib.sha1("\n".join(sorted(categories)).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class CategoryIndex:
+    """Unit-vector rows (centroids, then exemplars), each labelled with its category."""
+
+    model: str
+    categories: List[str]
+    labels: List[int]
+    rows: List[List[float]]
+    examples: int = 0
+    _matrix: Any = field(default=None, repr=False, compare=False)
+
+    def scores(self, vector: Sequence[float]) -> List[float]:
+        """Each category's best cosine similarity to ``vector``."""
+        query = _unit(vector)
+        best = [-1.0] * len(self.categories)
+        np = _numpy()
+        if np is not None:
+            if self._matrix is None:
+                self._matrix = np.asarray(self.rows, dtype=np.float32)
+            sims = self._matrix @ np.asarray(query, dtype=np.float32)
+            out = np.full(len(self.categories), -1.0, dtype=np.float32)
+            np.maximum.at(out, np.asarray(self.labels), sims)
+            return [float(s) for s in out]
+        for label, row in zip(self.labels, self.rows):
+            sim = sum(a * b for a, b in zip(row, query))
+            if sim > best[label]:
+                best[label] = sim
+        return best
+
+    def decide(self, vector: Sequence[float], margin: float) -> Optional[Dict[str, Any]]:
+        """The classify_text reply for ``vector``, or None when the margin is too thin."""
+        ranked = sorted(zip(self.scores(vector), self.categories), reverse=True)
+        top, category = ranked[0]
+        second, runner_up = ranked[1] if len(ranked) > 1 else (0.0, None)
+        if top - second < margin:
+            return None
+        reason = f"embedding match (cosine {top:.2f}"
+        if runner_up is not None:
+            reason += f", {top - second:.2f} ahead of '{runner_up}'"
+        return {
+            "category": category,
+            "confidence": round(max(0.0, min(1.0, top)), 3),
+            "reasoning": reason + ")",
+        }
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "categories": self.categories,
+            "labels": self.labels,
+            "rows": self.rows,
+            "examples": self.examples,
+        }
+
+
+def build(
+    model: str, examples: Dict[str, List[str]], vectors: Sequence[Sequence[float]]
+) -> CategoryIndex:
+    """An index from ``examples`` and their embeddings (in the examples' iteration order)."""
+    categories = list(examples)
+    labels: List[int] = []
+    for label, category in enumerate(categories):
+        for _ in examples[category]:
+            labels.append(label)
+    exemplars = [_unit(v) for v in vectors]
+    if len(exemplars) != len(labels):
+        raise ValueError(f"{len(labels)} examples but {len(exemplars)} embeddings")
+    centroids = []
+    for label in range(len(categories)):
+        members = [row for row, lab in zip(exemplars, labels) if lab == label]
+        centroids.append(_unit([sum(col) / len(members) for col in zip(*members)]))
+    return CategoryIndex(
+        model=model,
+        categories=categories,
+        labels=list(range(len(categories))) + labels,
+        rows=centroids + exemplars,
+        examples=len(exemplars),
+    )
+
+
+# index id → (file mtime_ns, index); a file rebuilt by another process is picked up.
+_INDEXES: Dict[str, Tuple[int, CategoryIndex]] = {}
+_LOCK = threading.Lock()
+
+
+def _path(categories: Sequence[str], directory: Optional[str | os.PathLike]) -> Path:
+    return Path(directory or EMBED_INDEX_DIR) / f"{index_id(categories)}.json"
+
+
+def save(index: CategoryIndex, directory: Optional[str | os.PathLike] = None) -> Path:
+    """Write ``index`` atomically, one file per category set; returns the path."""
+    path = _path(index.categories, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(index.to_json()), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def get(
+    categories: Sequence[str], directory: Optional[str | os.PathLike] = None
+) -> Optional[CategoryIndex]:
+    """The index for this category set, or None if none was built.
+
+    One ``stat`` per call; the file is parsed again only when its mtime changes.
+    """
+    path = _path(categories, directory)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    key = str(path)
+    with _LOCK:
+        known = _INDEXES.get(key)
+        if known is not None and known[0] == mtime_ns:
+            return known[1]
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        index = CategoryIndex(**data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if sorted(index.categories) != sorted(categories):
+        return None
+    with _LOCK:
+        _INDEXES[key] = (mtime_ns, index)
+    return index
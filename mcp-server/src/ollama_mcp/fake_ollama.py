@@ -0,0 +1,452 @@
+"""A stand-in Ollama for load and latency testing — no GPU, no model weights.
+
+Every test either mocks at a function seam (`httpx.MockTransport`, a fake client) or needs the
+real card, so nothing here could answer "what does the bridge do with twenty callers and two
+personas". This server speaks enough of Ollama's HTTP API for the bridge, the gate and oficina
+to run against it unchanged — point ``OLLAMA_URL`` at it — and reproduces the costs that shape
+their behaviour, scaled by ``time_scale`` so a CI run takes seconds:
+
+- **Speeds per model** (`ModelSpec`): generation tok/s, prompt-eval tok/s and cold-load time.
+- **VRAM.** At most ``max_loaded`` models are resident (default 1, the 12 GB card with 14B
+  personas). A call for another model waits until the resident one is idle, evicts it (least
+  recently used first) and pays the load. Up to ``parallel`` calls share a loaded model, like
+  ``OLLAMA_NUM_PARALLEL``; the rest queue.
+- **Prefix cache.** Each resident model remembers its last prompt; a call sharing a prefix with
+  it evaluates only the rest, and ``prompt_eval_count`` reports only those tokens, as Ollama's
+  does. A swap forgets it.
+- **Streaming.** ``"stream": true`` replies are chunked NDJSON, one line per token as it is
+  "generated", closed by the ``done`` line carrying the counters.
+
+Endpoints: ``POST /api/chat`` (``keep_alive: 0`` with no messages unloads), ``GET /api/tags``,
+``GET /api/ps``, ``POST /api/show``, ``GET /api/version``. Token counts are
+`tokens.approximate` — the fake has no vocabulary, and only needs counts that scale with text.
+
+Run it with ``python -m ollama_mcp.fake_ollama --port 11435`` (``make fake-ollama``); with no
+``--model`` flags it serves any model name at the default speeds. `FakeOllama` is the same
+server in-process, for tests and ``scripts/bench_load.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ollama_mcp.tokens import approximate
+
+_GB = 1024 ** 3
+_DEFAULT_REPLY_TOKENS = 64
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """How fast one fake model is, and how big it looks to ``/api/tags`` and ``/api/ps``."""
+
+    name: str
+    gen_tps: float = 40.0
+    prompt_tps: float = 1500.0
+    load_s: float = 8.0
+    size_bytes: int = 9 * _GB
+    num_ctx: int = 16384
+
+    @classmethod
+    def parse(cls, text: str) -> "ModelSpec":
+        """``name[=gen_tps[,prompt_tps[,load_s[,size_gb]]]]`` — the CLI's ``--model`` form."""
+        name, _, rest = text.partition("=")
+        values = [float(v) for v in rest.split(",") if v.strip()] if rest else []
+        keys = ("gen_tps", "prompt_tps", "load_s", "size_bytes")
+        kwargs: Dict[str, Any] = dict(zip(keys, values))
+        if "size_bytes" in kwargs:
+            kwargs["size_bytes"] = int(kwargs["size_bytes"] * _GB)
+        return cls(name=_canonical(name), **kwargs)
+
+
+def _canonical(name: str) -> str:
+    return name if ":" in name else f"{name}:latest"
+
+
+def _keep_alive_s(value: Any) -> Optional[float]:
+    """Ollama's keep_alive (``"15m"``, ``"30s"``, seconds, ``-1``) in seconds; None = forever."""
+    if value is None:
+        return 300.0
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)\s*([smh]?)", str(value).strip())
+    if not match:
+        return 300.0
+    amount = float(match.group(1))
+    return None if amount < 0 else amount * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def _default_reply(payload: Dict[str, Any], n_tokens: int) -> str:
+    """Deterministic filler: ``{}`` under a format, else ``n_tokens`` words."""
+    if payload.get("format"):
+        return "{}"
+    return " ".join(["token"] * n_tokens)
+
+
+@dataclass
+class _Resident:
+    spec: ModelSpec
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    active: int = 0
+    expires_at: Optional[float] = None  # wall clock; None = never
+    prefix: str = ""  # the last prompt, as the KV cache holds it
+
+
+@dataclass
+class FakeStats:
+    """What the fake did — for asserting on in tests and printing from benchmarks."""
+
+    requests: int = 0
+    loads: int = 0
+    evictions: int = 0
+    prefix_tokens_reused: int = 0
+    prompt_tokens_evaluated: int = 0
+    tokens_generated: int = 0
+
+
+class FakeOllama:
+    """The fake server: `start` it on a port (0 = any), use ``.url``, `close` it."""
+
+    def __init__(
+        self,
+        models: Optional[List[ModelSpec]] = None,
+        *,
+        max_loaded: int = 1,
+        parallel: int = 1,
+        time_scale: float = 1.0,
+        default: Optional[ModelSpec] = None,
+        reply: Optional[Callable[[Dict[str, Any], int], str]] = None,
+    ) -> None:
+        self.models: Dict[str, ModelSpec] = {m.name: m for m in models or []}
+        # With no models at all, any name is served at the default speeds.
+        self._default = default if default is not None or models else ModelSpec(name="*")
+        self.max_loaded = max_loaded
+        self.parallel = parallel
+        self.time_scale = time_scale
+        self._reply = reply or _default_reply
+        self.stats = FakeStats()
+        self._resident: "collections.OrderedDict[str, _Resident]" = collections.OrderedDict()
+        self._cond = asyncio.Condition()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.url = ""
+
+    # ── lifecycle ────────────────────────────────────────────────────────
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        bound = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound}"
+        return self.url
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            with contextlib.suppress(Exception):
+                await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeOllama":
+        if self._server is None:
+            await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    # ── the model scheduler ──────────────────────────────────────────────
+
+    def _spec(self, name: str) -> Optional[ModelSpec]:
+        key = _canonical(name)
+        if key in self.models:
+            return self.models[key]
+        if self._default is None:
+            return None
+        spec = dataclasses.replace(self._default, name=key)
+        self.models[key] = spec
+        return spec
+
+    def _expire(self) -> None:
+        now = time.time()
+        for name, r in list(self._resident.items()):
+            if r.active == 0 and r.expires_at is not None and r.expires_at <= now:
+                del self._resident[name]
+
+    def _evict_one(self) -> bool:
+        """Drop the least recently used idle model; False when every resident one is busy."""
+        for name, r in self._resident.items():
+            if r.active == 0 and r.ready.is_set():
+                del self._resident[name]
+                self.stats.evictions += 1
+                return True
+        return False
+
+    async def _acquire(self, spec: ModelSpec) -> Tuple[_Resident, bool]:
+        """A generation slot on ``spec``'s model, loading it (evicting others) if need be."""
+        async with self._cond:
+            while True:
+                self._expire()
+                r = self._resident.get(spec.name)
+                if r is not None:
+                    if r.active < self.parallel:
+                        r.active += 1
+                        self._resident.move_to_end(spec.name)
+                        cold = False
+                        break
+                elif len(self._resident) < self.max_loaded or self._evict_one():
+                    r = _Resident(spec=spec, active=1)
+                    self._resident[spec.name] = r
+                    cold = True
+                    break
+                await self._cond.wait()
+        if cold:
+            await asyncio.sleep(spec.load_s * self.time_scale)
+            self.stats.loads += 1
+            r.ready.set()
+        else:
+            await r.ready.wait()
+        return r, cold
+
+    async def _release(self, r: _Resident, keep_alive: Any) -> None:
+        async with self._cond:
+            r.active -= 1
+            ttl = _keep_alive_s(keep_alive)
+            r.expires_at = None if ttl is None else time.time() + ttl
+            if ttl == 0 and r.active == 0 and self._resident.get(r.spec.name) is r:
+                del self._resident[r.spec.name]
+            self._cond.notify_all()
+
+    async def _unload(self, name: str) -> None:
+        async with self._cond:
+            r = self._resident.get(_canonical(name))
+            if r is not None and r.active == 0:
+                del self._resident[_canonical(name)]
+            self._cond.notify_all()
+
+    # ── /api/chat ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _prompt(payload: Dict[str, Any]) -> str:
+        messages = payload.get("messages", [])
+        return "".join(f"<|{m.get('role', 'user')}|>{m.get('content', '')}" for m in messages)
+
+    async def _chat(self, payload: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        name = payload.get("model", "")
+        if not payload.get("messages") and payload.get("keep_alive") in (0, "0", "0s"):
+            await self._unload(name)
+            await _respond(writer, 200, {"model": name, "done": True, "done_reason": "unload"})
+            return
+        self.stats.requests += 1
+        spec = self._spec(name)
+        if spec is None:
+            await _respond(writer, 404, {"error": f"model '{name}' not found"})
+            return
+
+        t0 = time.perf_counter()
+        r, cold = await self._acquire(spec)
+        try:
+            load_ns = int((time.perf_counter() - t0) * 1e9) if cold else 0
+            prompt = self._prompt(payload)
+            shared = len(os.path.commonprefix([r.prefix, prompt]))
+            reused = approximate(prompt[:shared])
+            evaluated = max(1, approximate(prompt) - reused)
+            r.prefix = prompt
+            self.stats.prefix_tokens_reused += reused
+            self.stats.prompt_tokens_evaluated += evaluated
+
+            t_prompt = time.perf_counter()
+            await asyncio.sleep(evaluated / spec.prompt_tps * self.time_scale)
+            prompt_ns = int((time.perf_counter() - t_prompt) * 1e9)
+
+            limit = (payload.get("options") or {}).get("num_predict") or _DEFAULT_REPLY_TOKENS
+            pieces = re.findall(r"\s*\S+", self._reply(payload, limit))[: max(1, limit)]
+            per_token = self.time_scale / spec.gen_tps
+            t_gen = time.perf_counter()
+            stream = payload.get("stream", True)
+            if stream:
+                await _start_chunked(writer)
+                for piece in pieces:
+                    await asyncio.sleep(per_token)
+                    message = {"role": "assistant", "content": piece}
+                    await _chunk(writer, {"model": spec.name, "message": message, "done": False})
+            else:
+                await asyncio.sleep(per_token * len(pieces))
+            self.stats.tokens_generated += len(pieces)
+            final = {
+                "model": spec.name,
+                "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "message": {"role": "assistant", "content": "" if stream else "".join(pieces)},
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((time.perf_counter() - t0) * 1e9),
+                "load_duration": load_ns,
+                "prompt_eval_count": evaluated,
+                "prompt_eval_duration": prompt_ns,
+                "eval_count": len(pieces),
+                "eval_duration": int((time.perf_counter() - t_gen) * 1e9),
+            }
+            if stream:
+                await _chunk(writer, final)
+                await _end_chunked(writer)
+            else:
+                await _respond(writer, 200, final)
+        finally:
+            await self._release(r, payload.get("keep_alive"))
+
+    # ── the other endpoints ──────────────────────────────────────────────
+
+    def _tags(self) -> Dict[str, Any]:
+        return {"models": [
+            {
+                "name": m.name,
+                "model": m.name,
+                "size": m.size_bytes,
+                "digest": "sha256:" + hashlib.sha256(m.name.encode()).hexdigest(),
+            }
+            for m in self.models.values()
+        ]}
+
+    def _ps(self) -> Dict[str, Any]:
+        self._expire()
+        models = []
+        for name, r in self._resident.items():
+            expires = r.expires_at if r.expires_at is not None else time.time() + 10 * 365 * 86400
+            stamp = datetime.datetime.fromtimestamp(expires, datetime.timezone.utc)
+            models.append({
+                "name": name,
+                "model": name,
+                "size": r.spec.size_bytes,
+                "size_vram": r.spec.size_bytes,
+                "expires_at": stamp.isoformat().replace("+00:00", "Z"),
+            })
+        return {"models": models}
+
+    def _show(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        spec = self._spec(payload.get("model") or payload.get("name") or "")
+        if spec is None:
+            return 404, {"error": f"model '{payload.get('model')}' not found"}
+        return 200, {
+            "parameters": f"num_ctx                        {spec.num_ctx}",
+            "model_info": {"general.architecture": "fake", "fake.context_length": spec.num_ctx},
+            "details": {"family": "fake", "parameter_size": f"{spec.size_bytes / _GB:.1f}GB"},
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, body = request
+                if path == "/api/chat" and method == "POST":
+                    await self._chat(json.loads(body or b"{}"), writer)
+                elif path == "/api/tags":
+                    await _respond(writer, 200, self._tags())
+                elif path == "/api/ps":
+                    await _respond(writer, 200, self._ps())
+                elif path == "/api/show" and method == "POST":
+                    await _respond(writer, *self._show(json.loads(body or b"{}")))
+                elif path == "/api/version":
+                    await _respond(writer, 200, {"version": "0.0.0-fake"})
+                else:
+                    await _respond(writer, 404, {"error": f"no route {method} {path}"})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            with contextlib.suppress(Exception):
+                writer.close()
+
+
+# ── minimal HTTP/1.1 ─────────────────────────────────────────────────────────
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes]]:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], body
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, obj: Dict[str, Any]) -> None:
+    body = json.dumps(obj).encode()
+    reason = {200: "OK", 404: "Not Found"}.get(status, "Error")
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+async def _start_chunked(writer: asyncio.StreamWriter) -> None:
+    writer.write(
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+        b"Transfer-Encoding: chunked\r\n\r\n"
+    )
+    await writer.drain()
+
+
+async def _chunk(writer: asyncio.StreamWriter, obj: Dict[str, Any]) -> None:
+    line = json.dumps(obj).encode() + b"\n"
+    writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+    await writer.drain()
+
+
+async def _end_chunked(writer: asyncio.StreamWriter) -> None:
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for ``python -m ollama_mcp.fake_ollama``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument(
+        "--model", action="append", default=[], metavar="NAME[=GEN_TPS,PROMPT_TPS,LOAD_S,SIZE_GB]",
+        help="serve this model (repeatable); without any, every name is served at the defaults",
+    )
+    parser.add_argument("--max-loaded", type=int, default=1, help="models resident at once")
+    parser.add_argument("--parallel", type=int, default=1, help="concurrent calls per model")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiply every delay")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        fake = FakeOllama(
+            [ModelSpec.parse(m) for m in args.model],
+            max_loaded=args.max_loaded,
+            parallel=args.parallel,
+            time_scale=args.time_scale,
+        )
+        url = await fake.start(args.host, args.port)
+        print(f"[fake-ollama] serving on {url} — export OLLAMA_URL={url}", flush=True)
+        await fake.serve_forever()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
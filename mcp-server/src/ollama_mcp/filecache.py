@@ -0,0 +1,123 @@
+"""Process-wide cache of context files, with a line-offset index for cheap slices.
+
+`_build_context_block` re-read and ``splitlines()``-ed each file on every call. Claude often
+passes the same 2,000-line file many times in a session with different
+``start_line``/``end_line`` slices, and every slice paid for the whole file. This cache keeps
+each file's bytes and the byte offset of every line start, keyed by
+``(path, mtime_ns, size)``:
+
+- **A hit** is one ``stat``. A slice is a memoryview of the line range, decoded alone, so it
+  costs O(slice) instead of O(file).
+- **A change** (new mtime or size) re-reads the file. Nothing is ever served stale.
+- **Eviction** is least recently used, by total bytes (``CONTEXT_CACHE_MB``). A file larger
+  than the whole bound is read and served without being cached.
+
+Lines are ``\\n``-terminated (a trailing ``\\r`` is dropped), which is how editors number
+them. The old ``str.splitlines`` also split on ``\\r``, form feeds and Unicode separators;
+those inside a line now stay in it.
+
+Used by every context-file reader: `ask_ollama` / `generate_code` through
+`_build_context_block`, which oficina's `_build_prompt` and
+`Workspace._build_stable_parts` call too.
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ollama_mcp.config import CONTEXT_CACHE_MB
+
+
+@dataclass
+class _Entry:
+    mtime_ns: int
+    size: int
+    data: bytes
+    offsets: array  # byte offset of each line start, plus a final end sentinel
+
+    @property
+    def lines(self) -> int:
+        return len(self.offsets) - 1
+
+
+def _index(data: bytes) -> array:
+    offsets = array("Q", [0])
+    pos = data.find(b"\n")
+    while pos >= 0:
+        offsets.append(pos + 1)
+        pos = data.find(b"\n", pos + 1)
+    if data and not data.endswith(b"\n"):
+        offsets.append(len(data))
+    return offsets
+
+
+class FileCache:
+    """LRU of file contents + line offsets, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = int(CONTEXT_CACHE_MB * 1024 * 1024)) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "collections.OrderedDict[str, _Entry]" = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, path: Path) -> _Entry:
+        key = str(path)
+        st = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.mtime_ns, entry.size) == (st.st_mtime_ns, st.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        data = path.read_bytes()
+        entry = _Entry(st.st_mtime_ns, st.st_size, data, _index(data))
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.data)
+            if len(data) <= self.max_bytes:
+                self._entries[key] = entry
+                self._bytes += len(data)
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted.data)
+        return entry
+
+    def read_lines(
+        self, path: Path, start_line: Optional[int] = None, end_line: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Lines ``start_line``..``end_line`` (1-based, inclusive) of ``path``, newline-joined.
+
+        Returns ``(text, n)`` where ``n`` is the number of lines in the slice. Raises
+        ``OSError`` as reading the file would.
+        """
+        entry = self._load(path)
+        start = max(0, (start_line or 1) - 1)
+        end = entry.lines if end_line is None else max(start, min(end_line, entry.lines))
+        if start >= entry.lines:
+            return "", 0
+        view = memoryview(entry.data)[entry.offsets[start]:entry.offsets[end]]
+        text = bytes(view).decode("utf-8", errors="replace").replace("\r\n", "\n")
+        if text.endswith("\n"):
+            text = text[:-1]
+        return text, end - start
+
+
+_CACHE: Optional[FileCache] = None
+
+
+def get_cache() -> FileCache:
+    """The process-wide cache, created on first use."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = FileCache()
+    return _CACHE
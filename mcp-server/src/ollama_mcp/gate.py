@@ -0,0 +1,476 @@
+"""Model-call gate — cross-process admission for every Ollama call (T-88).
+
+`OllamaClient._inflight` only sees the calls of its own process, and every MCP bridge, the
+oficina worker and the benchmark scripts are separate processes. With several Claude Code
+sessions open at once they take turns swapping 14B personas in and out of the 12 GB card until
+a sync `generate_code` runs out of time (`ref:multi-session-contention`). The gate is the one
+component that sees all of them: a small local daemon on a Unix socket that every model call
+asks for admission before it reaches Ollama.
+
+**Altitude (`ref:model-gate-altitude`).** The unit here is a CALL, never a run. The gate knows
+models, priority classes and who is waiting — nothing about deliverables — so it lives beside
+`client.py` at layer 0, and oficina is a client of it like everyone else.
+
+**Policy over Ollama's scheduler, not a replacement (G-D5).** Ollama already queues requests
+and protects a generating model from eviction. What it cannot do is order calls ACROSS clients:
+
+- calls queue per model, and the model that is already loaded is drained before a swap
+  (the "swap-minimizing interleave" rule — a 14B↔14B swap costs ~15s each way);
+- ``interactive`` beats ``batch`` (queue ahead of, never interrupt) — a loaded model's batch
+  backlog does not hold an interactive call for another model;
+- ``max_hold_s`` bounds how long draining may starve a call for a different model.
+
+**Fail-open, always.** A gate that is down, absent or disabled (``OLLAMA_GATE_SOCKET=""``)
+admits immediately and reports ``gated=False``. The gate is scheduling, not correctness —
+Ollama's refCount already makes an unscheduled call safe, only slower. The one thing the gate
+does raise is `GateTimeoutError`, when the caller's own deadline ran out while it was queued.
+
+Wire protocol: newline-delimited JSON over the socket. A client sends
+``{"op": "acquire", "model", "priority", "client", "pid"}``, reads ``{"event": "queued",
+"position"}`` and later ``{"event": "admitted", "position", "wait_ms"}``, then HOLDS the
+connection for the length of its call. Closing it (or a crash closing it) releases the slot —
+so a dead client can never wedge the queue. ``{"op": "status"}`` returns a snapshot.
+
+Run the daemon with ``python -m ollama_mcp.gate``; `ensure_daemon` spawns it detached on
+demand (the bridge's lifespan and the oficina worker both call it).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from ollama_mcp.config import (
+    GATE_IDLE_EXIT_S,
+    GATE_MAX_HOLD_S,
+    GATE_MAX_MODELS,
+    GATE_SLOTS_PER_MODEL,
+    GATE_SOCKET,
+)
+
+# Lower rank is admitted first. Unknown classes are treated as batch — a typo must never
+# promote a call ahead of an interactive session.
+PRIORITIES: Dict[str, int] = {"interactive": 0, "batch": 1}
+_DEFAULT_RANK = PRIORITIES["batch"]
+
+
+class GateTimeoutError(Exception):
+    """The caller's deadline expired while its call was still queued at the gate."""
+
+
+@dataclass(frozen=True)
+class Admission:
+    """What the gate told a caller about its call's place in line.
+
+    Attributes:
+        position: 1-based place in the queue at enqueue time (1 = next in line).
+        wait_ms: Time spent queued before admission, in milliseconds.
+        gated: False when the gate was disabled or unreachable and the call went straight
+            through — position and wait are then 0 by construction, not by measurement.
+    """
+
+    position: int = 0
+    wait_ms: float = 0.0
+    gated: bool = False
+
+
+UNGATED = Admission()
+
+
+# ---------------------------------------------------------------------------
+# Scheduling policy (pure — no sockets, no clock of its own)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Ticket:
+    """One queued call."""
+
+    seq: int
+    model: str
+    rank: int
+    enqueued_at: float
+    client: str = ""
+
+
+@dataclass
+class GateScheduler:
+    """The admission policy, separated from transport so it is testable as plain calls.
+
+    ``slots_per_model`` mirrors ``OLLAMA_NUM_PARALLEL`` (concurrent calls one loaded model
+    serves); ``max_models`` mirrors ``OLLAMA_MAX_LOADED_MODELS`` (models admitted at once).
+    ``loaded`` is the model most recently admitted — the gate's best knowledge of what is in
+    VRAM, which is what "drain before swap" drains.
+    """
+
+    slots_per_model: int = 1
+    max_models: int = 1
+    max_hold_s: float = 120.0
+    loaded: Optional[str] = None
+    _waiting: List[_Ticket] = field(default_factory=list)
+    _active: Dict[str, int] = field(default_factory=dict)
+    _seq: Any = field(default_factory=itertools.count)
+
+    def enqueue(self, model: str, priority: str, now: float, client: str = "") -> tuple[_Ticket, int]:
+        """Queue a call; return its ticket and 1-based position among the waiting calls.
+
+        Position counts the waiting calls that sort ahead of this one by class and age — the
+        calls already admitted are running, not queued, and are not counted.
+        """
+        ticket = _Ticket(next(self._seq), model, PRIORITIES.get(priority, _DEFAULT_RANK), now, client)
+        ahead = sum(1 for t in self._waiting if t.rank <= ticket.rank)
+        self._waiting.append(ticket)
+        return ticket, ahead + 1
+
+    def cancel(self, ticket: _Ticket) -> None:
+        """Drop a ticket whose caller gave up before it was admitted."""
+        with contextlib.suppress(ValueError):
+            self._waiting.remove(ticket)
+
+    def release(self, model: str) -> None:
+        """Free one admitted slot of ``model``."""
+        count = self._active.get(model, 0)
+        if count <= 1:
+            self._active.pop(model, None)
+        else:
+            self._active[model] = count - 1
+
+    def admit_ready(self, now: float) -> List[_Ticket]:
+        """Move every ticket that may start now from waiting to active; return them in order."""
+        admitted: List[_Ticket] = []
+        while (ticket := self._pick(now)) is not None:
+            self._waiting.remove(ticket)
+            self._active[ticket.model] = self._active.get(ticket.model, 0) + 1
+            self.loaded = ticket.model
+            admitted.append(ticket)
+        return admitted
+
+    def _pick(self, now: float) -> Optional[_Ticket]:
+        """The next ticket to admit under the policy, or None if everything must wait."""
+        if not self._waiting:
+            return None
+        starving = [t for t in self._waiting if now - t.enqueued_at > self.max_hold_s]
+
+        # Top up a model that is already running — no swap involved — unless a call for some
+        # other model has waited past max_hold_s, in which case let this one drain instead.
+        for model, running in self._active.items():
+            if running >= self.slots_per_model:
+                continue
+            if any(t.model != model for t in starving):
+                continue
+            same = self._best(t for t in self._waiting if t.model == model)
+            if same is not None:
+                return same
+
+        if len(self._active) >= self.max_models:
+            return None
+        candidates = [t for t in self._waiting if t.model not in self._active]
+        if not candidates:
+            return None
+        if starving:
+            starved = [t for t in starving if t.model not in self._active]
+            if starved:
+                return min(starved, key=lambda t: t.seq)
+        best = self._best(candidates)
+        # Drain before swap: the loaded model's queue goes first while it holds a call of
+        # the same class as the best waiting call — but never a batch backlog ahead of an
+        # interactive call for a different model.
+        resident = self._best(t for t in candidates if t.model == self.loaded)
+        if resident is not None and resident.rank <= best.rank:
+            return resident
+        return best
+
+    @staticmethod
+    def _best(tickets) -> Optional[_Ticket]:
+        return min(tickets, key=lambda t: (t.rank, t.seq), default=None)
+
+    def is_idle(self) -> bool:
+        """True when nothing is queued or running."""
+        return not self._waiting and not self._active
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        """Per-model queued/active counts plus the oldest wait — for ``status`` and warm_model."""
+        queued: Dict[str, int] = {}
+        for t in self._waiting:
+            queued[t.model] = queued.get(t.model, 0) + 1
+        oldest = min((t.enqueued_at for t in self._waiting), default=now)
+        return {
+            "loaded": self.loaded,
+            "active": dict(self._active),
+            "queued": queued,
+            "oldest_wait_ms": round((now - oldest) * 1000, 2),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+class GateServer:
+    """Serves a `GateScheduler` over a Unix socket; one connection per call."""
+
+    def __init__(self, scheduler: GateScheduler, clock: Callable[[], float] = time.monotonic) -> None:
+        self.scheduler = scheduler
+        self._clock = clock
+        self._admit_events: Dict[int, asyncio.Event] = {}
+        self._connections = 0
+        self.last_activity = clock()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection: a status query, or one call's acquire → hold → release."""
+        self._connections += 1
+        self.last_activity = self._clock()
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                return
+            if request.get("op") == "status":
+                await _send(writer, self.scheduler.snapshot(self._clock()))
+            elif request.get("op") == "acquire":
+                await self._serve_call(request, reader, writer)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._connections -= 1
+            self.last_activity = self._clock()
+            writer.close()
+
+    async def _serve_call(self, request: Dict[str, Any], reader, writer) -> None:
+        """Queue the call, report its position, admit it in turn, hold until the client lets go."""
+        model = str(request.get("model", ""))
+        enqueued_at = self._clock()
+        ticket, position = self.scheduler.enqueue(
+            model, str(request.get("priority", "batch")), enqueued_at, str(request.get("client", ""))
+        )
+        admitted = self._admit_events[ticket.seq] = asyncio.Event()
+        await _send(writer, {"event": "queued", "position": position})
+        self._pump()
+
+        # Reading doubles as the liveness probe: the client sends nothing until it is done,
+        # so EOF while still queued means it gave up (deadline, crash) and the ticket goes.
+        client_done = asyncio.ensure_future(reader.read(1))
+        admitted_wait = asyncio.ensure_future(admitted.wait())
+        try:
+            await asyncio.wait({client_done, admitted_wait}, return_when=asyncio.FIRST_COMPLETED)
+            if not admitted.is_set():
+                self.scheduler.cancel(ticket)
+                return
+            try:
+                wait_ms = round((self._clock() - enqueued_at) * 1000, 2)
+                await _send(writer, {"event": "admitted", "position": position, "wait_ms": wait_ms})
+                await client_done
+            finally:
+                self.scheduler.release(model)
+        finally:
+            self._admit_events.pop(ticket.seq, None)
+            for task in (client_done, admitted_wait):
+                task.cancel()
+            self._pump()
+
+    def _pump(self) -> None:
+        """Wake every caller the scheduler now admits."""
+        for ticket in self.scheduler.admit_ready(self._clock()):
+            event = self._admit_events.get(ticket.seq)
+            if event is not None:
+                event.set()
+            else:  # the waiter vanished between enqueue and admission — hand the slot back
+                self.scheduler.release(ticket.model)
+
+    def idle_for(self) -> float:
+        """Seconds since the gate last had a connection, or 0 while it has any work."""
+        if self._connections or not self.scheduler.is_idle():
+            return 0.0
+        return self._clock() - self.last_activity
+
+
+async def _send(writer: asyncio.StreamWriter, obj: Dict[str, Any]) -> None:
+    writer.write((json.dumps(obj) + "\n").encode())
+    await writer.drain()
+
+
+async def serve(
+    socket_path: str,
+    scheduler: Optional[GateScheduler] = None,
+    idle_exit_s: float = GATE_IDLE_EXIT_S,
+) -> None:
+    """Run the gate daemon on ``socket_path`` until it has been idle for ``idle_exit_s``.
+
+    Exactly one daemon per socket: an exclusive ``flock`` on a sibling ``.lock`` file is held
+    for the daemon's whole life, so the loser of a double-spawn race exits at once, and a
+    socket file left behind by a crashed daemon is safe to unlink because its owner cannot be
+    alive. A lazy daemon like the oficina worker — it exits once there is nothing to gate.
+    """
+    path = Path(socket_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = open(f"{path}.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return
+    try:
+        path.unlink(missing_ok=True)
+        gate = GateServer(scheduler or _default_scheduler())
+        server = await asyncio.start_unix_server(gate.handle, path=str(path))
+        async with server:
+            while idle_exit_s <= 0 or gate.idle_for() < idle_exit_s:
+                await asyncio.sleep(min(5.0, idle_exit_s) if idle_exit_s > 0 else 5.0)
+        path.unlink(missing_ok=True)
+    finally:
+        lock.close()
+
+
+def _default_scheduler() -> GateScheduler:
+    return GateScheduler(
+        slots_per_model=GATE_SLOTS_PER_MODEL,
+        max_models=GATE_MAX_MODELS,
+        max_hold_s=GATE_MAX_HOLD_S,
+    )
+
+
+def ensure_daemon(socket_path: Optional[str] = None) -> bool:
+    """Spawn a detached gate daemon unless one is already answering; True if one should be up.
+
+    Never raises and never waits for the spawn — a call made before the daemon binds simply
+    goes through ungated, which is what it would have done anyway.
+    """
+    path = GATE_SOCKET if socket_path is None else socket_path
+    if not path:
+        return False
+    if _is_listening(path):
+        return True
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{path}.log", "ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "ollama_mcp.gate", path],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+    except OSError:
+        return False
+    return True
+
+
+def _is_listening(path: str) -> bool:
+    """True if something accepts connections on the Unix socket at ``path``."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.5)
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+@contextlib.asynccontextmanager
+async def admit(
+    model: str,
+    *,
+    priority: str = "interactive",
+    timeout: Optional[float] = None,
+    client: str = "ollama-bridge",
+    socket_path: Optional[str] = None,
+) -> AsyncIterator[Admission]:
+    """Wait for the gate to admit a call to ``model``; hold the slot for the ``with`` body.
+
+    Yields the `Admission` (queue position, wait). Raises `GateTimeoutError` if ``timeout``
+    seconds pass while still queued; every other gate failure yields `UNGATED` instead.
+    """
+    path = GATE_SOCKET if socket_path is None else socket_path
+    held = await _acquire(path, model, priority, timeout, client) if path else None
+    if held is None:
+        yield UNGATED
+        return
+    writer, admission = held
+    try:
+        yield admission
+    finally:
+        with contextlib.suppress(Exception):
+            writer.write(b'{"op": "release"}\n')
+            writer.close()
+
+
+async def _acquire(
+    path: str, model: str, priority: str, timeout: Optional[float], client: str
+) -> Optional[tuple[asyncio.StreamWriter, Admission]]:
+    """Connect, queue and wait for admission; None whenever the gate cannot be used."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(path), timeout=2)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        await _send(
+            writer,
+            {"op": "acquire", "model": model, "priority": priority, "client": client, "pid": os.getpid()},
+        )
+        queued = json.loads(await reader.readline())
+        try:
+            reply = await asyncio.wait_for(reader.readline(), timeout=timeout)
+        except asyncio.TimeoutError:
+            writer.close()
+            raise GateTimeoutError(
+                f"still queued behind other model calls after {timeout}s "
+                f"(position {queued.get('position')})"
+            ) from None
+        admitted = json.loads(reply)
+    except GateTimeoutError:
+        raise
+    except Exception:  # noqa: BLE001 — a broken gate is an ungated call, never a failed one
+        writer.close()
+        return None
+    return writer, Admission(
+        position=int(admitted.get("position", queued.get("position", 0))),
+        wait_ms=float(admitted.get("wait_ms", 0.0)),
+        gated=True,
+    )
+
+
+async def status(socket_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The gate's snapshot (per-model queued/active), or None if no gate is reachable."""
+    path = GATE_SOCKET if socket_path is None else socket_path
+    if not path:
+        return None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(path), timeout=2)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        await _send(writer, {"op": "status"})
+        return json.loads(await asyncio.wait_for(reader.readline(), timeout=2))
+    except Exception:  # noqa: BLE001 — diagnostics only
+        return None
+    finally:
+        writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for ``python -m ollama_mcp.gate [socket_path]``."""
+    args = sys.argv[1:] if argv is None else argv
+    path = args[0] if args else GATE_SOCKET
+    if not path:
+        print("[ollama-gate] OLLAMA_GATE_SOCKET is empty — gate disabled", file=sys.stderr)
+        return
+    asyncio.run(serve(path))
+
+
+if __name__ == "__main__":
+    main()
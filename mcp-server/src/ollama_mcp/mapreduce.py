@@ -0,0 +1,183 @@
+"""Map-reduce summarization for texts larger than the model's context (see `server.summarize`).
+
+`summarize` pasted the whole text into one prompt. Past ``num_ctx`` Ollama does not fail: it
+drops the HEAD of the prompt — the instruction and the start of the document — so a long
+transcript came back summarized from somewhere in the middle, with nothing to say so. A text
+that does not fit now goes through three steps:
+
+- **Chunk** on structure. The text is cut into blocks at blank lines and before headings; a
+  block too big for a chunk falls back to its lines, and a line too big to halving. Blocks
+  are packed into chunks of at most ``budget`` tokens (`tokens.count`). A chunk also ends
+  after a block whose hash hits once it is half full (a content-defined boundary), so an
+  edit moves only the boundaries near it: the packing re-synchronizes at the next such
+  block instead of shifting every chunk after the edit.
+- **Map.** Each chunk is summarized, ``concurrency`` at a time, at ``batch`` priority (T-88).
+  The prompt carries no chunk position or count, and the calls go through the response
+  cache (``cache=True``), which is keyed by model digest and prompt. Re-summarizing a lightly
+  edited document therefore regenerates only the chunks whose text changed.
+- **Reduce.** Partial summaries are packed into groups of at most ``budget`` tokens and each
+  group is merged, level by level, until everything fits one call; that last merge applies
+  ``max_points``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+from typing import Any, List, Optional
+
+from ollama_mcp import registry, tokens
+from ollama_mcp.config import SUMMARIZE_CHUNK_TOKENS, SUMMARIZE_FALLBACK_CTX
+
+# Tokens of the context kept free for the system prompt, the instruction and the reply.
+_HEADROOM = 2048
+# A line that opens a new block: a markdown heading, or a setext/rule underline.
+_HEADING = re.compile(r"^(#{1,6}\s|={3,}\s*$|-{3,}\s*$)")
+# A reduce that does not shrink after this many levels is stopped rather than looped.
+_MAX_LEVELS = 8
+
+MAP_INSTRUCTION = (
+    "The following is one part of a longer text. Summarize it as bullet points, keeping "
+    "every fact, number, date and name it contains:"
+)
+REDUCE_INSTRUCTION = (
+    "The following are bullet-point summaries of consecutive parts of one text, in order. "
+    "Merge them into one summary of the whole text, removing repetition"
+)
+
+
+def context_tokens(model: str) -> int:
+    """The model's ``num_ctx`` from the persona registry, else ``SUMMARIZE_FALLBACK_CTX``."""
+    entry = registry.get_registry().get(model) or {}
+    try:
+        return int(entry.get("num_ctx") or SUMMARIZE_FALLBACK_CTX)
+    except (TypeError, ValueError):
+        return SUMMARIZE_FALLBACK_CTX
+
+
+def window(model: str) -> int:
+    """Tokens of input a single summarize call can take without truncation."""
+    return max(512, context_tokens(model) - _HEADROOM)
+
+
+def chunk_budget(model: str) -> int:
+    """Tokens per map chunk: ``SUMMARIZE_CHUNK_TOKENS``, else a quarter of the context.
+
+    Smaller than the window on purpose: a model summarizes a short chunk more faithfully
+    than a full context, and more chunks can run in parallel.
+    """
+    return max(256, min(SUMMARIZE_CHUNK_TOKENS or context_tokens(model) // 4, window(model)))
+
+
+def _blocks(text: str) -> List[str]:
+    """``text`` cut at blank lines and before headings; ``"".join`` gives it back."""
+    blocks: List[str] = []
+    current: List[str] = []
+    for line in text.splitlines(keepends=True):
+        blank = not line.strip()
+        if current and (_HEADING.match(line) or (not blank and not current[-1].strip())):
+            blocks.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        blocks.append("".join(current))
+    return blocks
+
+
+def _fit(piece: str, budget: int) -> List[str]:
+    """``piece`` as parts of at most ``budget`` tokens: by lines, else by halving."""
+    if tokens.count(piece) <= budget:
+        return [piece]
+    lines = piece.splitlines(keepends=True)
+    if len(lines) > 1:
+        return [part for line in lines for part in _fit(line, budget)]
+    middle = len(piece) // 2
+    cut = piece.rfind(" ", 0, middle) + 1 or middle
+    if cut <= 0 or cut >= len(piece):
+        cut = middle
+    return _fit(piece[:cut], budget) + _fit(piece[cut:], budget)
+
+
+def _boundary(block: str) -> bool:
+    """A content-defined cut point: true for about one block in four, by content alone."""
+    digest = hashlib.blake2b(block.encode("utf-8", "surrogatepass"), digest_size=2).digest()
+    return digest[0] & 3 == 0
+
+
+def split(text: str, budget: int) -> List[str]:
+    """``text`` as chunks of at most ``budget`` tokens, cut on structure (see module doc)."""
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for block in _blocks(text):
+        for part in _fit(block, budget):
+            n = tokens.count(part)
+            if current and used + n > budget:
+                chunks.append("".join(current))
+                current, used = [], 0
+            current.append(part)
+            used += n
+            if used >= budget // 2 and _boundary(part):
+                chunks.append("".join(current))
+                current, used = [], 0
+    if current:
+        chunks.append("".join(current))
+    return [c for c in chunks if c.strip()]
+
+
+def _group(parts: List[str], budget: int) -> List[List[str]]:
+    groups: List[List[str]] = []
+    used = 0
+    for part in parts:
+        n = tokens.count(part)
+        if not groups or (used + n > budget and groups[-1]):
+            groups.append([])
+            used = 0
+        groups[-1].append(part)
+        used += n
+    if len(groups) == len(parts) > 1:  # every part alone: merge pairwise so the level shrinks
+        groups = [parts[i:i + 2] for i in range(0, len(parts), 2)]
+    return groups
+
+
+async def summarize(
+    client: Any,
+    text: str,
+    *,
+    model: str,
+    max_points: Optional[int] = None,
+    concurrency: int = 1,
+    timeout: int = 120,
+    tool: str = "summarize",
+) -> str:
+    """Summarize ``text`` of any length by map-reduce; Ollama errors propagate."""
+    budget = chunk_budget(model)
+    limit = window(model)
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def _call(instruction: str, body: str) -> str:
+        async with slots:
+            response = await client.chat(
+                prompt=f"{instruction}\n\n{body}",
+                model=model,
+                think=False,
+                timeout=timeout,
+                tool=tool,
+                priority="batch",
+                cache=True,
+            )
+        return response.content.strip()
+
+    parts = list(await asyncio.gather(*(_call(MAP_INSTRUCTION, c) for c in split(text, budget))))
+    merge = f"{REDUCE_INSTRUCTION}:"
+    for _ in range(_MAX_LEVELS):
+        if len(parts) <= 1 or tokens.count("\n\n".join(parts)) <= limit:
+            break
+        parts = list(await asyncio.gather(
+            *(_call(merge, "\n\n".join(group)) for group in _group(parts, budget))
+        ))
+    final = REDUCE_INSTRUCTION + (
+        f", in at most {max_points} bullet points:" if max_points is not None else ":"
+    )
+    return await _call(final, "\n\n".join(parts))
@@ -0,0 +1,305 @@
+"""Prometheus metrics for the bridge — which tool and which persona is spending GPU time.
+
+Until now the bridge's only telemetry was `debug_log` (off unless asked for) and calls.jsonl,
+neither of which the Prometheus + Grafana stack can scrape. With ``OLLAMA_METRICS_PORT`` set,
+`_lifespan` starts a small ``/metrics`` listener serving the text exposition format (0.0.4).
+It is hand-written rather than ``prometheus_client``, so the bridge keeps its four dependencies.
+
+What is measured, and where:
+
+- **Tools**: latency histograms and error counters, from the same ``tool_exit`` points
+  `debug_log` traces (`tool_exit`);
+- **Ollama calls**: prompt-eval and generation tok/s, TTFT for streamed calls, gate queue
+  wait, and generation seconds / tokens per ``model`` × ``tool`` — the GPU-time ledger
+  (`observe_call`, from `OllamaClient._log_call`, the one place every completed call passes).
+  Cache hits and coalesced followers are counted as calls but add no GPU time;
+- **In flight** per model, read from `OllamaClient.get_inflight` at scrape time;
+- **Context assembly** (`<context>` + `<refs>` blocks) time (`observe_assembly`).
+
+Recording never raises and costs a dict update under a lock, so it runs whether or not the
+listener is up. Several bridges (one per Claude Code session) each try ``METRICS_PORT`` and
+the ports after it; ``ollama_bridge_info`` carries ``client_id`` to tell them apart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ollama_mcp.config import METRICS_HOST, METRICS_PORT, METRICS_PORT_SPAN
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets sized for this workload: tools span a patch_file (ms) to a cold 14B generation
+# (minutes); tok/s spans a 14B on partial offload (~5) to prompt eval on a warm cache (1000s).
+_SECONDS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+_TOKENS_PER_S = (1, 2.5, 5, 10, 20, 30, 40, 60, 80, 120, 250, 500, 1000, 2500, 5000)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[Any, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items(), key=lambda kv: tuple(map(str, kv[0])))
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """A gauge read at scrape time from ``collect`` (label values → value)."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        collect: Optional[Callable[[], Dict[Tuple[Any, ...], float]]] = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.collect = collect or dict
+
+    def samples(self) -> List[str]:
+        try:
+            values = self.collect()
+        except Exception:  # noqa: BLE001 — a broken collector empties the gauge, not the scrape
+            values = {}
+        return [
+            f"{self.name}{_labels(self.labelnames, k)} {_number(v)}"
+            for k, v in sorted(values.items(), key=lambda kv: tuple(map(str, kv[0])))
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = _SECONDS
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values → [per-bucket counts..., sum, count]
+        self._series: Dict[Tuple[Any, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                ((k, list(v)) for k, v in self._series.items()),
+                key=lambda kv: tuple(map(str, kv[0])),
+            )
+        lines = []
+        for key, series in items:
+            running = 0.0
+            for bound, n in zip(self.buckets, series):
+                running += n
+                le = _labels(self.labelnames, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {_number(running)}")
+            plain = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{plain} {_number(series[-1])}")
+        return lines
+
+
+_REGISTRY: List[_Metric] = []
+
+TOOL_SECONDS = Histogram(
+    "ollama_bridge_tool_duration_seconds", "MCP tool latency.", ("tool", "outcome")
+)
+TOOL_ERRORS = Counter(
+    "ollama_bridge_tool_errors_total", "MCP tool calls that returned an error.", ("tool", "reason")
+)
+CALLS = Counter(
+    "ollama_bridge_ollama_calls_total",
+    "Completed Ollama chat calls (source: generated, cached or coalesced).",
+    ("model", "tool", "source"),
+)
+GPU_SECONDS = Counter(
+    "ollama_bridge_generation_seconds_total",
+    "Ollama's total_duration of generated calls — GPU time by model and tool.",
+    ("model", "tool"),
+)
+TOKENS = Counter(
+    "ollama_bridge_tokens_total", "Tokens evaluated (prompt) and generated (eval).",
+    ("model", "kind"),
+)
+PROMPT_TPS = Histogram(
+    "ollama_bridge_prompt_eval_tokens_per_second", "Prompt-eval speed per call.", ("model",),
+    buckets=_TOKENS_PER_S,
+)
+EVAL_TPS = Histogram(
+    "ollama_bridge_eval_tokens_per_second", "Generation speed per call.", ("model",),
+    buckets=_TOKENS_PER_S,
+)
+TTFT = Histogram(
+    "ollama_bridge_time_to_first_token_seconds", "Streamed calls: request to first token.",
+    ("model",),
+)
+QUEUE_WAIT = Histogram(
+    "ollama_bridge_gate_wait_seconds", "Time queued at the model-call gate.", ("model",)
+)
+ASSEMBLY = Histogram(
+    "ollama_bridge_context_assembly_seconds", "Building the <context>/<refs> prompt blocks."
+)
+INFLIGHT = Gauge(
+    "ollama_bridge_inflight_requests", "Ollama calls in flight in this bridge.", ("model",)
+)
+INFO = Gauge("ollama_bridge_info", "This bridge process.", ("client_id", "pid"))
+
+
+def tool_exit(tool: str, ok: bool, seconds: float, reason: Optional[str] = None) -> None:
+    """Record one MCP tool call's latency (and its error reason, if it failed)."""
+    with contextlib.suppress(Exception):
+        TOOL_SECONDS.observe(seconds, tool=tool, outcome="ok" if ok else "error")
+        if not ok:
+            TOOL_ERRORS.inc(tool=tool, reason=reason or "unknown")
+
+
+def observe_call(response: Any, tool: Optional[str]) -> None:
+    """Record a completed Ollama call from its ChatResponse."""
+    with contextlib.suppress(Exception):
+        model, tool = response.model, tool or ""
+        if response.cached or response.coalesced_with is not None:
+            source = "cached" if response.cached else "coalesced"
+            CALLS.inc(model=model, tool=tool, source=source)
+            return
+        CALLS.inc(model=model, tool=tool, source="generated")
+        GPU_SECONDS.inc(response.total_duration_ms / 1000, model=model, tool=tool)
+        TOKENS.inc(response.prompt_eval_count, model=model, kind="prompt")
+        TOKENS.inc(response.eval_count, model=model, kind="eval")
+        if response.prompt_eval_count and response.prompt_eval_duration_ms > 0:
+            PROMPT_TPS.observe(
+                response.prompt_eval_count / (response.prompt_eval_duration_ms / 1000), model=model
+            )
+        if response.eval_count and response.eval_duration_ms > 0:
+            EVAL_TPS.observe(response.eval_count / (response.eval_duration_ms / 1000), model=model)
+        if response.ttft_ms is not None:
+            TTFT.observe(response.ttft_ms / 1000, model=model)
+        QUEUE_WAIT.observe(response.queue_wait_ms / 1000, model=model)
+
+
+def observe_assembly(seconds: float) -> None:
+    with contextlib.suppress(Exception):
+        ASSEMBLY.observe(seconds)
+
+
+def render() -> str:
+    """Every metric in the Prometheus text format."""
+    return "".join(m.render() for m in _REGISTRY)
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+        path = request.split(b" ", 2)[1] if request.count(b" ") >= 2 else b""
+        if path.split(b"?", 1)[0] == b"/metrics":
+            status, ctype, body = "200 OK", _CONTENT_TYPE, render().encode()
+        else:
+            status, ctype, body = "404 Not Found", "text/plain", b"try /metrics\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception:  # noqa: BLE001 — a bad scrape must never touch the bridge
+        pass
+    finally:
+        with contextlib.suppress(Exception):
+            writer.close()
+
+
+async def start_listener(
+    client: Any,
+    client_id: str,
+    pid: int,
+    *,
+    port: int = METRICS_PORT,
+    host: str = METRICS_HOST,
+    span: int = METRICS_PORT_SPAN,
+) -> Optional[asyncio.AbstractServer]:
+    """Serve ``/metrics`` on the first free port of ``port``..``port+span-1``; None if off/none."""
+    INFLIGHT.collect = lambda: {(m,): n for m, n in client.get_inflight().items()}
+    INFO.collect = lambda: {(client_id, pid): 1}
+    if not port:
+        return None
+    for candidate in range(port, port + max(1, span)):
+        try:
+            server = await asyncio.start_server(_handle, host, candidate)
+        except OSError:
+            continue
+        print(f"[ollama-bridge] metrics on http://{host}:{candidate}/metrics", file=sys.stderr)
+        return server
+    print(
+        f"[ollama-bridge] Warning: no free metrics port in {port}-{port + span - 1}",
+        file=sys.stderr,
+    )
+    return None
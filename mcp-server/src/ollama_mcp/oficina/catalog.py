@@ -0,0 +1,241 @@
+"""Run catalog: one SQLite row per run, so the read verbs stop re-reading every ledger.
+
+``list_runs`` folded every run's whole ledger (twice) and ``rglob``-ed every artifacts dir
+on each call; ``run_result`` and ``cancel`` folded the whole ledger for one state. The
+catalog (``<root>/catalog.db``, WAL mode, shared by the worker, every bridge and the CLI)
+keeps what they need per run: folded state and phase, the last model named, first and last
+event timestamps, the ledger offset of each terminal event (the report pointer), and the
+artifacts / workspace footprint.
+
+The ledger stays the only truth; the catalog is a cache of folds over it:
+
+- **On append.** Ledgers built by ``run_ledger`` fold each new envelope into the row as it
+  is written (the worker's and ``submit``'s do).
+- **On read.** ``refresh`` compares the row with the ledger's size (one stat). A ledger that
+  grew without the hook — an older worker, a hand-written test ledger — is caught up from
+  the row's ``next_offset`` through the ledger's offset index, never refolded from 0.
+- **Footprints** are cached against the directory's mtime and re-measured when it moves.
+  A run still working is always measured live: its files are still being written.
+- ``reindex`` drops every row and rebuilds from the ledgers (``oficina reindex``).
+
+A catalog that cannot be opened on disk (read-only root) runs in memory, so the verbs keep
+working at the old cost; a catalog write that fails never fails the ledger append.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .ledger import Ledger, fold_state
+from .store import Store
+
+_TERMINAL_EVENTS = ("Delivered", "Failed", "IntakeRejected", "Cancelled", "Exhausted")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    model TEXT,
+    submitted_at TEXT,
+    updated_at TEXT,
+    next_offset INTEGER NOT NULL,
+    ledger_bytes INTEGER NOT NULL,
+    terminal TEXT NOT NULL,
+    footprint TEXT NOT NULL
+)
+"""
+
+
+@dataclass
+class RunRow:
+    """The catalog's view of one run, as of ``next_offset`` ledger events."""
+
+    run_id: str
+    state: str = "queued"
+    phase: str = "queued"
+    model: Optional[str] = None
+    submitted_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    next_offset: int = 0
+    ledger_bytes: int = 0
+    # event name → offset of its last occurrence, for the terminal events only
+    terminal: Dict[str, int] = field(default_factory=dict)
+    # "artifacts" / "workspace" → [bytes, dir mtime_ns] as last measured
+    footprint: Dict[str, List[int]] = field(default_factory=dict)
+
+    def fold(self, events: List[Dict[str, Any]]) -> None:
+        """Advance the row over ``events`` (those at or past ``next_offset``)."""
+        from .service import fold_phase
+
+        fresh = [e for e in events if e["offset"] >= self.next_offset]
+        if not fresh:
+            return
+        self.state = fold_state(fresh, self.state)
+        self.phase = fold_phase(fresh, self.phase)
+        for event in fresh:
+            model = (event.get("payload") or {}).get("model")
+            if isinstance(model, str) and model != "auto":
+                self.model = model
+            if event["event"] in _TERMINAL_EVENTS:
+                self.terminal[event["event"]] = event["offset"]
+        self.submitted_at = self.submitted_at or fresh[0].get("ts")
+        self.updated_at = fresh[-1].get("ts")
+        self.next_offset = fresh[-1]["offset"] + 1
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _tree_bytes(directory: Path) -> int:
+    return sum(f.stat().st_size for f in directory.rglob("*") if f.is_file())
+
+
+class Catalog:
+    """The run catalog for one oficina root."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.store = Store(root)
+        self.path = Path(root) / "catalog.db"
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(_SCHEMA)
+            except (sqlite3.Error, OSError):
+                db = sqlite3.connect(":memory:", check_same_thread=False)
+                db.execute(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def _load(self, run_id: str) -> Optional[RunRow]:
+        found = self._conn().execute(
+            "SELECT state, phase, model, submitted_at, updated_at, next_offset, ledger_bytes,"
+            " terminal, footprint FROM runs WHERE run_id = ?",
+            (run_id,),
+        ).fetchone()
+        if found is None:
+            return None
+        state, phase, model, submitted, updated, next_offset, ledger_bytes, terminal, fp = found
+        return RunRow(
+            run_id, state, phase, model, submitted, updated, next_offset, ledger_bytes,
+            json.loads(terminal), json.loads(fp),
+        )
+
+    def _save(self, row: RunRow) -> None:
+        db = self._conn()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    row.run_id, row.state, row.phase, row.model, row.submitted_at,
+                    row.updated_at, row.next_offset, row.ledger_bytes,
+                    json.dumps(row.terminal), json.dumps(row.footprint),
+                ),
+            )
+
+    def run_ledger(self, run_id: str) -> Ledger:
+        """The run's ledger, folding every append into this catalog."""
+        return Ledger(
+            self.store.events_path(run_id),
+            on_append=lambda envelope, size: self.record(run_id, envelope, size),
+        )
+
+    def record(self, run_id: str, envelope: Dict[str, Any], ledger_bytes: int) -> None:
+        """Fold one just-appended envelope into the run's row (never raises).
+
+        ``ledger_bytes`` is the ledger's length just past this envelope, as the
+        writer knows it: a concurrent append it did not see is left for ``refresh``.
+        """
+        try:
+            with self._lock:
+                row = self._load(run_id)
+                if row is None or row.next_offset != envelope["offset"]:
+                    self.refresh(run_id)
+                    return
+                row.fold([envelope])
+                row.ledger_bytes = ledger_bytes
+                self._save(row)
+        except (sqlite3.Error, OSError, ValueError):
+            pass
+
+    def refresh(self, run_id: str) -> Optional[RunRow]:
+        """The run's row, caught up with its ledger; None for an unknown run."""
+        if not self.store.run_dir(run_id).exists():
+            return None
+        path = self.store.events_path(run_id)
+        with self._lock:
+            row = self._load(run_id)
+            size = _size(path)
+            if row is not None and row.ledger_bytes == size:
+                return row
+            if row is None or size < row.ledger_bytes:
+                row = RunRow(run_id)  # new to the catalog, or its ledger was replaced
+            events = Ledger(path).read(row.next_offset)
+            if events and events[0]["offset"] != row.next_offset:
+                row = RunRow(run_id)
+                events = Ledger(path).read()
+            row.fold(events)
+            row.ledger_bytes = size
+            self._save(row)
+            return row
+
+    def footprint(self, row: RunRow, what: str) -> int:
+        """Bytes under the run's ``artifacts`` or ``workspace`` dir (0 if absent)."""
+        directory = self.store.run_dir(row.run_id) / what
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        cached = row.footprint.get(what)
+        if row.state in ("completed", "failed", "cancelled"):
+            if cached is not None and cached[1] == mtime_ns:
+                return cached[0]
+        measured = _tree_bytes(directory) if mtime_ns != -1 else 0
+        row.footprint[what] = [measured, mtime_ns]
+        with self._lock:
+            self._save(row)
+        return measured
+
+    def terminal_event(self, row: RunRow, name: str) -> Optional[Dict[str, Any]]:
+        """The run's last ``name`` event, read by its offset (no full ledger read)."""
+        offset = row.terminal.get(name)
+        if offset is None:
+            return None
+        events = Ledger(self.store.events_path(row.run_id)).read(offset)
+        return events[0] if events and events[0]["offset"] == offset else None
+
+    def runs(self) -> List[RunRow]:
+        """Every run in the store, each caught up with its ledger, in run-id order."""
+        if not self.store.runs_dir.exists():
+            return []
+        rows: List[RunRow] = []
+        for run_dir in sorted(self.store.runs_dir.iterdir()):
+            if run_dir.is_dir():
+                row = self.refresh(run_dir.name)
+                if row is not None:
+                    rows.append(row)
+        return rows
+
+    def reindex(self) -> int:
+        """Drop every row and rebuild the catalog from the ledgers; return the run count."""
+        with self._lock:
+            db = self._conn()
+            with db:
+                db.execute("DELETE FROM runs")
+            return len(self.runs())
@@ -1,4 +1,4 @@
-"""oficina CLI (P1-D11): submit | status | result | cancel | watch | runs | prune.
+"""oficina CLI (P1-D11): submit | status | result | cancel | watch | runs | prune | reindex.
 
 Thin verb parsing over the SAME service layer the MCP tools use — no logic
 duplication. Verbs print JSON (machine-readable) or short text; typed service
@@ -114,6 +114,12 @@ def cmd_prune(root: Path, dry_run: bool) -> int:
     return 0
 
 
+def cmd_reindex(root: Path) -> int:
+    """reindex: rebuild the run catalog (catalog.db) from every run's ledger."""
+    _emit(service.reindex(root))
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Build the oficina argument parser (one subparser per verb)."""
     parser = argparse.ArgumentParser(prog="oficina", description="Async local-model deliverable runs.")
@@ -130,6 +136,7 @@ def build_parser() -> argparse.ArgumentParser:
     sub.add_parser("runs", help="list runs with footprint + eligibility")
     p_prune = sub.add_parser("prune", help="run the retention sweep")
     p_prune.add_argument("--dry-run", action="store_true")
+    sub.add_parser("reindex", help="rebuild the run catalog from the ledgers")
     return parser
 
 
@@ -151,6 +158,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         return cmd_runs(root)
     if args.verb == "prune":
         return cmd_prune(root, args.dry_run)
+    if args.verb == "reindex":
+        return cmd_reindex(root)
     return 2
 
 
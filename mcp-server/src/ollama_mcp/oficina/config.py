@@ -5,14 +5,18 @@ overridable via the ``OFICINA_ROOT`` env var (tests + acceptance point it at a
 temp dir). Retention parameters live in ``~/.config/oficina/config.yaml`` (XDG);
 a missing file is NOT an error — embedded defaults encode the P6-harvest
 argument (``ledger: forever``, keep 20 runs of artifacts, 7-day workspace TTL).
+
+The same file sizes the worker pool (``workers:``): how many workers may drain the
+queue at once, and which runs each one prefers. The default is one worker, i.e. P1.
+``scheduling:`` bounds how far the queue may be reordered (``schedule.py``).
 """
 
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 ROOT_ENV_VAR = "OFICINA_ROOT"
 
@@ -39,18 +43,71 @@ class RetentionConfig:
     artifacts_keep_runs: int = 20
 
 
-def load_retention_config(config_path: Optional[Path] = None) -> RetentionConfig:
-    """Load retention config from YAML; a missing file yields embedded defaults."""
-    path = config_path or default_config_path()
+def _load_section(path: Path, name: str) -> Dict[str, Any]:
+    """One top-level section of the config YAML; a missing file or section is ``{}``."""
     if not path.exists():
-        return RetentionConfig()
+        return {}
     import yaml
 
     data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-    section = data.get("retention", {}) or {}
+    return data.get(name, {}) or {}
+
+
+def load_retention_config(config_path: Optional[Path] = None) -> RetentionConfig:
+    """Load retention config from YAML; a missing file yields embedded defaults."""
+    section = _load_section(config_path or default_config_path(), "retention")
     defaults = RetentionConfig()
     return RetentionConfig(
         ledger=section.get("ledger", defaults.ledger),
         workspaces_ttl_days=section.get("workspaces_ttl_days", defaults.workspaces_ttl_days),
         artifacts_keep_runs=section.get("artifacts_keep_runs", defaults.artifacts_keep_runs),
     )
+
+
+@dataclass
+class WorkerConfig:
+    """Worker pool parameters. ``affinity[i]`` is slot ``i``'s preference.
+
+    An affinity is ``{kinds: [...], models: [...]}``; a run matches when its
+    ``deliverable.kind`` and ``spec.model`` are in every list given. It is a
+    preference, not a filter: a worker with nothing matching queued takes the
+    oldest run anyway, so no run waits on a worker that is not there.
+    """
+
+    count: int = 1
+    affinity: List[Dict[str, List[str]]] = field(default_factory=list)
+
+    def affinity_for(self, slot: int) -> Dict[str, List[str]]:
+        """Slot ``slot``'s affinity (``{}``: no preference)."""
+        return self.affinity[slot] if slot < len(self.affinity) else {}
+
+
+def load_worker_config(config_path: Optional[Path] = None) -> WorkerConfig:
+    """Load the worker pool config from YAML; a missing file yields one worker."""
+    section = _load_section(config_path or default_config_path(), "workers")
+    return WorkerConfig(
+        count=max(1, int(section.get("count", 1))),
+        affinity=[dict(a or {}) for a in section.get("affinity", []) or []],
+    )
+
+
+@dataclass
+class ScheduleConfig:
+    """Queue reordering bounds (``schedule.py``).
+
+    Only the oldest ``window`` queued runs are ever reordered, and a run queued for
+    ``max_wait_s`` or longer goes first whatever it asks for.
+    """
+
+    window: int = 8
+    max_wait_s: float = 600.0
+
+
+def load_schedule_config(config_path: Optional[Path] = None) -> ScheduleConfig:
+    """Load the scheduling bounds from YAML; a missing file yields the defaults."""
+    section = _load_section(config_path or default_config_path(), "scheduling")
+    defaults = ScheduleConfig()
+    return ScheduleConfig(
+        window=max(1, int(section.get("window", defaults.window))),
+        max_wait_s=float(section.get("max_wait_s", defaults.max_wait_s)),
+    )
@@ -1,9 +1,17 @@
 """Disk FIFO queue for oficina runs (P1-D9).
 
 Markers are files named ``<epoch-ms>-<run_id>`` under ``<root>/queue/``. Many
-processes may push; in P1 a single worker pops. Safety comes from the marker
+processes may push, and several workers may pop. Safety comes from the marker
 names being distinct by construction (epoch-ms + unguessable run_id) and from
-atomic file creation — never a lock.
+atomic file operations — never a lock.
+
+A pop is a claim: the worker renames the marker into its own
+``<root>/claimed/<claimant>/`` directory. ``rename`` succeeds for exactly one
+caller, so two workers never take the same run; the loser gets
+``FileNotFoundError`` and tries the next marker. The claim stays on disk until
+the worker is ``done`` with the run, so a worker that dies mid-run leaves its
+claims behind for a live one to ``take`` and decide on. Marker names survive
+the round trip, so a requeued run keeps its place in line.
 
 Run IDs are ``secrets.token_urlsafe`` and MAY contain ``-``; the epoch-ms prefix
 never does, so the run_id is recovered by splitting on the FIRST dash. FIFO
@@ -20,6 +28,21 @@ from typing import List, Optional
 _SEP = "-"
 
 
+def marker_run_id(marker_name: str) -> str:
+    """The run_id a ``<epoch-ms>-<run_id>`` marker names."""
+    return marker_name.split(_SEP, 1)[1]
+
+
+def marker_epoch_ms(marker_name: str) -> int:
+    """When a marker's run was queued (its epoch-ms prefix)."""
+    return int(marker_name.split(_SEP, 1)[0])
+
+
+def _fifo_sorted(names: List[str]) -> List[str]:
+    """Marker names in FIFO order (numeric epoch-ms prefix, then name)."""
+    return sorted(names, key=lambda n: (marker_epoch_ms(n), n))
+
+
 class Fifo:
     """A directory-backed FIFO of run markers, rooted at ``root``."""
 
@@ -31,6 +54,15 @@ class Fifo:
         """The directory holding queue marker files."""
         return self.root / "queue"
 
+    @property
+    def claims_dir(self) -> Path:
+        """The parent of every claimant's directory of claimed markers."""
+        return self.root / "claimed"
+
+    def claimed_dir(self, claimant: str) -> Path:
+        """Where ``claimant``'s claimed markers sit until it is done with them."""
+        return self.claims_dir / claimant
+
     def _marker_name(self, run_id: str, now_ms: int) -> str:
         """Build the ``<epoch-ms>-<run_id>`` marker filename."""
         return f"{now_ms}{_SEP}{run_id}"
@@ -39,9 +71,8 @@ class Fifo:
         """Return all marker names ordered FIFO (numeric epoch-ms prefix)."""
         if not self.queue_dir.exists():
             return []
-        markers = list(self.queue_dir.iterdir())
-        markers.sort(key=lambda p: (int(p.name.split(_SEP, 1)[0]), p.name))
-        return [m.name for m in markers]
+        # A push's ``.tmp`` is not a marker until its rename lands.
+        return _fifo_sorted([p.name for p in self.queue_dir.iterdir() if p.suffix != ".tmp"])
 
     def push(self, run_id: str, now_ms: Optional[int] = None) -> str:
         """Enqueue a run; create the marker atomically; return the marker name."""
@@ -54,11 +85,68 @@ class Fifo:
         os.rename(temp_marker_path, self.queue_dir / marker_name)
         return marker_name
 
-    def pop(self) -> Optional[str]:
-        """Claim and remove the FIFO-lowest marker; return its run_id or None."""
-        markers = self._markers()
-        if not markers:
-            return None
-        first_marker = markers[0]
-        (self.queue_dir / first_marker).unlink()
-        return first_marker.split(_SEP, 1)[1]
+    def claim(self, marker: str, claimant: Optional[str] = None) -> bool:
+        """Take one queued marker; False if another worker took it first.
+
+        With a ``claimant`` the marker moves into its claimed dir (see ``done``);
+        without one it is removed outright.
+        """
+        try:
+            if claimant is None:
+                (self.queue_dir / marker).unlink()
+            else:
+                self.claimed_dir(claimant).mkdir(parents=True, exist_ok=True)
+                os.rename(self.queue_dir / marker, self.claimed_dir(claimant) / marker)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def pop(self, claimant: Optional[str] = None) -> Optional[str]:
+        """Claim the FIFO-lowest marker; return its run_id or None if none is left.
+
+        Strict FIFO; ``schedule.Scheduler`` is the worker's reordering pop.
+        """
+        for marker in self._markers():
+            if self.claim(marker, claimant):
+                return marker_run_id(marker)
+        return None
+
+    def claimants(self) -> List[str]:
+        """Every claimant that has a claimed dir (live or not)."""
+        if not self.claims_dir.exists():
+            return []
+        return sorted(p.name for p in self.claims_dir.iterdir() if p.is_dir())
+
+    def claims(self, claimant: str) -> List[str]:
+        """The marker names ``claimant`` holds, in FIFO order."""
+        directory = self.claimed_dir(claimant)
+        if not directory.exists():
+            return []
+        return _fifo_sorted([p.name for p in directory.iterdir()])
+
+    def take(self, claimant: str, marker: str, new_claimant: str) -> bool:
+        """Move one of ``claimant``'s claims to ``new_claimant``; False if it is gone."""
+        self.claimed_dir(new_claimant).mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(self.claimed_dir(claimant) / marker, self.claimed_dir(new_claimant) / marker)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def requeue(self, claimant: str, marker: str) -> None:
+        """Put a claimed marker back in the queue, at its original place in line."""
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        os.rename(self.claimed_dir(claimant) / marker, self.queue_dir / marker)
+
+    def done(self, claimant: str, run_id: str) -> None:
+        """Drop ``claimant``'s claim on ``run_id`` (the run reached a terminal event)."""
+        for marker in self.claims(claimant):
+            if marker_run_id(marker) == run_id:
+                (self.claimed_dir(claimant) / marker).unlink(missing_ok=True)
+
+    def retire(self, claimant: str) -> None:
+        """Remove ``claimant``'s claimed dir if it holds nothing."""
+        try:
+            self.claimed_dir(claimant).rmdir()
+        except OSError:
+            pass
@@ -87,6 +87,13 @@ class RunSpec(BaseModel):
     approval_gate: bool = False
     model: str = "auto"
     timeout_s: int = 1800
+    # Stream each model call into runs/<id>/stream.partial as it generates, so run_status
+    # shows a long generation is alive. With it, timeout_s bounds SILENCE per call (time
+    # to first token, then between chunks) rather than the call's total length.
+    stream: bool = False
+    # Scheduling (schedule.py): within the queue's reorder window a higher priority is
+    # claimed first. An ordering hint only — aging still bounds how long anything waits.
+    priority: int = 0
 
 
 # Allowed keys derived from the schema — single source of truth.
@@ -129,6 +136,7 @@ RULE_UNSUPPORTED_LANGUAGE = "unsupported_language"
 # P4 additions (judge gate)
 RULE_APPROVAL_GATE_UNSUPPORTED = "approval_gate_unsupported"
 RULE_RUBRIC_NOT_FOUND = "rubric_not_found"
+RULE_PRIORITY_NOT_INT = "priority_not_int"
 
 
 @dataclass
@@ -247,6 +255,14 @@ def _check_workspace(spec: Dict[str, Any]) -> Optional[Rejection]:
     return None
 
 
+def _check_priority(spec: Dict[str, Any]) -> Optional[Rejection]:
+    """Reject a non-integer priority (the scheduler would otherwise read it as 0)."""
+    priority = spec.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        return Rejection(RULE_PRIORITY_NOT_INT, f"priority must be an integer, got {priority!r}")
+    return None
+
+
 def _check_acceptance_supported(spec: Dict[str, Any]) -> Optional[Rejection]:
     """acceptance.test_cmd is only wired for loop kinds; reject it on file/answer.
 
@@ -420,6 +436,7 @@ _CHECKS = (
     _check_objective,
     _check_kind_and_target,
     _check_workspace,
+    _check_priority,
     _check_acceptance_supported,
     _check_worktree_supported,
     _check_language_supported,
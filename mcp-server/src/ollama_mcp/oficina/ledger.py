@@ -6,19 +6,42 @@ the ``event`` names; unknown event names MUST be tolerated (forward
 compatibility for draft-PN events).
 
 Single-writer discipline (P1-D6) is enforced by call topology, not locks: the
-MCP surface appends only ``RunSubmitted`` before queueing; the worker appends
-everything after. Appends are raw ``O_APPEND`` single-line writes — a crashed
+MCP surface appends only ``RunSubmitted`` before queueing; the worker that
+claimed the run appends everything after. The one exception is the worker
+ledger, which every worker in the pool appends to: it is opened ``shared``, and
+a shared ledger's appends hold an ``flock`` on ``<ledger>.lock`` so two workers
+never derive the same offset. Appends are raw ``O_APPEND`` single-line writes — a crashed
 writer leaves a torn last line, which reads tolerate by JSON parse failure on
 the last line only. An earlier-line parse failure is real corruption.
+
+Appends are O(1) in ledger length. The worker ledger under ``ledger:
+forever`` grows without bound, and re-reading it to count lines made every
+append slower than the last. A ``Ledger`` remembers the valid byte length and
+the next offset after each of its own appends; when the file size still
+matches, the append is one stat and one write. When it does not (first append,
+another process appended, a crash left a torn tail) only the tail is read: the
+last intact line carries its own ``offset``, so the next one is that plus one.
+The full scan runs only when the tail cannot vouch for the file.
+
+Reads from an offset are O(new events). Every ``_INDEX_STRIDE``-th append also
+records where its line starts in a sidecar (``events.jsonl.idx``: one
+little-endian u64 per stride, so slot ``i`` sits at byte ``8*i``). ``read(k)``
+looks up slot ``k // stride``, checks that the line there really carries that
+offset, skips at most ``stride - 1`` lines and parses only what follows. A
+missing, short or disagreeing index falls back to the full read: the sidecar is
+a hint, the ledger stays the only truth.
 """
 
 from __future__ import annotations
 
+import contextlib
+import fcntl
 import json
 import os
+import struct
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 # Public-state fold mapping (event model § "Public state fold"). Its keys ARE the
 # frozen run-event registry (ref:delegate-event-model) — RUN_EVENTS derives from it
@@ -55,6 +78,10 @@ _NON_FOLDING_RUN_EVENTS: frozenset[str] = frozenset(
         # is `working` before and after, and a failing judge does NOT block `Delivered`
         # (S17 gates DPO chosen labels, not delivery; H1 is Claude-gated by design).
         "Judged",
+        # Which queued run the worker claimed and why (``schedule.py``): the model it
+        # was grouped by, what was resident, how many older runs it went ahead of. The
+        # first event after RunSubmitted; the run is still `queued` until work starts.
+        "Scheduled",
     }
 )
 
@@ -65,6 +92,7 @@ WORKER_EVENTS: frozenset[str] = frozenset(
         "WorkerStopped",
         "RetentionPruned",
         "RefsDropped",
+        "ClaimRecovered",
     }
 )
 
@@ -86,8 +114,12 @@ def _read_valid_events(path: Path) -> List[Dict[str, Any]]:
     """
     if not path.exists():
         return []
+    return _parse_envelopes(path.read_text(encoding="utf-8"))
+
 
-    lines = path.read_text(encoding="utf-8").splitlines()
+def _parse_envelopes(text: str) -> List[Dict[str, Any]]:
+    """Parse ledger lines, dropping a torn last line; an earlier bad line raises."""
+    lines = text.splitlines()
     # Drop trailing blank lines so a torn line followed only by blanks is still
     # recognized as the (tolerated) last line rather than a mid-file failure.
     while lines and not lines[-1].strip():
@@ -130,11 +162,64 @@ def _valid_prefix_bytes(path: Path) -> int:
     return good_end
 
 
+_TAIL_WINDOW = 64 * 1024
+_INDEX_STRIDE = 64
+_INDEX_SLOT = struct.Struct("<Q")
+
+
+def _tail_state(path: Path) -> tuple[int, int] | None:
+    """Return ``(valid byte length, next offset)`` read from the file's tail only.
+
+    The last newline-terminated line must parse and carry an int ``offset``; an
+    unterminated fragment after it is a torn write and lies outside the valid
+    length. Returns None when the tail cannot vouch for the file — a junk or
+    blank terminated line, or no offset — and the caller falls back to a full scan.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return 0, 0
+    window = _TAIL_WINDOW
+    with path.open("rb") as f:
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            data = f.read(size - start)
+            end = data.rfind(b"\n")
+            line_start = data.rfind(b"\n", 0, end) + 1 if end != -1 else 0
+            if start > 0 and (end == -1 or line_start == 0):
+                window *= 4  # the last line is longer than the window — widen it
+                continue
+            break
+    if end == -1:
+        return 0, 0  # not one complete line: the whole file is a torn first write
+    try:
+        last = json.loads(data[line_start:end])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(last, dict) or not isinstance(last.get("offset"), int):
+        return None
+    return start + end + 1, last["offset"] + 1
+
+
 class Ledger:
     """Append-only event ledger bound to one ``events.jsonl`` file."""
 
-    def __init__(self, path: str | os.PathLike) -> None:
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        on_append: Optional[Callable[[Dict[str, Any], int], None]] = None,
+        shared: bool = False,
+    ) -> None:
         self.path = Path(path)
+        # Several processes append (the worker ledger under a pool): lock each append.
+        self.shared = shared
+        # Called after each append with the envelope and the ledger's byte length
+        # (the run catalog's hook, see catalog.py).
+        self.on_append = on_append
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        # (valid byte length, next offset) as of this instance's last append.
+        self._tail: tuple[int, int] | None = None
 
     def _repair_tail(self) -> None:
         """Heal a crashed-writer tail before appending (P1-D6: single writer).
@@ -151,22 +236,130 @@ class Ledger:
             with open(self.path, "r+b") as f:
                 f.truncate(good_end)
 
+    def _recover_tail(self) -> tuple[int, int]:
+        """Work out ``(valid byte length, next offset)`` from disk, healing a torn tail.
+
+        Reads the tail only (``_tail_state``); a tail that cannot vouch for the file
+        falls back to the full ``_repair_tail`` scan and a line count.
+        """
+        state = _tail_state(self.path)
+        if state is None:
+            self._repair_tail()
+            events = _read_valid_events(self.path)
+            return self.path.stat().st_size, len(events)
+        valid, offset = state
+        if self.path.exists() and valid < self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid)
+        return valid, offset
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
     def _append(self, event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Repair any torn tail, then append one envelope with a disk-derived offset."""
+        """Append one envelope with a disk-derived offset, repairing any torn tail first.
+
+        The offset comes from this instance's last append while the file size
+        still matches it, else from ``_recover_tail``.
+        """
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self._repair_tail()
-        envelope = {
-            "offset": len(_read_valid_events(self.path)),
-            "ts": _now_iso(),
-            "event": event,
-            "payload": payload,
-        }
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(envelope) + "\n")
+        with self._append_lock():
+            if self._tail is None or self._tail[0] != self._size():
+                self._tail = self._recover_tail()
+            valid, offset = self._tail
+            envelope = {
+                "offset": offset,
+                "ts": _now_iso(),
+                "event": event,
+                "payload": payload,
+            }
+            line = (json.dumps(envelope) + "\n").encode("utf-8")
+            with self.path.open("ab") as f:
+                f.write(line)
+            self._tail = (valid + len(line), offset + 1)
+            if offset % _INDEX_STRIDE == 0:
+                self._index_line(offset // _INDEX_STRIDE, valid)
+        if self.on_append is not None:
+            self.on_append(envelope, self._tail[0])
         return envelope
 
+    @contextlib.contextmanager
+    def _append_lock(self) -> Iterator[None]:
+        """Hold ``<ledger>.lock`` exclusively for a shared ledger; no-op otherwise."""
+        if not self.shared:
+            yield
+            return
+        with self.path.with_name(self.path.name + ".lock").open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _index_line(self, slot: int, position: int) -> None:
+        """Record where line ``slot * stride`` starts, if the index is complete up to it.
+
+        A gap (an index lost or behind) is left as is — readers fall back to the
+        last slot they can trust — rather than filled with a position not verified.
+        """
+        try:
+            with self.index_path.open("ab") as f:
+                if f.tell() == slot * _INDEX_SLOT.size:
+                    f.write(_INDEX_SLOT.pack(position))
+        except OSError:
+            pass
+
+    def _position(self, offset: int) -> int | None:
+        """Byte position where line ``offset`` starts (EOF if past the end).
+
+        None when the sidecar index cannot be trusted for this ledger.
+        """
+        base, position = 0, 0
+        try:
+            with self.index_path.open("rb") as f:
+                slots = f.seek(0, os.SEEK_END) // _INDEX_SLOT.size
+                if slots:
+                    slot = min(offset // _INDEX_STRIDE, slots - 1)
+                    f.seek(slot * _INDEX_SLOT.size)
+                    (position,) = _INDEX_SLOT.unpack(f.read(_INDEX_SLOT.size))
+                    base = slot * _INDEX_STRIDE
+        except OSError:
+            pass
+        try:
+            with self.path.open("rb") as f:
+                f.seek(position)
+                if base:
+                    try:
+                        first = json.loads(f.readline())
+                    except json.JSONDecodeError:
+                        return None
+                    if not isinstance(first, dict) or first.get("offset") != base:
+                        return None
+                    f.seek(position)
+                for _ in range(offset - base):
+                    if not f.readline():
+                        break
+                return f.tell()
+        except FileNotFoundError:
+            return 0
+
     def read(self, since_offset: int = 0) -> List[Dict[str, Any]]:
-        """Return envelopes whose offset is >= ``since_offset``, in order."""
+        """Return envelopes whose offset is >= ``since_offset``, in order.
+
+        A read from a later offset seeks through the sidecar index and parses only
+        the lines from there on.
+        """
+        if since_offset > 0:
+            position = self._position(since_offset)
+            if position is not None:
+                try:
+                    with self.path.open("rb") as f:
+                        f.seek(position)
+                        events = _parse_envelopes(f.read().decode("utf-8"))
+                except FileNotFoundError:
+                    return []
+                if not events or events[0].get("offset") == since_offset:
+                    return events
         events = _read_valid_events(self.path)
         return [e for e in events if e["offset"] >= since_offset]
 
@@ -223,16 +416,25 @@ class Ledger:
     def refs_dropped(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return self._append("RefsDropped", payload)
 
+    def claim_recovered(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._append("ClaimRecovered", payload)
+
     def context_limit_unknown(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return self._append("ContextLimitUnknown", payload)
 
     def judged(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return self._append("Judged", payload)
 
+    def scheduled(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._append("Scheduled", payload)
+
 
-def fold_state(events: List[Dict[str, Any]]) -> str:
-    """Fold an ordered event list into a public state, tolerating unknowns."""
-    current = "queued"
+def fold_state(events: List[Dict[str, Any]], current: str = "queued") -> str:
+    """Fold an ordered event list into a public state, tolerating unknowns.
+
+    ``current`` is the state already folded from earlier events, for folding
+    only what is new.
+    """
     for event in events:
         if event["event"] in _STATE_BY_EVENT:
             current = _STATE_BY_EVENT[event["event"]]
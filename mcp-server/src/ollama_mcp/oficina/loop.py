@@ -30,11 +30,13 @@ tokens are evicted, so the model silently loses the head of its own instructions
 from __future__ import annotations
 
 import difflib
-import math
 import time
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from ollama_mcp import tokens
+
 from .evaluator import LANGUAGES, attributable_failures, diff_touches_test_files
 from .errors import WHOSE_BY_LIMIT, WHOSE_SYSTEM, ContextBudgetError, triad
 from .intake import Budgets, resolve_language
@@ -263,13 +265,14 @@ class EvaluatedLoop:
     def _resolve_num_predict(self, assembly) -> int:
         """The effective per-call generation budget (E-D9). An explicit ``budgets.num_predict``
         always wins. Otherwise greenfield keeps the NUM_PREDICT floor/cap; edit mode sizes to the
-        current file — ``max(NUM_PREDICT, ceil(chars/4) * 2)`` capped at ``EDIT_NUM_PREDICT_CAP`` —
-        so a whole-file rewrite is never truncated mid-file (the T-91 class one level up)."""
+        current file — ``max(NUM_PREDICT, tokens(current_file) * 2)`` capped at
+        ``EDIT_NUM_PREDICT_CAP`` — so a whole-file rewrite is never truncated mid-file (the T-91
+        class one level up). Tokens are counted with the model's tokenizer (`tokens.count`)."""
         if self._explicit_num_predict is not None:
             return self._explicit_num_predict
         if assembly.mode == "edit":
             current_file = assembly.stable_parts.get("current_file", "")
-            derived = math.ceil(len(current_file) / 4) * 2
+            derived = tokens.count(current_file) * 2
             return min(EDIT_NUM_PREDICT_CAP, max(NUM_PREDICT, derived))
         return NUM_PREDICT
 
@@ -531,11 +534,12 @@ class EvaluatedLoop:
         """Why this generation cannot fit the model's window, or None when it can (T-112).
 
         The window holds the prompt AND the generated tokens, so the resolved per-call budget
-        is counted beside the prompt estimate. An unresolvable ceiling disables the guard —
+        is counted beside the prompt's token count (`tokens.count` — the tokenizer when its
+        files are present, else its approximation). An unresolvable ceiling disables the guard —
         the caller was already told once, at resolve time."""
         if self._context_limit is None:
             return None
-        estimated = math.ceil(len(prompt) / 4)
+        estimated = tokens.count(prompt)
         if estimated + self._num_predict <= self._context_limit:
             return None
         return (
@@ -611,7 +615,9 @@ class EvaluatedLoop:
         return self._exhausted(iterations_used=self.max_iterations, limit_hit="exhausted")
 
 
-def default_coder(num_predict: Optional[int] = None, timeout: int = 1800) -> CoderFn:
+def default_coder(
+    num_predict: Optional[int] = None, timeout: int = 1800, stream_to: Optional[Path] = None
+) -> CoderFn:
     """The real coder: one bounded `chat` call per iteration (T-91 num_predict).
 
     The construction-time ``num_predict`` is a FALLBACK (NUM_PREDICT floor/cap when None):
@@ -619,7 +625,8 @@ def default_coder(num_predict: Optional[int] = None, timeout: int = 1800) -> Cod
     which wins — so the worker's construction-time ``num_predict=budgets.num_predict`` is inert
     on the loop path (an explicit budget wins inside ``_resolve_num_predict`` instead); only a
     direct 3-arg call (tests/legacy) sees the baked value. ``timeout`` comes from
-    ``spec.timeout_s`` (wired by the worker, T-95).
+    ``spec.timeout_s`` (wired by the worker, T-95); ``stream_to`` is set for a ``stream: true``
+    spec and makes each iteration's reply visible as it generates.
     Built as a factory so the loop stays free of async/GPU concerns and tests inject a fake.
     Transport + cold-start grace are the worker's shared per-call helpers (T-95 decision (b)) —
     the loop emits NO Generation events; per-call telemetry lives in calls.jsonl, run_id-tagged.
@@ -630,7 +637,8 @@ def default_coder(num_predict: Optional[int] = None, timeout: int = 1800) -> Cod
         effective = num_predict if num_predict is not None else baked
         return _cold_start_grace(
             lambda: _chat_generation(
-                prompt, model, run_id, timeout=timeout, num_predict=effective
+                prompt, model, run_id, timeout=timeout, num_predict=effective,
+                stream_to=stream_to,
             )
         )
 
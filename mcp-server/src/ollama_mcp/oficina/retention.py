@@ -11,6 +11,11 @@ lives in the ``Delivered`` event payload, so ``run_result`` stays answerable aft
 
 Prunable state is artifacts/ AND workspace/ (crashed-run worktrees); staleness for
 the TTL policy is run-dir mtime.
+
+Footprints come from the run catalog (``catalog.py``): a finished run's tree is measured
+once and re-measured only when its directory's mtime moves, so a sweep over many retained
+runs does not walk every one of them again. A prune is recorded there too, so ``runs``
+shows the freed space without another walk.
 """
 
 from __future__ import annotations
@@ -22,6 +27,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Set, Tuple
 
+from .catalog import Catalog
 from .config import RetentionConfig
 from .ledger import Ledger
 from .store import Store
@@ -59,19 +65,27 @@ def _has_content(artifacts_dir: Path) -> bool:
     return artifacts_dir.exists() and any(f.is_file() for f in artifacts_dir.rglob("*"))
 
 
-def _prune_artifacts(store: Store, run_id: str, policy: str, dry_run: bool) -> Optional[PruneRecord]:
+def _prune_artifacts(
+    store: Store, catalog: Catalog, run_id: str, policy: str, dry_run: bool
+) -> Optional[PruneRecord]:
     """Prune one run's artifacts dir under ``policy``; None if nothing to free."""
     artifacts_dir = store.artifacts_dir(run_id)
-    if not _has_content(artifacts_dir):
+    if not artifacts_dir.exists():
+        return None
+    row = catalog.refresh(run_id)
+    freed = catalog.footprint(row, "artifacts") if row else _artifacts_bytes(artifacts_dir)
+    if freed == 0 and not _has_content(artifacts_dir):
         return None
-    freed = _artifacts_bytes(artifacts_dir)
     if not dry_run:
         shutil.rmtree(artifacts_dir)
+        if row:
+            catalog.footprint(row, "artifacts")
     return PruneRecord("artifacts", run_id, freed, policy)
 
 
 def _prune_workspace(
     store: Store,
+    catalog: Catalog,
     run_id: str,
     policy: str,
     dry_run: bool,
@@ -85,13 +99,16 @@ def _prune_workspace(
     workspace_dir = store.run_dir(run_id) / "workspace"
     if not workspace_dir.exists():
         return None
-    freed = _workspace_bytes(workspace_dir)
+    row = catalog.refresh(run_id)
+    freed = catalog.footprint(row, "workspace") if row else _workspace_bytes(workspace_dir)
     if dry_run:
         return PruneRecord("workspace", run_id, freed, policy, git_pruned=None)
     base_repo = _base_repo_of(store, run_id)
     if base_repo is not None:
         _deregister_worktree(base_repo, workspace_dir / "worktree")
     shutil.rmtree(workspace_dir, ignore_errors=True)
+    if row:
+        catalog.footprint(row, "workspace")
     return PruneRecord("workspace", run_id, freed, policy, git_pruned=base_repo is not None)
 
 
@@ -144,7 +161,7 @@ def _runs_past_ttl(
 
 
 def _prune_over_keep_limit(
-    store: Store, config: RetentionConfig, dry_run: bool
+    store: Store, catalog: Catalog, config: RetentionConfig, dry_run: bool
 ) -> Tuple[Set[str], List[PruneRecord]]:
     """Keep-limit policy: prune artifacts of runs beyond ``artifacts_keep_runs``.
 
@@ -155,7 +172,7 @@ def _prune_over_keep_limit(
     records: List[PruneRecord] = []
     pruned: Set[str] = set()
     for run_id in _runs_over_keep_limit(store, config.artifacts_keep_runs):
-        record = _prune_artifacts(store, run_id, "artifacts_keep_runs", dry_run)
+        record = _prune_artifacts(store, catalog, run_id, "artifacts_keep_runs", dry_run)
         if record:
             records.append(record)
             pruned.add(run_id)
@@ -163,7 +180,12 @@ def _prune_over_keep_limit(
 
 
 def _prune_past_ttl(
-    store: Store, config: RetentionConfig, now: float, skip: Set[str], dry_run: bool
+    store: Store,
+    catalog: Catalog,
+    config: RetentionConfig,
+    now: float,
+    skip: Set[str],
+    dry_run: bool,
 ) -> List[PruneRecord]:
     """TTL policy: prune artifacts + workspace of runs past ``workspaces_ttl_days``.
 
@@ -173,10 +195,12 @@ def _prune_past_ttl(
     records: List[PruneRecord] = []
     for run_id in _runs_past_ttl(store, config.workspaces_ttl_days, now):
         if run_id not in skip:
-            record = _prune_artifacts(store, run_id, "workspaces_ttl_days", dry_run)
+            record = _prune_artifacts(store, catalog, run_id, "workspaces_ttl_days", dry_run)
             if record:
                 records.append(record)
-        workspace_record = _prune_workspace(store, run_id, "workspaces_ttl_days", dry_run)
+        workspace_record = _prune_workspace(
+            store, catalog, run_id, "workspaces_ttl_days", dry_run
+        )
         if workspace_record:
             records.append(workspace_record)
     return records
@@ -205,8 +229,9 @@ def sweep(
 ) -> List[PruneRecord]:
     """Run both retention policies; emit RetentionPruned per prune unless dry-run."""
     now = time.time() if now is None else now
-    pruned, records = _prune_over_keep_limit(store, config, dry_run)
-    records += _prune_past_ttl(store, config, now, skip=pruned, dry_run=dry_run)
+    catalog = Catalog(store.root)
+    pruned, records = _prune_over_keep_limit(store, catalog, config, dry_run)
+    records += _prune_past_ttl(store, catalog, config, now, skip=pruned, dry_run=dry_run)
     if not dry_run:
         _emit_records(worker_ledger, records)
     return records
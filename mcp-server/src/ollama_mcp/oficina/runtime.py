@@ -0,0 +1,131 @@
+"""The worker's one long-lived event loop and Ollama client (runs the async side of its calls).
+
+oficina's seams are synchronous on purpose — `CoderFn`, the judge's ``chat``, `GenerateFn` —
+so the loop and the packaging code stay free of async concerns. Each call used to bridge to the
+async client with its own ``asyncio.run`` and a freshly built `OllamaClient`: a three-iteration
+loop with a four-criterion judge built and tore down about eight loops, clients and connection
+pools, and `model_context_limit` refetched ``/api/show`` every time.
+
+`CallRuntime` is the one bridge instead: a daemon thread running one loop for the worker's whole
+life, holding one client (and so one keep-alive pool, `client._HostPool`). The sync seams stay
+sync; `run_call` submits their coroutine onto the loop and blocks on the result. The worker
+installs a runtime for the span of `Worker.run`; anywhere else — the CLI, tests, the acceptance
+script — there is none, and `run_call` falls back to the old throwaway ``asyncio.run``, so no
+caller needs to know which it got.
+
+Startup cost and per-call dispatch overhead are measured here and reported by the worker on its
+``WorkerStarted`` / ``WorkerStopped`` events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# A call: given the shared client, produce the coroutine to run.
+CallFactory = Callable[[Any], Awaitable[T]]
+
+
+class CallRuntime:
+    """One event loop on a daemon thread, plus the OllamaClient that lives on it."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Any = None
+        self.startup_ms = 0.0
+        self._overheads_ms: List[float] = []
+
+    def start(self) -> None:
+        """Start the loop thread and build the client on it; records ``startup_ms``."""
+        from ollama_mcp.client import OllamaClient
+
+        t0 = time.perf_counter()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="oficina-calls", daemon=True
+        )
+        self._thread.start()
+
+        async def _make_client() -> Any:
+            return OllamaClient()
+
+        self._client = asyncio.run_coroutine_threadsafe(_make_client(), self._loop).result()
+        self.startup_ms = (time.perf_counter() - t0) * 1000
+
+    def run(self, factory: CallFactory[T]) -> T:
+        """Run ``factory(client)`` on the loop and return its result (re-raising its error).
+
+        The recorded overhead is dispatch: from submission to the coroutine running on the
+        loop — the part of each call that is the bridge's own cost, not Ollama's.
+        """
+        submitted = time.perf_counter()
+
+        async def _call() -> T:
+            self._overheads_ms.append((time.perf_counter() - submitted) * 1000)
+            return await factory(self._client)
+
+        return asyncio.run_coroutine_threadsafe(_call(), self._loop).result()
+
+    def stop(self) -> None:
+        """Close the client, stop the loop and join its thread. Safe to call twice."""
+        if self._loop is None:
+            return
+        if self._client is not None:
+            with contextlib.suppress(Exception):
+                asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-call overhead summary for the ``WorkerStopped`` payload."""
+        samples = self._overheads_ms
+        return {
+            "calls": len(samples),
+            "call_overhead_ms_mean": round(sum(samples) / len(samples), 3) if samples else 0.0,
+            "call_overhead_ms_max": round(max(samples), 3) if samples else 0.0,
+        }
+
+
+_ACTIVE: Optional[CallRuntime] = None
+
+
+@contextlib.contextmanager
+def installed(runtime: CallRuntime) -> Iterator[CallRuntime]:
+    """Make ``runtime`` the one `run_call` uses for the duration; stop it on exit."""
+    global _ACTIVE
+    runtime.start()
+    _ACTIVE = runtime
+    try:
+        yield runtime
+    finally:
+        _ACTIVE = None
+        runtime.stop()
+
+
+def run_call(factory: CallFactory[T]) -> T:
+    """Run an async client call from sync code — on the installed runtime if any.
+
+    Without one (CLI, tests, scripts) this is the throwaway path: a fresh loop via
+    ``asyncio.run`` and a client closed as soon as the call returns.
+    """
+    if _ACTIVE is not None:
+        return _ACTIVE.run(factory)
+
+    from ollama_mcp.client import OllamaClient
+
+    async def _once() -> T:
+        client = OllamaClient()
+        try:
+            return await factory(client)
+        finally:
+            await client.close()
+
+    return asyncio.run(_once())
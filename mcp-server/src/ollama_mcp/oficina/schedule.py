@@ -0,0 +1,193 @@
+"""Queue scheduling — which queued run a worker claims next.
+
+The FIFO is strictly ordered by submission time, and the queue is usually a mix: a
+Python function run, a Go one, an answer for an explicit ``spec.model``. Taken in
+that order nearly every run swaps the model, and each swap is 10–30 s of cold load
+before the first token. This layer reorders the head of the queue instead:
+
+- **Bounded window.** Only the oldest ``window`` queued runs are candidates; a run
+  further back cannot be picked ahead of them, however well it would fit.
+- **Rank** within the window, most significant first: ``spec.priority`` (higher
+  goes first, default 0), the worker slot's affinity (``workers.affinity``), whether
+  the run's model is the one resident now, then submission order.
+- **Aging.** A candidate queued for ``max_wait_s`` or longer goes first, oldest
+  first, whatever it asks for — so a run for a cold model is delayed, never starved.
+
+Which model is resident comes from the caller (the worker asks the model-call gate,
+and falls back to the model of its own last run). The same rule is the gate's drain
+before swap, one level up: the gate orders calls already in flight, this orders runs
+before any of their calls exist.
+
+``rank`` is pure — everything it decides from is passed in — so the policy is
+testable without a queue; ``Scheduler`` reads the candidates off disk and claims.
+Every pick is a ``Decision``, which the worker records as the run's ``Scheduled``
+event.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ollama_mcp.residency import matches
+
+from .config import ScheduleConfig
+from .fifo import Fifo, marker_epoch_ms, marker_run_id
+from .store import Store, UnknownRunError
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """One queued run as the policy sees it."""
+
+    marker: str
+    run_id: str
+    model: str
+    priority: int = 0
+    waited_s: float = 0.0
+    preferred: bool = False
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Why a run was picked: the payload of its ``Scheduled`` event."""
+
+    candidate: Candidate
+    reason: str  # "fifo" | "aged" | "priority" | "affinity" | "resident"
+    passed_over: int  # older runs in the window this one went ahead of
+    resident: Optional[str]
+    window: int
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            "model": self.candidate.model,
+            "reason": self.reason,
+            "resident": self.resident,
+            "priority": self.candidate.priority,
+            "waited_s": round(self.candidate.waited_s, 3),
+            "passed_over": self.passed_over,
+            "window": self.window,
+        }
+
+
+def _priority(spec: Dict[str, Any]) -> int:
+    value = spec.get("priority", 0)
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def affinity_matches(affinity: Dict[str, Any], spec: Dict[str, Any], model: str) -> bool:
+    """True if ``spec`` fits a slot's affinity (``kinds`` / ``models``; ``{}`` fits nothing)."""
+    if not affinity:
+        return False
+    kinds, models = affinity.get("kinds"), affinity.get("models")
+    if kinds and (spec.get("deliverable") or {}).get("kind") not in kinds:
+        return False
+    return not models or any(matches(model, m) for m in models)
+
+
+def rank(
+    candidates: List[Candidate], resident: Optional[str], config: ScheduleConfig
+) -> List[Decision]:
+    """Order ``candidates`` (given in FIFO order) by the policy, each with its reason.
+
+    The first entry is the pick; the rest are the fallbacks, in order, for when a
+    concurrent worker claims the pick first.
+    """
+    window = candidates[: config.window]
+
+    def is_resident(c: Candidate) -> bool:
+        return resident is not None and matches(resident, c.model)
+
+    def aged(c: Candidate) -> bool:
+        return c.waited_s >= config.max_wait_s
+
+    def key(item):
+        index, c = item
+        if aged(c):
+            return (0, index)
+        return (1, -c.priority, not c.preferred, not is_resident(c), index)
+
+    def reason(c: Candidate, passed: List[int]) -> str:
+        if aged(c):
+            return "aged"
+        if not passed:
+            return "fifo"
+        oldest = window[min(passed)]  # what strict FIFO would have run instead
+        if c.priority != oldest.priority:
+            return "priority"
+        if c.preferred != oldest.preferred:
+            return "affinity"
+        return "resident"
+
+    ordered = [index for index, _ in sorted(enumerate(window), key=key)]
+    decisions = []
+    for position, index in enumerate(ordered):
+        passed = [later for later in ordered[position + 1:] if later < index]
+        candidate = window[index]
+        decisions.append(
+            Decision(candidate, reason(candidate, passed), len(passed), resident, config.window)
+        )
+    return decisions
+
+
+class Scheduler:
+    """Picks and claims the next run for one worker, rooted at ``root``.
+
+    ``model_of`` (spec → the model the run will load first) and ``resident``
+    (→ the model in VRAM now, or None) are the worker's; ``resident`` is only
+    asked when there is a choice to make.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        model_of: Callable[[Dict[str, Any]], str],
+        resident: Callable[[], Optional[str]],
+        config: Optional[ScheduleConfig] = None,
+        affinity: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.fifo = Fifo(root)
+        self.store = Store(root)
+        self.model_of = model_of
+        self.resident = resident
+        self.config = config or ScheduleConfig()
+        self.affinity = affinity or {}
+        self._clock = clock
+
+    def candidates(self) -> List[Candidate]:
+        """The oldest ``window`` queued runs, in FIFO order."""
+        now = self._clock()
+        found: List[Candidate] = []
+        for marker in self.fifo._markers()[: self.config.window]:
+            run_id = marker_run_id(marker)
+            try:
+                spec = self.store.load_spec(run_id)
+            except (UnknownRunError, ValueError, OSError):
+                spec = {}  # still claimable; intake will say what is wrong with it
+            try:
+                model = self.model_of(spec) if spec else "auto"
+            except Exception:
+                model = "auto"  # a malformed spec is intake's to reject, not ours to crash on
+            found.append(
+                Candidate(
+                    marker, run_id, model, _priority(spec),
+                    max(0.0, now - marker_epoch_ms(marker) / 1000),
+                    affinity_matches(self.affinity, spec, model),
+                )
+            )
+        return found
+
+    def pop(self, claimant: str) -> Optional[Decision]:
+        """Claim the policy's pick for ``claimant``; None if the queue is empty."""
+        while True:
+            candidates = self.candidates()
+            if not candidates:
+                return None
+            resident = self.resident() if len(candidates) > 1 else None
+            for decision in rank(candidates, resident, self.config):
+                if self.fifo.claim(decision.candidate.marker, claimant):
+                    return decision
+            # Every candidate went to other workers while we ranked: look again.
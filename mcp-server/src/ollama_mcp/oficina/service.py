@@ -19,10 +19,11 @@ import os
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from .catalog import Catalog
 from .fifo import Fifo
-from .ledger import Ledger, fold_state
+from .ledger import Ledger
 from .store import Store, UnknownRunError
-from .workerproc import WorkerProc
+from .workerproc import ensure_workers
 
 _TERMINAL_STATES = {"completed", "failed", "cancelled"}
 
@@ -59,6 +60,9 @@ _PHASE_NEUTRAL_EVENTS = frozenset(
         # therefore off. It reports a capability, not progress, so the run's phase is whatever
         # it already was.
         "ContextLimitUnknown",
+        # The scheduler's pick (`schedule.py`): the run leaves the queue, but nothing has
+        # started on it yet — `queued` still tells the caller the truth until it does.
+        "Scheduled",
     }
 )
 
@@ -81,9 +85,11 @@ def watch_cmd(run_id: str) -> str:
     return f"oficina watch {run_id}"
 
 
-def fold_phase(events: List[Dict[str, Any]]) -> str:
-    """Fold events to a coarse internal phase, tolerating unknown names."""
-    phase = "queued"
+def fold_phase(events: List[Dict[str, Any]], phase: str = "queued") -> str:
+    """Fold events to a coarse internal phase, tolerating unknown names.
+
+    ``phase`` is the phase already folded from earlier events.
+    """
     for event in events:
         if event["event"] in _PHASE_BY_EVENT:
             phase = _PHASE_BY_EVENT[event["event"]]
@@ -100,18 +106,18 @@ def _shape_check(spec: Any) -> Optional[str]:
 
 
 def _default_ensure_worker(root: Path) -> None:
-    """Ensure a live worker owns the store (spawns one detached if none)."""
-    from .worker import worker_argv
+    """Ensure live workers drain the store: one per pending run, up to ``workers.count``.
 
-    WorkerProc(root).ensure_worker(worker_argv())
+    Pending is queued plus claimed: a run a worker is busy with holds that slot, so a
+    new submission needs the next one rather than waiting behind it.
+    """
+    from .config import load_worker_config
+    from .worker import worker_argv
 
-
-def _last_event(events: List[Dict[str, Any]], name: str) -> Optional[Dict[str, Any]]:
-    """Return the last event with ``name``, or None."""
-    for event in reversed(events):
-        if event["event"] == name:
-            return event
-    return None
+    fifo = Fifo(root)
+    pending = len(fifo._markers()) + sum(len(fifo.claims(c)) for c in fifo.claimants())
+    wanted = min(load_worker_config().count, pending)
+    ensure_workers(root, worker_argv, wanted)
 
 
 def submit(
@@ -129,7 +135,7 @@ def submit(
     run_id = store.create_run(spec)
     queue_position = len(fifo._markers()) + 1
     # submitted_from: origin annotation (T-89 D2) — display-only, never a filter key.
-    Ledger(store.events_path(run_id)).run_submitted(
+    Catalog(root).run_ledger(run_id).run_submitted(
         {"queue_position": queue_position, "submitted_from": os.getcwd()}
     )
     fifo.push(run_id, now_ms)
@@ -138,32 +144,46 @@ def submit(
 
 
 def status(root: str | Path, run_id: str, since_offset: int = 0) -> Dict[str, Any]:
-    """Fold the ledger into {state, phase, events[since:], next_offset}."""
-    store = Store(root)
-    if not store.run_dir(run_id).exists():
+    """Fold the ledger into {state, phase, events[since:], next_offset} (+ streamed_bytes).
+
+    State and phase come from the run catalog; the events are read from
+    ``since_offset`` on, so a watcher's poll costs O(new events).
+    """
+    store, catalog = Store(root), Catalog(root)
+    row = catalog.refresh(run_id)
+    if row is None:
         raise UnknownRunError(run_id)
-    all_events = Ledger(store.events_path(run_id)).read()
-    next_offset = all_events[-1]["offset"] + 1 if all_events else 0
-    return {
-        "state": fold_state(all_events),
-        "phase": fold_phase(all_events),
-        "events": [e for e in all_events if e["offset"] >= since_offset],
-        "next_offset": next_offset,
+    events = Ledger(store.events_path(run_id)).read(since_offset)
+    snapshot = {
+        "state": row.state,
+        "phase": row.phase,
+        "events": events,
+        "next_offset": events[-1]["offset"] + 1 if events else row.next_offset,
     }
+    # A ``stream: true`` run's liveness between ledger events: how much of the current
+    # model call's reply has arrived. Only while running — afterwards it is history.
+    stream_path = store.stream_path(run_id)
+    if row.state not in _TERMINAL_STATES and stream_path.exists():
+        snapshot["streamed_bytes"] = stream_path.stat().st_size
+    return snapshot
 
 
 def result(root: str | Path, run_id: str) -> Dict[str, Any]:
-    """Return the terminal result; raise for unknown / not-terminal (pruned is OK)."""
-    store = Store(root)
-    if not store.run_dir(run_id).exists():
+    """Return the terminal result; raise for unknown / not-terminal (pruned is OK).
+
+    The report is read from the terminal event the catalog points at, not by
+    folding the whole ledger.
+    """
+    store, catalog = Store(root), Catalog(root)
+    row = catalog.refresh(run_id)
+    if row is None:
         raise UnknownRunError(run_id)
-    events = Ledger(store.events_path(run_id)).read()
-    state = fold_state(events)
+    state = row.state
     if state not in _TERMINAL_STATES:
         raise RunNotTerminalError(run_id, state)
     artifacts_pruned = not store.artifacts_dir(run_id).exists()
     if state == "completed":
-        delivered = _last_event(events, "Delivered")["payload"]
+        delivered = catalog.terminal_event(row, "Delivered")["payload"]
         return {
             "state": state,
             "report": delivered.get("report"),
@@ -171,10 +191,10 @@ def result(root: str | Path, run_id: str) -> Dict[str, Any]:
             "artifacts_pruned": artifacts_pruned,
         }
     terminal = (
-        _last_event(events, "Failed")
-        or _last_event(events, "IntakeRejected")
-        or _last_event(events, "Cancelled")
-        or _last_event(events, "Exhausted")
+        catalog.terminal_event(row, "Failed")
+        or catalog.terminal_event(row, "IntakeRejected")
+        or catalog.terminal_event(row, "Cancelled")
+        or catalog.terminal_event(row, "Exhausted")
     )
     report = terminal["payload"] if terminal else {}
     # Exhausted is a terminal 'failed' with a best attempt attached (S11) — surface the
@@ -193,33 +213,36 @@ def result(root: str | Path, run_id: str) -> Dict[str, Any]:
 
 
 def list_runs(root: str | Path) -> List[Dict[str, Any]]:
-    """Summarize every run: id, folded state, artifacts footprint, prune eligibility."""
-    store = Store(root)
-    if not store.runs_dir.exists():
-        return []
+    """Summarize every run: id, folded state and phase, model, first/last event time,
+    artifacts footprint, prune eligibility — all from the run catalog."""
+    catalog = Catalog(root)
     summaries: List[Dict[str, Any]] = []
-    for run_dir in sorted(store.runs_dir.iterdir()):
-        if not run_dir.is_dir():
-            continue
-        run_id = run_dir.name
-        events = Ledger(store.events_path(run_id)).read()
-        artifacts_dir = store.artifacts_dir(run_id)
-        artifacts_bytes = sum(f.stat().st_size for f in artifacts_dir.rglob("*") if f.is_file()) if artifacts_dir.exists() else 0
+    for row in catalog.runs():
+        artifacts_bytes = catalog.footprint(row, "artifacts")
         summaries.append(
             {
-                "run_id": run_id,
-                "state": fold_state(events),
+                "run_id": row.run_id,
+                "state": row.state,
+                "phase": row.phase,
+                "model": row.model,
+                "submitted_at": row.submitted_at,
+                "updated_at": row.updated_at,
                 "artifacts_bytes": artifacts_bytes,
-                "prune_eligible": artifacts_bytes > 0 and fold_state(events) in _TERMINAL_STATES,
+                "prune_eligible": artifacts_bytes > 0 and row.state in _TERMINAL_STATES,
             }
         )
     return summaries
 
 
+def reindex(root: str | Path) -> Dict[str, Any]:
+    """Rebuild the run catalog from the ledgers; return {runs} (the count indexed)."""
+    return {"runs": Catalog(root).reindex()}
+
+
 def cancel(root: str | Path, run_id: str) -> Dict[str, Any]:
     """Write the cooperative cancel flag (P1-D6); return the current {state}."""
     store = Store(root)
     if not store.run_dir(run_id).exists():
         raise UnknownRunError(run_id)
     (store.run_dir(run_id) / "cancel").write_text("1", encoding="utf-8")
-    return {"state": fold_state(Ledger(store.events_path(run_id)).read())}
+    return {"state": Catalog(root).refresh(run_id).state}
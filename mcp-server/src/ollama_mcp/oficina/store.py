@@ -2,7 +2,8 @@
 
 Storage root is machine-global (``~/.local/share/oficina/`` by default) but is
 ALWAYS injected as a parameter — tests use tmp_path, the default is wired later.
-Layout per run: ``runs/<run_id>/{spec.json, events.jsonl, artifacts/}``.
+Layout per run: ``runs/<run_id>/{spec.json, events.jsonl, artifacts/}``. The root also
+holds ``catalog.db``, the run catalog derived from those ledgers (``catalog.py``).
 
 ``spec.json`` is write-once and immutable after creation (P1-D6 ownership table),
 written atomically via tmp + ``os.replace``. ``events.jsonl`` is owned by the
@@ -46,6 +47,10 @@ class Store:
         """Path to a run's artifacts subdirectory."""
         return self.run_dir(run_id) / "artifacts"
 
+    def stream_path(self, run_id: str) -> Path:
+        """Where a ``stream: true`` run's in-progress model reply grows, chunk by chunk."""
+        return self.run_dir(run_id) / "stream.partial"
+
     def create_run(self, spec: Dict[str, Any]) -> str:
         """Mint an ID, build the run dir + artifacts, persist spec.json; return id."""
         run_id = ids.mint_run_id()
@@ -15,10 +15,13 @@ and the whole client chain into anything that wanted to make one model call.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
 from ollama_mcp.client import OllamaTimeoutError
 
+from .runtime import run_call
+
 
 @dataclass
 class GenerationResult:
@@ -63,41 +66,49 @@ def _chat_generation(
     # so both are opt-in seams rather than a second transport that would miss calls.jsonl.
     system: Optional[str] = None,
     schema: Optional[Dict[str, Any]] = None,
+    # Opt-in streaming (spec ``stream: true``): the reply is appended to this file as it
+    # is generated — truncated at the start of each call — so a watcher sees liveness.
+    stream_to: Optional[Path] = None,
 ) -> GenerationResult:
     """One Ollama chat call → ``GenerationResult`` — the shared generation transport (T-95).
 
     Owns the call convention for BOTH the single-shot default and the loop's per-iteration
-    coder: client lifecycle, ``think=False``, ``run_id`` tagging (calls.jsonl), bounded
+    coder: where the call runs (`runtime.run_call` — the worker's long-lived loop and
+    client when installed), ``think=False``, ``run_id`` tagging (calls.jsonl), bounded
     ``num_predict`` (T-91), fence stripping. Deliberately emits NO events — the single-shot
     path narrates via GenerationStarted/Finished, the loop via IterationStarted/Evaluated,
     and per-call telemetry lives in calls.jsonl joined on run_id (T-99 decision (b)).
     """
-    import asyncio
-
     from ollama_mcp import server as srv
-    from ollama_mcp.client import OllamaClient
-
-    async def _call() -> Any:
-        client = OllamaClient()
-        try:
-            return await client.chat(
-                prompt=prompt,
-                model=model,
-                think=False,
-                timeout=timeout,
-                run_id=run_id,
-                num_predict=num_predict,
-                system=system,
-                format=schema,
-                # T-105: oficina does NOT route through the generate_code MCP tool —
-                # this seam goes straight to the client, so it must self-attribute.
-                # Verdicts for these are per-RUN (via run_result), not per-call.
-                tool="oficina",
-            )
-        finally:
-            await client.close()
-
-    resp = asyncio.run(_call())
+
+    async def _call(client: Any) -> Any:
+        kwargs = dict(
+            prompt=prompt,
+            model=model,
+            think=False,
+            timeout=timeout,
+            run_id=run_id,
+            num_predict=num_predict,
+            system=system,
+            format=schema,
+            # T-105: oficina does NOT route through the generate_code MCP tool —
+            # this seam goes straight to the client, so it must self-attribute.
+            # Verdicts for these are per-RUN (via run_result), not per-call.
+            tool="oficina",
+            # T-88: a detached run has no one waiting on each call — it queues
+            # behind interactive sessions at the gate instead of swapping under them.
+            priority="batch",
+        )
+        if stream_to is None:
+            return await client.chat(**kwargs)
+        stream = client.chat_stream(**kwargs)
+        with open(stream_to, "w", encoding="utf-8") as sink:
+            async for delta in stream:
+                sink.write(delta)
+                sink.flush()
+        return stream.response
+
+    resp = run_call(_call)
     content = srv._strip_code_fences(resp.content) if strip_fences else resp.content
     return GenerationResult(
         content=content, model=resp.model,
@@ -115,28 +126,34 @@ def model_context_limit(model: str) -> Optional[int]:
     high silently disables the caller's fit check, guessing low aborts valid work. Every
     failure (transport, status, shape, parse) lands on the same None channel; the ceiling
     is a value-or-absence, never a sentinel in the value channel (T-112).
+
+    Memoized per process for found values only: the loop asks once per iteration, and a
+    worker drains its queue and exits, so a model re-created mid-life is not a concern —
+    while caching a None would turn one transient /api/show failure into a fit check that
+    stays off for every later run the worker takes.
     """
+    if model in _CONTEXT_LIMITS:
+        return _CONTEXT_LIMITS[model]
     descriptor = _fetch_model_descriptor(model)
     if not descriptor:
         return None
-    return _num_ctx_from_parameters(descriptor.get("parameters", ""))
+    limit = _num_ctx_from_parameters(descriptor.get("parameters", ""))
+    if limit is not None:
+        _CONTEXT_LIMITS[model] = limit
+    return limit
+
+
+_CONTEXT_LIMITS: Dict[str, int] = {}
 
 
 def _fetch_model_descriptor(model: str) -> Optional[Dict[str, Any]]:
     """The model's /api/show descriptor, or None if it cannot be retrieved."""
-    import asyncio
-
-    from ollama_mcp.client import OllamaClient
 
-    async def _call() -> Any:
-        client = OllamaClient()
-        try:
-            return await client.fetch_model_descriptor(model)
-        finally:
-            await client.close()
+    async def _call(client: Any) -> Any:
+        return await client.fetch_model_descriptor(model)
 
     try:
-        return asyncio.run(_call())
+        return run_call(_call)
     except Exception:  # noqa: BLE001 — an undeterminable ceiling is None, never a raise
         return None
 
@@ -1,9 +1,17 @@
 """oficina worker — main loop: pop → intake → generate → package → events (T6).
 
-Lazy daemon (P1-D9): the worker's FIRST act is to claim the pidfile; if it loses
-the double-spawn race it exits immediately. It runs a retention sweep, then drains
-the FIFO one run at a time, emitting run events to each run's ledger and
-WorkerStarted/WorkerStopped to the worker ledger, and exits when the queue empties.
+Lazy daemon (P1-D9): the worker's FIRST act is to claim its slot's pidfile; if it
+loses the double-spawn race it exits immediately. It recovers claims orphaned by dead
+workers, runs a retention sweep (slot 0 only), then drains the FIFO one run at a time,
+emitting run events to each run's ledger and WorkerStarted/WorkerStopped to the worker
+ledger, and exits when the queue empties.
+
+Up to ``workers.count`` workers drain the queue together, one per slot, so one run's
+CPU-bound evaluation (pytest, go build) no longer holds the next run's generation
+back; the gate still decides which model call reaches the GPU. Each pop is an atomic
+claim (``fifo.py``) of the run ``schedule.py`` picks: within a bounded window of the
+queue head, runs for the model already resident (and a slot's ``affinity``) go first,
+and the pick is recorded as the run's ``Scheduled`` event.
 
 Generation is an INJECTABLE seam (mirrors T5's start_time_reader): the default
 builds its own OllamaClient and runs today's generate_code/ask_ollama semantics per
@@ -18,15 +26,25 @@ import sys
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
+from ollama_mcp import gate
 from ollama_mcp.client import OllamaTimeoutError
 
-from .config import default_root, load_retention_config
+from .catalog import Catalog
+from .config import (
+    ScheduleConfig,
+    default_root,
+    load_retention_config,
+    load_schedule_config,
+    load_worker_config,
+)
 from .errors import WHOSE_MODEL, WHOSE_SYSTEM, triad
-from .fifo import Fifo
+from .fifo import Fifo, marker_run_id
 from .intake import LOOP_KINDS, check_intake
 from .ledger import Ledger
 from .report import _compact_drift, _compact_judge, _iterations_trail
 from .retention import sweep
+from .runtime import CallRuntime, installed, run_call
+from .schedule import Scheduler
 from .store import Store
 from .transport import (
     GenerationResult,
@@ -40,9 +58,10 @@ from .workerproc import WorkerProc
 GenerateFn = Callable[[Dict[str, Any], str], GenerationResult]
 
 
-def worker_argv() -> list[str]:
-    """The argv that spawns a detached worker process (used by submit + acceptance)."""
-    return [sys.executable, "-m", "ollama_mcp.oficina.worker"]
+def worker_argv(slot: int = 0) -> list[str]:
+    """The argv that spawns a detached worker for ``slot`` (used by submit + acceptance)."""
+    argv = [sys.executable, "-m", "ollama_mcp.oficina.worker"]
+    return argv + ["--slot", str(slot)] if slot else argv
 
 
 def _failure_triad(stage: str, exc: Exception) -> Dict[str, Any]:
@@ -64,6 +83,21 @@ def _resolve_model(spec: Dict[str, Any], kind: str, srv) -> str:
     return srv._DEFAULT_CODEGEN_MODEL if kind == "file" else srv.DEFAULT_MODEL
 
 
+def planned_model(spec: Dict[str, Any]) -> str:
+    """The model a run will load first — what the scheduler groups runs by."""
+    model = spec.get("model", "auto")
+    if model and model != "auto":
+        return model
+    kind = (spec.get("deliverable") or {}).get("kind")
+    if kind in LOOP_KINDS:
+        from .evaluator import language_pack
+
+        return language_pack(spec).coder_model
+    from ollama_mcp import server as srv
+
+    return _resolve_model(spec, kind, srv)
+
+
 def _build_prompt(spec: Dict[str, Any], srv) -> str:
     """Objective, optionally prefixed with a server-side context-files block."""
     prompt = spec["objective"]
@@ -74,7 +108,9 @@ def _build_prompt(spec: Dict[str, Any], srv) -> str:
     return prompt
 
 
-def _default_generate(spec: Dict[str, Any], run_id: str) -> GenerationResult:
+def _default_generate(
+    spec: Dict[str, Any], run_id: str, stream_to: Optional[Path] = None
+) -> GenerationResult:
     """Run one generation via the shared transport (imports server lazily)."""
     from ollama_mcp import server as srv
 
@@ -85,6 +121,7 @@ def _default_generate(spec: Dict[str, Any], run_id: str) -> GenerationResult:
         run_id,
         timeout=spec.get("timeout_s", 1800),
         strip_fences=(kind == "file"),
+        stream_to=stream_to,
     )
 
 
@@ -99,13 +136,25 @@ class Worker:
         loop_coder=None,
         loop_evaluate=None,
         loop_judge=None,
+        slot: int = 0,
+        affinity: Optional[Dict[str, Any]] = None,
+        schedule: Optional[ScheduleConfig] = None,
+        resident_model: Optional[Callable[[], Optional[str]]] = None,
     ) -> None:
         self.root = Path(root)
         self.store = Store(root)
         self.fifo = Fifo(root)
-        self.proc = proc or WorkerProc(root)
-        self.worker_ledger = Ledger(self.root / "worker-events.jsonl")
+        self.slot = slot
+        self.proc = proc or WorkerProc(root, slot=slot)
+        self.claimant = self.proc.claimant()
+        self.worker_ledger = Ledger(self.root / "worker-events.jsonl", shared=True)
+        self.catalog = Catalog(root)
         self._generate = generate or _default_generate
+        # The planned model of this worker's last run: resident unless something evicted it.
+        self._last_model: Optional[str] = None
+        self.scheduler = Scheduler(
+            root, planned_model, resident_model or self._resident_model, schedule, affinity
+        )
         # P2 loop seams (injected for tests); resolved to the real ones lazily in _run_loop.
         self._loop_coder = loop_coder
         self._loop_evaluate = loop_evaluate
@@ -113,7 +162,7 @@ class Worker:
 
     def _run_ledger(self, run_id: str) -> Ledger:
         """The ledger for one run (the worker owns it post-queue-pop, P1-D6)."""
-        return Ledger(self.store.events_path(run_id))
+        return self.catalog.run_ledger(run_id)
 
     def _is_cancelled(self, run_id: str) -> bool:
         """True if the cooperative cancel flag file has been written (P1-D6)."""
@@ -121,6 +170,11 @@ class Worker:
 
     def _generate_with_cold_start_grace(self, spec: Dict[str, Any], run_id: str) -> GenerationResult:
         """Run the GenerateFn seam through the shared cold-start grace (one retry)."""
+        if self._generate is _default_generate and spec.get("stream"):
+            # The store path is the worker's to know, so the default seam gets it here;
+            # an injected GenerateFn keeps the plain (spec, run_id) contract.
+            stream_to = self.store.stream_path(run_id)
+            return _cold_start_grace(lambda: _default_generate(spec, run_id, stream_to))
         return _cold_start_grace(lambda: self._generate(spec, run_id))
 
     def _run_generation(self, ledger: Ledger, run_id: str, spec: Dict[str, Any]) -> Optional[GenerationResult]:
@@ -160,12 +214,10 @@ class Worker:
         refs = (spec.get("context") or {}).get("refs") or []
         if not refs:
             return ""
-        import asyncio
-
         from ollama_mcp.server import _build_refs_block
 
         try:
-            block = asyncio.run(_build_refs_block(refs, None))
+            block = run_call(lambda _client: _build_refs_block(refs, None))
         except Exception as exc:  # noqa: BLE001 — refs are best-effort context, never fatal
             self._note_refs_dropped(run_id, refs, f"{type(exc).__name__}: {exc}")
             return ""
@@ -232,7 +284,8 @@ class Worker:
 
         num_predict = (spec.get("budgets") or {}).get("num_predict")
         coder = self._loop_coder or default_coder(
-            num_predict=num_predict, timeout=spec.get("timeout_s", 1800)
+            num_predict=num_predict, timeout=spec.get("timeout_s", 1800),
+            stream_to=self.store.stream_path(run_id) if spec.get("stream") else None,
         )
         evaluate = self._loop_evaluate or default_evaluate
         run_dir = self.store.run_dir(run_id) / "workspace"
@@ -308,31 +361,111 @@ class Worker:
             return
         self._package(ledger, run_id, spec, gen)
 
+    def _resident_model(self) -> Optional[str]:
+        """The model in VRAM now: the gate's last admitted model, else our last run's."""
+        from ollama_mcp import gate
+
+        try:
+            snapshot = run_call(lambda _client: gate.status())
+        except Exception:  # noqa: BLE001 — a guess for ordering, never a failure
+            snapshot = None
+        return (snapshot or {}).get("loaded") or self._last_model
+
     def run_once(self) -> Optional[str]:
-        """Pop and process one run; return its id, or None if the queue is empty."""
-        run_id = self.fifo.pop()
-        if run_id is None:
+        """Claim and process the scheduler's pick; return its id, or None if the queue is empty.
+
+        The claim is dropped only once the run is processed: if this worker dies
+        first, the claim is what lets the next worker find the run.
+        """
+        decision = self.scheduler.pop(self.claimant)
+        if decision is None:
             return None
+        run_id = decision.candidate.run_id
+        self._run_ledger(run_id).scheduled({**decision.payload(), "slot": self.slot})
         self.process_run(run_id)
+        self.fifo.done(self.claimant, run_id)
+        self._last_model = decision.candidate.model
         return run_id
 
-    def run(self) -> None:
-        """Claim the pidfile (FIRST act), sweep retention, drain the queue, exit."""
-        if not self.proc.claim_pidfile():
-            return  # lost the double-spawn race — a live worker already owns the store
-        self.worker_ledger.worker_started({"pid": os.getpid()})
-        try:
-            sweep(self.store, self.worker_ledger, load_retention_config())
-            while self.run_once() is not None:
-                pass
-        finally:
-            self.worker_ledger.worker_stopped({"pid": os.getpid()})
-            self.proc.pidfile.unlink(missing_ok=True)
+    def recover_claims(self) -> None:
+        """Settle the claims of workers that died holding them.
 
+        Each orphaned claim is first taken over (a rename, so of two recovering
+        workers exactly one handles it), then settled by how far the run got: a
+        run already terminal is just dropped, one no worker event reached goes back
+        to the queue at its old place, and one that died mid-flight gets a Failed
+        event — its workspace and branch may be half-built, so it is not re-run.
+        """
+        for claimant in self.fifo.claimants():
+            if claimant == self.claimant or self.proc.claimant_is_live(claimant):
+                continue
+            for marker in self.fifo.claims(claimant):
+                if self.fifo.take(claimant, marker, self.claimant):
+                    self._settle_orphan(claimant, marker)
+            self.fifo.retire(claimant)
+
+    def _settle_orphan(self, dead_claimant: str, marker: str) -> None:
+        run_id = marker_run_id(marker)
+        row = self.catalog.refresh(run_id)
+        if row is not None and row.state == "queued":
+            self.fifo.requeue(self.claimant, marker)
+            action = "requeued"
+        else:
+            if row is not None and row.state == "working":
+                what = f"the worker running it ({dead_claimant}) died; resubmit the run"
+                self._run_ledger(run_id).failed(triad("worker", what, WHOSE_SYSTEM))
+                action = "failed"
+            else:
+                action = "dropped"
+            self.fifo.done(self.claimant, run_id)
+        self.worker_ledger.claim_recovered(
+            {"run_id": run_id, "claimant": dead_claimant, "action": action}
+        )
 
-def main() -> None:
-    """Entry point for ``python -m ollama_mcp.oficina.worker``."""
-    Worker(default_root()).run()
+    def run(self) -> None:
+        """Claim the slot's pidfile (FIRST act), recover orphaned claims, sweep, drain, exit.
+
+        Every model call the drain makes runs on one `CallRuntime` — one event loop and one
+        client for the worker's life. What that costs is on the worker ledger: loop startup
+        on ``WorkerStarted``, call count and per-call dispatch overhead on ``WorkerStopped``.
+        """
+        if not self.proc.claim_pidfile():
+            return  # lost the double-spawn race — a live worker already owns this slot
+        with installed(CallRuntime()) as runtime:
+            self.worker_ledger.worker_started(
+                {
+                    "pid": os.getpid(),
+                    "slot": self.slot,
+                    "runtime_startup_ms": round(runtime.startup_ms, 3),
+                }
+            )
+            try:
+                self.recover_claims()
+                if self.slot == 0:
+                    # One sweeper: two concurrent sweeps would race on the same rmtree.
+                    sweep(self.store, self.worker_ledger, load_retention_config())
+                while self.run_once() is not None:
+                    pass
+            finally:
+                self.worker_ledger.worker_stopped(
+                    {"pid": os.getpid(), "slot": self.slot, **runtime.stats()}
+                )
+                self.fifo.retire(self.claimant)
+                self.proc.pidfile.unlink(missing_ok=True)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry point for ``python -m ollama_mcp.oficina.worker [--slot N]``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ollama_mcp.oficina.worker")
+    parser.add_argument("--slot", type=int, default=0, help="worker pool slot (default 0)")
+    slot = parser.parse_args(argv).slot
+    # T-88: the worker may be the only Ollama client up (CLI submit, no bridge running),
+    # so it brings the gate up itself rather than relying on a bridge's lifespan.
+    gate.ensure_daemon()
+    affinity = load_worker_config().affinity_for(slot)
+    Worker(default_root(), slot=slot, affinity=affinity, schedule=load_schedule_config()).run()
 
 
 if __name__ == "__main__":
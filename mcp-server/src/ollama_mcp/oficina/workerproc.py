@@ -1,8 +1,9 @@
 """Worker process arbitration + detached spawn (P1-D9).
 
-Exactly one worker owns the store at a time. Ownership is a pidfile
-(``<root>/worker.pid``) created with ``O_CREAT|O_EXCL`` — the loser of a
-double-spawn race fails the exclusive create and backs off. The pidfile stores
+Exactly one worker owns each pool SLOT at a time (``workers.count`` slots; one by
+default). Ownership is a pidfile (``<root>/worker.pid`` for slot 0,
+``worker-<slot>.pid`` for the rest) created with ``O_CREAT|O_EXCL`` — the loser of a
+double-spawn race for a slot fails the exclusive create and backs off. The pidfile stores
 the PID **and** the process start-time: a bare PID is not enough because the OS
 recycles PIDs, so a stale pidfile whose PID now belongs to an unrelated process
 must be distinguishable from a live owner. Liveness = ``kill(pid, 0)`` succeeds
@@ -11,6 +12,9 @@ AND the recorded start-time matches the live process's start-time.
 The start-time lookup is injectable so the PID-reuse case is testable without an
 actual reuse (feed a wrong start-time against a real, alive PID).
 
+The same ``(pid, start)`` pair names a worker's queue claims (``claimant``), so
+whether a claim's owner is still alive is checked exactly like a pidfile's.
+
 The spawn target (argv) is a PARAMETER — this module owns process mechanics, not
 the worker's body (``worker.py`` is a later task).
 """
@@ -47,14 +51,16 @@ class WorkerProc:
         self,
         root: str | os.PathLike,
         start_time_reader: Callable[[int], Optional[str]] = _proc_start_time,
+        slot: int = 0,
     ) -> None:
         self.root = Path(root)
         self._start_time_reader = start_time_reader
+        self.slot = slot
 
     @property
     def pidfile(self) -> Path:
-        """Path to the exclusive worker pidfile."""
-        return self.root / "worker.pid"
+        """Path to this slot's exclusive worker pidfile."""
+        return self.root / ("worker.pid" if self.slot == 0 else f"worker-{self.slot}.pid")
 
     @property
     def log_path(self) -> Path:
@@ -80,15 +86,32 @@ class WorkerProc:
         except (json.JSONDecodeError, OSError):
             return None
 
+    def is_live(self, pid: int, start: Optional[str]) -> bool:
+        """True iff ``pid`` is alive AND is the process that started at ``start``."""
+        if not self.is_alive(pid):
+            return False
+        return start == self._start_time_reader(pid)
+
     def owner_is_live(self) -> bool:
         """True iff the pidfile names a live process with a matching start-time."""
         data = self.read_pidfile()
         if not data:
             return False
-        pid = data["pid"]
-        if not self.is_alive(pid):
+        return self.is_live(data["pid"], data.get("start"))
+
+    def claimant(self, pid: Optional[int] = None) -> str:
+        """This process's queue-claimant name: ``<pid>.<start>``."""
+        if pid is None:
+            pid = os.getpid()
+        return f"{pid}.{self._start_time_reader(pid)}"
+
+    def claimant_is_live(self, name: str) -> bool:
+        """True iff the process a ``claimant`` name was minted for still runs."""
+        pid, _, start = name.partition(".")
+        try:
+            return self.is_live(int(pid), None if start == "None" else start)
+        except ValueError:
             return False
-        return data.get("start") == self._start_time_reader(pid)
 
     def _exclusive_write(self, pid: int, start: Optional[str]) -> bool:
         """Create the pidfile with O_CREAT|O_EXCL; False if it already exists."""
@@ -132,3 +155,13 @@ class WorkerProc:
         if self.owner_is_live():
             return self.read_pidfile()["pid"]
         return self.spawn_detached(argv)
+
+
+def ensure_workers(
+    root: str | os.PathLike, argv_for_slot: Callable[[int], List[str]], wanted: int
+) -> List[int]:
+    """Make sure slots ``0..wanted-1`` each have a live worker; return their pids."""
+    return [
+        WorkerProc(root, slot=slot).ensure_worker(argv_for_slot(slot))
+        for slot in range(max(1, wanted))
+    ]
@@ -0,0 +1,180 @@
+"""In-process index of ``<!-- ref:KEY -->`` blocks — replacing a ref-lookup.sh spawn per key.
+
+`_build_refs_block` used to fork ``ref-lookup.sh`` once per key, and every fork grepped every
+``*.md`` under the root: a call with six refs ran six bash pipelines over the whole docs tree,
+and the oficina worker did it again for every run. This module parses the markers once per
+root and remembers, per key, the file and byte span of its block:
+
+- **Invalidation** is per file, by ``(mtime_ns, size)``. A lookup re-stats the tree (at most
+  once per ``_RESTAT_S``, so a gather of N keys walks it once) and re-parses only the files
+  that changed; deleted files drop out. Block text is read from disk by span on demand, so
+  the index holds offsets, not documents.
+- **Same answers as the script.** A block runs from its opening marker's line through its
+  closing marker's line (to end of file if unclosed). When a key appears in several files the
+  first by path wins. ``list`` prints the sorted keys, ``paths`` prints ``KEY<TAB>relpath``
+  for each key's first occurrence outside ``.claude/local/`` whose marker is the whole line
+  (an inline mention in prose is resolvable but not a block's home), and a trailing ``*``
+  selects every key with that prefix, printed in key order and separated by a blank line.
+
+The script stays as the fallback (`server._ref_lookup_script`): an explicit
+``OFICINA_REF_LOOKUP`` or ``OLLAMA_REF_INDEX=false`` routes lookups back through it.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_OPEN = re.compile(rb"<!-- ref:([a-z0-9-]+) -->")
+# Entries under here are personal notes: resolvable, but never advertised by ``paths``.
+_LOCAL = f"{os.sep}.claude{os.sep}local{os.sep}"
+_RESTAT_S = 1.0
+
+
+class RefNotFoundError(LookupError):
+    """No block matched the key (or pattern); the message is the script's own wording."""
+
+
+@dataclass(frozen=True)
+class RefSpan:
+    """Where one key's block lives: a byte range of one file."""
+
+    key: str
+    path: Path
+    start: int
+    end: int
+    standalone: bool  # the opening marker is its line's only content (what ``paths`` needs)
+
+
+def _parse(path: Path, data: bytes) -> List[RefSpan]:
+    spans = []
+    for match in _OPEN.finditer(data):
+        key = match.group(1)
+        start = data.rfind(b"\n", 0, match.start()) + 1
+        line_end = data.find(b"\n", match.end())
+        standalone = start == match.start() and match.end() == (
+            len(data) if line_end < 0 else line_end
+        )
+        close = data.find(b"<!-- /ref:" + key + b" -->", match.end())
+        if close < 0:
+            end = len(data)
+        else:
+            newline = data.find(b"\n", close)
+            end = len(data) if newline < 0 else newline
+        spans.append(RefSpan(key.decode(), path, start, end, standalone))
+    return spans
+
+
+class RefIndex:
+    """Every ref block under one root, kept current by file mtime and size."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self._files: Dict[Path, Tuple[int, int, List[RefSpan]]] = {}
+        self._by_key: Dict[str, List[RefSpan]] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _walk(self) -> List[Path]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            found.extend(Path(dirpath) / f for f in filenames if f.endswith(".md"))
+        return found
+
+    def refresh(self, *, force: bool = False) -> None:
+        """Re-stat the tree and re-parse what changed (throttled unless ``force``)."""
+        with self._lock:
+            if not force and time.monotonic() - self._checked < _RESTAT_S:
+                return
+            if not self.root.is_dir():
+                raise RefNotFoundError(f"--root directory not found: {self.root}")
+            files: Dict[Path, Tuple[int, int, List[RefSpan]]] = {}
+            changed = False
+            for path in self._walk():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                known = self._files.get(path)
+                if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+                    files[path] = known
+                    continue
+                try:
+                    spans = _parse(path, path.read_bytes())
+                except OSError:
+                    continue
+                files[path] = (st.st_mtime_ns, st.st_size, spans)
+                changed = True
+            if changed or files.keys() != self._files.keys():
+                by_key: Dict[str, List[RefSpan]] = {}
+                for path in sorted(files):
+                    for span in files[path][2]:
+                        by_key.setdefault(span.key, []).append(span)
+                self._by_key = by_key
+            self._files = files
+            self._checked = time.monotonic()
+
+    def keys(self) -> List[str]:
+        self.refresh()
+        return sorted(self._by_key)
+
+    def span(self, key: str) -> Optional[RefSpan]:
+        self.refresh()
+        spans = self._by_key.get(key)
+        return spans[0] if spans else None
+
+    def paths(self) -> List[Tuple[str, str]]:
+        """``(key, relpath)`` of each key's first whole-line marker outside .claude/local/."""
+        self.refresh()
+        rows = []
+        for key in sorted(self._by_key):
+            for span in self._by_key[key]:
+                if span.standalone and _LOCAL not in str(span.path):
+                    rows.append((key, str(span.path.relative_to(self.root))))
+                    break
+        return rows
+
+    def read(self, span: RefSpan) -> str:
+        with open(span.path, "rb") as f:
+            f.seek(span.start)
+            return f.read(span.end - span.start).decode("utf-8", errors="replace")
+
+    def lookup(self, key: str) -> str:
+        """The block for ``key``, or every block matching a ``prefix*`` pattern."""
+        if "*" in key:
+            pattern = re.compile("^" + ".*".join(map(re.escape, key.split("*"))) + "$")
+            matches = [k for k in self.keys() if pattern.match(k)]
+            if not matches:
+                raise RefNotFoundError(f"No ref keys matching pattern: {key}")
+            return "\n\n".join(self.read(self._by_key[k][0]) for k in matches)
+        span = self.span(key)
+        if span is None:
+            raise RefNotFoundError(f"ref:{key} not found in any *.md file under {self.root}")
+        return self.read(span)
+
+    def query(self, key: str) -> str:
+        """ref-lookup.sh's interface: ``list``/``--list``, ``paths``/``--paths``, or a key."""
+        if key in ("list", "--list"):
+            return "\n".join(self.keys())
+        if key in ("paths", "--paths"):
+            return "\n".join(f"{k}\t{p}" for k, p in self.paths())
+        return self.lookup(key).strip()
+
+
+_INDEXES: Dict[str, RefIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_for(root: str | Path) -> RefIndex:
+    """The process-wide index for ``root`` (one per resolved path, built on first use)."""
+    key = os.path.realpath(root)
+    with _INDEXES_LOCK:
+        if key not in _INDEXES:
+            _INDEXES[key] = RefIndex(key)
+        return _INDEXES[key]
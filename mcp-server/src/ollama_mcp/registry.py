@@ -1,20 +1,43 @@
-"""Persona registry: load, cache, query, and build language routes.
+"""Persona registry: load, cache, index, query, and build language routes.
 
 The persona registry (personas/registry.yaml) is the source of truth for all
-Ollama personas. This module loads it once at server startup and provides:
+Ollama personas. This module loads it on first use — not at server start-up, which
+would put a YAML import and parse in front of every bridge's first response — and
+provides:
 
 - query_personas(): filter/search personas by language, domain, tier, or name
 - get_language_routes(): mapping of programming language → best persona name,
   used by generate_code for automatic persona selection
+
+Every read checks the YAML's mtime and size (one stat) and rebuilds when they
+changed, so a persona added by another session or an edit by hand shows up
+without a restart. A rebuild reads the compiled cache next to the YAML
+(registry.compiled.json, shared with personas/lib/registry.py — same format,
+same COMPILED_VERSION) and only parses the YAML when the cache is stale, then
+rewrites it. From the entries it builds a _RegistryIndex: token → persona
+postings for roles and names plus per-tier and per-language maps, so a query
+intersects small sets instead of scanning every entry.
 """
 
 from __future__ import annotations
 
+import json
+import os
 import re
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
+from ollama_mcp.config import REGISTRY_PATH
+
+COMPILED_NAME = "registry.compiled.json"
+COMPILED_VERSION = 1
+
+# A run of letters/digits. A query made only of these can only match inside one
+# token, so substring search over the token vocabulary finds exactly what a
+# substring search over the whole string would.
+_TOKEN = re.compile(r"[^\W_]+")
 
 # ---------------------------------------------------------------------------
 # Module-level cache (populated by load_registry, read by everything else)
@@ -22,6 +45,10 @@ import yaml
 
 _registry: dict[str, dict[str, Any]] = {}
 _language_routes: dict[str, str] = {}
+_index: _RegistryIndex | None = None
+_loaded = False
+_stamp: tuple[int, int] | None = None  # (mtime_ns, size) of the YAML last loaded
+_load_lock = threading.Lock()
 
 # ---------------------------------------------------------------------------
 # Language keywords to scan for in persona role strings
@@ -58,11 +85,58 @@ _LANGUAGE_ALIASES: dict[str, str] = {
 }
 
 
+def _stat(path: str | Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_compiled(path: str | Path, stamp: tuple[int, int]) -> dict[str, dict[str, Any]] | None:
+    """The compiled cache's entries if it was built from this exact YAML, else None."""
+    try:
+        with open(Path(path).with_name(COMPILED_NAME)) as f:
+            data = json.load(f)
+        if (
+            data.get("version") == COMPILED_VERSION
+            and (data.get("mtime_ns"), data.get("size")) == stamp
+        ):
+            return data["entries"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None
+
+
+def _write_compiled(
+    path: str | Path, stamp: tuple[int, int], entries: dict[str, dict[str, Any]]
+) -> None:
+    """Write the compiled cache atomically. A read-only checkout just goes without."""
+    target = Path(path).with_name(COMPILED_NAME)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    payload = {
+        "version": COMPILED_VERSION,
+        "mtime_ns": stamp[0],
+        "size": stamp[1],
+        "entries": entries,
+    }
+    try:
+        with open(tmp, "w") as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp, target)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
 def load_registry(path: str | Path) -> dict[str, dict[str, Any]]:
-    """Load the persona registry YAML and cache it.
+    """Load the persona registry and cache it, with its index and language routes.
 
-    Called once during server startup (_lifespan). Populates both the
-    _registry cache and the _language_routes cache.
+    Called on first use and whenever the file changes (ensure_loaded), and after
+    create_persona. Reads the compiled cache when it matches the YAML, else
+    parses the YAML and rewrites the cache.
 
     Args:
         path: Absolute path to registry.yaml.
@@ -74,73 +148,183 @@ def load_registry(path: str | Path) -> dict[str, dict[str, Any]]:
         FileNotFoundError: If the registry file doesn't exist.
         yaml.YAMLError: If the file isn't valid YAML.
     """
-    global _registry, _language_routes
+    global _registry, _language_routes, _index, _loaded, _stamp
+    stamp = _stat(path)
+    if stamp is None:
+        raise FileNotFoundError(f"Persona registry not found: {path}")
+
+    entries = _read_compiled(path, stamp)
+    if entries is None:
+        import yaml
+
+        with open(path, "r") as f:
+            raw = yaml.safe_load(f)
+
+        # Filter out None/non-dict entries (comments-only sections parse as None)
+        entries = {
+            k: v for k, v in (raw or {}).items()
+            if isinstance(v, dict)
+        }
+        _write_compiled(path, stamp, entries)
+
+    index = _RegistryIndex.build(entries)
+    _registry = entries
+    _index = index
+    _language_routes = _build_language_routes(entries, index)
+    _stamp = stamp
+    _loaded = True
+    return _registry
 
-    with open(path, "r") as f:
-        raw = yaml.safe_load(f)
 
-    # Filter out None/non-dict entries (comments-only sections parse as None)
-    _registry = {
-        k: v for k, v in (raw or {}).items()
-        if isinstance(v, dict)
-    }
+def ensure_loaded() -> dict[str, dict[str, Any]]:
+    """The registry, (re)loaded from REGISTRY_PATH whenever the file has changed.
 
-    _language_routes = _build_language_routes(_registry)
+    The first load raises as load_registry does. After that a failed reload (say,
+    a half-saved edit) also raises, but the previous registry stays cached and
+    the same file is not retried until it changes again. A registry file that
+    has gone missing keeps the cached copy.
+    """
+    global _loaded, _stamp
+    if not REGISTRY_PATH:
+        _loaded = True
+        return _registry
+    stamp = _stat(REGISTRY_PATH)
+    if _loaded and (stamp is None or stamp == _stamp):
+        return _registry
+    with _load_lock:
+        stamp = _stat(REGISTRY_PATH)
+        if not _loaded or (stamp is not None and stamp != _stamp):
+            _loaded = True
+            _stamp = stamp
+            load_registry(REGISTRY_PATH)
     return _registry
 
 
 def get_registry() -> dict[str, dict[str, Any]]:
-    """Return the cached registry (empty dict if not loaded)."""
-    return _registry
+    """Return the cached registry, loading it on first use (empty dict if unavailable)."""
+    try:
+        return ensure_loaded()
+    except Exception:
+        return _registry
 
 
 def get_language_routes() -> dict[str, str]:
     """Return the cached language → persona routing table."""
+    get_registry()
     return _language_routes
 
 
+def _get_index() -> _RegistryIndex:
+    get_registry()
+    if _index is None or _index.source is not _registry:
+        # _registry was replaced without load_registry (tests do this) — index it.
+        return _RegistryIndex.build(_registry)
+    return _index
+
+
+# ---------------------------------------------------------------------------
+# Compiled index
+# ---------------------------------------------------------------------------
+
+def _postings(texts: dict[str, str]) -> dict[str, set[str]]:
+    postings: dict[str, set[str]] = {}
+    for persona_name, text in texts.items():
+        for token in _TOKEN.findall(text):
+            postings.setdefault(token, set()).add(persona_name)
+    return postings
+
+
+@dataclass
+class _RegistryIndex:
+    """Everything query_personas and the language routes need, built once per load.
+
+    Only active personas are indexed; ``active`` keeps registry order so results
+    come back in the order the YAML lists them.
+    """
+
+    source: dict[str, dict[str, Any]]
+    active: list[str] = field(default_factory=list)
+    roles: dict[str, str] = field(default_factory=dict)    # persona → lowercased role
+    names: dict[str, str] = field(default_factory=dict)    # persona → lowercased name
+    role_postings: dict[str, set[str]] = field(default_factory=dict)
+    name_postings: dict[str, set[str]] = field(default_factory=dict)
+    by_tier: dict[str, set[str]] = field(default_factory=dict)
+    # canonical language → [(persona, matched in its name)], registry order
+    by_language: dict[str, list[tuple[str, bool]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, registry: dict[str, dict[str, Any]]) -> _RegistryIndex:
+        index = cls(source=registry)
+        for persona_name, attrs in registry.items():
+            if attrs.get("status") != "active":
+                continue
+            role = (attrs.get("role") or "").lower()
+            name_lower = persona_name.lower()
+            index.active.append(persona_name)
+            index.roles[persona_name] = role
+            index.names[persona_name] = name_lower
+            index.by_tier.setdefault(attrs.get("tier"), set()).add(persona_name)
+
+            langs: dict[str, bool] = {}
+            for keyword, lang in _LANGUAGE_KEYWORDS.items():
+                matched_in_name = keyword.strip(" -") in name_lower
+                if matched_in_name or keyword in role:
+                    langs[lang] = langs.get(lang, False) or matched_in_name
+            for lang, specialist in langs.items():
+                index.by_language.setdefault(lang, []).append((persona_name, specialist))
+        index.role_postings = _postings(index.roles)
+        index.name_postings = _postings(index.names)
+        return index
+
+    def containing(self, query: str, *, roles: bool, names: bool) -> set[str]:
+        """Active personas whose role and/or name contains ``query`` (case-insensitive)."""
+        q = query.lower()
+        found: set[str] = set()
+        if _TOKEN.fullmatch(q):
+            for wanted, postings in ((roles, self.role_postings), (names, self.name_postings)):
+                if wanted:
+                    for token, personas in postings.items():
+                        if q in token:
+                            found |= personas
+            return found
+        # Spaces or punctuation in the query — match against the whole strings.
+        for wanted, texts in ((roles, self.roles), (names, self.names)):
+            if wanted:
+                found.update(p for p, text in texts.items() if q in text)
+        return found
+
+
 # ---------------------------------------------------------------------------
 # Language route builder
 # ---------------------------------------------------------------------------
 
-def _build_language_routes(registry: dict[str, dict[str, Any]]) -> dict[str, str]:
-    """Scan active full-tier personas and build language → persona mapping.
+def _build_language_routes(
+    registry: dict[str, dict[str, Any]], index: _RegistryIndex | None = None
+) -> dict[str, str]:
+    """Pick the best active full-tier persona for each language in the index.
 
     Algorithm:
-    1. For each active, full-tier persona, scan its role string and name
-       for language keywords.
-    2. If multiple personas match the same language, prefer the one whose
-       *name* contains the language (specialist) over one that only mentions
-       it in the role (generalist/polyglot).
+    1. The index lists, per language, every active persona whose role string
+       or name contains one of that language's keywords.
+    2. If multiple full-tier personas match the same language, prefer the one
+       whose *name* contains the language (specialist) over one that only
+       mentions it in the role (generalist/polyglot).
 
     Returns:
         Dict mapping canonical language name to persona name, e.g.
         {"java": "my-java-q3", "python": "my-python-q3", ...}
     """
+    if index is None:
+        index = _RegistryIndex.build(registry)
     routes: dict[str, str] = {}
     # Track whether current winner is a "name match" (specialist) so we
     # know if a new candidate can override it.
     is_specialist: dict[str, bool] = {}
 
-    for persona_name, attrs in registry.items():
-        if attrs.get("status") != "active":
-            continue
-        if attrs.get("tier") != "full":
-            continue
-
-        role = (attrs.get("role") or "").lower()
-        name_lower = persona_name.lower()
-
-        for keyword, lang in _LANGUAGE_KEYWORDS.items():
-            # Check if this persona matches this language keyword
-            matched_in_role = keyword in role
-            matched_in_name = keyword.strip(" -") in name_lower
-
-            if not (matched_in_role or matched_in_name):
+    for lang, candidates in index.by_language.items():
+        for persona_name, candidate_is_specialist in candidates:
+            if registry[persona_name].get("tier") != "full":
                 continue
-
-            candidate_is_specialist = matched_in_name
-
             if lang not in routes:
                 # First match — take it
                 routes[lang] = persona_name
@@ -182,26 +366,20 @@ def query_personas(
     Returns:
         List of dicts, each with "persona_name" key plus all registry attrs.
     """
-    results: list[dict[str, Any]] = []
-
-    for persona_name, attrs in _registry.items():
-        # Only include active personas by default
-        if attrs.get("status") != "active":
-            continue
-
-        role_lower = (attrs.get("role") or "").lower()
-        name_lower = persona_name.lower()
-
-        # Apply filters (AND logic)
-        if language and language.lower() not in role_lower and language.lower() not in name_lower:
-            continue
-        if domain and domain.lower() not in role_lower:
-            continue
-        if tier and attrs.get("tier") != tier:
-            continue
-        if name and name.lower() not in name_lower:
-            continue
-
-        results.append({"persona_name": persona_name, **attrs})
-
-    return results
+    index = _get_index()
+    # Only active personas are indexed, so they are the only ones returned
+    selected: set[str] | None = None
+    for matched in (
+        index.containing(language, roles=True, names=True) if language else None,
+        index.containing(domain, roles=True, names=False) if domain else None,
+        index.by_tier.get(tier, set()) if tier else None,
+        index.containing(name, roles=False, names=True) if name else None,
+    ):
+        if matched is not None:
+            selected = matched if selected is None else selected & matched
+
+    return [
+        {"persona_name": persona_name, **index.source[persona_name]}
+        for persona_name in index.active
+        if selected is None or persona_name in selected
+    ]
@@ -0,0 +1,206 @@
+"""VRAM residency — which models stay loaded, which make room, and for how long.
+
+`warm_model` used to unload EVERY running model before loading its target, and hardcoded
+``keep_alive: "5m"`` while `chat` asked for ``"15m"``. Alternating a coder persona with the
+judge therefore paid a full swap each way even when both fit on the card together. This
+module owns that decision instead:
+
+- **Footprints.** A model's VRAM cost is learned from ``/api/ps`` ``size_vram`` whenever it is
+  seen loaded; before that it is estimated from its weights (``/api/tags`` ``size``) times
+  ``VRAM_OVERHEAD`` for the KV cache and runtime buffers. A model with neither is assumed to
+  need the whole card — the old evict-everything behaviour, now only as the unknown case.
+- **Capacity** is ``VRAM_MB`` less ``VRAM_RESERVE_MB`` (display, CUDA context).
+- **Eviction is minimal and LRU.** Only as much as the target needs is unloaded, least
+  recently used first. "Recently" is Ollama's ``expires_at``: every call resets it to
+  now + keep_alive, and with one keep-alive policy for all callers (`keep_alive_for`) the
+  earliest expiry is the least recently used — across every process, not just this one.
+- **Pins.** A model with work in flight in this bridge (`OllamaClient.is_busy`) or active or
+  queued at the model-call gate (any session, T-88) is never evicted; if the target only
+  fits by evicting a pinned model, `plan` says so and the caller refuses (or forces).
+
+`plan` is pure — everything it decides from is passed in — so the policy is testable without
+an Ollama; `ResidencyManager` gathers those inputs and acts on the plan.
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from ollama_mcp import debug_log, gate
+from ollama_mcp.config import KEEP_ALIVE, VRAM_MB, VRAM_OVERHEAD, VRAM_RESERVE_MB
+
+_MB = 1024 * 1024
+
+# name → size_vram last observed in /api/ps. Per process; a fresh bridge starts from the
+# /api/tags estimate and corrects itself the first time it sees each model loaded.
+_FOOTPRINTS: Dict[str, int] = {}
+
+
+def canonical(name: str) -> str:
+    """``my-coder-q3`` and ``my-coder-q3:latest`` are the same model."""
+    return name if ":" in name else f"{name}:latest"
+
+
+def matches(loaded: str, requested: str) -> bool:
+    """Whether a loaded ``model:tag`` is the requested model (bare names match any tag)."""
+    return canonical(loaded) == canonical(requested) or (
+        ":" not in requested and loaded.split(":")[0] == requested
+    )
+
+
+def keep_alive_for(model: str) -> str:
+    """How long Ollama should keep ``model`` loaded after a call.
+
+    One value for every caller on purpose: `plan` reads LRU order off ``expires_at``,
+    which is only meaningful while every use of every model extends it by the same amount.
+    """
+    return KEEP_ALIVE
+
+
+def capacity_bytes() -> int:
+    return int((VRAM_MB - VRAM_RESERVE_MB) * _MB)
+
+
+def learn(running: Iterable[Dict[str, Any]]) -> None:
+    """Record the real footprint of every model currently loaded."""
+    for m in running:
+        if m.get("name") and m.get("size_vram"):
+            _FOOTPRINTS[canonical(m["name"])] = int(m["size_vram"])
+
+
+def footprint(model: str, tags: Iterable[Dict[str, Any]] = ()) -> Optional[int]:
+    """``model``'s VRAM cost in bytes: observed if ever seen loaded, else estimated, else None."""
+    key = canonical(model)
+    if key in _FOOTPRINTS:
+        return _FOOTPRINTS[key]
+    for m in tags:
+        if canonical(m.get("name", "")) == key and m.get("size"):
+            return int(m["size"] * VRAM_OVERHEAD)
+    return None
+
+
+def _expiry(m: Dict[str, Any]) -> float:
+    """``expires_at`` as epoch seconds (Ollama sends nanosecond fractions Python won't parse)."""
+    raw = m.get("expires_at") or ""
+    raw = re.sub(r"(\.\d{6})\d+", r"\1", raw).replace("Z", "+00:00")
+    try:
+        return datetime.datetime.fromisoformat(raw).timestamp()
+    except ValueError:
+        return float("inf")  # unknown: treat as most recently used, evict it last
+
+
+@dataclass
+class Plan:
+    """What it takes to make ``target`` resident."""
+
+    target: str
+    need_bytes: Optional[int]
+    free_bytes: int
+    already_loaded: bool = False
+    evict: List[str] = field(default_factory=list)
+    # Pinned models that would ALSO have to go for the target to fit. Empty when it fits.
+    blocked_by: List[str] = field(default_factory=list)
+
+    @property
+    def fits(self) -> bool:
+        return not self.blocked_by
+
+
+def plan(
+    target: str,
+    running: List[Dict[str, Any]],
+    *,
+    need_bytes: Optional[int],
+    pinned: Iterable[str],
+    capacity: int,
+) -> Plan:
+    """Decide the minimal LRU eviction that makes room for ``target``.
+
+    ``need_bytes=None`` (footprint unknown) is planned as the whole card.
+    """
+    pinned_set = {canonical(p) for p in pinned}
+    loaded = {canonical(m.get("name", "")): m for m in running}
+    used = sum(int(m.get("size_vram") or m.get("size") or 0) for m in running)
+    result = Plan(target=target, need_bytes=need_bytes, free_bytes=max(0, capacity - used))
+    if any(matches(name, target) for name in loaded):
+        result.already_loaded = True
+        return result
+
+    need = capacity if need_bytes is None else need_bytes
+    free = result.free_bytes
+    for name, m in sorted(loaded.items(), key=lambda item: _expiry(item[1])):
+        if free >= need:
+            break
+        size = int(m.get("size_vram") or m.get("size") or 0)
+        if name in pinned_set:
+            result.blocked_by.append(m.get("name", name))
+            continue
+        result.evict.append(m.get("name", name))
+        free += size
+    if free >= need:
+        result.blocked_by = []
+    return result
+
+
+class ResidencyManager:
+    """Gathers a plan's inputs from Ollama and the gate, and carries the plan out."""
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    async def pinned(self, running: List[Dict[str, Any]]) -> List[str]:
+        """Loaded models with work in flight here, or active/queued at the gate."""
+        status = await gate.status() or {}
+        at_gate = {canonical(n) for n in (*status.get("active", {}), *status.get("queued", {}))}
+        pinned = []
+        for m in running:
+            name = m.get("name", "")
+            if self._client.is_busy(name) or self._client.is_busy(name.split(":")[0]):
+                pinned.append(name)
+            elif canonical(name) in at_gate:
+                pinned.append(name)
+        return pinned
+
+    async def plan_for(self, model: str, *, force: bool = False) -> Plan:
+        """The plan for ``model`` against what is loaded now (``force`` ignores pins)."""
+        running = await self._client.list_running()
+        learn(running)
+        need = footprint(model)
+        if need is None:
+            need = footprint(model, await self._client.list_models())
+        pins = [] if force else await self.pinned(running)
+        return plan(model, running, need_bytes=need, pinned=pins, capacity=capacity_bytes())
+
+    async def make_resident(self, model: str, result: Plan) -> List[str]:
+        """Evict what the plan says, then load ``model``. Returns the evicted names."""
+        evicted = []
+        for name in result.evict:
+            await self._client.unload_model(name)
+            evicted.append(name)
+        debug_log.info(
+            "residency_load",
+            model=model,
+            need_mb=None if result.need_bytes is None else round(result.need_bytes / _MB),
+            free_mb=round(result.free_bytes / _MB),
+            evicted=evicted,
+        )
+        resp = await self._client._http.post(
+            "/api/chat",
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": "."}],
+                "stream": False,
+                "keep_alive": keep_alive_for(model),
+                "options": {"num_predict": 1},
+            },
+            timeout=120,  # Cold load can take a while on 12GB GPU
+        )
+        resp.raise_for_status()
+        try:
+            learn(await self._client.list_running())
+        except Exception:  # noqa: BLE001 — the load succeeded; learning is a bonus
+            pass
+        return evicted
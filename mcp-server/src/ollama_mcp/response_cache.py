@@ -0,0 +1,231 @@
+"""Content-addressed cache of Ollama chat replies (opt-in, under `OllamaClient.chat`).
+
+A good share of our calls repeat exactly: `classify_text` with the same categories over the
+same text, `summarize` on a doc that has not changed, benchmark reruns at temperature 0. Each
+one costs a full GPU generation for an answer we already have. With the cache on, `chat`
+looks the call up before it reaches the gate, and a hit comes back without touching Ollama.
+
+**The key is everything that decides the reply** — the model's DIGEST (not its name: a persona
+rebuilt with ``ollama create`` keeps its name and gets a new digest, so stale replies simply
+stop matching), system, prompt, format schema, think, and the sampling options. ``keep_alive``
+and the timeout are excluded; they change when, never what. A model whose digest cannot be
+resolved is not cached at all — a name-keyed entry would outlive the model it came from.
+
+**Two tiers.** An in-memory LRU (per process) in front of a disk tier shared by every bridge
+and the oficina worker: one JSON file per key under ``RESPONSE_CACHE_DIR``, expired after
+``RESPONSE_CACHE_TTL_S`` and evicted oldest-first once the directory passes
+``RESPONSE_CACHE_MB``. A disk hit is promoted into memory.
+
+**A hit is still a call.** It returns a `ChatResponse` with ``cached=True`` and a NEW
+``call_id``, and it is logged to calls.jsonl like any call (with ``cached: true``), so a
+verdict given on a cached answer still joins to a record of its own. Latency readers should
+skip ``cached`` records: their eval figures are the original generation's.
+
+Off by default (``OLLAMA_RESPONSE_CACHE=off``); a caller can force it either way per call
+with ``chat(..., cache=True|False)``. Every failure here is a miss, never an error.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ollama_mcp.config import (
+    RESPONSE_CACHE,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_MB,
+    RESPONSE_CACHE_MEM_ENTRIES,
+    RESPONSE_CACHE_TTL_S,
+)
+
+# The ChatResponse fields a cached entry carries. Identity, gate and stream fields are
+# per-call and deliberately left out — a hit gets its own.
+_STORED_FIELDS = (
+    "content",
+    "model",
+    "prompt_eval_count",
+    "eval_count",
+    "eval_duration_ms",
+    "total_duration_ms",
+    "prompt_eval_duration_ms",
+)
+
+
+def cache_key(digest: str, payload: Dict[str, Any]) -> str:
+    """The content address of a /api/chat request against the model with ``digest``."""
+    messages = payload.get("messages", [])
+    material = {
+        "digest": digest,
+        "system": next((m["content"] for m in messages if m["role"] == "system"), None),
+        "prompt": next((m["content"] for m in messages if m["role"] == "user"), None),
+        "format": payload.get("format"),
+        "think": payload.get("think"),
+        "options": payload.get("options", {}),
+    }
+    blob = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        rate = round(self.hits / total, 3) if total else 0.0
+        return {**asdict(self), "hits": self.hits, "hit_rate": rate}
+
+
+class ResponseCache:
+    """Memory LRU over a TTL'd, size-bounded directory of JSON entries."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike = RESPONSE_CACHE_DIR,
+        *,
+        enabled: bool = RESPONSE_CACHE == "on",
+        memory_entries: int = RESPONSE_CACHE_MEM_ENTRIES,
+        ttl_s: float = RESPONSE_CACHE_TTL_S,
+        max_bytes: int = int(RESPONSE_CACHE_MB * 1024 * 1024),
+    ) -> None:
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self._memory: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+        self._memory_entries = memory_entries
+        self._ttl_s = ttl_s
+        self._max_bytes = max_bytes
+        self._disk_bytes: Optional[int] = None  # measured on the first store
+        self.stats = CacheStats()
+        # get/put run on worker threads (see the client), so the LRU and counters are guarded.
+        self._lock = threading.RLock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self._ttl_s
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_entries:
+                self._memory.popitem(last=False)
+
+    # The disk halves are plain blocking functions; the client runs them off the loop.
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The stored reply fields for ``key``, or None (counted as a miss)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._fresh(entry):
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return entry["response"]
+            self._memory.pop(key, None)
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+            if self._fresh(entry):
+                self._remember(key, entry)
+                with self._lock:
+                    self.stats.disk_hits += 1
+                return entry["response"]
+            self._path(key).unlink(missing_ok=True)
+        except Exception:
+            pass
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def put(self, key: str, response: Any) -> None:
+        """Store the reply fields of ``response`` (a ChatResponse) under ``key``."""
+        entry = {
+            "stored_at": time.time(),
+            "response": {name: getattr(response, name) for name in _STORED_FIELDS},
+        }
+        self._remember(key, entry)
+        try:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            data = json.dumps(entry, ensure_ascii=False)
+            tmp.write_text(data, encoding="utf-8")
+            os.replace(tmp, path)
+            with self._lock:
+                self.stats.stores += 1
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_bytes()
+                else:
+                    self._disk_bytes += len(data.encode())
+                if self._disk_bytes > self._max_bytes:
+                    self._evict()
+        except Exception:
+            pass
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        found = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((st.st_mtime, st.st_size, path))
+        return found
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest, until the tier is under 90% of its bound.
+
+        The directory is shared with other processes, so the size is re-measured here
+        rather than trusted from this process's running total.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self._max_bytes * 0.9)
+        cutoff = time.time() - self._ttl_s
+        for mtime, size, path in entries:
+            if total <= target and mtime >= cutoff:
+                break
+            path.unlink(missing_ok=True)
+            self._memory.pop(path.stem, None)
+            total -= size
+            self.stats.evictions += 1
+        self._disk_bytes = total
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus tier sizes, for the ``cache_stats`` tool."""
+        return {
+            "enabled": self.enabled,
+            **self.stats.as_dict(),
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes if self._disk_bytes is not None else self._scan_bytes(),
+            "directory": str(self.directory),
+        }
+
+
+_CACHE: Optional[ResponseCache] = None
+
+
+def get_cache() -> ResponseCache:
+    """The process-wide cache (built from config on first use)."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ResponseCache()
+    return _CACHE
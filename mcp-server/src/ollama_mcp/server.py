@@ -16,21 +16,49 @@ import asyncio
 import json
 import os
 import pathlib
+import shutil
 import sys
 import time
 from contextlib import asynccontextmanager
 from typing import Any, AsyncIterator, Callable
 
-from mcp.server.fastmcp import FastMCP
+import httpx
+from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel
 
-from ollama_mcp.client import OllamaClient, OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError
-from ollama_mcp.config import DEFAULT_MODEL, MODELS, REGISTRY_PATH, REPO_ROOT, TEMPS, repo_root
+from ollama_mcp.client import (
+    ChatResponse,
+    OllamaClient,
+    OllamaConnectionError,
+    OllamaModelNotFoundError,
+    OllamaStreamError,
+    OllamaTimeoutError,
+)
+from ollama_mcp.config import (
+    DEFAULT_MODEL,
+    EMBED_MARGIN,
+    EMBED_MODEL,
+    GATE_SLOTS_PER_MODEL,
+    MODELS,
+    REF_INDEX,
+    REGISTRY_PATH,
+    REPO_ROOT,
+    TEMPS,
+    repo_root,
+)
+from ollama_mcp import calllog
 from ollama_mcp import debug_log
+from ollama_mcp import embedindex
+from ollama_mcp import filecache
+from ollama_mcp import gate
+from ollama_mcp import mapreduce
+from ollama_mcp import metrics
+from ollama_mcp import refindex
 from ollama_mcp import registry
-from ollama_mcp.oficina import config as oficina_config
-from ollama_mcp.oficina import service as oficina_service
-from ollama_mcp.oficina.store import UnknownRunError
+from ollama_mcp import residency
+from ollama_mcp import response_cache
+from ollama_mcp import tokens
+from ollama_mcp import transmem
 
 # ---------------------------------------------------------------------------
 # context_files support
@@ -70,23 +98,21 @@ def _build_context_block(context_files: list[ContextFile]) -> str:
         if not p.is_file():
             return f"Error: context_files path is not a file: {cf.path!r}"
 
+        # Served from the process-wide cache: one stat when unchanged, and a slice
+        # decodes only its own lines (filecache.py).
         try:
-            lines = p.read_text(encoding="utf-8", errors="replace").splitlines()
+            content, n = filecache.get_cache().read_lines(p, cf.start_line, cf.end_line)
         except OSError as e:
             return f"Error: cannot read {cf.path!r}: {e}"
 
-        # Apply line slice (1-based, inclusive → 0-based slice)
         if cf.start_line is not None or cf.end_line is not None:
             start = max(0, (cf.start_line or 1) - 1)
-            end = cf.end_line if cf.end_line is not None else len(lines)
-            lines = lines[start:end]
-            label = f"{cf.path} (lines {cf.start_line or 1}–{cf.end_line or len(lines) + start})"
+            label = f"{cf.path} (lines {cf.start_line or 1}–{cf.end_line or n + start})"
         else:
             label = cf.path
 
         # Infer language hint from extension for the fenced block
         suffix = p.suffix.lstrip(".") or "text"
-        content = "\n".join(lines)
         sections.append(f"### {label}\n```{suffix}\n{content}\n```")
 
     return "<context>\n" + "\n\n".join(sections) + "\n</context>"
@@ -159,14 +185,37 @@ async def _run_script(
         return f"Error running {label}: {e}"
 
 
+def _ref_index_enabled() -> bool:
+    """Whether refs resolve in-process (`refindex`) rather than through ref-lookup.sh.
+
+    An explicit ``OFICINA_REF_LOOKUP`` script is a deliberate override, so it still wins;
+    read at call time for the same reason `_ref_lookup_script` is (T-96).
+    """
+    return REF_INDEX and not os.environ.get("OFICINA_REF_LOOKUP")
+
+
+async def _query_ref_index(key: str, root: str) -> str:
+    """``key`` against the in-process index for ``root``, off the event loop.
+
+    Raises `refindex.RefNotFoundError` with the script's wording when nothing matches.
+    """
+    return await asyncio.to_thread(lambda: refindex.index_for(root).query(key))
+
+
 async def _resolve_ref_key(key: str, root: str | None) -> str:
-    """Run ref-lookup.sh for a single key. Return stdout or an Error: string.
+    """Resolve a single ref key. Return its block or an Error: string.
 
-    root is forwarded as --root only when not None (matches ref_lookup tool
-    behaviour — lets the script handle its own default when omitted).
-    Expected to be called against small ref folders; the script has no
-    internal timeout, so keep ref roots compact.
+    Uses the in-process index unless `_ref_index_enabled` says otherwise; then runs
+    ref-lookup.sh, with root forwarded as --root only when not None (matches ref_lookup
+    tool behaviour — lets the script handle its own default when omitted). Either way an
+    omitted root means the repo's own docs.
     """
+    if _ref_index_enabled():
+        try:
+            return await _query_ref_index(key, root or repo_root())
+        except refindex.RefNotFoundError as e:
+            return f"Error: ref:'{key}' not found — {e}"
+
     script = _ref_lookup_script()
     if not os.path.isfile(script):
         return f"Error: ref-lookup script not found at {script}"
@@ -220,18 +269,22 @@ async def _assemble_prompt(
     ``base`` must already carry any caller-specific prefix (e.g. generate_code's
     ``[Language: X]`` hint) — this helper is prompt-content-agnostic.
     """
-    full_prompt = base
-    if context_files:
-        context_block = _build_context_block(context_files)
-        if context_block.startswith("Error:"):
-            return base, context_block
-        full_prompt = f"{context_block}\n\n{full_prompt}"
-    if refs:
-        refs_block = await _build_refs_block(refs, refs_root)
-        if refs_block.startswith("Error:"):
-            return base, refs_block
-        full_prompt = f"{refs_block}\n\n{full_prompt}"
-    return full_prompt, None
+    t0 = time.perf_counter()
+    try:
+        full_prompt = base
+        if context_files:
+            context_block = _build_context_block(context_files)
+            if context_block.startswith("Error:"):
+                return base, context_block
+            full_prompt = f"{context_block}\n\n{full_prompt}"
+        if refs:
+            refs_block = await _build_refs_block(refs, refs_root)
+            if refs_block.startswith("Error:"):
+                return base, refs_block
+            full_prompt = f"{refs_block}\n\n{full_prompt}"
+        return full_prompt, None
+    finally:
+        metrics.observe_assembly(time.perf_counter() - t0)
 
 
 # ---------------------------------------------------------------------------
@@ -281,6 +334,58 @@ def _write_output_file(path: pathlib.Path | str, content: str) -> str:
     return f"Written {resolved.stat().st_size} bytes to {resolved}"
 
 
+# Seconds between MCP progress notifications while a streamed reply arrives — often
+# enough to read as alive, rarely enough not to flood the client with one per token.
+_STREAM_PROGRESS_INTERVAL_S = 2.0
+
+
+async def _stream_chat(
+    client: OllamaClient,
+    output_path: pathlib.Path | None,
+    ctx: Context | None,
+    **chat_kwargs: Any,
+) -> ChatResponse:
+    """Run a streamed chat call, showing liveness while it generates; return the response.
+
+    Two liveness channels, both best-effort. Deltas are appended to ``<output>.partial``
+    as they arrive (``tail -f`` it), and the MCP client gets a progress notification every
+    few seconds with the characters received so far. The partial file is only a window:
+    the caller still writes the FINISHED content to the real output path through
+    `_write_output_file`, so a reader of that path never sees a half-written deliverable,
+    and the partial is removed once the stream ends either way.
+    """
+    partial = (
+        pathlib.Path(str(output_path) + ".partial") if output_path is not None else None
+    )
+    sink = None
+    if partial is not None:
+        try:
+            partial.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(partial, "w", encoding="utf-8")
+        except OSError:
+            sink = None
+    received = 0
+    last_report = time.perf_counter()
+    stream = client.chat_stream(**chat_kwargs)
+    try:
+        async for delta in stream:
+            received += len(delta)
+            if sink is not None:
+                sink.write(delta)
+                sink.flush()
+            if ctx is not None and time.perf_counter() - last_report >= _STREAM_PROGRESS_INTERVAL_S:
+                last_report = time.perf_counter()
+                try:
+                    await ctx.report_progress(received, message=f"{received} chars received")
+                except Exception:
+                    pass  # liveness is a courtesy — never fail the call over it
+    finally:
+        if sink is not None:
+            sink.close()
+            partial.unlink(missing_ok=True)
+    return stream.response
+
+
 # ---------------------------------------------------------------------------
 # Language → persona routing for generate_code
 # ---------------------------------------------------------------------------
@@ -319,31 +424,23 @@ def _get_client() -> OllamaClient:
 # Server lifespan (startup/shutdown)
 # ---------------------------------------------------------------------------
 
-@asynccontextmanager
-async def _lifespan(app: FastMCP) -> AsyncIterator[None]:
-    """Manage the Ollama HTTP client lifecycle.
+async def _startup_checks(client: OllamaClient) -> None:
+    """Diagnostics that used to hold up start-up, run once in the background instead.
 
-    This is an async context manager — Python's pattern for "setup, yield,
-    teardown". The code before `yield` runs on startup, the code after runs
-    on shutdown (even if an error occurred). FastMCP calls this automatically.
+    The git banner (two subprocesses), the Ollama health probe (an HTTP round trip) and
+    the persona registry (a YAML import and parse) only report on the bridge; no tool
+    waits for them. Every bridge is a fresh process per session, so they run after the
+    server is already answering. The registry loads on first use anyway — this only
+    gets it done early and reports the result.
     """
-    global _client
-    _client = OllamaClient()
+    build = await asyncio.to_thread(debug_log.build_info)
+    print(f"[ollama-bridge] git={build['git']} branch={build['branch']}", file=sys.stderr)
+    debug_log.info("server_build", **build)
 
-    banner = debug_log.setup()
-    print(
-        f"[ollama-bridge] pid={banner['pid']} ppid={banner['ppid']} "
-        f"git={banner['git']} branch={banner['branch']} "
-        f"client_id={banner['client_id']} log_level={banner['log_level']} "
-        f"log_file={banner['log_file']}",
-        file=sys.stderr,
-    )
-    debug_log.info("server_start", **banner)
-
-    # Non-blocking health probe — log Ollama status at startup for diagnostics.
+    # Health probe — log Ollama status at startup for diagnostics.
     # Tools handle errors individually, so failure here doesn't block the server.
     try:
-        models = await _client.list_models()
+        models = await client.list_models()
         print(
             f"[ollama-bridge] Ollama connected — {len(models)} model(s) available",
             file=sys.stderr,
@@ -360,11 +457,11 @@ async def _lifespan(app: FastMCP) -> AsyncIterator[None]:
             file=sys.stderr,
         )
 
-    # Load persona registry (used for query_personas, language routing, and
-    # persona validation). Non-fatal: tools degrade gracefully if missing.
+    # Persona registry (used for query_personas, language routing, and persona
+    # validation). Non-fatal: tools degrade gracefully if missing.
     if REGISTRY_PATH:
         try:
-            reg = registry.load_registry(REGISTRY_PATH)
+            reg = await asyncio.to_thread(registry.ensure_loaded)
             active = sum(1 for v in reg.values() if v.get("status") == "active")
             print(
                 f"[ollama-bridge] Persona registry loaded — {active} active persona(s)",
@@ -381,12 +478,56 @@ async def _lifespan(app: FastMCP) -> AsyncIterator[None]:
             file=sys.stderr,
         )
 
+
+@asynccontextmanager
+async def _lifespan(app: FastMCP) -> AsyncIterator[None]:
+    """Manage the Ollama HTTP client lifecycle.
+
+    This is an async context manager — Python's pattern for "setup, yield,
+    teardown". The code before `yield` runs on startup, the code after runs
+    on shutdown (even if an error occurred). FastMCP calls this automatically.
+    Start-up itself does no I/O beyond the gate check; diagnostics run in the
+    background (`_startup_checks`).
+    """
+    global _client
+    _client = OllamaClient()
+
+    banner = debug_log.setup()
+    print(
+        f"[ollama-bridge] pid={banner['pid']} ppid={banner['ppid']} "
+        f"client_id={banner['client_id']} log_level={banner['log_level']} "
+        f"log_file={banner['log_file']}",
+        file=sys.stderr,
+    )
+    debug_log.info("server_start", **banner)
+
+    # T-88: bring up the shared model-call gate (no-op if another bridge already did).
+    # Fail-open by design — until it binds, calls simply go straight to Ollama.
+    if gate.ensure_daemon():
+        debug_log.info("gate_ensured", socket=gate.GATE_SOCKET)
+
+    checks = asyncio.create_task(_startup_checks(_client))
+
+    # Prometheus /metrics (OLLAMA_METRICS_PORT). Off by default; never fatal.
+    metrics_server = None
+    try:
+        metrics_server = await metrics.start_listener(
+            _client, banner["client_id"], banner["pid"]
+        )
+    except Exception as e:
+        print(f"[ollama-bridge] Warning: metrics listener failed: {e}", file=sys.stderr)
+
     try:
         yield
     finally:
         debug_log.info("server_stop")
+        checks.cancel()
+        if metrics_server is not None:
+            metrics_server.close()
         await _client.close()
         _client = None
+        # Write out any queued calls.jsonl records before the process goes.
+        await asyncio.to_thread(calllog.close)
 
 
 # ---------------------------------------------------------------------------
@@ -423,6 +564,8 @@ async def ask_ollama(
     output_file: str | None = None,
     output_only: bool = False,
     timeout: int = 120,
+    stream: bool = False,
+    ctx: Context | None = None,
 ) -> str:
     """Ask a question to a local Ollama model.
 
@@ -469,6 +612,11 @@ async def ask_ollama(
                      inspection. Ignored if output_file is not set.
         timeout: Max seconds to wait for a response. Default 120. Increase for
                  large models (30B+) or complex prompts (e.g., 300 for hybrid models).
+                 With stream=True it bounds silence (time to first token, then
+                 between chunks) rather than the whole generation.
+        stream: Stream the reply as it is generated. Progress is reported while it
+                runs, and with output_file the text grows in "<output_file>.partial"
+                until the finished content is written. Use for long generations.
 
     Returns:
         The model's text response. If Ollama is unreachable, returns an error
@@ -483,15 +631,18 @@ async def ask_ollama(
         output_file=output_file,
         output_only=output_only,
         timeout=timeout,
+        stream=stream,
         prompt_chars=len(prompt),
     )
 
     def _done(ok: bool, **fields):
+        elapsed = time.perf_counter() - t0
+        metrics.tool_exit("ask_ollama", ok, elapsed, fields.get("reason"))
         debug_log.debug(
             "tool_exit",
             tool="ask_ollama",
             ok=ok,
-            ms=round((time.perf_counter() - t0) * 1000, 2),
+            ms=round(elapsed * 1000, 2),
             **fields,
         )
 
@@ -524,13 +675,19 @@ async def ask_ollama(
         return prompt_err
 
     try:
-        response = await client.chat(
+        chat_kwargs = dict(
             prompt=full_prompt,
             model=model,
             temperature=temperature,
             timeout=timeout,
             tool="ask_ollama",
         )
+        if stream:
+            response = await _stream_chat(
+                client, _pre if output_file else None, ctx, **chat_kwargs
+            )
+        else:
+            response = await client.chat(**chat_kwargs)
         content = response.content
         if output_file:
             write_result = _write_output_file(_pre, content)
@@ -561,6 +718,9 @@ async def ask_ollama(
             "Error: Ollama timed out. The model may be loading (cold start). "
             "Try again in a few seconds."
         )
+    except OllamaStreamError as e:
+        _done(False, reason="OllamaStreamError", model=model)
+        return _format_error(e)
 
 
 @mcp.tool()
@@ -595,6 +755,25 @@ async def list_models() -> str:
     return "Available Ollama models:\n" + "\n".join(lines)
 
 
+@mcp.tool()
+async def cache_stats() -> str:
+    """Report the response cache's hit/miss counters and tier sizes.
+
+    Counters are for this bridge process since it started; the disk tier is shared by
+    every process on the machine. The cache is opt-in (OLLAMA_RESPONSE_CACHE=on).
+    The translate tool's translation memory is reported alongside, per segment.
+
+    Returns:
+        JSON {enabled, hits, memory_hits, disk_hits, misses, hit_rate, stores,
+        evictions, memory_entries, disk_bytes, directory, translation_memory:
+        {enabled, hits, misses, hit_rate, stores, evictions, entries, bytes, path}}.
+    """
+    cache = response_cache.get_cache()
+    stats = await asyncio.to_thread(cache.snapshot)
+    stats["translation_memory"] = await asyncio.to_thread(transmem.get_memory().snapshot)
+    return json.dumps(stats)
+
+
 def _model_matches(loaded_name: str, requested: str) -> bool:
     """True if an Ollama model name (possibly ``model:tag``) matches a requested
     base or fully-qualified name — tolerant of an implicit ``:latest`` tag.
@@ -631,19 +810,17 @@ async def warm_model(
 ) -> str:
     """Pre-load a model into VRAM to avoid cold-start timeouts on the next call.
 
-    Checks if the target model is already loaded. If not, safely evicts the
-    current model (checking for in-flight requests first) and sends a trivial
-    prompt to force-load the target model.
+    Checks if the target model is already loaded. If not, asks the residency
+    manager (residency.py) for the minimal eviction that makes room — least
+    recently used first, and nothing at all when the target fits beside what
+    is already loaded — then sends a trivial prompt to force-load the target.
 
     Use at session start or before switching between models (e.g., switching
     from a coding persona to a summarizer). Prevents the first real call from
     timing out due to model loading.
 
-    NOTE: The in-flight safety check is single-session only. Each Claude Code
-    session has its own MCP server process with its own in-flight counter, so
-    calls from a different session (e.g., the expense repo) are not visible.
-    Cross-session protection requires the file-based coordination layer
-    described in docs/ideas/ollama-coordination-layer.md (Option 2).
+    A model is never evicted while it has work in flight in this bridge or
+    active/queued at the model-call gate (any session).
 
     Args:
         model: The Ollama model/persona name to pre-load (e.g., "my-coder-q3").
@@ -654,72 +831,37 @@ async def warm_model(
         Status message describing what was done.
     """
     client = _get_client()
+    manager = residency.ResidencyManager(client)
 
     try:
-        running = await client.list_running()
+        plan = await manager.plan_for(model, force=force)
     except OllamaConnectionError:
         return (
             "Error: Cannot connect to Ollama. "
             "Is it running? Start with: ollama serve"
         )
 
-    # Check if target model is already loaded (matcher handles the "model:tag" format)
-    running_names = [m.get("name", "") for m in running]
-    target_loaded = any(_model_matches(name, model) for name in running_names)
-
-    if target_loaded:
+    if plan.already_loaded:
         return f"Model '{model}' is already loaded in VRAM. No action needed."
 
     # Validate target exists BEFORE evicting — prevents "evict then 404" bug.
     if err := await _check_model_exists(client, model):
         return err
 
-    # Check if any currently loaded model has in-flight requests
-    if running and not force:
-        busy_models = []
-        for m in running:
-            name = m.get("name", "")
-            # Check all name variations against in-flight tracker
-            if client.is_busy(name) or client.is_busy(name.split(":")[0]):
-                busy_models.append(name)
-
-        if busy_models:
-            return (
-                f"Cannot warm '{model}': model(s) {', '.join(busy_models)} "
-                f"have in-flight requests. Use force=True to override, "
-                f"or wait for current requests to complete."
-            )
-
-    # Evict currently loaded model(s)
-    evicted = []
-    for m in running:
-        name = m.get("name", "")
-        try:
-            await client.unload_model(name)
-            evicted.append(name)
-        except Exception as e:
-            return f"Error evicting '{name}': {e}"
+    # Making room would take a model that still has work to do.
+    if not plan.fits:
+        return (
+            f"Cannot warm '{model}': model(s) {', '.join(plan.blocked_by)} "
+            f"have in-flight requests. Use force=True to override, "
+            f"or wait for current requests to complete."
+        )
 
-    # Send a trivial prompt to force-load the target model.
-    # num_predict: 1 ensures minimal generation (just load the model).
-    # keep_alive: 5m keeps it loaded for subsequent real calls.
     try:
-        resp = await client._http.post(
-            "/api/chat",
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": "."}],
-                "stream": False,
-                "keep_alive": "5m",
-                "options": {"num_predict": 1},
-            },
-            timeout=120,  # Cold load can take a while on 12GB GPU
-        )
-        resp.raise_for_status()
+        evicted = await manager.make_resident(model, plan)
     except Exception as e:
         return f"Error loading '{model}': {e}"
 
-    evict_msg = f" Evicted: {', '.join(evicted)}." if evicted else ""
+    evict_msg = f" Evicted: {', '.join(evicted)}." if evicted else " Nothing evicted."
     return f"Model '{model}' is now loaded and warm.{evict_msg}"
 
 
@@ -783,6 +925,8 @@ async def generate_code(
     output_file: str | None = None,
     output_only: bool = False,
     timeout: int = 120,
+    stream: bool = False,
+    ctx: Context | None = None,
 ) -> str:
     """Generate code using a local Ollama model with smart persona routing.
 
@@ -826,6 +970,11 @@ async def generate_code(
                      inspection. Ignored if output_file is not set.
         timeout: Max seconds to wait for a response. Default 120. Increase for
                  large models (30B+) or complex prompts (e.g., 300 for hybrid models).
+                 With stream=True it bounds silence (time to first token, then
+                 between chunks) rather than the whole generation.
+        stream: Stream the reply as it is generated. Progress is reported while it
+                runs, and with output_file the text grows in "<output_file>.partial"
+                until the finished content is written. Use for long generations.
 
     Returns:
         Generated code (typically in a fenced code block). Returns an error
@@ -840,15 +989,18 @@ async def generate_code(
         output_file=output_file,
         output_only=output_only,
         timeout=timeout,
+        stream=stream,
         prompt_chars=len(prompt),
     )
 
     def _done(ok: bool, **fields):
+        elapsed = time.perf_counter() - t0
+        metrics.tool_exit("generate_code", ok, elapsed, fields.get("reason"))
         debug_log.debug(
             "tool_exit",
             tool="generate_code",
             ok=ok,
-            ms=round((time.perf_counter() - t0) * 1000, 2),
+            ms=round(elapsed * 1000, 2),
             **fields,
         )
 
@@ -884,13 +1036,19 @@ async def generate_code(
         return prompt_err
 
     try:
-        response = await client.chat(
+        chat_kwargs = dict(
             prompt=full_prompt,
             model=chosen_model,
             think=False,
             timeout=timeout,
             tool="generate_code",
         )
+        if stream:
+            response = await _stream_chat(
+                client, _pre if output_file else None, ctx, **chat_kwargs
+            )
+        else:
+            response = await client.chat(**chat_kwargs)
         content = _strip_code_fences(response.content)
         if output_file:
             write_result = _write_output_file(_pre, content)
@@ -902,7 +1060,9 @@ async def generate_code(
                 return write_result
         _done(True, model=chosen_model, content_chars=len(content))
         return content
-    except (OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError) as e:
+    except (
+        OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError, OllamaStreamError
+    ) as e:
         _done(False, reason=type(e).__name__, model=chosen_model)
         return _format_error(e)
 
@@ -912,24 +1072,48 @@ async def summarize(
     text: str,
     max_points: int | None = None,
     model: str = "my-summarizer-q3",
+    mode: str = "auto",
+    concurrency: int | None = None,
 ) -> str:
     """Summarize text into concise bullet points using a local Ollama model.
 
     The summarizer preserves facts, numbers, and conclusions from the source.
-    Output is bullet points by default.
+    Output is bullet points by default. Text longer than the model's context is
+    summarized in chunks and the partial summaries merged (map-reduce), instead of
+    being silently truncated by Ollama.
 
     Args:
         text: The text to summarize.
         max_points: Maximum number of bullet points. If omitted, the model
                     decides based on content length.
         model: Ollama model to use. Default: my-summarizer-q3.
+        mode: "auto" (map-reduce only when the text does not fit one call),
+              "single" (always one call) or "map_reduce" (always chunk).
+        concurrency: Chunk summaries in flight at once (map-reduce only).
+                     Default: OLLAMA_NUM_PARALLEL (usually 1).
 
     Returns:
         Bullet-point summary. Returns an error message string if Ollama
         is unreachable.
     """
+    if mode not in ("auto", "single", "map_reduce"):
+        return f"Error: mode must be 'auto', 'single' or 'map_reduce', got {mode!r}"
     client = _get_client()
 
+    if mode == "map_reduce" or (
+        mode == "auto" and tokens.count(text) > mapreduce.window(model)
+    ):
+        try:
+            return await mapreduce.summarize(
+                client,
+                text,
+                model=model,
+                max_points=max_points,
+                concurrency=concurrency or GATE_SLOTS_PER_MODEL,
+            )
+        except (OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError) as e:
+            return _format_error(e)
+
     # Build prompt with optional constraint
     if max_points is not None:
         prompt = f"Summarize the following text in at most {max_points} bullet points:\n\n{text}"
@@ -948,52 +1132,70 @@ async def summarize(
         return _format_error(e)
 
 
+def _classification_schema(categories: list[str]) -> dict[str, Any]:
+    """JSON schema for a classification reply.
+
+    The enum constrains the model's output to only the provided categories via
+    grammar-constrained decoding.
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "category": {
+                "type": "string",
+                "enum": categories,
+            },
+            "confidence": {
+                "type": "number",
+            },
+            "reasoning": {
+                "type": "string",
+            },
+        },
+        "required": ["category", "confidence", "reasoning"],
+    }
+
+
+def _classification_instructions(categories: list[str]) -> str:
+    return f"Classify the following text into one of these categories: {', '.join(categories)}."
+
+
 @mcp.tool()
 async def classify_text(
     text: str,
     categories: list[str],
     model: str = "my-classifier-q3",
+    mode: str = "auto",
 ) -> str:
     """Classify text into one of the provided categories using a local Ollama model.
 
     Uses grammar-constrained decoding (Ollama's format parameter) to guarantee
-    valid JSON output with the category restricted to the provided list.
+    valid JSON output with the category restricted to the provided list. If a
+    category index was built for this category set (build_category_index), a
+    clear-cut item is answered from embeddings in milliseconds instead; only the
+    close calls are generated.
 
     Args:
         text: The text to classify.
         categories: List of valid category names (e.g., ["food", "transport", "housing"]).
                     The model must pick exactly one.
         model: Ollama model to use. Default: my-classifier-q3.
+        mode: "auto" (embedding fast path when an index exists) or "generate"
+              (always ask the model).
 
     Returns:
         JSON string with keys: category, confidence (0.0-1.0), reasoning.
         Returns an error message string if Ollama is unreachable.
     """
+    if mode not in ("auto", "generate"):
+        return f"Error: mode must be 'auto' or 'generate', got {mode!r}"
     client = _get_client()
-
-    # Build dynamic JSON schema — the enum constrains the model's output
-    # to only the provided categories via grammar-constrained decoding.
-    schema: dict[str, Any] = {
-        "type": "object",
-        "properties": {
-            "category": {
-                "type": "string",
-                "enum": categories,
-            },
-            "confidence": {
-                "type": "number",
-            },
-            "reasoning": {
-                "type": "string",
-            },
-        },
-        "required": ["category", "confidence", "reasoning"],
-    }
-
-    prompt = (
-        f"Classify the following text into one of these categories: "
-        f"{', '.join(categories)}.\n\n{text}"
-    )
+    if mode == "auto":
+        fast = await _classify_by_embedding(client, text, categories)
+        if fast is not None:
+            return json.dumps(fast)
+    schema = _classification_schema(categories)
+    prompt = f"{_classification_instructions(categories)}\n\n{text}"
 
     try:
         response = await client.chat(
@@ -1008,6 +1210,73 @@ async def classify_text(
         return _format_error(e)
 
 
+async def _classify_by_embedding(
+    client: OllamaClient, text: str, categories: list[str]
+) -> dict[str, Any] | None:
+    """The classify_text reply from the category index, or None to generate instead.
+
+    None covers every reason not to answer here: no index for this category set, the
+    embedding call failing, or a margin too thin to trust (see embedindex.py).
+    """
+    index = await asyncio.to_thread(embedindex.get, categories)
+    if index is None:
+        return None
+    try:
+        vectors = await client.embed([text], model=index.model, timeout=30)
+    except (OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError,
+            httpx.HTTPError) as e:
+        debug_log.error("embed_fast_path_failed", model=index.model, reason=str(e))
+        return None
+    if not vectors:
+        return None
+    return index.decide(vectors[0], EMBED_MARGIN)
+
+
+@mcp.tool()
+async def build_category_index(
+    examples: dict[str, list[str]],
+    model: str = EMBED_MODEL,
+) -> str:
+    """Build the embedding index classify_text uses for one category set.
+
+    Embeds labelled examples once; afterwards classify_text answers items that are
+    clearly closest to one category without a generation. Rebuilding replaces the
+    index for the same category set.
+
+    Args:
+        examples: Category name → example texts of that category. The keys are the
+                  category set; every category needs at least one example (5-20 is
+                  typical).
+        model: Ollama embedding model. Default: OLLAMA_EMBED_MODEL (nomic-embed-text).
+
+    Returns:
+        JSON summary {categories, examples, model, dims, path}, or an error string.
+    """
+    empty = [c for c, texts in examples.items() if not texts]
+    if len(examples) < 2 or empty:
+        return (
+            "Error: need at least two categories, each with at least one example"
+            + (f" (no examples for: {', '.join(empty)})" if empty else "")
+        )
+    texts = [t for category in examples for t in examples[category]]
+    try:
+        vectors = await _get_client().embed(texts, model=model, priority="batch")
+    except (OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError) as e:
+        return _format_error(e)
+    try:
+        index = embedindex.build(model, examples, vectors)
+        path = await asyncio.to_thread(embedindex.save, index)
+    except (ValueError, OSError) as e:
+        return f"Error: cannot build the category index: {e}"
+    return json.dumps({
+        "categories": index.categories,
+        "examples": index.examples,
+        "model": model,
+        "dims": len(vectors[0]) if vectors else 0,
+        "path": str(path),
+    })
+
+
 @mcp.tool()
 async def translate(
     text: str,
@@ -1018,7 +1287,9 @@ async def translate(
     """Translate text to a target language using a local Ollama model.
 
     The translator preserves meaning, tone, and formatting. Outputs only the
-    translated text with no preamble or explanation.
+    translated text with no preamble or explanation. Paragraphs translated
+    before (same languages and model) come from the translation memory; only
+    new ones are sent to the model.
 
     Args:
         text: The text to translate.
@@ -1033,11 +1304,21 @@ async def translate(
     """
     client = _get_client()
 
+    if transmem.get_memory().enabled:
+        try:
+            return await transmem.translate(
+                client,
+                text,
+                target=target_language,
+                source=source_language,
+                model=model,
+                concurrency=GATE_SLOTS_PER_MODEL,
+            )
+        except (OllamaConnectionError, OllamaModelNotFoundError, OllamaTimeoutError) as e:
+            return _format_error(e)
+
     # Build prompt with language pair info
-    if source_language:
-        prompt = f"Translate the following text from {source_language} to {target_language}:\n\n{text}"
-    else:
-        prompt = f"Translate the following text to {target_language}:\n\n{text}"
+    prompt = transmem.single_prompt(text, source_language, target_language)
 
     try:
         response = await client.chat(
@@ -1051,6 +1332,218 @@ async def translate(
         return _format_error(e)
 
 
+# ---------------------------------------------------------------------------
+# Batch tools
+# ---------------------------------------------------------------------------
+
+# Items whose error message is echoed back in a batch summary; the rest are in the file.
+_BATCH_ERRORS_SHOWN = 3
+
+
+async def _run_batch(
+    items: list[str],
+    *,
+    instructions: str | None,
+    model: str,
+    system: str | None,
+    schema: dict | None,
+    temperature: float | None,
+    concurrency: int | None,
+    timeout: int,
+    output_file: str | None,
+    tool: str,
+    ctx: Context | None,
+) -> str:
+    """Run one chat call per item, ``concurrency`` at a time, and report on them.
+
+    Every call's user message is ``instructions`` then the item, after the same system
+    prompt, so all of them share one stable prefix and Ollama reuses its KV state for it
+    instead of re-evaluating the instructions per item. Calls are ``priority="batch"`` at
+    the gate (T-88): an interactive call from another session is not stuck behind 300 of
+    these. Concurrency defaults to the gate's slots per model (``OLLAMA_NUM_PARALLEL``) —
+    more would only queue inside Ollama.
+
+    With ``output_file``, each result is appended to it as a JSONL line the moment it
+    completes (``{index, ok, content | error, call_id, ms, wait_ms}``, in completion order;
+    ``ms`` is the call alone, ``wait_ms`` the time spent queued for a slot) and only
+    a compact JSON summary is returned. Without one, the summary carries the results too,
+    in item order.
+    """
+    t0 = time.perf_counter()
+    sink = None
+    resolved: pathlib.Path | None = None
+    if output_file is not None:
+        pre = _resolve_output_path(output_file)
+        if isinstance(pre, str):
+            return pre
+        try:
+            pre.parent.mkdir(parents=True, exist_ok=True)
+            resolved = pre.resolve()
+            sink = open(resolved, "w", encoding="utf-8")
+        except OSError as e:
+            return f"Error writing to {pre}: {e}"
+
+    client = _get_client()
+    slots = asyncio.Semaphore(max(1, concurrency or GATE_SLOTS_PER_MODEL))
+    results: list[dict | None] = [None] * len(items)
+    done = 0
+
+    async def _one(index: int, item: str) -> None:
+        nonlocal done
+        prompt = f"{instructions}\n\n{item}" if instructions else item
+        queued = time.perf_counter()
+        async with slots:
+            started = time.perf_counter()
+            try:
+                response = await client.chat(
+                    prompt=prompt,
+                    model=model,
+                    system=system,
+                    format=schema,
+                    temperature=temperature,
+                    think=False,
+                    timeout=timeout,
+                    tool=tool,
+                    priority="batch",
+                )
+                record = {"index": index, "ok": True, "content": response.content,
+                          "call_id": response.call_id}
+            except Exception as e:
+                # Any failure (an HTTP 500 from an OOM'd runner included) is this item's
+                # error line; it must not abort the gather and lose the siblings' results.
+                record = {"index": index, "ok": False, "error": _format_error(e)}
+        record["ms"] = round((time.perf_counter() - started) * 1000)
+        record["wait_ms"] = round((started - queued) * 1000)
+        results[index] = record
+        done += 1
+        if sink is not None:
+            sink.write(json.dumps(record) + "\n")
+            sink.flush()
+        if ctx is not None:
+            try:
+                await ctx.report_progress(done, total=len(items), message=f"{done}/{len(items)}")
+            except Exception:
+                pass  # liveness is a courtesy — never fail the batch over it
+
+    try:
+        await asyncio.gather(*(_one(i, item) for i, item in enumerate(items)))
+    finally:
+        if sink is not None:
+            sink.close()
+
+    failed = [r for r in results if r is not None and not r["ok"]]
+    summary: dict[str, Any] = {
+        "items": len(items),
+        "ok": len(items) - len(failed),
+        "errors": len(failed),
+        "model": model,
+        "ms": round((time.perf_counter() - t0) * 1000),
+    }
+    if failed:
+        summary["first_errors"] = [
+            {"index": r["index"], "error": r["error"]} for r in failed[:_BATCH_ERRORS_SHOWN]
+        ]
+    if resolved is not None:
+        summary["output_file"] = str(resolved)
+    else:
+        summary["results"] = results
+    return json.dumps(summary)
+
+
+@mcp.tool()
+async def batch_ask(
+    prompts: list[str],
+    instructions: str | None = None,
+    model: str = DEFAULT_MODEL,
+    system: str | None = None,
+    format: dict | None = None,
+    temperature: float | None = None,
+    concurrency: int | None = None,
+    output_file: str | None = None,
+    timeout: int = 120,
+    ctx: Context | None = None,
+) -> str:
+    """Run many independent prompts against one model in a single tool call.
+
+    Use instead of a long run of ask_ollama calls (summarize every note in a folder,
+    extract a field from 300 lines): one round-trip, and with output_file only a short
+    summary comes back into context.
+
+    Args:
+        prompts: The items — one model call each.
+        instructions: Text placed before every item (e.g. "Summarize this note:"). Shared by
+                      all calls, so Ollama evaluates it once and reuses the cache after.
+        model: Ollama model or persona to use for every item.
+        system: Optional system prompt for every call (default: the model's own).
+        format: Optional JSON schema every reply must follow.
+        temperature: Sampling temperature (default: the model's own).
+        concurrency: Calls in flight at once. Default: OLLAMA_NUM_PARALLEL (usually 1).
+        output_file: JSONL path for the results, one line per item as it completes:
+                     {index, ok, content | error, call_id, ms, wait_ms}. Relative paths
+                     resolve from REPO_ROOT.
+        timeout: Per-call timeout in seconds.
+
+    Returns:
+        JSON summary {items, ok, errors, model, ms, first_errors?} plus output_file, or
+        plus "results" (in item order) when no output_file was given.
+    """
+    return await _run_batch(
+        prompts,
+        instructions=instructions,
+        model=model,
+        system=system,
+        schema=format,
+        temperature=temperature,
+        concurrency=concurrency,
+        timeout=timeout,
+        output_file=output_file,
+        tool="batch_ask",
+        ctx=ctx,
+    )
+
+
+@mcp.tool()
+async def classify_batch(
+    texts: list[str],
+    categories: list[str],
+    model: str = "my-classifier-q3",
+    concurrency: int | None = None,
+    output_file: str | None = None,
+    timeout: int = 120,
+    ctx: Context | None = None,
+) -> str:
+    """Classify many texts into the same categories in a single tool call.
+
+    The batch form of classify_text: same schema, same prompt, one call per text.
+
+    Args:
+        texts: The texts to classify.
+        categories: Valid category names; every text gets exactly one.
+        model: Ollama model to use. Default: my-classifier-q3.
+        concurrency: Calls in flight at once. Default: OLLAMA_NUM_PARALLEL (usually 1).
+        output_file: JSONL path for the results; each line's "content" is the
+                     classify_text JSON {category, confidence, reasoning}.
+        timeout: Per-call timeout in seconds.
+
+    Returns:
+        JSON summary {items, ok, errors, model, ms, first_errors?} plus output_file, or
+        plus "results" (in item order) when no output_file was given.
+    """
+    return await _run_batch(
+        texts,
+        instructions=_classification_instructions(categories),
+        model=model,
+        system=None,
+        schema=_classification_schema(categories),
+        temperature=None,
+        concurrency=concurrency,
+        timeout=timeout,
+        output_file=output_file,
+        tool="classify_batch",
+        ctx=ctx,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Persona tools
 # ---------------------------------------------------------------------------
@@ -1372,7 +1865,8 @@ async def ref_lookup(key: str, path: str | None = None) -> str:
     resume steps, etc. This tool retrieves a block by key without requiring
     file access or knowing which file it lives in.
 
-    Pass key="list" to get all available keys.
+    Pass key="list" to get all available keys, key="paths" for KEY<TAB>file lines, or a
+    trailing wildcard (key="plan-*") for every block whose key has that prefix.
 
     Args:
         key: The reference key to look up (e.g. "current-status", "bash-wrappers",
@@ -1387,6 +1881,13 @@ async def ref_lookup(key: str, path: str | None = None) -> str:
         key is "list". Returns an error message if the key is not found or
         REPO_ROOT is not set.
     """
+    not_found = f"ref:'{key}' not found. Available keys: run ref_lookup(key='list')"
+    if _ref_index_enabled() and (path is not None or REPO_ROOT):
+        try:
+            return await _query_ref_index(key, path or REPO_ROOT)
+        except refindex.RefNotFoundError:
+            return not_found
+
     if not REPO_ROOT:
         return "Error: LLM_REPO_ROOT not set — cannot locate ref-lookup script."
 
@@ -1405,9 +1906,7 @@ async def ref_lookup(key: str, path: str | None = None) -> str:
         args,
         timeout=10,
         label="ref-lookup",
-        on_error=lambda rc, out, err: (
-            f"ref:'{key}' not found. Available keys: run ref_lookup(key='list')"
-        ),
+        on_error=lambda rc, out, err: not_found,
     )
 
 
@@ -1452,11 +1951,13 @@ async def patch_file(
     )
 
     def _done(ok: bool, **fields):
+        elapsed = time.perf_counter() - t0
+        metrics.tool_exit("patch_file", ok, elapsed, fields.get("reason"))
         debug_log.debug(
             "tool_exit",
             tool="patch_file",
             ok=ok,
-            ms=round((time.perf_counter() - t0) * 1000, 2),
+            ms=round(elapsed * 1000, 2),
             **fields,
         )
 
@@ -1496,10 +1997,205 @@ async def patch_file(
         return f"Error: {e}"
 
 
+class Edit(BaseModel):
+    """One exact-string replacement within a file (patch_file's arguments)."""
+
+    old_string: str
+    new_string: str
+    replace_all: bool = False
+
+
+class FileEdits(BaseModel):
+    """Every edit for one file; ``path`` resolves like patch_file's."""
+
+    path: str
+    edits: list[Edit]
+
+
+def _plan_edits(content: str, edits: list[Edit], label: str) -> tuple[str, int] | str:
+    """Apply ``edits`` to ``content`` in memory: (new content, replacements) or an error.
+
+    Every old_string is matched against the ORIGINAL content, not the output of the edits
+    before it, so the order of edits does not matter and no edit can match text another
+    one inserted. Matches of different edits must not overlap.
+    """
+    spans: list[tuple[int, int, int, str]] = []  # (start, end, edit number, replacement)
+    for n, edit in enumerate(edits, 1):
+        if not edit.old_string:
+            return f"Error: {label} edit {n}: old_string is empty."
+        starts = []
+        at = content.find(edit.old_string)
+        while at >= 0:
+            starts.append(at)
+            at = content.find(edit.old_string, at + len(edit.old_string))
+        if not starts:
+            return f"Error: {label} edit {n}: old_string not found."
+        if len(starts) > 1 and not edit.replace_all:
+            return (
+                f"Error: {label} edit {n}: old_string found {len(starts)} times. "
+                "Use replace_all=True to replace all, or provide a more specific old_string."
+            )
+        spans.extend((a, a + len(edit.old_string), n, edit.new_string) for a in starts)
+    spans.sort()
+    for (_, end, first, _), (start, _, second, _) in zip(spans, spans[1:]):
+        if start < end:
+            return f"Error: {label} edits {min(first, second)} and {max(first, second)} overlap."
+    out, pos = [], 0
+    for start, end, _, replacement in spans:
+        out.append(content[pos:start])
+        out.append(replacement)
+        pos = end
+    out.append(content[pos:])
+    return "".join(out), len(spans)
+
+
+def _commit_files(planned: list[tuple[pathlib.Path, str, str, os.stat_result]]) -> str | None:
+    """Write every (path, original, new, stat at read) all-or-nothing; None or an error.
+
+    New contents go to temp files beside their targets first; nothing is renamed until all
+    of them are written, and a target changed on disk since it was read aborts the lot. If
+    a rename still fails part-way, the files already replaced get their original content
+    back the same way.
+    """
+    temps: list[tuple[pathlib.Path, pathlib.Path]] = []
+    done = 0
+    try:
+        try:
+            for path, _, new, _ in planned:
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.patch.tmp")
+                temps.append((tmp, path))
+                tmp.write_text(new, encoding="utf-8")
+                shutil.copymode(path, tmp)
+            for path, _, _, seen in planned:
+                now = path.stat()
+                if (now.st_mtime_ns, now.st_size) != (seen.st_mtime_ns, seen.st_size):
+                    return f"Error: {path} changed on disk while patching; nothing was written."
+        except OSError as e:
+            return f"Error: {e}; nothing was written."
+        try:
+            for tmp, path in temps:
+                os.replace(tmp, path)
+                done += 1
+        except OSError as e:
+            for path, original, _, _ in planned[:done]:
+                back = path.with_name(f".{path.name}.{os.getpid()}.undo.tmp")
+                try:
+                    back.write_text(original, encoding="utf-8")
+                    os.replace(back, path)
+                except OSError:
+                    back.unlink(missing_ok=True)
+            return f"Error: {e}; the {done} file(s) already replaced were restored."
+        return None
+    finally:
+        for tmp, _ in temps:
+            tmp.unlink(missing_ok=True)
+
+
+@mcp.tool()
+async def patch_files(files: list[FileEdits]) -> str:
+    """Apply many exact-string edits across several files in one call, all or nothing.
+
+    The batch form of patch_file for refactors: each file is read once, every edit is
+    checked first (each old_string must exist, be unique unless replace_all, and not
+    overlap another edit's match), and only then are all files written together. If any
+    edit fails, no file is touched.
+
+    Every old_string is matched against the file as it was before this call — edits do
+    not see each other's output, so their order within a file does not matter.
+
+    Args:
+        files: [{path, edits: [{old_string, new_string, replace_all?}]}]. Paths are
+               absolute or relative to REPO_ROOT; each file appears once.
+
+    Returns:
+        "Patched N files (M replacements): path1 k1, path2 k2, ..." or an "Error: ..."
+        string naming the file and edit number.
+    """
+    t0 = time.perf_counter()
+    debug_log.debug(
+        "tool_enter",
+        tool="patch_files",
+        files=len(files),
+        edits=sum(len(f.edits) for f in files),
+    )
+
+    def _done(ok: bool, **fields):
+        elapsed = time.perf_counter() - t0
+        metrics.tool_exit("patch_files", ok, elapsed, fields.get("reason"))
+        debug_log.debug(
+            "tool_exit",
+            tool="patch_files",
+            ok=ok,
+            ms=round(elapsed * 1000, 2),
+            **fields,
+        )
+
+    if not files:
+        _done(False, reason="empty")
+        return "Error: no files to patch."
+
+    planned: list[tuple[pathlib.Path, str, str, os.stat_result]] = []
+    counts: list[int] = []
+    seen: set[pathlib.Path] = set()
+    for group in files:
+        resolved = _resolve_output_path(group.path)
+        if isinstance(resolved, str):
+            _done(False, reason="resolve_failed")
+            return resolved
+        resolved = resolved.resolve()
+        if resolved in seen:
+            _done(False, reason="duplicate_file", resolved=str(resolved))
+            return f"Error: {resolved} appears more than once; group its edits in one entry."
+        seen.add(resolved)
+        if not group.edits:
+            _done(False, reason="no_edits", resolved=str(resolved))
+            return f"Error: no edits for {resolved}."
+        try:
+            if not resolved.is_file():
+                _done(False, reason="not_found", resolved=str(resolved))
+                return f"Error: file not found: {resolved}"
+            stat = resolved.stat()
+            content = resolved.read_text(encoding="utf-8")
+        except OSError as e:
+            _done(False, reason="oserror", error=str(e))
+            return f"Error: {e}"
+        plan = _plan_edits(content, group.edits, str(resolved))
+        if isinstance(plan, str):
+            _done(False, reason="invalid_edit", resolved=str(resolved))
+            return plan
+        planned.append((resolved, content, plan[0], stat))
+        counts.append(plan[1])
+
+    error = await asyncio.to_thread(_commit_files, planned)
+    if error is not None:
+        _done(False, reason="commit_failed", error=error)
+        return error
+
+    total = sum(counts)
+    _done(True, files=len(planned), count=total)
+    per_file = ", ".join(f"{path} {n}" for (path, *_), n in zip(planned, counts))
+    return (
+        f"Patched {len(planned)} file{'s' if len(planned) != 1 else ''} "
+        f"({total} replacement{'s' if total != 1 else ''}): {per_file}"
+    )
+
+
 # ---------------------------------------------------------------------------
 # oficina — async local-model deliverable runs (P1)
 # ---------------------------------------------------------------------------
 
+def _oficina() -> tuple[Any, pathlib.Path]:
+    """oficina's service module and run root, imported on first use.
+
+    Most bridges never submit a run, so oficina (and the ledger, store and worker code
+    behind it) stays out of server start-up.
+    """
+    from ollama_mcp.oficina import config as oficina_config
+    from ollama_mcp.oficina import service as oficina_service
+
+    return oficina_service, oficina_config.default_root()
+
+
 @mcp.tool()
 async def submit_run(spec: dict) -> str:
     """Submit an async local-model deliverable run.
@@ -1514,8 +2210,9 @@ async def submit_run(spec: dict) -> str:
     Returns:
         JSON {run_id, watch_cmd, queue_position}, or an "Error: ..." string.
     """
+    oficina_service, root = _oficina()
     try:
-        result = oficina_service.submit(oficina_config.default_root(), spec)
+        result = oficina_service.submit(root, spec)
         return json.dumps(result)
     except oficina_service.SpecShapeError as e:
         return f"Error: invalid spec — {e}"
@@ -1532,10 +2229,11 @@ async def run_status(run_id: str, since_offset: int = 0) -> str:
     Returns:
         JSON {state, phase, events, next_offset}, or an "Error: ..." string.
     """
+    oficina_service, root = _oficina()
     try:
-        result = oficina_service.status(oficina_config.default_root(), run_id, since_offset)
+        result = oficina_service.status(root, run_id, since_offset)
         return json.dumps(result)
-    except UnknownRunError:
+    except oficina_service.UnknownRunError:
         return f"Error: unknown run_id {run_id!r}"
 
 
@@ -1552,10 +2250,11 @@ async def run_result(run_id: str) -> str:
     Returns:
         JSON {state, report, deliverable, artifacts_pruned}, or an "Error: ..." string.
     """
+    oficina_service, root = _oficina()
     try:
-        result = oficina_service.result(oficina_config.default_root(), run_id)
+        result = oficina_service.result(root, run_id)
         return json.dumps(result)
-    except UnknownRunError:
+    except oficina_service.UnknownRunError:
         return f"Error: unknown run_id {run_id!r}"
     except oficina_service.RunNotTerminalError as e:
         return f"Error: run not terminal yet — {e}"
@@ -1574,8 +2273,9 @@ async def cancel_run(run_id: str) -> str:
     Returns:
         JSON {state}, or an "Error: ..." string.
     """
+    oficina_service, root = _oficina()
     try:
-        result = oficina_service.cancel(oficina_config.default_root(), run_id)
+        result = oficina_service.cancel(root, run_id)
         return json.dumps(result)
-    except UnknownRunError:
+    except oficina_service.UnknownRunError:
         return f"Error: unknown run_id {run_id!r}"
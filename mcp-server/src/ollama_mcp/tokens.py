@@ -0,0 +1,207 @@
+"""Token counting with the models' own tokenizer — replacing the chars/4 estimates.
+
+Four places sized things by ``len(text) / 4``: oficina's input-fit guard (T-112), the edit-mode
+generation budget (E-D9), the overlay merge's ``fit_num_ctx`` and the call log's
+``claude_tokens_est``. Four characters per token is a prose figure. Code tokenizes differently —
+indentation runs, operators and identifiers split unlike English words — so the guard aborted
+runs that fit and let others overflow the window.
+
+**One vocabulary.** Every persona here is built on the Qwen2.5 / Qwen3 family, which share a
+single byte-level BPE vocabulary, so one tokenizer counts for all of them. Its files are read
+from ``TOKENIZER_PATH``: a ``tokenizer.json`` (or a ``vocab.json`` + ``merges.txt`` pair) as
+published with the base model — copy them once from any Qwen2.5/Qwen3 checkpoint. Nothing is
+downloaded.
+
+**Three backends, best available wins:**
+
+- ``tokenizers`` — Hugging Face's Rust tokenizer, when that package is installed (optional);
+- ``bpe`` — a small pure-Python byte-level BPE over the same files (exact for ordinary text;
+  special-token strings are counted as text);
+- ``approx`` — no files at all: pre-tokenize with the Qwen split pattern and charge each
+  piece ``ceil(len/4)``, min 1. Still an estimate, but one that sees indentation and
+  punctuation as the tokenizer does; ``make bench-tokens`` reports its error.
+
+`count` memoizes by text hash, because the callers recount the same stable prompt parts
+every iteration.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import hashlib
+import json
+import math
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ollama_mcp.config import TOKENIZER_PATH
+
+# The Qwen2 pre-tokenizer split, with ``\p{L}`` / ``\p{N}`` spelled in stdlib ``re`` terms
+# (``[^\W\d_]`` is a letter, ``\d`` a digit) so no ``regex`` dependency is needed.
+_PRETOKEN = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+_CACHE_ENTRIES = 4096
+
+
+def approximate(text: str) -> int:
+    """A file-free estimate: per pre-token piece, ``ceil(len / 4)`` with a floor of 1."""
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _PRETOKEN.findall(text))
+
+
+@functools.lru_cache(maxsize=1)
+def _byte_alphabet() -> Dict[int, str]:
+    """GPT-2's byte → printable-character table, which byte-level BPE vocabularies use."""
+    printable = (
+        list(range(ord("!"), ord("~") + 1))
+        + list(range(ord("¡"), ord("¬") + 1))
+        + list(range(ord("®"), ord("ÿ") + 1))
+    )
+    chars = printable[:]
+    extra = 0
+    for b in range(256):
+        if b not in printable:
+            printable.append(b)
+            chars.append(256 + extra)
+            extra += 1
+    return {b: chr(c) for b, c in zip(printable, chars)}
+
+
+class _BytePairEncoder:
+    """Byte-level BPE over a vocabulary and its ranked merges — counting only, no ids."""
+
+    def __init__(self, vocab: Dict[str, int], merges: List[Tuple[str, str]]) -> None:
+        self._vocab = vocab
+        self._ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self._alphabet = _byte_alphabet()
+        self._piece_tokens = functools.lru_cache(maxsize=65536)(self._bpe)
+
+    def _bpe(self, piece: str) -> int:
+        if piece in self._vocab:
+            return 1
+        word = list(piece)
+        while len(word) > 1:
+            # The lowest-ranked adjacent pair is merged everywhere it occurs, then repeat.
+            first, second = min(zip(word, word[1:]), key=lambda p: self._ranks.get(p, math.inf))
+            if (first, second) not in self._ranks:
+                break
+            merged: List[str] = []
+            i = 0
+            while i < len(word):
+                if i < len(word) - 1 and word[i] == first and word[i + 1] == second:
+                    merged.append(first + second)
+                    i += 2
+                else:
+                    merged.append(word[i])
+                    i += 1
+            word = merged
+        return len(word)
+
+    def count(self, text: str) -> int:
+        alphabet = self._alphabet
+        return sum(
+            self._piece_tokens("".join(alphabet[b] for b in piece.encode("utf-8")))
+            for piece in _PRETOKEN.findall(text)
+        )
+
+
+def _load_bpe(path: Path) -> Optional[_BytePairEncoder]:
+    """Read ``tokenizer.json``, or ``vocab.json`` + ``merges.txt``, from ``path`` (file or dir)."""
+    if not path.exists():
+        return None
+    directory = path if path.is_dir() else path.parent
+    spec = path if path.is_file() else directory / "tokenizer.json"
+    if spec.is_file():
+        model = json.loads(spec.read_text(encoding="utf-8"))["model"]
+        vocab, raw = model["vocab"], model["merges"]
+    elif (directory / "vocab.json").is_file() and (directory / "merges.txt").is_file():
+        vocab = json.loads((directory / "vocab.json").read_text(encoding="utf-8"))
+        raw = [
+            line for line in (directory / "merges.txt").read_text(encoding="utf-8").splitlines()
+            if line and not line.startswith("#version")
+        ]
+    else:
+        return None
+    # Older files store a merge as "a b", newer ones as ["a", "b"].
+    merges = [tuple(m.split(" ", 1)) if isinstance(m, str) else tuple(m) for m in raw]
+    return _BytePairEncoder(vocab, merges)
+
+
+def _load_fast(path: Path) -> Optional[Callable[[str], int]]:
+    """The Rust tokenizer, if the optional ``tokenizers`` package and a tokenizer.json exist."""
+    spec = path if path.is_file() else path / "tokenizer.json"
+    if not spec.is_file():
+        return None
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        return None
+    tokenizer = Tokenizer.from_file(str(spec))
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+class TokenCounter:
+    """Counts tokens with the best backend available for the files at ``path``."""
+
+    def __init__(self, path: str | Path = TOKENIZER_PATH) -> None:
+        self.path = Path(path).expanduser()
+        self.backend = "approx"
+        self._count: Callable[[str], int] = approximate
+        try:
+            fast = _load_fast(self.path)
+            if fast is not None:
+                self.backend, self._count = "tokenizers", fast
+            else:
+                bpe = _load_bpe(self.path)
+                if bpe is not None:
+                    self.backend, self._count = "bpe", bpe.count
+        except Exception:  # unreadable or malformed files: estimate rather than fail
+            self.backend, self._count = "approx", approximate
+        self._memo: "collections.OrderedDict[str, int]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def exact(self) -> bool:
+        return self.backend != "approx"
+
+    def count(self, text: str) -> int:
+        """Tokens in ``text`` (memoized by content hash)."""
+        if not text:
+            return 0
+        key = hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        n = self._count(text)
+        with self._lock:
+            self._memo[key] = n
+            while len(self._memo) > _CACHE_ENTRIES:
+                self._memo.popitem(last=False)
+        return n
+
+
+_COUNTER: Optional[TokenCounter] = None
+
+
+def counter() -> TokenCounter:
+    """The process-wide counter, loaded on first use."""
+    global _COUNTER
+    if _COUNTER is None:
+        _COUNTER = TokenCounter()
+    return _COUNTER
+
+
+def count(text: str) -> int:
+    """Tokens in ``text`` for the Qwen-family personas (exact when tokenizer files exist)."""
+    return counter().count(text)
@@ -0,0 +1,323 @@
+"""Segment-level translation memory for the `translate` tool.
+
+`translate` sent the whole text to the translator on every call. Most of our translations
+are re-runs: a doc that changed in two paragraphs, UI strings that repeat across files. This
+module remembers translations per SEGMENT (a paragraph — text between blank lines) and
+`server.translate` only generates the segments it has not seen:
+
+- **The key** is ``(source language, target language, model, normalized segment)`` hashed to
+  16 bytes. Normalization collapses whitespace runs, so a re-wrapped paragraph still hits;
+  the leading and trailing whitespace of each segment is kept from the input, never stored.
+  An auto-detected source language is its own key (``auto``).
+- **Misses go in one prompt** per batch of up to ``TM_BATCH_TOKENS``, each under a stable
+  ``<<<SEG n>>>`` delimiter line the model is asked to echo; the reply is split on the same
+  lines and the text reassembled with the input's own separators. A segment missing from the
+  reply is re-asked alone, so a model that drops a delimiter costs a call, not a wrong answer.
+  A single miss is asked with the plain prompt, exactly as before.
+- **The store** is one SQLite file (``TM_PATH``) shared by every bridge: key, translation and
+  a last-used time per row, nothing else. Past ``TM_MB`` of translations the least recently
+  used rows are deleted down to 90% of the bound.
+
+Hit and miss counters are per process and reported by the ``cache_stats`` tool. Every store
+failure is a miss, never an error: the memory must not break `translate`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ollama_mcp import tokens
+from ollama_mcp.config import TM_BATCH_TOKENS, TM_MB, TM_PATH
+
+# A segment boundary: a blank line (whitespace-only lines included), kept verbatim.
+_SEPARATOR = re.compile(r"(\n[ \t]*\n\s*)")
+_DELIMITER = re.compile(r"^<<<SEG (\d+)>>>[ \t]*$", re.MULTILINE)
+
+
+def normalize(segment: str) -> str:
+    return " ".join(segment.split())
+
+
+def key(source: Optional[str], target: str, model: str, segment: str) -> bytes:
+    material = "\0".join(
+        ((source or "auto").lower(), target.lower(), model, normalize(segment))
+    )
+    return hashlib.sha256(material.encode("utf-8")).digest()[:16]
+
+
+@dataclass
+class Segment:
+    """One translatable span: ``lead + core + trail`` is the original text."""
+
+    lead: str
+    core: str
+    trail: str
+
+
+def split(text: str) -> List[str | Segment]:
+    """``text`` as separators (str, kept verbatim) and Segments, in order.
+
+    A span with nothing to translate (no letters: rules, numbers, blank) stays a str.
+    """
+    parts: List[str | Segment] = []
+    for n, piece in enumerate(_SEPARATOR.split(text)):
+        core = piece.strip()
+        if n % 2 or not any(ch.isalpha() for ch in core):
+            parts.append(piece)
+            continue
+        start = piece.index(core)
+        parts.append(Segment(piece[:start], core, piece[start + len(core):]))
+    return parts
+
+
+def batch_prompt(segments: Sequence[str], source: Optional[str], target: str) -> str:
+    pair = f"from {source} to {target}" if source else f"to {target}"
+    body = "\n".join(f"<<<SEG {n}>>>\n{seg}" for n, seg in enumerate(segments, 1))
+    return (
+        f"Translate each segment below {pair}. Every segment starts with a delimiter "
+        "line like <<<SEG 1>>>. Reply with the same delimiter lines, in the same order, "
+        "each followed by that segment's translation and nothing else.\n\n" + body
+    )
+
+
+def parse_batch(reply: str, count: int) -> Dict[int, str]:
+    """Segment number → translation for every delimiter found in ``reply`` (1-based)."""
+    found: Dict[int, str] = {}
+    marks = list(_DELIMITER.finditer(reply))
+    for mark, following in zip(marks, marks[1:] + [None]):
+        n = int(mark.group(1))
+        end = following.start() if following is not None else len(reply)
+        text = reply[mark.end():end].strip()
+        if 1 <= n <= count and text and n not in found:
+            found[n] = text
+    return found
+
+
+@dataclass
+class MemoryStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        rate = round(self.hits / total, 3) if total else 0.0
+        return {**asdict(self), "hit_rate": rate}
+
+
+class TranslationMemory:
+    """Segment translations in one SQLite file, evicted least recently used by bytes."""
+
+    def __init__(
+        self, path: str | Path = TM_PATH, *, max_bytes: int = int(TM_MB * 1024 * 1024)
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.max_bytes = max_bytes
+        self.stats = MemoryStats()
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                " key BLOB PRIMARY KEY, target TEXT NOT NULL, used REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tm_used ON tm (used)")
+            self._db = db
+        return self._db
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, str]:
+        """The stored translations among ``keys``; marks them used. Counts hits and misses."""
+        found: Dict[bytes, str] = {}
+        if self.enabled and keys:
+            try:
+                with self._lock:
+                    db = self._conn()
+                    unique = list(dict.fromkeys(keys))
+                    for i in range(0, len(unique), 500):
+                        chunk = unique[i:i + 500]
+                        marks = ",".join("?" * len(chunk))
+                        found.update(db.execute(
+                            f"SELECT key, target FROM tm WHERE key IN ({marks})", chunk
+                        ).fetchall())
+                    now = time.time()
+                    with db:
+                        db.executemany(
+                            "UPDATE tm SET used = ? WHERE key = ?", [(now, k) for k in found]
+                        )
+            except (sqlite3.Error, OSError):
+                found = {}
+        hits = sum(1 for k in keys if k in found)
+        with self._lock:
+            self.stats.hits += hits
+            self.stats.misses += len(keys) - hits
+        return found
+
+    def put_many(self, rows: Sequence[Tuple[bytes, str]]) -> None:
+        if not self.enabled or not rows:
+            return
+        try:
+            with self._lock:
+                db = self._conn()
+                now = time.time()
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO tm (key, target, used) VALUES (?, ?, ?)",
+                        [(k, text, now) for k, text in rows],
+                    )
+                self.stats.stores += len(rows)
+                if self._bytes is None:
+                    self._bytes = self._measure(db)
+                else:
+                    self._bytes += sum(len(text.encode("utf-8")) for _, text in rows)
+                if self._bytes > self.max_bytes:
+                    self._evict(db)
+        except (sqlite3.Error, OSError):
+            pass
+
+    @staticmethod
+    def _measure(db: sqlite3.Connection) -> int:
+        sql = "SELECT COALESCE(SUM(LENGTH(CAST(target AS BLOB))), 0) FROM tm"
+        return db.execute(sql).fetchone()[0]
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Delete the least recently used rows until under 90% of the bound.
+
+        The file is shared with other bridges, so the size is re-measured here rather than
+        trusted from this process's running total.
+        """
+        total = self._measure(db)
+        target = int(self.max_bytes * 0.9)
+        doomed: List[bytes] = []
+        for row_key, size in db.execute(
+            "SELECT key, LENGTH(CAST(target AS BLOB)) FROM tm ORDER BY used"
+        ):
+            if total <= target:
+                break
+            doomed.append(row_key)
+            total -= size
+        with db:
+            db.executemany("DELETE FROM tm WHERE key = ?", [(k,) for k in doomed])
+        self.stats.evictions += len(doomed)
+        self._bytes = total
+
+    def snapshot(self) -> Dict[str, object]:
+        """Counters plus the store's size, for the ``cache_stats`` tool."""
+        info: Dict[str, object] = {"enabled": self.enabled, **self.stats.as_dict()}
+        if self.enabled:
+            try:
+                with self._lock:
+                    db = self._conn()
+                    info["entries"] = db.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+                    info["bytes"] = self._measure(db)
+            except (sqlite3.Error, OSError):
+                pass
+            info["path"] = str(self.path)
+        return info
+
+
+_MEMORY: Optional[TranslationMemory] = None
+
+
+def get_memory() -> TranslationMemory:
+    """The process-wide translation memory (built from config on first use)."""
+    global _MEMORY
+    if _MEMORY is None:
+        _MEMORY = TranslationMemory()
+    return _MEMORY
+
+
+def single_prompt(text: str, source: Optional[str], target: str) -> str:
+    """The translate tool's one-text prompt."""
+    if source:
+        return f"Translate the following text from {source} to {target}:\n\n{text}"
+    return f"Translate the following text to {target}:\n\n{text}"
+
+
+def _batches(cores: Sequence[str]) -> List[List[int]]:
+    """Indexes of ``cores`` grouped into batches of at most ``TM_BATCH_TOKENS``."""
+    batches: List[List[int]] = []
+    used = 0
+    for i, core in enumerate(cores):
+        n = tokens.count(core)
+        if not batches or (batches[-1] and used + n > TM_BATCH_TOKENS):
+            batches.append([])
+            used = 0
+        batches[-1].append(i)
+        used += n
+    return batches
+
+
+async def translate(
+    client: Any,
+    text: str,
+    *,
+    target: str,
+    source: Optional[str] = None,
+    model: str,
+    concurrency: int = 1,
+    tool: str = "translate",
+) -> str:
+    """Translate ``text`` segment by segment, generating only what the memory lacks.
+
+    Ollama errors propagate; a segment the model leaves out of a batch reply is re-asked
+    on its own.
+    """
+    memory = get_memory()
+    parts = split(text)
+    segments = [p for p in parts if isinstance(p, Segment)]
+    keys = [key(source, target, model, s.core) for s in segments]
+    done = await asyncio.to_thread(memory.get_many, keys)
+    todo = list({k: s.core for k, s in zip(keys, segments) if k not in done}.items())
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def _ask(prompt: str) -> str:
+        async with slots:
+            response = await client.chat(prompt=prompt, model=model, think=False, tool=tool)
+        return response.content.strip()
+
+    async def _batch(indexes: List[int]) -> Dict[bytes, str]:
+        cores = [todo[i][1] for i in indexes]
+        if len(cores) == 1:
+            return {todo[indexes[0]][0]: await _ask(single_prompt(cores[0], source, target))}
+        found = parse_batch(await _ask(batch_prompt(cores, source, target)), len(cores))
+        lost = [n for n in range(1, len(cores) + 1) if n not in found]
+        retried = await asyncio.gather(
+            *(_ask(single_prompt(cores[n - 1], source, target)) for n in lost)
+        )
+        found.update(zip(lost, retried))
+        return {todo[i][0]: found[n] for n, i in enumerate(indexes, 1)}
+
+    fresh: Dict[bytes, str] = {}
+    for result in await asyncio.gather(*(_batch(b) for b in _batches([c for _, c in todo]))):
+        fresh.update(result)
+    await asyncio.to_thread(memory.put_many, list(fresh.items()))
+    done.update(fresh)
+
+    out: List[str] = []
+    segment_keys = iter(keys)
+    for part in parts:
+        if isinstance(part, Segment):
+            out.append(part.lead + done[next(segment_keys)] + part.trail)
+        else:
+            out.append(part)
+    return "".join(out)
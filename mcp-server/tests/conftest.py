@@ -4,6 +4,43 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _no_model_gate(monkeypatch) -> None:
+    """Keep every test off the real model-call gate (T-88) — and never spawn one.
+
+    Tests that exercise the gate pass an explicit tmp socket path instead.
+    """
+    monkeypatch.setattr("ollama_mcp.gate.GATE_SOCKET", "")
+
+
+@pytest.fixture(autouse=True)
+def _no_response_cache(monkeypatch, tmp_path) -> None:
+    """Never serve a test from (or write it into) the machine's real response cache,
+    whatever OLLAMA_RESPONSE_CACHE says. Cache tests install an enabled one of their own.
+    """
+    from ollama_mcp import response_cache
+
+    monkeypatch.setattr(
+        response_cache, "_CACHE", response_cache.ResponseCache(tmp_path / "cache", enabled=False)
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_translation_memory(monkeypatch, tmp_path) -> None:
+    """Give each test an empty translation memory of its own, never the machine's."""
+    from ollama_mcp import transmem
+
+    monkeypatch.setattr(
+        transmem, "_MEMORY", transmem.TranslationMemory(tmp_path / "translation-memory.db")
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_embed_index(monkeypatch, tmp_path) -> None:
+    """Never answer classify_text from (or build into) the machine's real category indexes."""
+    monkeypatch.setattr("ollama_mcp.embedindex.EMBED_INDEX_DIR", str(tmp_path / "embed-index"))
+
+
 @pytest.fixture
 def repo_root() -> pathlib.Path:
     return pathlib.Path(__file__).parent.parent.parent
@@ -0,0 +1,89 @@
+"""Tests for oficina.catalog — the run catalog behind runs / prune / run_status / run_result.
+
+Synchronous tests (plain ``def``), not async. The contract: the read verbs answer from the
+catalog without re-reading ledgers or re-walking artifacts they already know, a ledger that
+grew behind the catalog's back is caught up on the next read, and ``reindex`` rebuilds it.
+"""
+
+import json
+import os
+
+import pytest
+
+from ollama_mcp.oficina import catalog as catalog_mod
+from ollama_mcp.oficina import cli, service
+from ollama_mcp.oficina.catalog import Catalog
+from ollama_mcp.oficina.config import RetentionConfig
+from ollama_mcp.oficina.ledger import Ledger
+from ollama_mcp.oficina.retention import sweep
+from ollama_mcp.oficina.store import Store
+
+
+def _run(tmp_path, model="my-python-q3"):
+    """A completed run whose events all went through the catalog hook."""
+    run_id = service.submit(
+        tmp_path, {"deliverable": {"kind": "answer"}, "objective": "q"},
+        ensure_worker=lambda root: None,
+    )["run_id"]
+    ledger = Catalog(tmp_path).run_ledger(run_id)
+    ledger.generation_started({"model": "auto"})
+    ledger.generation_finished({"model": model})
+    (Store(tmp_path).artifacts_dir(run_id) / "out.txt").write_text("12345")
+    ledger.delivered({"report": {"summary": "done"}, "deliverable": {"kind": "answer"}})
+    return run_id
+
+
+def test_rows_follow_appends_through_the_hook(tmp_path):
+    run_id = _run(tmp_path)
+    row = Catalog(tmp_path)._load(run_id)
+    assert (row.state, row.phase, row.model, row.next_offset) == (
+        "completed", "delivered", "my-python-q3", 4,
+    )
+    assert row.terminal == {"Delivered": 3} and row.submitted_at <= row.updated_at
+    assert row.ledger_bytes == Store(tmp_path).events_path(run_id).stat().st_size
+
+
+def test_read_verbs_answer_without_rereading_ledgers_or_artifacts(tmp_path, monkeypatch):
+    run_id = _run(tmp_path)
+    first = service.list_runs(tmp_path)
+    assert first[0]["artifacts_bytes"] == 5 and first[0]["prune_eligible"] is True
+
+    reads = []
+    real_read = Ledger.read
+    monkeypatch.setattr(Ledger, "read", lambda self, k=0: reads.append(k) or real_read(self, k))
+    monkeypatch.setattr(catalog_mod, "_tree_bytes", lambda d: pytest.fail("re-walked"))
+
+    assert service.list_runs(tmp_path) == first
+    assert service.result(tmp_path, run_id)["report"] == {"summary": "done"}
+    assert service.status(tmp_path, run_id, since_offset=4)["state"] == "completed"
+    assert reads == [3, 4]  # the Delivered line for the report, the empty status slice
+
+
+def test_changes_behind_the_catalog_are_caught_up(tmp_path):
+    run_id = _run(tmp_path)
+    service.list_runs(tmp_path)
+    store = Store(tmp_path)
+    Ledger(store.events_path(run_id)).judged({"verdict": "pass"})  # no hook
+    artifact = store.artifacts_dir(run_id) / "late.txt"
+    artifact.write_text("1234567890")
+    os.utime(store.artifacts_dir(run_id), ns=(1, 1))  # the dir moved, whatever the clock
+
+    summary = service.list_runs(tmp_path)[0]
+    assert summary["artifacts_bytes"] == 15
+    assert Catalog(tmp_path)._load(run_id).next_offset == 5
+
+
+def test_prunes_are_recorded_and_reindex_rebuilds(tmp_path, capsys):
+    run_id = _run(tmp_path)
+    service.list_runs(tmp_path)
+    store = Store(tmp_path)
+    os.utime(store.run_dir(run_id), (1000, 1000))
+    config = RetentionConfig(artifacts_keep_runs=10, workspaces_ttl_days=1)
+    records = sweep(store, Ledger(tmp_path / "worker-events.jsonl"), config)
+    assert [(r.what, r.bytes_freed) for r in records] == [("artifacts", 5)]
+    assert service.list_runs(tmp_path)[0]["artifacts_bytes"] == 0
+
+    Catalog(tmp_path)._conn().execute("DELETE FROM runs").connection.commit()
+    assert cli.cmd_reindex(tmp_path) == 0
+    assert json.loads(capsys.readouterr().out) == {"runs": 1}
+    assert Catalog(tmp_path)._load(run_id).state == "completed"
@@ -83,3 +83,58 @@ def test_push_returns_marker_name(tmp_path):
     fifo = Fifo(tmp_path)
     name = fifo.push("run1", now_ms=1000)
     assert isinstance(name, str) and (fifo.queue_dir / name).exists()
+
+
+def test_claiming_pop_moves_the_marker_to_the_claimant(tmp_path):
+    """A claimant's pop renames the marker into claimed/<claimant>/ until done."""
+    fifo = Fifo(tmp_path)
+    name = fifo.push("run1", now_ms=1000)
+    assert fifo.pop("w1") == "run1"
+    assert fifo.claims("w1") == [name] and fifo._markers() == []
+    fifo.done("w1", "run1")
+    assert fifo.claims("w1") == []
+
+
+def test_two_workers_never_claim_the_same_run(tmp_path):
+    """A marker another worker already took is skipped, not returned twice."""
+    first, second = Fifo(tmp_path), Fifo(tmp_path)
+    first.push("a", now_ms=1)
+    first.push("b", now_ms=2)
+    markers = second._markers()
+    assert first.pop("w1") == "a"
+    second._markers = lambda: markers  # second listed the queue before first's claim
+    assert second.pop("w2") == "b"
+    assert second.pop("w2") is None
+
+
+def test_claim_takes_a_named_marker_once(tmp_path):
+    """claim() takes one specific marker; a second claim of it fails."""
+    fifo = Fifo(tmp_path)
+    fifo.push("a", now_ms=1)
+    name = fifo.push("b", now_ms=2)
+    assert fifo.claim(name, "w1") is True
+    assert fifo.claim(name, "w2") is False
+    assert fifo.claims("w1") == [name] and fifo.pop() == "a"
+
+
+def test_taken_claims_requeue_at_their_old_place(tmp_path):
+    """A claim moved to a new claimant and requeued pops before later runs."""
+    fifo = Fifo(tmp_path)
+    fifo.push("early", now_ms=1)
+    fifo.pop("dead")
+    fifo.push("late", now_ms=2)
+    [marker] = fifo.claims("dead")
+    assert fifo.take("dead", marker, "live") is True
+    assert fifo.take("dead", marker, "other") is False  # already taken
+    fifo.requeue("live", marker)
+    fifo.retire("dead")
+    assert "dead" not in fifo.claimants()
+    assert fifo.pop() == "early"
+
+
+def test_an_unrenamed_push_is_not_a_marker(tmp_path):
+    """A push's .tmp file is never popped."""
+    fifo = Fifo(tmp_path)
+    fifo.queue_dir.mkdir()
+    (fifo.queue_dir / "1-half.tmp").touch()
+    assert fifo.pop() is None
@@ -131,3 +131,37 @@ def test_default_coder_explicit_num_predict_wins(monkeypatch):
     default_coder(num_predict=512, timeout=60)("p", "m", "run-2")
 
     assert _FakeClient.captured["num_predict"] == 512
+
+
+class _FakeStream:
+    """Stands in for ChatStream: yields a reply in pieces, then exposes the response."""
+
+    def __init__(self):
+        self.response = None
+
+    async def __aiter__(self):
+        for piece in ("```python\n", "x = 1\n", "```"):
+            yield piece
+        self.response = _FakeResponse()
+
+
+class _FakeStreamingClient(_FakeClient):
+    async def chat(self, **kwargs):
+        raise AssertionError("a stream_to call must stream, not wait for the whole reply")
+
+    def chat_stream(self, **kwargs):
+        _FakeClient.captured = kwargs
+        return _FakeStream()
+
+
+def test_stream_to_grows_the_reply_on_disk_and_returns_the_same_result(monkeypatch, tmp_path):
+    """A ``stream: true`` run's coder writes the raw reply to its stream file as it arrives;
+    the GenerationResult is the same shape (fences stripped, call_id carried) as unstreamed."""
+    monkeypatch.setattr("ollama_mcp.client.OllamaClient", _FakeStreamingClient)
+    sink = tmp_path / "stream.partial"
+
+    gen = default_coder(timeout=60, stream_to=sink)("p", "m", "run-3")
+
+    assert sink.read_text() == "```python\nx = 1\n```"
+    assert gen.content.strip() == "x = 1" and gen.call_id == "abc123def456"
+    assert _FakeClient.captured["priority"] == "batch"
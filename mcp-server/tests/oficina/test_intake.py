@@ -19,6 +19,7 @@ from ollama_mcp.oficina.intake import (
     RULE_FILE_WITHOUT_TARGET,
     RULE_LANGUAGE_NOT_SUPPORTED,
     RULE_OBJECTIVE_MISSING,
+    RULE_PRIORITY_NOT_INT,
     RULE_TARGET_NOT_GIT_REPO,
     RULE_UNKNOWN_KEY,
     RULE_UNKNOWN_KIND,
@@ -191,6 +192,15 @@ def test_in_place_workspace_accepted():
     accepts(spec)
 
 
+def test_priority_must_be_an_integer():
+    """spec.priority is a known key; an int is accepted, anything else names the rule."""
+    spec = an_answer_spec()
+    spec["priority"] = 5
+    accepts(spec)
+    spec["priority"] = "high"
+    rejects(spec, with_rule=RULE_PRIORITY_NOT_INT)
+
+
 # --- Context-file existence -------------------------------------------------
 
 
@@ -232,3 +232,82 @@ def test_corruption_on_earlier_line_raises(tmp_path):
     ledger = Ledger(tmp_path / "events.jsonl")
     with pytest.raises(LedgerCorruptionError):
         ledger.read()
+
+
+def test_appends_do_not_rescan_the_ledger(tmp_path, monkeypatch):
+    """Once the tail is known, appends never re-read the file (O(1) in ledger length)."""
+    from ollama_mcp.oficina import ledger as ledger_mod
+
+    ledger = Ledger(tmp_path / "events.jsonl")
+    for n in range(3):
+        ledger.worker_started({"n": n})
+
+    def _no_scan(*args):
+        raise AssertionError("full scan on append")
+
+    monkeypatch.setattr(ledger_mod, "_read_valid_events", _no_scan)
+    monkeypatch.setattr(ledger_mod, "_valid_prefix_bytes", _no_scan)
+    assert Ledger(tmp_path / "events.jsonl").worker_started({})["offset"] == 3
+    assert ledger.worker_stopped({})["offset"] == 4
+
+
+def test_interleaved_writers_keep_offsets_sequential(tmp_path):
+    """An append by another instance is noticed by file size; offsets stay line indexes."""
+    path = tmp_path / "events.jsonl"
+    surface, worker = Ledger(path), Ledger(path)
+    surface.run_submitted({})
+    worker.generation_started({})
+    surface.cancelled({})
+    worker.failed({"big": "x" * 200_000})  # a last line longer than the tail window
+    assert Ledger(path).worker_stopped({})["offset"] == 4
+    assert [e["offset"] for e in worker.read()] == [0, 1, 2, 3, 4]
+
+
+def test_read_since_offset_seeks_through_the_index(tmp_path, monkeypatch):
+    """read(k) on a long ledger parses only lines >= k, found via the sidecar index."""
+    from ollama_mcp.oficina import ledger as ledger_mod
+
+    ledger = Ledger(tmp_path / "events.jsonl")
+    for n in range(200):
+        ledger.worker_started({"n": n})
+    assert ledger.index_path.stat().st_size == 4 * 8  # offsets 0, 64, 128, 192
+
+    parsed = []
+    real_parse = ledger_mod._parse_envelopes
+    monkeypatch.setattr(
+        ledger_mod, "_parse_envelopes", lambda text: parsed.append(text) or real_parse(text)
+    )
+    events = ledger.read(since_offset=150)
+    assert [e["offset"] for e in events] == list(range(150, 200))
+    assert parsed[0].count("\n") == 50
+    assert ledger.read(since_offset=500) == []
+
+
+def test_a_stale_index_falls_back_to_the_full_read(tmp_path):
+    """An index that disagrees with the ledger is ignored, never trusted."""
+    ledger = Ledger(tmp_path / "events.jsonl")
+    for n in range(130):
+        ledger.worker_started({"n": n})
+    ledger.index_path.write_bytes(b"\0" * 8 + (7).to_bytes(8, "little"))
+    assert [e["offset"] for e in ledger.read(since_offset=100)] == list(range(100, 130))
+    ledger.index_path.unlink()
+    assert len(ledger.read(since_offset=100)) == 30
+
+
+def test_shared_ledger_appends_never_repeat_an_offset(tmp_path):
+    """Concurrent writers of a shared ledger (the worker pool's) keep offsets unique."""
+    import threading
+
+    path = tmp_path / "worker-events.jsonl"
+
+    def _writer(n):
+        ledger = Ledger(path, shared=True)
+        for i in range(100):
+            ledger.worker_started({"writer": n, "i": i})
+
+    threads = [threading.Thread(target=_writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [e["offset"] for e in Ledger(path).read()] == list(range(400))
@@ -0,0 +1,93 @@
+"""Tests for oficina.runtime — the worker's one long-lived loop and client.
+
+Synchronous tests (plain ``def``), like the rest of the worker suite: the point of the
+runtime is that its callers are sync. The client is a fake patched in where the runtime
+imports it, so "one client for the worker's life" is countable.
+"""
+
+import threading
+
+import pytest
+
+from ollama_mcp.oficina import runtime, transport
+from ollama_mcp.oficina.ledger import Ledger
+from ollama_mcp.oficina.runtime import CallRuntime, installed, run_call
+from ollama_mcp.oficina.worker import Worker
+
+
+class _CountingClient:
+    """Stands in for OllamaClient; counts constructions and closes."""
+
+    made = 0
+    closed = 0
+
+    def __init__(self):
+        _CountingClient.made += 1
+
+    async def close(self):
+        _CountingClient.closed += 1
+
+
+def _reset(monkeypatch):
+    _CountingClient.made = _CountingClient.closed = 0
+    monkeypatch.setattr("ollama_mcp.client.OllamaClient", _CountingClient)
+
+
+async def _whoami(client):
+    return client, threading.current_thread().name
+
+
+def test_without_a_runtime_each_call_gets_a_throwaway_client(monkeypatch):
+    _reset(monkeypatch)
+    first, _ = run_call(_whoami)
+    second, _ = run_call(_whoami)
+    assert first is not second
+    assert _CountingClient.made == 2 and _CountingClient.closed == 2
+
+
+def test_installed_runtime_serves_every_call_with_one_client_on_one_thread(monkeypatch):
+    _reset(monkeypatch)
+    with installed(CallRuntime()) as rt:
+        results = [run_call(_whoami) for _ in range(3)]
+        assert rt.stats()["calls"] == 3
+    clients = {id(c) for c, _ in results}
+    threads = {t for _, t in results}
+    assert len(clients) == 1 and threads == {"oficina-calls"}
+    assert _CountingClient.made == 1 and _CountingClient.closed == 1
+    assert runtime._ACTIVE is None
+
+
+def test_errors_raised_on_the_loop_reach_the_sync_caller(monkeypatch):
+    _reset(monkeypatch)
+
+    async def boom(client):
+        raise ValueError("from the loop")
+
+    with installed(CallRuntime()):
+        with pytest.raises(ValueError, match="from the loop"):
+            run_call(boom)
+
+
+def test_worker_reports_runtime_costs_on_its_ledger(tmp_path, monkeypatch):
+    _reset(monkeypatch)
+    Worker(tmp_path).run()
+    events = {e["event"]: e for e in Ledger(tmp_path / "worker-events.jsonl").read()}
+    started, stopped = events["WorkerStarted"], events["WorkerStopped"]
+    assert started["payload"]["runtime_startup_ms"] >= 0
+    assert {"calls", "call_overhead_ms_mean", "call_overhead_ms_max"} <= set(stopped["payload"])
+
+
+def test_context_limit_is_fetched_once_per_model_but_absence_is_not_cached(monkeypatch):
+    fetched = []
+    replies = {"known": {"parameters": "num_ctx 16384"}, "unknown": None}
+
+    def fake_fetch(model):
+        fetched.append(model)
+        return replies[model]
+
+    monkeypatch.setattr(transport, "_fetch_model_descriptor", fake_fetch)
+    monkeypatch.setattr(transport, "_CONTEXT_LIMITS", {})
+
+    assert [transport.model_context_limit("known") for _ in range(3)] == [16384] * 3
+    assert [transport.model_context_limit("unknown") for _ in range(2)] == [None, None]
+    assert fetched == ["known", "unknown", "unknown"]
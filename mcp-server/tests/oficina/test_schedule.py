@@ -0,0 +1,137 @@
+"""Tests for oficina.schedule — model-affinity reordering within a bounded window.
+
+Synchronous tests (plain ``def``), not async. ``rank`` is pure, so most of the policy is
+tested on hand-built candidates; the rest goes through a real queue and worker.
+"""
+
+import time
+
+from ollama_mcp.oficina import schedule as schedule_mod
+from ollama_mcp.oficina.config import ScheduleConfig
+from ollama_mcp.oficina.ledger import Ledger
+from ollama_mcp.oficina.schedule import Candidate, Scheduler, rank
+from ollama_mcp.oficina.store import Store
+from ollama_mcp.oficina.transport import GenerationResult
+from ollama_mcp.oficina.worker import Worker
+
+PY, GO = "my-python-q25c14-16k", "my-go-q25c14-16k"
+
+
+def _queue(*models, **fields):
+    """Candidates in FIFO order, one per model, named r0, r1, ..."""
+    return [
+        Candidate(f"{n}-r{n}", f"r{n}", model, **fields) for n, model in enumerate(models)
+    ]
+
+
+def _picks(candidates, resident, **config):
+    return [d.candidate.run_id for d in rank(candidates, resident, ScheduleConfig(**config))]
+
+
+def test_resident_model_runs_first_then_fifo():
+    """Runs for the resident model go ahead; each group keeps submission order."""
+    assert _picks(_queue(PY, GO, PY, GO), GO) == ["r1", "r3", "r0", "r2"]
+    assert _picks(_queue(PY, GO, PY, GO), None) == ["r0", "r1", "r2", "r3"]
+    assert _picks(_queue(PY, GO), f"{GO}:latest") == ["r1", "r0"]  # tag-insensitive
+
+
+def test_reordering_never_reaches_past_the_window():
+    """A resident-model run outside the window cannot jump the runs inside it."""
+    assert _picks(_queue(PY, PY, GO), GO, window=2) == ["r0", "r1"]
+
+
+def test_aged_runs_go_first_whatever_their_model():
+    """A run queued past max_wait_s is not starved by the resident model's backlog."""
+    queue = _queue(PY, GO, GO)
+    queue[0] = Candidate("0-r0", "r0", PY, waited_s=601)
+    decision = rank(queue, GO, ScheduleConfig(max_wait_s=600))[0]
+    assert (decision.candidate.run_id, decision.reason) == ("r0", "aged")
+
+
+def test_priority_then_affinity_outrank_residency():
+    """spec.priority beats everything but aging; slot affinity beats residency."""
+    queue = _queue(GO, PY) + [Candidate("2-r2", "r2", PY, priority=1)]
+    assert _picks(queue, GO) == ["r2", "r0", "r1"]
+    queue = _queue(GO) + [Candidate("1-r1", "r1", PY, preferred=True)]
+    assert _picks(queue, GO) == ["r1", "r0"]
+
+
+def test_decisions_say_why_and_what_they_passed():
+    """The pick carries its reason, the resident model and the runs it went ahead of."""
+    first = rank(_queue(PY, PY, GO), GO, ScheduleConfig())[0]
+    assert first.payload() == {
+        "model": GO, "reason": "resident", "resident": GO, "priority": 0,
+        "waited_s": 0.0, "passed_over": 2, "window": 8,
+    }
+    assert rank(_queue(PY, GO), None, ScheduleConfig())[0].reason == "fifo"
+
+
+def _gen(spec, run_id):
+    return GenerationResult(content="ok", model=spec["model"], eval_count=1, duration_ms=1.0)
+
+
+def test_worker_drains_resident_model_first_and_records_it(tmp_path):
+    """Interleaved submissions run grouped by model; each run's ledger says why."""
+    store = Store(tmp_path)
+    resident = []
+    worker = Worker(
+        tmp_path, generate=_gen, resident_model=lambda: resident[-1] if resident else GO,
+    )
+    runs = []
+    for n, model in enumerate([PY, GO, PY, GO]):
+        run_id = store.create_run(
+            {"deliverable": {"kind": "answer"}, "objective": "q", "model": model}
+        )
+        Ledger(store.events_path(run_id)).run_submitted({"queue_position": n + 1})
+        worker.fifo.push(run_id, now_ms=int(time.time() * 1000) + n)
+        runs.append(run_id)
+
+    order = []
+    while (run_id := worker.run_once()) is not None:
+        order.append(run_id)
+        resident.append(store.load_spec(run_id)["model"])
+    assert order == [runs[1], runs[3], runs[0], runs[2]]
+
+    events = Ledger(store.events_path(runs[1])).read()
+    assert [e["event"] for e in events][:2] == ["RunSubmitted", "Scheduled"]
+    assert events[1]["payload"]["reason"] == "resident"
+    assert events[1]["payload"]["passed_over"] == 1 and events[-1]["event"] == "Delivered"
+
+
+def test_scheduler_skips_a_pick_another_worker_claimed(tmp_path, monkeypatch):
+    """When the pick is claimed first, the next decision in rank order is claimed."""
+    store = Store(tmp_path)
+    scheduler = Scheduler(tmp_path, lambda spec: spec["model"], lambda: GO)
+    for n, model in enumerate([PY, GO]):
+        run_id = store.create_run({"deliverable": {"kind": "answer"}, "model": model})
+        scheduler.fifo.push(run_id, now_ms=int(time.time() * 1000) + n)
+
+    def _rank_then_lose_the_pick(candidates, resident, config):
+        decisions = rank(candidates, resident, config)
+        scheduler.fifo.claim(decisions[0].candidate.marker, "other-worker")
+        return decisions
+
+    monkeypatch.setattr(schedule_mod, "rank", _rank_then_lose_the_pick)
+    decision = scheduler.pop("me")
+    assert decision.candidate.model == PY and decision.reason == "fifo"
+    assert scheduler.pop("me") is None
+
+
+def test_malformed_spec_is_left_to_intake_not_the_scheduler(tmp_path):
+    """A spec the model lookup chokes on is claimed and rejected; the queue keeps moving."""
+    store = Store(tmp_path)
+    worker = Worker(tmp_path, generate=_gen, resident_model=lambda: GO)
+    bad = store.create_run(
+        {"deliverable": {"kind": "function", "language": ["python"], "target": "a.py"},
+         "objective": "q"}
+    )
+    good = store.create_run({"deliverable": {"kind": "answer"}, "objective": "q", "model": GO})
+    now = int(time.time() * 1000)
+    for n, run_id in enumerate([bad, good]):
+        Ledger(store.events_path(run_id)).run_submitted({"queue_position": n + 1})
+        worker.fifo.push(run_id, now_ms=now + n)
+
+    assert worker.run_once() == good  # resident model first; "auto" does not block it
+    assert worker.run_once() == bad
+    assert worker.run_once() is None
+    assert "IntakeRejected" in [e["event"] for e in Ledger(store.events_path(bad)).read()]
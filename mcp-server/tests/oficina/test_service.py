@@ -112,6 +112,20 @@ def test_status_folds_state_and_slices_events(tmp_path):
     assert len(st2["events"]) == 1
 
 
+def test_status_reports_stream_progress_only_while_running(tmp_path):
+    """A streaming run shows how much of the current reply has arrived; a finished one does
+    not — the leftover stream file is history then, not liveness."""
+    fn, _ = _spy_ensure()
+    store = Store(tmp_path)
+    run_id = service.submit(tmp_path, {**_valid_spec(), "stream": True}, ensure_worker=fn)["run_id"]
+    led = Ledger(store.events_path(run_id))
+    led.generation_started({})
+    store.stream_path(run_id).write_text("partial rep")
+    assert service.status(tmp_path, run_id)["streamed_bytes"] == 11
+    led.delivered({"report": {}, "deliverable": {"kind": "answer", "answer": "x"}})
+    assert "streamed_bytes" not in service.status(tmp_path, run_id)
+
+
 def test_result_unknown_run_raises(tmp_path):
     """result on an unknown run_id raises UnknownRunError."""
     with pytest.raises(UnknownRunError):
@@ -231,3 +245,41 @@ def test_the_phase_map_covers_every_run_event():
         f"undeclared: {set(RUN_EVENTS) - declared}; "
         f"not a run event: {declared - set(RUN_EVENTS)}"
     )
+
+
+def test_polling_status_folds_only_new_events(tmp_path, monkeypatch):
+    """A watcher's since_offset poll reads from its offset, not the whole ledger, and the
+    carried-over fold still reaches the same state and phase as a full fold."""
+    fn, _ = _spy_ensure()
+    store = Store(tmp_path)
+    run_id = service.submit(tmp_path, _valid_spec(), ensure_worker=fn)["run_id"]
+    led = Ledger(store.events_path(run_id))
+    led.generation_started({})
+    first = service.status(tmp_path, run_id)
+    assert (first["state"], first["phase"], first["next_offset"]) == ("working", "generating", 2)
+
+    reads = []
+    real_read = Ledger.read
+    monkeypatch.setattr(Ledger, "read", lambda self, k=0: reads.append(k) or real_read(self, k))
+    led.generation_finished({})
+    led.delivered({"report": {}, "deliverable": {"kind": "answer", "answer": "x"}})
+    polled = service.status(tmp_path, run_id, since_offset=first["next_offset"])
+
+    assert set(reads) == {2}  # the catalog's catch-up and the events slice; never from 0
+    assert [e["event"] for e in polled["events"]] == ["GenerationFinished", "Delivered"]
+    assert (polled["state"], polled["phase"], polled["next_offset"]) == ("completed", "delivered", 4)
+    assert service.status(tmp_path, run_id, since_offset=4)["events"] == []
+
+
+def test_default_ensure_counts_claimed_runs_toward_the_pool(tmp_path, monkeypatch):
+    """A submission while a worker holds a claim ensures a second slot, not just the first."""
+    from ollama_mcp.oficina import config as config_mod
+    from ollama_mcp.oficina.config import WorkerConfig
+
+    wanted = []
+    monkeypatch.setattr(config_mod, "load_worker_config", lambda: WorkerConfig(count=2))
+    monkeypatch.setattr(service, "ensure_workers", lambda root, argv, n: wanted.append(n))
+    service.submit(tmp_path, _valid_spec())
+    assert Fifo(tmp_path).pop("slot-0") is not None  # slot 0 is now busy with the first run
+    service.submit(tmp_path, _valid_spec())
+    assert wanted == [1, 2]
@@ -158,3 +158,47 @@ def test_run_drains_queue_then_exits(tmp_path):
     worker.run()
     assert "Delivered" in _events(store, r1) and "Delivered" in _events(store, r2)
     assert worker.fifo.pop() is None  # queue drained
+
+
+def test_pool_workers_claim_distinct_runs(tmp_path):
+    """Two slots drain one queue without taking the same run, honoring affinity."""
+    store = Store(tmp_path)
+    answers = Worker(tmp_path, generate=_gen_ok(), slot=0)
+    files = Worker(tmp_path, generate=_gen_ok(), slot=1, affinity={"kinds": ["file"]})
+    r1 = _submit(store, answers, {"deliverable": {"kind": "answer"}, "objective": "a"})
+    r2 = _submit(store, answers, {
+        "deliverable": {"kind": "file", "target": str(tmp_path / "f.py")}, "objective": "f",
+    })
+    assert files.run_once() == r2
+    assert answers.run_once() == r1
+    assert answers.run_once() is None
+    assert "Delivered" in _events(store, r1) and "Delivered" in _events(store, r2)
+    assert answers.fifo.claims(answers.claimant) == []
+
+
+def test_claims_of_a_dead_worker_are_recovered(tmp_path, monkeypatch):
+    """Orphaned claims: queued → requeued, mid-flight → Failed, terminal → dropped."""
+    store = Store(tmp_path)
+    dead = Worker(tmp_path, generate=_gen_ok())
+    runs = []
+    for n in range(3):
+        run_id = store.create_run({"deliverable": {"kind": "answer"}, "objective": str(n)})
+        Ledger(store.events_path(run_id)).run_submitted({"queue_position": n + 1})
+        dead.fifo.push(run_id, now_ms=n)
+        runs.append(run_id)
+    dead.claimant = "999999999.gone"
+    assert [dead.fifo.pop(dead.claimant) for _ in runs] == runs
+    dead.process_run(runs[2])  # delivered, but the claim was never dropped
+    Ledger(store.events_path(runs[1])).generation_started({"model": "auto"})
+
+    live = Worker(tmp_path, generate=_gen_ok(), slot=1)
+    live.recover_claims()
+    recovered = {
+        e["payload"]["run_id"]: e["payload"]["action"] for e in live.worker_ledger.read()
+    }
+    assert recovered == {runs[0]: "requeued", runs[1]: "failed", runs[2]: "dropped"}
+    failed = Ledger(store.events_path(runs[1])).read()[-1]
+    assert failed["event"] == "Failed" and failed["payload"]["where"] == "worker"
+    assert live.fifo.claimants() == [live.claimant]
+    assert live.run_once() == runs[0]
+    assert live.fifo.claims(live.claimant) == []
@@ -188,3 +188,22 @@ def test_ensure_worker_skips_spawn_when_owner_live(tmp_path):
     )
     returned = wp.ensure_worker(["sleep", "30"])
     assert returned == os.getpid()
+
+
+def test_each_slot_has_its_own_pidfile(tmp_path):
+    """Slot 0 keeps worker.pid; other slots are exclusive independently."""
+    first = WorkerProc(tmp_path, start_time_reader=_fixed_reader)
+    second = WorkerProc(tmp_path, start_time_reader=_fixed_reader, slot=1)
+    assert first.pidfile.name == "worker.pid" and second.pidfile.name == "worker-1.pid"
+    assert first.claim_pidfile() is True
+    assert second.claim_pidfile() is True
+    assert WorkerProc(tmp_path, start_time_reader=_fixed_reader, slot=1).claim_pidfile() is False
+
+
+def test_claimant_names_are_live_only_for_their_process(tmp_path, dead_pid):
+    """A claimant name is live for this process, dead for a reaped or reused pid."""
+    wp = WorkerProc(tmp_path)
+    assert wp.claimant_is_live(wp.claimant()) is True
+    assert wp.claimant_is_live(f"{dead_pid}.1") is False
+    assert wp.claimant_is_live(f"{os.getpid()}.not-my-start") is False
+    assert wp.claimant_is_live("junk") is False
@@ -0,0 +1,113 @@
+"""Tests for batch_ask / classify_batch — many items, one tool call, a bounded number in flight.
+
+A fake client stands in for Ollama and records how many calls overlap, so the concurrency
+bound is observable. The contract pinned here: every call shares the same prefix (system +
+instructions, item last), runs at ``batch`` priority, and with ``output_file`` the results go
+to JSONL while only a summary is returned.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from ollama_mcp import server
+from ollama_mcp.client import OllamaTimeoutError
+
+
+class _Client:
+    def __init__(self, fail_on=(), error=lambda: OllamaTimeoutError("slow"), delay=0.01):
+        self.calls, self.active, self.peak = [], 0, 0
+        self.fail_on = set(fail_on)
+        self.error = error
+        self.delay = delay
+
+    async def chat(self, **kwargs):
+        self.calls.append(kwargs)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if kwargs["prompt"].endswith(tuple(self.fail_on)):
+                raise self.error()
+            return SimpleNamespace(content=f"re:{kwargs['prompt'][-2:]}", call_id="c")
+        finally:
+            self.active -= 1
+
+
+async def test_batch_ask_bounds_concurrency_and_shares_the_prefix(monkeypatch):
+    fake = _Client()
+    monkeypatch.setattr(server, "_client", fake)
+
+    summary = json.loads(await server.batch_ask(
+        [f"i{n}" for n in range(6)], instructions="Summarize:", system="S", concurrency=2,
+    ))
+
+    assert fake.peak == 2
+    assert summary["ok"] == 6 and summary["errors"] == 0
+    assert [r["content"] for r in summary["results"]] == [f"re:i{n}" for n in range(6)]
+    assert {c["system"] for c in fake.calls} == {"S"}
+    assert all(c["prompt"].startswith("Summarize:\n\n") for c in fake.calls)
+    assert {c["priority"] for c in fake.calls} == {"batch"}
+
+
+async def test_output_file_gets_jsonl_and_the_reply_stays_compact(monkeypatch, tmp_path):
+    fake = _Client(fail_on={"i1"})
+    monkeypatch.setattr(server, "_client", fake)
+    out = tmp_path / "results.jsonl"
+
+    summary = json.loads(await server.batch_ask(["i0", "i1", "i2"], output_file=str(out)))
+
+    assert "results" not in summary and summary["output_file"] == str(out.resolve())
+    assert summary["errors"] == 1 and summary["first_errors"][0]["index"] == 1
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(r["index"] for r in lines) == [0, 1, 2]
+    assert next(r for r in lines if r["index"] == 1)["error"].startswith("Error:")
+
+
+async def test_item_ms_times_the_call_not_the_wait_for_a_slot(monkeypatch):
+    monkeypatch.setattr(server, "_client", _Client(delay=0.05))
+
+    summary = json.loads(await server.batch_ask([f"i{n}" for n in range(4)], concurrency=1))
+
+    results = summary["results"]
+    assert all(r["ms"] < 150 for r in results)  # each call alone, not the batch so far
+    assert [r["wait_ms"] for r in results] == sorted(r["wait_ms"] for r in results)
+    assert results[-1]["wait_ms"] >= 140  # queued behind three 50 ms calls
+
+
+def _http_500():
+    request = httpx.Request("POST", "http://ollama/api/chat")
+    response = httpx.Response(500, request=request, text="CUDA out of memory")
+    return httpx.HTTPStatusError("500 Internal Server Error", request=request, response=response)
+
+
+async def test_an_unexpected_error_is_one_error_line_not_a_failed_batch(monkeypatch, tmp_path):
+    fake = _Client(fail_on={"i1"}, error=_http_500)
+    monkeypatch.setattr(server, "_client", fake)
+    out = tmp_path / "results.jsonl"
+
+    summary = json.loads(await server.batch_ask(["i0", "i1", "i2"], output_file=str(out)))
+
+    assert summary["ok"] == 2 and summary["errors"] == 1
+    assert summary["first_errors"][0]["index"] == 1
+    assert "500" in summary["first_errors"][0]["error"]
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(r["index"] for r in lines) == [0, 1, 2]
+    assert sorted(r["content"] for r in lines if r["ok"]) == ["re:i0", "re:i2"]
+
+
+async def test_classify_batch_uses_the_classify_text_schema_and_prompt(monkeypatch):
+    fake = _Client()
+    monkeypatch.setattr(server, "_client", fake)
+
+    await server.classify_batch(["taxi 12.00", "rent"], ["food", "transport", "housing"])
+
+    schema = fake.calls[0]["format"]
+    assert schema["properties"]["category"]["enum"] == ["food", "transport", "housing"]
+    assert fake.calls[0]["prompt"] == (
+        "Classify the following text into one of these categories: food, transport, housing."
+        "\n\ntaxi 12.00"
+    )
+    assert {c["tool"] for c in fake.calls} == {"classify_batch"}
@@ -18,6 +18,7 @@ import json
 
 import httpx
 
+from ollama_mcp import calllog
 from ollama_mcp.client import OllamaClient
 
 _OLLAMA_BODY = {
@@ -62,6 +63,7 @@ class _FakeAsyncClient:
 
 def _records(log_path):
     """Every JSONL record written to `log_path`, in order."""
+    calllog.flush()
     with open(log_path, encoding="utf-8") as fh:
         return [json.loads(line) for line in fh if line.strip()]
 
@@ -0,0 +1,96 @@
+"""Tests for calllog — the background calls.jsonl writer and its segment reader.
+
+The writer exists so `_log_call` does no disk I/O on the event loop; these pin what that
+must not cost: records still land whole and in order, a full queue drops rather than blocks,
+and rotation never hides a record from a reader walking the log with `iter_records`.
+"""
+
+import json
+import os
+import threading
+import time
+
+from ollama_mcp import calllog
+from ollama_mcp.calllog import CallLogWriter, iter_records, manifest_path, segments
+
+
+def _entry(i):
+    return {"ts": f"2026-01-01T00:00:{i:02d}+00:00", "call_id": f"{i:012x}"}
+
+
+def test_batched_records_land_in_order_after_flush(tmp_path):
+    log = tmp_path / "calls.jsonl"
+    writer = CallLogWriter(log, flush_s=5.0)
+    for i in range(10):
+        writer.submit(_entry(i))
+
+    assert writer.flush()
+    assert [r["call_id"] for r in iter_records(log)] == [f"{i:012x}" for i in range(10)]
+    assert writer.stats()["batches"] == 1
+    writer.close()
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    writer = CallLogWriter(tmp_path / "calls.jsonl", max_queue=1, batch=1)
+    stuck, release = threading.Event(), threading.Event()
+
+    def slow_write(batch):  # a disk that stalls mid-batch
+        stuck.set()
+        release.wait(5)
+
+    writer._write = slow_write
+    writer.submit(_entry(0))
+    assert stuck.wait(5)
+    writer.submit(_entry(1))  # fills the queue
+
+    t0 = time.perf_counter()
+    writer.submit(_entry(2))
+    assert (time.perf_counter() - t0) < 0.05
+    assert writer.stats()["dropped"] == 1
+    release.set()
+    writer.close()
+
+
+def test_size_rotation_seals_segments_and_readers_see_every_record(tmp_path):
+    log = tmp_path / "calls.jsonl"
+    writer = CallLogWriter(log, batch=1, rotate="size", rotate_bytes=1)
+    for i in range(3):
+        writer.submit(_entry(i))
+        writer.flush()
+    writer.close()
+
+    assert [p.name for p in segments(log)] == ["calls.00001.jsonl", "calls.00002.jsonl", "calls.jsonl"]
+    manifest = json.loads(manifest_path(log).read_text())
+    assert [s["records"] for s in manifest["segments"]] == [1, 1]
+    assert manifest["segments"][0]["first_ts"] == _entry(0)["ts"]
+    assert [r["call_id"] for r in iter_records(log)] == [f"{i:012x}" for i in range(3)]
+
+
+def test_daily_rotation_seals_a_segment_last_written_on_another_day(tmp_path):
+    log = tmp_path / "calls.jsonl"
+    log.write_text(json.dumps(_entry(0)) + "\n")
+    yesterday = time.time() - 86400
+    os.utime(log, (yesterday, yesterday))
+
+    writer = CallLogWriter(log, rotate="daily")
+    writer.submit(_entry(1))
+    writer.close()
+
+    assert [p.name for p in segments(log)] == ["calls.00001.jsonl", "calls.jsonl"]
+    assert writer.stats()["rotations"] == 1
+
+
+def test_reader_skips_a_torn_line_and_needs_no_manifest(tmp_path):
+    log = tmp_path / "calls.jsonl"
+    (tmp_path / "calls.00001.jsonl").write_text(json.dumps(_entry(0)) + "\n")
+    log.write_text(json.dumps(_entry(1)) + "\n" + '{"ts": "2026-01-0')
+
+    assert [r["call_id"] for r in iter_records(log)] == [_entry(0)["call_id"], _entry(1)["call_id"]]
+
+
+def test_module_submit_never_raises_on_an_unwritable_path(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    calllog.submit(blocker / "calls.jsonl", _entry(0))
+    calllog.flush()
+    assert calllog.writer_for(blocker / "calls.jsonl").stats()["dropped"] == 1
@@ -0,0 +1,110 @@
+"""Tests for single-flight coalescing of identical in-flight chat calls.
+
+Identical requests arriving while one is generating must cost ONE generation, yet each caller
+remains a call of its own — own ``call_id``, own calls.jsonl record naming the call it rode
+on. The fake Ollama holds every request until released, so "in flight at once" is exact
+rather than a race.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from ollama_mcp import calllog
+from ollama_mcp.client import OllamaClient, OllamaTimeoutError
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+_BODY = {"model": "m", "message": {"content": "shared"}, "done": True, "eval_count": 3}
+
+
+@pytest.fixture
+def held_ollama(monkeypatch):
+    """A fake Ollama that answers only once ``release`` is set; returns (requests, release)."""
+    requests, release = [], asyncio.Event()
+
+    async def handler(request):
+        if request.url.path == "/api/version":  # the pool's probe after a cancelled call
+            return httpx.Response(200, json={"version": "0"})
+        requests.append(json.loads(request.content))
+        await release.wait()
+        return httpx.Response(200, json=_BODY)
+
+    def factory(*args, **kwargs):
+        return _REAL_ASYNC_CLIENT(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+    return requests, release
+
+
+async def _settle_then(release):
+    await asyncio.sleep(0.05)
+    release.set()
+
+
+async def test_identical_concurrent_calls_share_one_generation(held_ollama, monkeypatch, tmp_path):
+    requests, release = held_ollama
+    log = tmp_path / "calls.jsonl"
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", str(log))
+    client = OllamaClient()
+
+    results = await asyncio.gather(
+        *(client.chat("same", model="m") for _ in range(3)), _settle_then(release)
+    )
+    replies = results[:3]
+
+    assert len(requests) == 1
+    assert {r.content for r in replies} == {"shared"}
+    assert len({r.call_id for r in replies}) == 3
+    [leader] = [r for r in replies if r.coalesced_with is None]
+    assert all(r.coalesced_with == leader.call_id for r in replies if r is not leader)
+
+    calllog.flush()
+    records = list(calllog.iter_records(log))
+    links = sorted(r.get("coalesced_with") or "" for r in records)
+    assert links == ["", leader.call_id, leader.call_id]
+
+
+async def test_different_requests_and_cache_false_are_not_coalesced(held_ollama):
+    requests, release = held_ollama
+    client = OllamaClient()
+
+    await asyncio.gather(
+        client.chat("one", model="m"),
+        client.chat("two", model="m"),
+        client.chat("one", model="m", cache=False),
+        _settle_then(release),
+    )
+    assert len(requests) == 3
+
+
+async def test_cancelled_leader_leaves_its_follower_to_generate(held_ollama):
+    requests, release = held_ollama
+    client = OllamaClient()
+
+    leader = asyncio.create_task(client.chat("q", model="m"))
+    await asyncio.sleep(0.02)
+    follower = asyncio.create_task(client.chat("q", model="m"))
+    await asyncio.sleep(0.02)
+    leader.cancel()
+    await asyncio.sleep(0.02)
+    release.set()
+
+    reply = await follower
+    assert reply.content == "shared" and reply.coalesced_with is None
+    assert len(requests) == 2
+
+
+async def test_follower_keeps_its_own_deadline(held_ollama):
+    requests, release = held_ollama
+    client = OllamaClient()
+
+    leader = asyncio.create_task(client.chat("q", model="m"))
+    await asyncio.sleep(0.02)
+    with pytest.raises(OllamaTimeoutError):
+        await client.chat("q", model="m", timeout=0.05)
+    release.set()
+    assert (await leader).content == "shared"
@@ -0,0 +1,122 @@
+"""Tests for embedindex — classify_text's embedding fast path.
+
+Toy 3-d vectors stand in for embeddings so the geometry is obvious: an item next to one
+category's examples is answered from the index, one halfway between two is generated as
+before. The server tests pin the contract that matters: no generation for a clear item, the
+normal generation for a close call, and any embedding failure falls back instead of erroring.
+"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import httpx
+
+from ollama_mcp import embedindex, server
+from ollama_mcp.client import OllamaClient, OllamaModelNotFoundError
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+_VECTORS = {
+    "lunch at cafe": [1.0, 0.1, 0.0],
+    "groceries": [0.9, 0.0, 0.1],
+    "bus ticket": [0.0, 1.0, 0.1],
+    "taxi home": [0.1, 0.9, 0.0],
+    "sandwich": [0.95, 0.05, 0.0],
+    "uber eats to the station": [0.5, 0.5, 0.0],
+}
+_EXAMPLES = {"food": ["lunch at cafe", "groceries"], "transport": ["bus ticket", "taxi home"]}
+
+
+class _Client:
+    def __init__(self, embed_error=None):
+        self.chats, self.embeds = [], []
+        self.embed_error = embed_error
+
+    async def embed(self, texts, **kwargs):
+        self.embeds.append((texts, kwargs))
+        if self.embed_error is not None:
+            raise self.embed_error
+        return [_VECTORS[t] for t in texts]
+
+    async def chat(self, **kwargs):
+        self.chats.append(kwargs)
+        return SimpleNamespace(
+            content='{"category": "food", "confidence": 0.6, "reasoning": "generated"}'
+        )
+
+
+def _index(model="embed-m"):
+    vectors = [_VECTORS[t] for texts in _EXAMPLES.values() for t in texts]
+    return embedindex.build(model, _EXAMPLES, vectors)
+
+
+def test_clear_items_are_answered_and_close_calls_deferred():
+    index = _index()
+    reply = index.decide(_VECTORS["sandwich"], margin=0.05)
+    assert reply["category"] == "food" and reply["confidence"] > 0.9
+    assert "ahead of 'transport'" in reply["reasoning"]
+    assert index.decide(_VECTORS["uber eats to the station"], margin=0.05) is None
+
+
+def test_saved_index_is_found_for_the_set_in_any_order_and_reloaded_on_rebuild(tmp_path):
+    embedindex.save(_index(), tmp_path)
+    found = embedindex.get(["transport", "food"], tmp_path)
+    assert found is not None and found.model == "embed-m" and found.examples == 4
+    assert embedindex.get(["food", "transport", "housing"], tmp_path) is None
+
+    path = embedindex.save(_index("embed-2"), tmp_path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert embedindex.get(["food", "transport"], tmp_path).model == "embed-2"
+
+
+async def test_classify_text_skips_generation_only_for_clear_items(monkeypatch):
+    fake = _Client()
+    monkeypatch.setattr(server, "_client", fake)
+    built = json.loads(await server.build_category_index(_EXAMPLES, model="embed-m"))
+    assert built["examples"] == 4 and built["dims"] == 3
+
+    clear = json.loads(await server.classify_text("sandwich", ["food", "transport"]))
+    assert clear["category"] == "food" and clear["reasoning"].startswith("embedding match")
+    assert fake.chats == [] and fake.embeds[-1][1]["model"] == "embed-m"
+
+    close = json.loads(
+        await server.classify_text("uber eats to the station", ["food", "transport"])
+    )
+    assert close["reasoning"] == "generated" and len(fake.chats) == 1
+
+    await server.classify_text("sandwich", ["food", "transport"], mode="generate")
+    assert len(fake.chats) == 2
+
+
+async def test_embedding_failure_falls_back_to_generation(monkeypatch):
+    embedindex.save(_index())
+    fake = _Client(embed_error=OllamaModelNotFoundError("no embed-m"))
+    monkeypatch.setattr(server, "_client", fake)
+
+    reply = json.loads(await server.classify_text("sandwich", ["food", "transport"]))
+    assert reply["reasoning"] == "generated" and len(fake.embeds) == 1
+
+
+async def test_build_rejects_a_category_without_examples(monkeypatch):
+    monkeypatch.setattr(server, "_client", _Client())
+    result = await server.build_category_index({"food": ["groceries"], "transport": []})
+    assert result.startswith("Error:") and "transport" in result
+
+
+async def test_client_embed_posts_every_text_in_one_request(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"embeddings": [[0.1, 0.2], [0.3, 0.4]]})
+
+    def factory(*args, **kwargs):
+        return _REAL_ASYNC_CLIENT(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    vectors = await OllamaClient().embed(["a", "b"], model="embed-m")
+
+    assert vectors == [[0.1, 0.2], [0.3, 0.4]]
+    assert seen[0][0] == "/api/embed" and seen[0][1]["input"] == ["a", "b"]
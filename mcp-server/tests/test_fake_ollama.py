@@ -0,0 +1,86 @@
+"""Tests for fake_ollama — the GPU-free Ollama stand-in behind the load benchmarks.
+
+The fake is only useful if the real client cannot tell it apart from Ollama, so every test
+drives `OllamaClient` over a real socket (no transport mocks). Delays are scaled down with
+``time_scale``; the assertions are on what the fake reports and counts, not on wall time,
+except where ordering is the point.
+"""
+
+import asyncio
+
+import pytest
+
+from ollama_mcp import residency
+from ollama_mcp.client import OllamaClient, OllamaModelNotFoundError
+from ollama_mcp.fake_ollama import FakeOllama, ModelSpec
+
+_FAST = dict(gen_tps=2000.0, prompt_tps=100000.0, load_s=0.05)
+
+
+@pytest.fixture
+async def fake(monkeypatch, tmp_path):
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", str(tmp_path / "calls.jsonl"))
+    specs = [ModelSpec(name="coder:latest", **_FAST), ModelSpec(name="judge:latest", **_FAST)]
+    async with FakeOllama(specs) as server:
+        yield server
+
+
+async def test_chat_round_trip_reports_ollama_counters(fake):
+    async with OllamaClient(fake.url) as client:
+        reply = await client.chat("hello", model="coder", num_predict=5)
+    assert reply.content == "token token token token token"
+    assert reply.eval_count == 5 and reply.prompt_eval_count > 0
+    assert fake.stats.loads == 1
+
+
+async def test_streamed_reply_arrives_as_chunks(fake):
+    async with OllamaClient(fake.url) as client:
+        chunks = [c async for c in client.chat_stream("hi", model="coder", num_predict=4)]
+    assert len(chunks) == 4 and "".join(chunks) == "token token token token"
+
+
+async def test_one_model_at_a_time_swaps_and_lists_in_ps(fake):
+    async with OllamaClient(fake.url) as client:
+        await client.chat("a", model="coder", num_predict=1)
+        await client.chat("b", model="judge", num_predict=1)
+        running = await client.list_running()
+        tags = await client.list_models()
+    assert [m["name"] for m in running] == ["judge:latest"]
+    assert fake.stats.loads == 2 and fake.stats.evictions == 1
+    assert residency.footprint("judge", tags) is not None
+
+
+async def test_shared_prefix_is_not_evaluated_again(fake):
+    stable = "spec and context " * 50
+    async with OllamaClient(fake.url) as client:
+        first = await client.chat(stable + "attempt 1", model="coder", num_predict=1, cache=False)
+        second = await client.chat(stable + "attempt 2", model="coder", num_predict=1, cache=False)
+    assert second.prompt_eval_count < first.prompt_eval_count / 10
+    assert fake.stats.prefix_tokens_reused > 0
+
+
+async def test_calls_for_a_busy_model_queue_behind_its_parallel_slots(monkeypatch, tmp_path):
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", str(tmp_path / "calls.jsonl"))
+    spec = ModelSpec(name="m:latest", gen_tps=200.0, prompt_tps=1e6, load_s=0.0)
+    async with FakeOllama([spec], parallel=1) as server, OllamaClient(server.url) as client:
+        replies = await asyncio.gather(
+            *(client.chat(f"p{i}", model="m", num_predict=10, cache=False) for i in range(3))
+        )
+    durations = sorted(r.total_duration_ms for r in replies)
+    # Each generation takes ~50ms; the third caller waited for the two ahead of it.
+    assert durations[-1] > 2 * durations[0]
+
+
+async def test_unknown_model_is_a_404_and_unload_empties_ps(fake):
+    async with OllamaClient(fake.url) as client:
+        with pytest.raises(OllamaModelNotFoundError):
+            await client.chat("x", model="missing")
+        await client.chat("x", model="coder", num_predict=1)
+        await client.unload_model("coder")
+        assert await client.list_running() == []
+
+
+def test_model_spec_parses_the_cli_form():
+    spec = ModelSpec.parse("coder=30,900,12,9.5")
+    assert spec.name == "coder:latest" and spec.gen_tps == 30 and spec.load_s == 12
+    assert spec.size_bytes == int(9.5 * 1024 ** 3)
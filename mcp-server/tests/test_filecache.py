@@ -0,0 +1,82 @@
+"""Tests for filecache — context_files served from memory, sliced by a line-offset index.
+
+A slice must read exactly what the old ``splitlines()`` + list slice produced, a repeat read
+must not touch the file again, and any change in mtime or size must. The byte bound is
+checked by filling a tiny cache past it.
+"""
+
+import os
+
+from ollama_mcp import filecache, server
+from ollama_mcp.filecache import FileCache
+from ollama_mcp.server import ContextFile
+
+
+def _old_slice(text, start_line, end_line):
+    lines = text.splitlines()
+    start = max(0, (start_line or 1) - 1)
+    end = end_line if end_line is not None else len(lines)
+    return "\n".join(lines[start:end])
+
+
+def test_slices_match_the_old_splitlines_reader(tmp_path):
+    cache = FileCache()
+    for name, text in {
+        "plain.py": "a\nb\nc\nd\n",
+        "no_eol.py": "a\nb\nc",
+        "crlf.py": "a\r\nb\r\nc\r\n",
+        "blank.py": "\n\nx\n\n",
+        "empty.py": "",
+    }.items():
+        path = tmp_path / name
+        path.write_bytes(text.encode())
+        for start, end in [(None, None), (2, None), (None, 2), (2, 3), (3, 99), (9, 12), (3, 1)]:
+            assert cache.read_lines(path, start, end)[0] == _old_slice(text, start, end), (
+                name, start, end,
+            )
+
+
+def test_repeat_reads_hit_and_a_change_rereads(tmp_path):
+    path = tmp_path / "f.txt"
+    path.write_text("one\ntwo\nthree\n")
+    cache = FileCache()
+    assert cache.read_lines(path, 2, 2) == ("two", 1)
+    assert cache.read_lines(path, 1, 3) == ("one\ntwo\nthree", 3)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    path.write_text("ONE\ntwo\nthree\n")  # same size: only the mtime tells
+    os.utime(path, ns=(1, 1))
+    assert cache.read_lines(path, 1, 1) == ("ONE", 1)
+    assert cache.misses == 2
+
+
+def test_eviction_keeps_total_bytes_under_the_bound(tmp_path):
+    cache = FileCache(max_bytes=25)
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"{n}.txt"
+        path.write_text("x" * 9 + "\n")
+        paths.append(path)
+        cache.read_lines(path)
+    assert list(cache._entries) == [str(p) for p in paths[1:]]
+    assert cache._bytes == 20
+
+    big = tmp_path / "big.txt"
+    big.write_text("y" * 40)
+    assert cache.read_lines(big) == ("y" * 40, 1)  # served, not cached
+    assert str(big) not in cache._entries and cache._bytes == 20
+
+
+def test_context_block_reads_through_the_shared_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(filecache, "_CACHE", FileCache())
+    path = tmp_path / "mod.py"
+    path.write_text("".join(f"line {n}\n" for n in range(1, 11)))
+
+    block = server._build_context_block([ContextFile(path=str(path), start_line=4)])
+    assert block == (
+        f"<context>\n### {path} (lines 4–10)\n```py\n"
+        + "\n".join(f"line {n}" for n in range(4, 11))
+        + "\n```\n</context>"
+    )
+    server._build_context_block([ContextFile(path=str(path), start_line=2, end_line=3)])
+    assert filecache.get_cache().misses == 1 and filecache.get_cache().hits == 1
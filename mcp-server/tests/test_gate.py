@@ -0,0 +1,165 @@
+"""Tests for the cross-process model-call gate (T-88).
+
+Two layers, tested apart on purpose. `GateScheduler` is the whole policy and takes the
+clock as an argument, so the ordering rules — drain before swap, interactive ahead of
+batch, the max-hold starvation guard — are plain calls with no sockets or sleeps. The
+daemon + `admit` pair is then exercised end-to-end over a throwaway socket for what only
+the wire can show: a held connection is the slot, and closing it frees the next caller.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from ollama_mcp import gate
+from ollama_mcp.client import OllamaClient, OllamaTimeoutError
+from ollama_mcp.gate import GateScheduler, GateServer
+
+
+def _models(tickets):
+    return [t.model for t in tickets]
+
+
+# ---------------------------------------------------------------------------
+# Policy
+# ---------------------------------------------------------------------------
+
+def test_first_call_is_admitted_at_position_one():
+    sched = GateScheduler()
+    _, position = sched.enqueue("a", "interactive", now=0)
+    assert position == 1
+    assert _models(sched.admit_ready(now=0)) == ["a"]
+    assert sched.loaded == "a"
+
+
+def test_one_slot_per_model_holds_the_second_call():
+    sched = GateScheduler(slots_per_model=1)
+    sched.enqueue("a", "interactive", now=0)
+    sched.admit_ready(now=0)
+    _, position = sched.enqueue("a", "interactive", now=1)
+    assert position == 1  # next in line — the running call is not queued
+    assert sched.admit_ready(now=1) == []
+    sched.release("a")
+    assert _models(sched.admit_ready(now=2)) == ["a"]
+
+
+def test_loaded_model_drains_before_a_swap():
+    """Queued in order a, b, a — the second `a` jumps `b` because `a` is resident."""
+    sched = GateScheduler()
+    sched.enqueue("a", "batch", now=0)
+    sched.admit_ready(now=0)
+    sched.enqueue("b", "batch", now=1)
+    sched.enqueue("a", "batch", now=2)
+    sched.release("a")
+    assert _models(sched.admit_ready(now=3)) == ["a"]
+    sched.release("a")
+    assert _models(sched.admit_ready(now=4)) == ["b"]
+
+
+def test_interactive_call_is_not_held_behind_a_batch_backlog():
+    sched = GateScheduler()
+    sched.enqueue("a", "batch", now=0)
+    sched.admit_ready(now=0)
+    sched.enqueue("a", "batch", now=1)
+    _, position = sched.enqueue("b", "interactive", now=2)
+    assert position == 1  # queues ahead of the batch call
+    sched.release("a")
+    assert _models(sched.admit_ready(now=3)) == ["b"]
+
+
+def test_max_hold_stops_draining_from_starving_another_model():
+    sched = GateScheduler(slots_per_model=1, max_hold_s=10)
+    sched.enqueue("a", "batch", now=0)
+    sched.admit_ready(now=0)
+    sched.enqueue("b", "batch", now=1)
+    sched.enqueue("a", "batch", now=2)
+    sched.release("a")
+    assert _models(sched.admit_ready(now=20)) == ["b"]
+
+
+def test_cancelled_ticket_is_never_admitted():
+    sched = GateScheduler()
+    ticket, _ = sched.enqueue("a", "interactive", now=0)
+    sched.cancel(ticket)
+    assert sched.admit_ready(now=1) == []
+    assert sched.is_idle()
+
+
+def test_snapshot_counts_active_and_queued_per_model():
+    sched = GateScheduler()
+    sched.enqueue("a", "interactive", now=0)
+    sched.admit_ready(now=0)
+    sched.enqueue("b", "batch", now=1)
+    snap = sched.snapshot(now=3)
+    assert snap["active"] == {"a": 1}
+    assert snap["queued"] == {"b": 1}
+    assert snap["oldest_wait_ms"] == 2000
+
+
+# ---------------------------------------------------------------------------
+# Daemon + client over a real socket
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def gate_socket(tmp_path):
+    """A live gate daemon on a throwaway socket, torn down after the test."""
+    path = str(tmp_path / "gate.sock")
+    server = await asyncio.start_unix_server(GateServer(GateScheduler()).handle, path=path)
+    yield path
+    server.close()
+    await server.wait_closed()
+
+
+async def test_second_caller_waits_for_the_first_to_release(gate_socket):
+    order = []
+
+    async def call(name, hold):
+        async with gate.admit("m", socket_path=gate_socket) as admission:
+            order.append((name, admission.position))
+            await asyncio.sleep(hold)
+
+    first = asyncio.create_task(call("first", 0.2))
+    await asyncio.sleep(0.05)
+    await asyncio.gather(first, call("second", 0))
+    assert order == [("first", 1), ("second", 1)]
+
+
+async def test_queue_wait_is_reported(gate_socket):
+    async def hold():
+        async with gate.admit("m", socket_path=gate_socket):
+            await asyncio.sleep(0.2)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.05)
+    async with gate.admit("m", socket_path=gate_socket) as admission:
+        assert admission.gated
+        assert admission.wait_ms >= 100
+    await holder
+
+
+async def test_deadline_while_queued_raises_and_frees_the_ticket(gate_socket):
+    async with gate.admit("m", socket_path=gate_socket):
+        with pytest.raises(gate.GateTimeoutError):
+            async with gate.admit("m", socket_path=gate_socket, timeout=0.1):
+                pass
+        await asyncio.sleep(0.05)  # let the daemon see the abandoned connection
+        snap = await gate.status(gate_socket)
+    assert snap["queued"] == {}
+    assert snap["active"] == {"m": 1}
+
+
+async def test_unreachable_gate_fails_open(tmp_path):
+    async with gate.admit("m", socket_path=str(tmp_path / "absent.sock")) as admission:
+        assert admission == gate.UNGATED
+
+
+async def test_queue_timeout_surfaces_as_ollama_timeout(gate_socket, monkeypatch):
+    """Callers already handle OllamaTimeoutError; a gate deadline must not be a new type."""
+    monkeypatch.setattr("ollama_mcp.gate.GATE_SOCKET", gate_socket)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+    client = OllamaClient()
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *a, **k: pytest.fail("reached Ollama"))
+    async with gate.admit("m", socket_path=gate_socket):
+        with pytest.raises(OllamaTimeoutError):
+            await client.chat("hi", model="m", timeout=0.1)
@@ -0,0 +1,111 @@
+"""Tests for the shared per-host connection pool (`client._HostPool`).
+
+The pool replaced a fresh httpx client per chat call, whose only job was to dodge the
+stale-connection state a cancelled or timed-out request left behind. These pin the two
+things that make the shared pool safe to default to: a stale keep-alive socket costs one
+transparent retry, and a timeout makes the next call check the host before trusting the
+pool. Transport is httpx's own `MockTransport`, so the pool's real client is exercised.
+"""
+
+import httpx
+import pytest
+
+from ollama_mcp import client as client_mod
+from ollama_mcp.client import OllamaClient, OllamaTimeoutError
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+_BODY = {
+    "model": "m",
+    "message": {"content": "ok"},
+    "done": True,
+    "eval_count": 1,
+    "total_duration": 1_000_000,
+}
+
+
+def _route(monkeypatch, handler):
+    """Every pool the client builds talks to ``handler`` instead of a socket."""
+
+    def factory(*args, **kwargs):
+        return _REAL_ASYNC_CLIENT(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+
+
+async def test_clients_on_one_loop_share_a_pool_until_the_last_closes(monkeypatch):
+    _route(monkeypatch, lambda request: httpx.Response(200, json=_BODY))
+    first, second = OllamaClient(), OllamaClient()
+    await first.chat("a", model="m")
+    await second.chat("b", model="m")
+
+    pool = first._pool
+    assert pool is second._pool and pool.users == 2
+    await first.close()
+    assert not pool.http.is_closed
+    await second.close()
+    assert pool.http.is_closed
+
+
+async def test_stale_keepalive_socket_is_retried_once(monkeypatch):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+        return httpx.Response(200, json=_BODY)
+
+    _route(monkeypatch, handler)
+    resp = await OllamaClient().chat("hi", model="m")
+
+    assert resp.content == "ok"
+    assert attempts == ["/api/chat", "/api/chat"]
+
+
+async def test_timeout_makes_the_next_call_probe_and_rebuild_a_dead_pool(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if request.url.path == "/api/version":
+            raise httpx.ConnectError("refused")
+        if len(seen) == 1:
+            raise httpx.ReadTimeout("slow")
+        return httpx.Response(200, json=_BODY)
+
+    _route(monkeypatch, handler)
+    client = OllamaClient()
+    with pytest.raises(OllamaTimeoutError):
+        await client.chat("hi", model="m")
+    assert client._pool.suspect
+
+    await client.chat("hi", model="m")
+
+    assert seen == ["/api/chat", "/api/version", "/api/chat"]
+    assert client._pool.rebuilds == 1 and not client._pool.suspect
+
+
+async def test_healthy_probe_keeps_the_pool(monkeypatch):
+    def handler(request):
+        if request.url.path == "/api/version":
+            return httpx.Response(200, json={"version": "0"})
+        return httpx.Response(200, json=_BODY)
+
+    _route(monkeypatch, handler)
+    client = OllamaClient()
+    pool = client._host_pool()
+    pool.mark_suspect()
+    await client.chat("hi", model="m")
+    assert pool.rebuilds == 0 and client._pool is pool
+
+
+def test_pools_are_per_event_loop():
+    """An httpx client is bound to its first loop — two `asyncio.run`s get two pools."""
+    import asyncio
+
+    async def grab():
+        return client_mod._pool_for("http://x")
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
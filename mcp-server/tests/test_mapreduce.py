@@ -0,0 +1,139 @@
+"""Tests for mapreduce — summarize for texts longer than the model's context.
+
+Chunks must stay within the token budget and fall on structural boundaries, and an edit
+must leave most chunks byte-identical: that is what lets the response cache skip them. The
+end-to-end test runs the real client against a mock Ollama with the cache on and counts the
+generations a re-summarize of a lightly edited document costs.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from ollama_mcp import mapreduce, response_cache, server, tokens
+from ollama_mcp.client import OllamaClient
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+
+def _document(paragraphs=120, edit=None):
+    parts = []
+    for n in range(paragraphs):
+        if n % 20 == 0:
+            parts.append(f"## Section {n // 20}\n\n")
+        body = f"Paragraph {n} records that meeting {n} approved budget item {n * 7}."
+        if n == edit:
+            body += " An amendment was added later."
+        parts.append(body + "\n\n")
+    return "".join(parts)
+
+
+def test_chunks_fit_the_budget_and_start_on_block_boundaries():
+    text = _document()
+    chunks = mapreduce.split(text, 120)
+    assert len(chunks) > 5
+    assert "".join(chunks) == text
+    assert all(tokens.count(c) <= 120 for c in chunks)
+    assert all(c.startswith(("Paragraph", "## Section")) for c in chunks)
+
+
+def test_an_oversized_line_is_split_by_halving():
+    line = " ".join(f"word{n}" for n in range(400))
+    chunks = mapreduce.split(line, 60)
+    assert "".join(chunks) == line and all(tokens.count(c) <= 60 for c in chunks)
+
+
+def test_an_edit_leaves_most_chunks_unchanged():
+    before = mapreduce.split(_document(), 120)
+    after = mapreduce.split(_document(edit=60), 120)
+    changed = set(after) - set(before)
+    assert 1 <= len(changed) <= 3 < len(after) // 4
+
+
+async def test_map_calls_share_a_position_free_prefix_and_the_last_merge_bounds_points(
+    monkeypatch,
+):
+    monkeypatch.setattr(mapreduce, "chunk_budget", lambda model: 120)
+    monkeypatch.setattr(mapreduce, "window", lambda model: 400)
+
+    class _Client:
+        def __init__(self):
+            self.calls, self.active, self.peak = [], 0, 0
+
+        async def chat(self, **kwargs):
+            self.calls.append(kwargs)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.005)
+            self.active -= 1
+            return SimpleNamespace(content=f"- point {len(self.calls)}")
+
+    fake = _Client()
+    summary = await mapreduce.summarize(
+        fake, _document(), model="m", max_points=5, concurrency=3
+    )
+
+    maps = [c for c in fake.calls if c["prompt"].startswith(mapreduce.MAP_INSTRUCTION)]
+    assert len(maps) == len(mapreduce.split(_document(), 120)) and fake.peak == 3
+    assert {c["priority"] for c in fake.calls} == {"batch"}
+    assert {c["cache"] for c in fake.calls} == {True}
+    assert "at most 5 bullet points" in fake.calls[-1]["prompt"]
+    assert summary == f"- point {len(fake.calls)}"
+
+
+async def test_resummarizing_an_edited_document_regenerates_only_changed_chunks(
+    monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        response_cache, "_CACHE", response_cache.ResponseCache(tmp_path / "cache", enabled=True)
+    )
+    monkeypatch.setattr(mapreduce, "chunk_budget", lambda model: 120)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+    generated = []
+
+    def handler(request):
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": [{"name": "m:latest", "digest": "d1"}]})
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        generated.append(prompt)
+        return httpx.Response(200, json={
+            "model": "m", "message": {"content": f"- {len(generated)}"}, "done": True,
+        })
+
+    def factory(*args, **kwargs):
+        return _REAL_ASYNC_CLIENT(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    client = OllamaClient()
+
+    await mapreduce.summarize(client, _document(), model="m")
+    first = len(generated)
+    generated.clear()
+    await mapreduce.summarize(client, _document(edit=60), model="m")
+
+    remapped = [p for p in generated if p.startswith(mapreduce.MAP_INSTRUCTION)]
+    assert 1 <= len(remapped) <= 3 and len(generated) < first // 2
+
+
+async def test_summarize_tool_chunks_only_what_does_not_fit(monkeypatch):
+    calls = []
+
+    class _Client:
+        async def chat(self, **kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(content="- ok")
+
+    monkeypatch.setattr(server, "_client", _Client())
+    monkeypatch.setattr(mapreduce, "window", lambda model: 300)
+    monkeypatch.setattr(mapreduce, "chunk_budget", lambda model: 120)
+
+    await server.summarize("a short note", max_points=3)
+    assert len(calls) == 1 and calls[0]["prompt"].startswith("Summarize the following text in")
+
+    calls.clear()
+    await server.summarize(_document())
+    assert len(calls) > 2 and all(c["priority"] == "batch" for c in calls)
+
+    assert (await server.summarize("x", mode="tree")).startswith("Error: mode must be")
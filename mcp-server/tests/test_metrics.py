@@ -0,0 +1,97 @@
+"""Tests for metrics — the bridge's Prometheus /metrics listener.
+
+The exposition is hand-written, so its format is pinned (cumulative buckets, ``+Inf``, label
+escaping). The rest checks the wiring: a real chat call through the client lands in the
+GPU-time and tok/s series, a failing tool in the error counter, and a scrape over TCP returns
+the text with the in-flight gauge read from the client at that moment.
+"""
+
+import asyncio
+import socket
+
+import httpx
+
+from ollama_mcp import metrics, server
+from ollama_mcp.client import OllamaClient
+from ollama_mcp.metrics import Counter, Histogram
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    h = Histogram("t_seconds", "help.", ("tool",), buckets=(1, 5))
+    metrics._REGISTRY.remove(h)
+    h.observe(0.5, tool="a")
+    h.observe(3, tool="a")
+    h.observe(9, tool="a")
+    text = h.render()
+    assert 't_seconds_bucket{tool="a",le="1"} 1' in text
+    assert 't_seconds_bucket{tool="a",le="5"} 2' in text
+    assert 't_seconds_bucket{tool="a",le="+Inf"} 3' in text
+    assert 't_seconds_sum{tool="a"} 12.5' in text and 't_seconds_count{tool="a"} 3' in text
+    assert "# TYPE t_seconds histogram" in text
+
+
+def test_label_values_are_escaped():
+    c = Counter("t_total", "help.", ("reason",))
+    metrics._REGISTRY.remove(c)
+    c.inc(reason='say "hi"\\now')
+    assert 't_total{reason="say \\"hi\\"\\\\now"} 1' in c.render()
+
+
+async def test_chat_call_is_recorded_by_model_and_tool(monkeypatch):
+    body = {
+        "model": "m-metrics", "message": {"content": "x"}, "done": True,
+        "prompt_eval_count": 100, "prompt_eval_duration": 50_000_000,
+        "eval_count": 20, "eval_duration": 1_000_000_000, "total_duration": 2_000_000_000,
+    }
+
+    def factory(*args, **kwargs):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+        return _REAL_ASYNC_CLIENT(*args, transport=transport, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+    before = metrics.GPU_SECONDS.value(model="m-metrics", tool="t")
+
+    await OllamaClient().chat("q", model="m-metrics", tool="t")
+
+    assert metrics.GPU_SECONDS.value(model="m-metrics", tool="t") == before + 2.0
+    assert metrics.EVAL_TPS.count(model="m-metrics") >= 1
+    assert 'ollama_bridge_prompt_eval_tokens_per_second_bucket{model="m-metrics",le="2500"}' in (
+        metrics.render()
+    )
+
+
+async def test_failing_tool_counts_its_reason(tmp_path):
+    before = metrics.TOOL_ERRORS.value(tool="patch_file", reason="not_found")
+    result = await server.patch_file(str(tmp_path / "absent.txt"), "a", "b")
+    assert result.startswith("Error:")
+    assert metrics.TOOL_ERRORS.value(tool="patch_file", reason="not_found") == before + 1
+
+
+async def test_listener_serves_metrics_with_the_clients_inflight_counts():
+    class _Client:
+        def get_inflight(self):
+            return {"busy-model": 2}
+
+    listener = await metrics.start_listener(_Client(), "abcd1234", 42, port=0)
+    assert listener is None  # port 0 means off
+
+    with socket.socket() as probe:  # a port that is free right now
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server_ = await metrics.start_listener(_Client(), "abcd1234", 42, port=port, span=4)
+    assert server_ is not None
+    try:
+        bound = server_.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", bound)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+        await writer.drain()
+        reply = (await reader.read()).decode()
+        writer.close()
+    finally:
+        server_.close()
+    assert reply.startswith("HTTP/1.1 200")
+    assert 'ollama_bridge_inflight_requests{model="busy-model"} 2' in reply
+    assert 'ollama_bridge_info{client_id="abcd1234",pid="42"} 1' in reply
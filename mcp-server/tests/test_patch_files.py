@@ -0,0 +1,83 @@
+"""Tests for patch_files — many edits across files in one call, all or nothing.
+
+Every failure mode (missing or ambiguous old_string, overlapping edits, a failed write)
+must leave every file exactly as it was, including files whose own edits were fine.
+"""
+
+import os
+
+from ollama_mcp import server
+from ollama_mcp.server import Edit, FileEdits, patch_files
+
+
+def _files(tmp_path):
+    a = tmp_path / "a.py"
+    b = tmp_path / "b.py"
+    a.write_text("def old_name():\n    return old_name\n\nold_name()\n", encoding="utf-8")
+    b.write_text("from a import old_name\nx = 1\n", encoding="utf-8")
+    return a, b
+
+
+async def test_edits_across_files_apply_with_a_per_file_count(tmp_path):
+    a, b = _files(tmp_path)
+    result = await patch_files([
+        FileEdits(path=str(a), edits=[
+            Edit(old_string="old_name", new_string="new_name", replace_all=True),
+        ]),
+        FileEdits(path=str(b), edits=[
+            Edit(old_string="x = 1", new_string="x = 2"),
+            Edit(old_string="import old_name", new_string="import new_name"),
+        ]),
+    ])
+    assert result == f"Patched 2 files (5 replacements): {a} 3, {b} 2"
+    assert "old_name" not in a.read_text() + b.read_text()
+    assert b.read_text() == "from a import new_name\nx = 2\n"
+
+
+async def test_edits_match_the_original_so_order_does_not_matter(tmp_path):
+    a, _ = _files(tmp_path)
+    await patch_files([FileEdits(path=str(a), edits=[
+        Edit(old_string="old_name()\n", new_string="main()\n"),
+        Edit(old_string="def old_name", new_string="def main"),
+    ])])
+    assert a.read_text() == "def main():\n    return old_name\n\nmain()\n"
+
+
+async def test_any_invalid_edit_leaves_every_file_untouched(tmp_path):
+    a, b = _files(tmp_path)
+    before = (a.read_text(), b.read_text())
+    good = FileEdits(path=str(a), edits=[Edit(old_string="def", new_string="async def")])
+
+    for bad, expected in [
+        (Edit(old_string="missing", new_string="x"), "edit 1: old_string not found"),
+        (Edit(old_string="o", new_string="0"), "edit 1: old_string found 3 times"),
+    ]:
+        result = await patch_files([good, FileEdits(path=str(b), edits=[bad])])
+        assert result.startswith("Error:") and expected in result
+    overlapping = FileEdits(path=str(b), edits=[
+        Edit(old_string="import old_name", new_string="x"),
+        Edit(old_string="old_name\nx", new_string="y"),
+    ])
+    assert "edits 1 and 2 overlap" in await patch_files([good, overlapping])
+    assert "appears more than once" in await patch_files([good, good])
+    assert (a.read_text(), b.read_text()) == before
+
+
+async def test_a_failed_write_rolls_back_files_already_replaced(tmp_path, monkeypatch):
+    a, b = _files(tmp_path)
+    before = (a.read_text(), b.read_text())
+    real_replace = os.replace
+
+    def _flaky_replace(src, dst):
+        if str(dst) == str(b):
+            raise OSError("disk full")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(server.os, "replace", _flaky_replace)
+    result = await patch_files([
+        FileEdits(path=str(a), edits=[Edit(old_string="return", new_string="yield")]),
+        FileEdits(path=str(b), edits=[Edit(old_string="x = 1", new_string="x = 2")]),
+    ])
+    assert result.startswith("Error: disk full") and "restored" in result
+    assert (a.read_text(), b.read_text()) == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.py", "b.py"]
@@ -0,0 +1,113 @@
+"""Tests for refindex — the in-process replacement for a ref-lookup.sh spawn per key.
+
+The index must answer exactly what the script answered (block boundaries, first file wins,
+``list`` / ``paths`` / prefix wildcard), and stay current as docs change without re-reading
+files that did not. The server wiring is checked by asserting no subprocess is spawned.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ollama_mcp import refindex, server
+from ollama_mcp.refindex import RefIndex, RefNotFoundError
+
+_SCRIPT = Path(__file__).resolve().parents[2] / "overlays/ref-indexing/files/ref-lookup.sh"
+
+
+@pytest.fixture
+def docs(tmp_path):
+    (tmp_path / "a.md").write_text(
+        "intro\n<!-- ref:plan-one -->\nfirst plan\n<!-- /ref:plan-one -->\n"
+        "between\n<!-- ref:plan-two -->\nsecond plan\n<!-- /ref:plan-two -->\ntail\n"
+    )
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.md").write_text("<!-- ref:other -->\nunclosed to the end\n")
+    local = tmp_path / ".claude" / "local"
+    local.mkdir(parents=True)
+    (local / "notes.md").write_text("<!-- ref:private -->\nmine\n<!-- /ref:private -->\n")
+    return tmp_path
+
+
+def test_block_spans_marker_line_to_closing_line(docs):
+    index = RefIndex(docs)
+    assert index.query("plan-one") == "<!-- ref:plan-one -->\nfirst plan\n<!-- /ref:plan-one -->"
+    assert index.query("other") == "<!-- ref:other -->\nunclosed to the end"
+
+
+def test_list_paths_and_prefix_wildcard(docs):
+    index = RefIndex(docs)
+    assert index.query("list").splitlines() == ["other", "plan-one", "plan-two", "private"]
+    assert index.query("--paths").splitlines() == [
+        "other\tsub/b.md", "plan-one\ta.md", "plan-two\ta.md",
+    ]
+    both = index.query("plan-*")
+    assert both.index("first plan") < both.index("second plan")
+    assert "\n\n<!-- ref:plan-two -->" in both
+
+
+def test_missing_key_and_pattern_raise_with_the_scripts_wording(docs):
+    index = RefIndex(docs)
+    with pytest.raises(RefNotFoundError, match="ref:nope not found in any"):
+        index.query("nope")
+    with pytest.raises(RefNotFoundError, match="No ref keys matching pattern"):
+        index.query("zzz-*")
+
+
+def test_changed_file_is_reparsed_and_unchanged_ones_are_not(docs, monkeypatch):
+    index = RefIndex(docs)
+    index.refresh(force=True)
+    parsed = []
+    real_parse = refindex._parse
+    monkeypatch.setattr(refindex, "_parse", lambda p, d: parsed.append(p.name) or real_parse(p, d))
+
+    target = docs / "sub" / "b.md"
+    target.write_text("<!-- ref:other -->\nrewritten\n<!-- /ref:other -->\n")
+    os.utime(target, ns=(1, 1))
+    (docs / "a.md").unlink()
+    index.refresh(force=True)
+
+    assert parsed == ["b.md"]
+    assert "rewritten" in index.query("other")
+    assert "plan-one" not in index.query("list")
+
+
+@pytest.mark.skipif(not _SCRIPT.exists(), reason="ref-lookup.sh overlay not in this tree")
+def test_paths_ignores_inline_mentions_like_the_script(docs):
+    (docs / "0-prose.md").write_text(
+        "See <!-- ref:plan-one --> for the plan.\n"
+        "Only mentioned: <!-- ref:mentioned --> here.\n"
+    )
+    script = subprocess.run(
+        ["bash", str(_SCRIPT), "--paths", "--root", str(docs)],
+        capture_output=True, text=True, check=True,
+    )
+    paths = RefIndex(docs).query("--paths")
+    assert paths == script.stdout.strip()
+    assert "plan-one\ta.md" in paths.splitlines() and "mentioned" not in paths
+
+
+async def test_refs_block_resolves_without_spawning_the_script(docs, monkeypatch):
+    monkeypatch.delenv("OFICINA_REF_LOOKUP", raising=False)
+
+    async def _no_subprocess(*args, **kwargs):
+        raise AssertionError("ref-lookup.sh was spawned")
+
+    monkeypatch.setattr(server, "_run_script", _no_subprocess)
+    block = await server._build_refs_block(["plan-one", "other"], str(docs))
+    assert block.startswith("<refs>\n<!-- ref:plan-one -->") and "unclosed" in block
+
+    missing = await server._build_refs_block(["absent"], str(docs))
+    assert missing.startswith("Error: ref:'absent' not found")
+    assert await server.ref_lookup("plan-*", path=str(docs)) == await server._resolve_ref_key(
+        "plan-*", str(docs)
+    )
+
+
+async def test_explicit_script_override_still_routes_to_the_script(docs, monkeypatch):
+    monkeypatch.setenv("OFICINA_REF_LOOKUP", str(docs / "custom.sh"))
+    assert not server._ref_index_enabled()
+    result = await server._resolve_ref_key("plan-one", str(docs))
+    assert result.startswith("Error: ref-lookup script not found")
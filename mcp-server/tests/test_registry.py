@@ -0,0 +1,98 @@
+"""Tests for the persona registry's compiled index, hot reload and compiled cache.
+
+A small registry in tmp_path stands in for personas/registry.yaml. The contract: queries
+keep their substring semantics, an edit to the YAML is seen on the next read without a
+restart, and a fresh compiled cache is read without parsing the YAML at all.
+"""
+
+import json
+import os
+
+import pytest
+
+from ollama_mcp import registry
+
+_YAML = """\
+my-java-q3:
+  role: Java 21 backend developer (Spring Boot 3.x)
+  tier: full
+  status: active
+my-polyglot-q3:
+  role: Reviews Java, Go and TypeScript code
+  tier: full
+  status: active
+my-go-q25:
+  role: Go backend developer
+  tier: bare
+  status: active
+my-old-q25:
+  role: Java developer
+  tier: full
+  status: retired
+"""
+
+
+@pytest.fixture
+def reg(tmp_path, monkeypatch):
+    path = tmp_path / "registry.yaml"
+    path.write_text(_YAML, encoding="utf-8")
+    monkeypatch.setattr(registry, "REGISTRY_PATH", str(path))
+    monkeypatch.setattr(registry, "_registry", {})
+    monkeypatch.setattr(registry, "_language_routes", {})
+    monkeypatch.setattr(registry, "_index", None)
+    monkeypatch.setattr(registry, "_stamp", None)
+    monkeypatch.setattr(registry, "_loaded", False)
+    return path
+
+
+def _names(results):
+    return [r["persona_name"] for r in results]
+
+
+def test_queries_match_substrings_in_registry_order(reg):
+    assert _names(registry.query_personas(language="java")) == ["my-java-q3", "my-polyglot-q3"]
+    assert _names(registry.query_personas(domain="script")) == ["my-polyglot-q3"]
+    assert _names(registry.query_personas(domain="spring boot")) == ["my-java-q3"]
+    assert _names(registry.query_personas(language="go", tier="bare")) == ["my-go-q25"]
+    assert _names(registry.query_personas(name="q25")) == ["my-go-q25"]
+    assert registry.get_language_routes() == {
+        "java": "my-java-q3", "go": "my-polyglot-q3", "typescript": "my-polyglot-q3",
+    }
+
+
+def test_an_edited_registry_is_seen_on_the_next_read(reg):
+    assert "my-rust-q3" not in registry.get_registry()
+    reg.write_text(
+        _YAML + "my-rust-q3:\n  role: Rust developer\n  tier: full\n  status: active\n",
+        encoding="utf-8",
+    )
+    os.utime(reg, ns=(reg.stat().st_atime_ns, reg.stat().st_mtime_ns + 1))
+
+    assert _names(registry.query_personas(language="rust")) == ["my-rust-q3"]
+    assert registry.get_language_routes()["rust"] == "my-rust-q3"
+
+
+def test_a_broken_edit_keeps_the_last_good_registry(reg):
+    registry.get_registry()
+    reg.write_text("my-java-q3: [unclosed\n", encoding="utf-8")
+    os.utime(reg, ns=(reg.stat().st_atime_ns, reg.stat().st_mtime_ns + 1))
+
+    assert "my-polyglot-q3" in registry.get_registry()
+
+
+def test_a_fresh_compiled_cache_skips_the_yaml(reg, monkeypatch):
+    registry.get_registry()
+    compiled = reg.with_name(registry.COMPILED_NAME)
+    data = json.loads(compiled.read_text())
+    assert set(data["entries"]) == {"my-java-q3", "my-polyglot-q3", "my-go-q25", "my-old-q25"}
+
+    data["entries"]["my-java-q3"]["role"] = "from the cache"
+    compiled.write_text(json.dumps(data))
+    monkeypatch.setattr(registry, "_loaded", False)
+    assert registry.get_registry()["my-java-q3"]["role"] == "from the cache"
+
+    data["size"] += 1  # stale: the YAML is parsed again and the cache rewritten
+    compiled.write_text(json.dumps(data))
+    monkeypatch.setattr(registry, "_loaded", False)
+    assert registry.get_registry()["my-java-q3"]["role"].startswith("Java 21")
+    assert json.loads(compiled.read_text())["size"] == reg.stat().st_size
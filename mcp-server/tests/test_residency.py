@@ -0,0 +1,102 @@
+"""Tests for residency — the VRAM plan behind `warm_model` and every call's keep_alive.
+
+`plan` is pure, so the policy is pinned directly: evict only what the target needs, least
+recently used first, never a pinned model, and everything unpinned only when the target's
+footprint is unknown (the old behaviour, kept as the fallback). One wiring test drives
+`warm_model` through a fake client to show the swap that used to happen no longer does.
+"""
+
+from ollama_mcp import residency, server
+from ollama_mcp.residency import plan
+
+_GB = 1024 ** 3
+
+
+def _loaded(name, gb, expires):
+    expires_at = f"2026-01-01T00:{expires:02d}:00Z"
+    return {"name": name, "size_vram": int(gb * _GB), "expires_at": expires_at}
+
+
+def test_target_that_fits_beside_what_is_loaded_evicts_nothing():
+    running = [_loaded("coder:latest", 5, 10)]
+    result = plan("judge", running, need_bytes=5 * _GB, pinned=[], capacity=11 * _GB)
+    assert result.fits and result.evict == []
+
+
+def test_eviction_is_minimal_and_least_recently_used_first():
+    running = [_loaded("a:latest", 4, 30), _loaded("b:latest", 4, 10), _loaded("c:latest", 2, 20)]
+    result = plan("new", running, need_bytes=5 * _GB, pinned=[], capacity=11 * _GB)
+    assert result.evict == ["b:latest"]
+
+
+def test_pinned_model_is_skipped_and_blocks_only_when_nothing_else_frees_enough():
+    running = [_loaded("busy:latest", 4, 10), _loaded("idle:latest", 4, 20)]
+    skipped = plan("new", running, need_bytes=6 * _GB, pinned=["busy"], capacity=11 * _GB)
+    assert skipped.fits and skipped.evict == ["idle:latest"]
+
+    blocked = plan("new", running, need_bytes=10 * _GB, pinned=["busy"], capacity=11 * _GB)
+    assert not blocked.fits and blocked.blocked_by == ["busy:latest"]
+
+
+def test_unknown_footprint_falls_back_to_clearing_the_card():
+    running = [_loaded("a:latest", 1, 10), _loaded("b:latest", 1, 20)]
+    result = plan("new", running, need_bytes=None, pinned=[], capacity=11 * _GB)
+    assert result.evict == ["a:latest", "b:latest"]
+
+
+def test_already_loaded_matches_bare_and_tagged_names():
+    running = [_loaded("coder:latest", 5, 10)]
+    assert plan("coder", running, need_bytes=None, pinned=[], capacity=1).already_loaded
+
+
+def test_observed_footprint_beats_the_weights_estimate(monkeypatch):
+    monkeypatch.setattr(residency, "_FOOTPRINTS", {})
+    tags = [{"name": "m:latest", "size": 4 * _GB}]
+    assert residency.footprint("m", tags) == int(4 * _GB * residency.VRAM_OVERHEAD)
+    residency.learn([_loaded("m:latest", 6, 10)])
+    assert residency.footprint("m", tags) == 6 * _GB
+
+
+class _FakeClient:
+    """list_running/list_models/unload + a recorded load POST — no Ollama."""
+
+    def __init__(self, running, tags):
+        self.running, self.tags = running, tags
+        self.unloaded, self.loaded = [], []
+        self._http = self
+
+    def is_busy(self, model=None):
+        return False
+
+    async def list_running(self):
+        return self.running
+
+    async def list_models(self):
+        return self.tags
+
+    async def unload_model(self, name):
+        self.unloaded.append(name)
+
+    async def post(self, url, json, timeout):
+        self.loaded.append(json)
+
+        class _Ok:
+            def raise_for_status(self):
+                return None
+
+        return _Ok()
+
+
+async def test_warm_model_keeps_a_coresident_model_and_uses_the_policy_keep_alive(monkeypatch):
+    monkeypatch.setattr(residency, "_FOOTPRINTS", {})
+    monkeypatch.setattr(residency, "capacity_bytes", lambda: 11 * _GB)
+    fake = _FakeClient(
+        running=[_loaded("coder:latest", 5, 10)],
+        tags=[{"name": "coder:latest", "size": 4 * _GB}, {"name": "judge:latest", "size": 4 * _GB}],
+    )
+    monkeypatch.setattr(server, "_client", fake)
+
+    message = await server.warm_model("judge")
+
+    assert "Nothing evicted" in message and fake.unloaded == []
+    assert fake.loaded[0]["keep_alive"] == residency.keep_alive_for("judge")
@@ -0,0 +1,144 @@
+"""Tests for the content-addressed response cache under `OllamaClient.chat`.
+
+What the cache must never do is serve an answer to a question it was not asked — so most of
+these vary one part of the key and expect a miss. The rest pin the contract a hit keeps with
+the call log: it is a call of its own (new ``call_id``) and says it was cached. Transport is
+httpx's `MockTransport`, counting how many requests actually reached "Ollama".
+"""
+
+import json
+import os
+import time
+
+import httpx
+import pytest
+
+from ollama_mcp import calllog, response_cache
+from ollama_mcp import client as client_mod
+from ollama_mcp.client import OllamaClient
+from ollama_mcp.response_cache import ResponseCache, cache_key
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+_BODY = {
+    "model": "m",
+    "message": {"content": "answer"},
+    "done": True,
+    "eval_count": 7,
+    "total_duration": 9_000_000,
+}
+
+
+class _Chats(list):
+    """The chat requests the fake Ollama received, plus the digest it reports for "m"."""
+
+    digest = "sha256:aaa"
+
+
+@pytest.fixture
+def ollama(monkeypatch, tmp_path):
+    """Route every pool to a fake Ollama; return the `_Chats` it records."""
+    chats = _Chats()
+
+    def handler(request):
+        if request.url.path == "/api/tags":
+            models = [{"name": "m:latest", "digest": chats.digest}]
+            return httpx.Response(200, json={"models": models})
+        chats.append(json.loads(request.content))
+        return httpx.Response(200, json=_BODY)
+
+    def factory(*args, **kwargs):
+        return _REAL_ASYNC_CLIENT(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    monkeypatch.setattr(client_mod, "_DIGESTS", {})
+    monkeypatch.setattr(response_cache, "_CACHE", ResponseCache(tmp_path / "cache", enabled=True))
+    return chats
+
+
+async def test_repeat_call_is_served_from_cache_with_its_own_call_id(ollama, monkeypatch, tmp_path):
+    log = tmp_path / "calls.jsonl"
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", str(log))
+    client = OllamaClient()
+
+    first = await client.chat("q", model="m", temperature=0)
+    second = await client.chat("q", model="m", temperature=0)
+
+    assert len(ollama) == 1
+    assert second.cached and not first.cached
+    assert second.content == first.content and second.eval_count == 7
+    assert second.call_id != first.call_id
+
+    calllog.flush()
+    records = list(calllog.iter_records(log))
+    assert [r["call_id"] for r in records] == [first.call_id, second.call_id]
+    assert "cached" not in records[0] and records[1]["cached"] is True
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        {"prompt": "other"},
+        {"system": "be terse"},
+        {"temperature": 0.7},
+        {"format": {"type": "object"}},
+        {"think": True},
+        {"num_predict": 10},
+    ],
+)
+async def test_any_part_of_the_request_changes_the_key(ollama, variant):
+    client = OllamaClient()
+    await client.chat("q", model="m", temperature=0)
+    await client.chat(**{"prompt": "q", "model": "m", "temperature": 0, **variant})
+    assert len(ollama) == 2
+
+
+async def test_rebuilt_model_gets_a_new_digest_and_misses(ollama):
+    client = OllamaClient()
+    await client.chat("q", model="m")
+    ollama.digest = "sha256:bbb"
+    client_mod._DIGESTS.clear()  # as if the memo's TTL had run out
+    await client.chat("q", model="m")
+    assert len(ollama) == 2
+
+
+async def test_cache_false_forces_a_generation_and_disabled_cache_is_bypassed(ollama):
+    client = OllamaClient()
+    await client.chat("q", model="m")
+    await client.chat("q", model="m", cache=False)
+    response_cache.get_cache().enabled = False
+    await client.chat("q", model="m")
+    assert len(ollama) == 3
+
+
+def test_disk_tier_serves_a_new_process_and_expires_by_ttl(tmp_path):
+    class _Reply:
+        content, model = "x", "m"
+        prompt_eval_count = eval_count = 1
+        eval_duration_ms = total_duration_ms = prompt_eval_duration_ms = 1.0
+
+    key = cache_key("sha256:aaa", {"messages": [{"role": "user", "content": "q"}]})
+    ResponseCache(tmp_path).put(key, _Reply())
+
+    fresh = ResponseCache(tmp_path)
+    assert fresh.get(key)["content"] == "x"
+    assert fresh.stats.disk_hits == 1
+
+    assert ResponseCache(tmp_path, ttl_s=0).get(key) is None
+
+
+def test_disk_tier_evicts_oldest_past_its_size_bound(tmp_path):
+    class _Reply:
+        content, model = "x" * 400, "m"
+        prompt_eval_count = eval_count = 1
+        eval_duration_ms = total_duration_ms = prompt_eval_duration_ms = 1.0
+
+    cache = ResponseCache(tmp_path, max_bytes=1500)
+    keys = [f"{i:064x}" for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, _Reply())
+        os.utime(cache._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+
+    remaining = {p.stem for p in tmp_path.glob("*/*.json")}
+    assert keys[-1] in remaining and keys[0] not in remaining
+    assert cache.stats.evictions >= 1
@@ -0,0 +1,51 @@
+"""Tests for start-up laziness — what `import ollama_mcp.server` must not pay for.
+
+The import runs in a fresh interpreter so earlier tests cannot have loaded the modules
+already. The registry must load itself on first use, and the git lookup must stay out of
+the logging setup that runs at import.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from ollama_mcp import debug_log, registry
+
+_SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_server_import_defers_oficina_and_yaml():
+    probe = (
+        "import sys, ollama_mcp.server\n"
+        "print(' '.join(m for m in sys.modules"
+        " if m == 'yaml' or m.startswith('ollama_mcp.oficina')))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True, text=True, check=True,
+        env={"PYTHONPATH": str(_SRC), "PATH": "/usr/bin:/bin"},
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_registry_loads_on_first_use(tmp_path, monkeypatch):
+    path = tmp_path / "registry.yaml"
+    path.write_text(
+        "my-go-q3:\n  role: Go coder\n  tier: full\n", encoding="utf-8"
+    )
+    monkeypatch.setattr(registry, "REGISTRY_PATH", str(path))
+    monkeypatch.setattr(registry, "_registry", {})
+    monkeypatch.setattr(registry, "_language_routes", {})
+    monkeypatch.setattr(registry, "_loaded", False)
+
+    assert "my-go-q3" in registry.get_registry()
+    path.unlink()
+    assert "my-go-q3" in registry.get_registry()  # loaded once, not re-read
+
+
+def test_logging_setup_runs_no_git(monkeypatch):
+    calls = []
+    monkeypatch.setattr(debug_log, "_git_field", lambda *args: calls.append(args) or "x")
+    banner = debug_log.setup()
+    assert calls == [] and "git" not in banner
+    assert debug_log.build_info() == {"git": "x", "branch": "x"} and len(calls) == 2
@@ -0,0 +1,139 @@
+"""Tests for the streamed chat path (`OllamaClient.chat_stream`) and its tool opt-in.
+
+Anchored at the HTTP boundary like `test_call_logging.py`, but with httpx's own
+`MockTransport` rather than a hand-rolled client: streaming goes through
+`AsyncClient.stream()` and `aiter_lines()`, and faking those by hand would test the fake.
+The NDJSON bodies below are the wire shape Ollama sends with ``"stream": true`` — content
+deltas, then one ``done`` line carrying the counters.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from ollama_mcp import calllog, server
+from ollama_mcp.client import OllamaClient, OllamaStreamError
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+_DONE = {
+    "model": "m",
+    "message": {"content": ""},
+    "done": True,
+    "prompt_eval_count": 3,
+    "eval_count": 4,
+    "eval_duration": 5_000_000,
+    "total_duration": 6_000_000,
+}
+
+
+def _ndjson(*lines):
+    return "".join(json.dumps(line) + "\n" for line in lines)
+
+
+def _delta(text):
+    return {"model": "m", "message": {"content": text}, "done": False}
+
+
+def _serve(monkeypatch, body, seen=None):
+    """Route every httpx.AsyncClient the client opens to a canned NDJSON reply."""
+
+    def handler(request):
+        if seen is not None:
+            seen.append(json.loads(request.content))
+        return httpx.Response(200, content=body.encode())
+
+    def factory(*args, **kwargs):
+        return _REAL_ASYNC_CLIENT(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+
+
+def _records(log_path):
+    calllog.flush()
+    with open(log_path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+async def test_deltas_arrive_in_order_and_assemble_the_response(monkeypatch, tmp_path):
+    seen = []
+    _serve(monkeypatch, _ndjson(_delta("hel"), _delta("lo"), _DONE), seen)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+
+    stream = OllamaClient().chat_stream("hi", model="m")
+    deltas = [d async for d in stream]
+
+    assert deltas == ["hel", "lo"]
+    assert seen[0]["stream"] is True
+    resp = stream.response
+    assert resp.content == "hello"
+    assert resp.eval_count == 4 and resp.total_duration_ms == 6.0
+    assert resp.ttft_ms is not None and len(resp.chunk_offsets_ms) == 2
+    assert resp.chunk_offsets_ms == sorted(resp.chunk_offsets_ms)
+
+
+async def test_streamed_call_logs_ttft_and_chunk_offsets(monkeypatch, tmp_path):
+    log_path = tmp_path / "calls.jsonl"
+    _serve(monkeypatch, _ndjson(_delta("a"), _delta("b"), _delta("c"), _DONE))
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", str(log_path))
+
+    resp = await OllamaClient().chat_stream("hi", model="m", tool="test").collect()
+
+    [record] = _records(log_path)
+    assert record["call_id"] == resp.call_id
+    assert record["response"] == "abc"
+    assert "ttft_ms" in record and len(record["chunk_offsets_ms"]) == 3
+
+
+async def test_non_streamed_records_carry_no_stream_fields(monkeypatch, tmp_path):
+    """Additive contract: existing readers of calls.jsonl see no new keys for `chat`."""
+    log_path = tmp_path / "calls.jsonl"
+    body = {**_DONE, "message": {"content": "whole"}}
+
+    def factory(*args, **kwargs):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+        return _REAL_ASYNC_CLIENT(*args, transport=transport, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", str(log_path))
+
+    resp = await OllamaClient().chat("hi", model="m")
+
+    assert resp.ttft_ms is None
+    assert "ttft_ms" not in _records(log_path)[0]
+
+
+async def test_error_line_mid_stream_raises(monkeypatch):
+    _serve(monkeypatch, _ndjson(_delta("par"), {"error": "out of memory"}))
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+
+    with pytest.raises(OllamaStreamError, match="out of memory"):
+        await OllamaClient().chat_stream("hi", model="m").collect()
+
+
+async def test_stream_without_done_line_is_truncated_not_complete(monkeypatch):
+    _serve(monkeypatch, _ndjson(_delta("half")))
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+    stream = OllamaClient().chat_stream("hi", model="m")
+
+    with pytest.raises(OllamaStreamError):
+        await stream.collect()
+    assert stream.response is None
+
+
+async def test_generate_code_stream_writes_the_finished_file_and_drops_the_partial(
+    monkeypatch, tmp_path
+):
+    _serve(monkeypatch, _ndjson(_delta("```python\n"), _delta("x = 1\n"), _delta("```"), _DONE))
+    monkeypatch.setattr("ollama_mcp.client.CALL_LOG_PATH", "")
+    monkeypatch.setattr(server, "_client", OllamaClient())
+    target = tmp_path / "out.py"
+
+    result = await server.generate_code(
+        "x", model="m", output_file=str(target), output_only=True, stream=True
+    )
+
+    assert result.startswith("Written")
+    assert target.read_text() == "x = 1\n"
+    assert not (tmp_path / "out.py.partial").exists()
@@ -0,0 +1,74 @@
+"""Tests for tokens — the tokenizer-backed counts that replaced the chars/4 estimates.
+
+A real Qwen vocabulary is 150k entries and not shipped, so the byte-level BPE is checked
+against a tiny hand-built ``tokenizer.json`` whose merges make the expected counts obvious.
+The rest pins the fallbacks: no files means the approximation, never an error.
+"""
+
+import json
+
+from ollama_mcp import tokens
+from ollama_mcp.tokens import TokenCounter, approximate
+
+
+def _tokenizer_json(path, merges):
+    """A minimal byte-level BPE tokenizer.json: every byte symbol, plus each merge's result."""
+    alphabet = tokens._byte_alphabet()
+    vocab = {symbol: i for i, symbol in enumerate(alphabet.values())}
+    for first, second in merges:
+        vocab.setdefault(first + second, len(vocab))
+    spec = {"model": {"type": "BPE", "vocab": vocab, "merges": [f"{a} {b}" for a, b in merges]}}
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
+
+
+def test_bpe_applies_merges_in_rank_order(tmp_path):
+    # "Ġ" is the byte-level symbol for a space: "abab" and " ab" each merge to one token.
+    merges = [("a", "b"), ("ab", "ab"), ("Ġ", "ab")]
+    counter = TokenCounter(_tokenizer_json(tmp_path / "tokenizer.json", merges))
+
+    assert counter.backend in ("bpe", "tokenizers") and counter.exact
+    assert counter.count("abab") == 1
+    assert counter.count("abab ab") == 2
+    assert counter.count("ba") == 2  # no merge for (b, a)
+
+
+def test_vocab_and_merges_pair_is_read_from_a_directory(tmp_path):
+    alphabet = tokens._byte_alphabet()
+    vocab = {symbol: i for i, symbol in enumerate(alphabet.values())}
+    vocab["ab"] = len(vocab)
+    (tmp_path / "vocab.json").write_text(json.dumps(vocab), encoding="utf-8")
+    (tmp_path / "merges.txt").write_text("#version: 0.2\na b\n", encoding="utf-8")
+
+    counter = TokenCounter(tmp_path)
+    assert counter.exact and counter.count("abab") == 2
+
+
+def test_missing_or_malformed_files_fall_back_to_the_approximation(tmp_path):
+    assert TokenCounter(tmp_path / "absent").backend == "approx"
+
+    (tmp_path / "tokenizer.json").write_text("{not json", encoding="utf-8")
+    broken = TokenCounter(tmp_path)
+    assert broken.backend == "approx"
+    assert broken.count("def f(x):\n    return x") == approximate("def f(x):\n    return x")
+
+
+def test_approximation_sees_code_structure_that_chars_over_4_misses():
+    # Punctuation-dense code is many short pieces, each at least one token.
+    code = "a(b[c],{d:e});" * 10
+    assert approximate(code) > len(code) // 4
+    assert approximate("") == 0 and approximate("x") == 1
+
+
+def test_count_is_memoized_by_content(tmp_path):
+    counter = TokenCounter(tmp_path / "absent")
+    calls = []
+
+    def counting(text):
+        calls.append(text)
+        return approximate(text)
+
+    counter._count = counting
+    assert counter.count("same text") == counter.count("same text")
+    assert calls == ["same text"]
+    assert counter.count("") == 0 and calls == ["same text"]
@@ -0,0 +1,103 @@
+"""Tests for transmem — translate only the paragraphs the translation memory lacks.
+
+A fake translator upper-cases what it is given and answers batch prompts in the delimiter
+format, so every reply can be checked against the input. The contract: the text comes back
+with its own separators, a re-run with one edited paragraph sends only that paragraph, a
+segment dropped from a batch reply is re-asked alone, and the store stays under its bound.
+"""
+
+import json
+import re
+from types import SimpleNamespace
+
+from ollama_mcp import server, transmem
+from ollama_mcp.transmem import TranslationMemory
+
+_DOC = "Intro paragraph.\n\nSecond one,\nwrapped.\n\n---\n\n  Indented third.\n"
+
+
+class _Translator:
+    def __init__(self, drop=()):
+        self.prompts = []
+        self.drop = set(drop)
+
+    async def chat(self, *, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if "<<<SEG 1>>>" not in prompt:
+            return SimpleNamespace(content=prompt.split("\n\n", 1)[1].upper())
+        segments = re.split(r"<<<SEG \d+>>>\n", prompt)[1:]
+        reply = "\n".join(
+            f"<<<SEG {n}>>>\n{seg.strip().upper()}"
+            for n, seg in enumerate(segments, 1) if n not in self.drop
+        )
+        return SimpleNamespace(content=reply)
+
+
+def _expected(text):
+    return "".join(
+        p if isinstance(p, str) else p.lead + p.core.upper() + p.trail
+        for p in transmem.split(text)
+    )
+
+
+async def test_misses_go_in_one_batch_and_the_text_keeps_its_layout():
+    fake = _Translator()
+    result = await transmem.translate(fake, _DOC, target="German", model="t")
+
+    assert result == _expected(_DOC)
+    assert result.endswith("\n\n---\n\n  INDENTED THIRD.\n")
+    assert len(fake.prompts) == 1 and "<<<SEG 3>>>" in fake.prompts[0]
+
+
+async def test_rerun_with_one_edited_paragraph_sends_only_that_paragraph():
+    fake = _Translator()
+    await transmem.translate(fake, _DOC, target="German", model="t")
+    rewrapped = _DOC.replace("Second one,\nwrapped.", "Second  one, wrapped.")
+    edited = rewrapped.replace("Intro paragraph.", "Intro paragraph, revised.")
+
+    fake.prompts.clear()
+    result = await transmem.translate(fake, edited, target="German", model="t")
+
+    assert fake.prompts == [
+        "Translate the following text to German:\n\nIntro paragraph, revised."
+    ]
+    assert result.startswith("INTRO PARAGRAPH, REVISED.\n\nSECOND ONE,\nWRAPPED.")
+    stats = transmem.get_memory().stats.as_dict()
+    assert stats["hits"] == 2 and stats["misses"] == 4 and stats["hit_rate"] == 0.333
+
+    fake.prompts.clear()
+    await transmem.translate(fake, _DOC, target="French", model="t")
+    assert len(fake.prompts) == 1  # another language pair shares nothing
+
+
+async def test_a_segment_dropped_from_the_batch_reply_is_reasked_alone():
+    fake = _Translator(drop={2})
+    result = await transmem.translate(fake, _DOC, target="German", source="English", model="t")
+
+    assert result == _expected(_DOC)
+    assert fake.prompts[1] == (
+        "Translate the following text from English to German:\n\nSecond one,\nwrapped."
+    )
+
+
+def test_store_evicts_least_recently_used_rows_past_its_bound(tmp_path):
+    memory = TranslationMemory(tmp_path / "tm.db", max_bytes=100)
+    keys = [bytes([n]) * 16 for n in range(4)]
+    memory.put_many([(keys[0], "a" * 40), (keys[1], "b" * 40)])
+    memory.get_many([keys[0]])  # keys[1] is now the least recently used
+    memory.put_many([(keys[2], "c" * 40)])
+
+    assert set(memory.get_many(keys)) == {keys[0], keys[2]}
+    snapshot = memory.snapshot()
+    assert snapshot["entries"] == 2 and snapshot["bytes"] == 80 and snapshot["evictions"] == 1
+
+
+async def test_translate_tool_uses_the_memory_and_cache_stats_reports_it(monkeypatch):
+    fake = _Translator()
+    monkeypatch.setattr(server, "_client", fake)
+    await server.translate(_DOC, "German")
+    await server.translate(_DOC, "German")
+
+    assert len(fake.prompts) == 1
+    stats = json.loads(await server.cache_stats())["translation_memory"]
+    assert stats["hits"] == 3 and stats["hit_rate"] == 0.5 and stats["entries"] == 3
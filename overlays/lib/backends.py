@@ -19,19 +19,42 @@ _DEFAULT_READ_TIMEOUT_S = 120   # per-socket-read timeout (cold load + think bur
 _DEFAULT_MERGE_TIMEOUT_S = 600  # overall wall-clock deadline; on exceed → None
 
 
-def fit_num_ctx(prompt_chars: int, output_headroom_tokens: int = 1024) -> int:
+def fit_num_ctx(
+    prompt_chars: int,
+    output_headroom_tokens: int = 1024,
+    *,
+    prompt_tokens: int | None = None,
+) -> int:
     """Smallest ctx bucket that holds the INPUT prompt, plus output headroom.
 
-    The context window must fit the *input* prompt (~chars/4 tokens, this repo's
-    diagnostic heuristic), NOT the small JSON output — sizing to the output was
-    the RC1 bug that truncated full-file merges. Capped at the 14B VRAM ceiling.
+    The context window must fit the *input* prompt, NOT the small JSON output —
+    sizing to the output was the RC1 bug that truncated full-file merges. Capped
+    at the 14B VRAM ceiling. ``prompt_tokens`` is the tokenizer's count when the
+    caller has one (see `count_prompt_tokens`); without it the input is
+    estimated at ~chars/4.
     """
-    need = (prompt_chars // 4) + output_headroom_tokens
+    if prompt_tokens is None:
+        prompt_tokens = prompt_chars // 4
+    need = prompt_tokens + output_headroom_tokens
     for bucket in _CTX_BUCKETS:
         if bucket >= need:
             return bucket
     return _CTX_BUCKETS[-1]
 
+
+def count_prompt_tokens(prompt: str) -> int | None:
+    """Tokens in ``prompt`` via the MCP server's tokenizer, or None where it isn't installed.
+
+    The overlay runs from any checkout, so ``ollama_mcp`` is optional here; None makes
+    `fit_num_ctx` fall back to its chars/4 estimate.
+    """
+    try:
+        from ollama_mcp.tokens import count
+    except ImportError:
+        return None
+    return count(prompt)
+
+
 try:
     import yaml
 except ImportError:
@@ -97,7 +120,7 @@ class OllamaApiBackend(Backend):
 
         # Size the context window to the INPUT prompt (full-file merges overflow
         # a fixed constant); output is small JSON, covered by fit_num_ctx headroom.
-        num_ctx = fit_num_ctx(len(prompt))
+        num_ctx = fit_num_ctx(len(prompt), prompt_tokens=count_prompt_tokens(prompt))
         payload: dict = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
@@ -29,10 +29,9 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
-try:
-    import yaml
-except ImportError:
-    yaml = None
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.registry import parse_registry  # noqa: E402
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -518,14 +517,12 @@ def load_registry(registry_path: str = None) -> dict:
     if not Path(registry_path).exists():
         return {}
 
-    if yaml is None:
+    # Compiled cache if fresh (no YAML parse), else PyYAML — see lib/registry.py
+    try:
+        return parse_registry(registry_path)
+    except ImportError:
         # Fallback: parse manually (basic YAML subset)
         return _parse_registry_basic(registry_path)
-
-    try:
-        with open(registry_path) as f:
-            data = yaml.safe_load(f)
-            return data or {}
     except Exception:
         return {}
 
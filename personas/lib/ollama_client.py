@@ -8,15 +8,77 @@ without pulling in httpx or asyncio.
 
 Used by:
   - personas/build-persona.py (Task 3.5 conversational builder)
+  - benchmarks/lib/ and evaluator/lib/ sweeps
+
+Every call asks the model-call gate (mcp-server/src/ollama_mcp/gate.py, T-88) for
+admission first, so a benchmark sweep queues behind interactive sessions instead of
+swapping models out from under them. The wire protocol is re-spoken here with the
+stdlib socket module rather than imported, to keep this file dependency-free.
+Fail-open: no gate (or OLLAMA_GATE_SOCKET="") means the call goes straight through.
 """
 
+import contextlib
 import json
+import os
+import socket
+import time
 import urllib.request
 import urllib.error
 
 OLLAMA_URL = "http://localhost:11434/api/chat"
 DEFAULT_TIMEOUT = 120  # seconds — covers cold starts
 
+GATE_SOCKET = os.environ.get(
+    "OLLAMA_GATE_SOCKET",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "ollama-bridge", "gate.sock"),
+)
+
+
+@contextlib.contextmanager
+def _gate_admission(model: str, priority: str, timeout: float):
+    """Hold a gate slot for ``model`` for the body; yields (queue_position, queue_wait_ms).
+
+    Raises TimeoutError if ``timeout`` passes while still queued. Any other gate problem
+    yields (0, 0.0) and the call proceeds ungated.
+    """
+    sock = None
+    admitted = (0, 0.0)
+    if GATE_SOCKET:
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(2)
+            sock.connect(GATE_SOCKET)
+            request = {"op": "acquire", "model": model, "priority": priority,
+                       "client": "personas", "pid": os.getpid()}
+            sock.sendall((json.dumps(request) + "\n").encode())
+            stream = sock.makefile("r", encoding="utf-8")
+            queued = json.loads(stream.readline())
+            sock.settimeout(timeout)
+            try:
+                reply = json.loads(stream.readline())
+            except socket.timeout:
+                queued_out = queued.get("position")
+            else:
+                queued_out = None
+                admitted = (int(reply.get("position", 0)), float(reply.get("wait_ms", 0.0)))
+        except (OSError, ValueError):  # includes connect timeouts — fail open
+            if sock is not None:
+                sock.close()
+            sock = None
+            queued_out = None
+        if queued_out is not None:
+            sock.close()
+            raise TimeoutError(
+                f"Still queued at the model-call gate after {timeout}s (position {queued_out})."
+            )
+    try:
+        yield admitted
+    finally:
+        if sock is not None:
+            with contextlib.suppress(OSError):
+                sock.sendall(b'{"op": "release"}\n')
+            sock.close()
+
 
 def ollama_chat(
     prompt: str,
@@ -28,6 +90,7 @@ def ollama_chat(
     format_schema: dict | None = None,
     timeout: int = DEFAULT_TIMEOUT,
     keep_alive: str | None = None,
+    priority: str = "batch",
 ) -> dict:
     """
     Send a chat request to Ollama and return the response.
@@ -43,10 +106,13 @@ def ollama_chat(
         keep_alive: How long to keep the model in VRAM after response.
                     "0" evicts immediately (use in multi-model comparisons to
                     avoid VRAM contention). None = Ollama default (5 minutes).
+        priority: Model-call gate class. "batch" by default — these scripts are
+                  sweeps; pass "interactive" when a person is waiting on the reply.
 
     Returns:
         Dict with keys: content (str), model (str), prompt_eval_count (int),
-        eval_count (int), total_duration_ms (float).
+        eval_count (int), total_duration_ms (float), queue_position (int),
+        queue_wait_ms (float). The queue fields are 0 for an ungated call.
 
     Raises:
         ConnectionError: Cannot reach Ollama (not running, wrong port).
@@ -79,9 +145,12 @@ def ollama_chat(
         headers={"Content-Type": "application/json"},
     )
 
+    t0 = time.monotonic()
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            body = json.loads(resp.read())
+        with _gate_admission(model, priority, timeout) as (queue_position, queue_wait_ms):
+            remaining = max(1.0, timeout - (time.monotonic() - t0))
+            with urllib.request.urlopen(req, timeout=remaining) as resp:
+                body = json.loads(resp.read())
     except urllib.error.HTTPError as e:
         if e.code == 404:
             raise RuntimeError(
@@ -108,4 +177,6 @@ def ollama_chat(
         "prompt_eval_count": body.get("prompt_eval_count", 0),
         "eval_count": body.get("eval_count", 0),
         "total_duration_ms": body.get("total_duration", 0) / 1_000_000,
+        "queue_position": queue_position,
+        "queue_wait_ms": queue_wait_ms,
     }
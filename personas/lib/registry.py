@@ -1,23 +1,105 @@
 """Shared registry loader for personas/registry.yaml.
 
-Provides a single load_registry() entry point used by benchmark.py and any
-other tool that needs to read persona definitions. Keeps YAML-loading logic
-in one place so callers don't re-implement it.
-
-Note: the MCP server (mcp-server/src/ollama_mcp/registry.py) has its own
-more complex registry module with caching and language-routing logic that
-is specific to the server's startup lifecycle — it is not replaced by this
-module.
+Provides a single load_registry() entry point used by benchmark.py,
+detect-persona.py and any other tool that needs to read persona definitions.
+Keeps YAML-loading logic in one place so callers don't re-implement it.
+
+Parsing the YAML is the slow part of every tool's start-up, so the parsed
+entries are kept in a compiled cache next to it (registry.compiled.json),
+stamped with the YAML's mtime and size. A fresh cache is read with json alone —
+PyYAML is only imported when the YAML changed, and the cache is then rewritten.
+The MCP server (mcp-server/src/ollama_mcp/registry.py) reads and writes the
+same file in the same format; keep COMPILED_VERSION in step with its copy.
+A cache that can't be read or written is ignored: it never breaks a load.
+
+Note: the MCP server has its own more complex registry module with caching,
+query indexes and language-routing logic that is specific to the server's
+lifecycle — it is not replaced by this module.
 """
 
+import json
+import os
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 # Default path: personas/registry.yaml, resolved relative to this file.
 _DEFAULT_REGISTRY = Path(__file__).resolve().parent.parent / "registry.yaml"
 
+COMPILED_NAME = "registry.compiled.json"
+COMPILED_VERSION = 1
+
+
+def compiled_path(path: "Path | str") -> Path:
+    """The compiled cache that belongs to the registry at ``path``."""
+    return Path(path).with_name(COMPILED_NAME)
+
+
+def read_compiled(
+    path: "Path | str", stamp: "tuple[int, int]"
+) -> "dict[str, dict[str, Any]] | None":
+    """The cached entries for ``path`` if built from the YAML with this ``(mtime_ns, size)``."""
+    try:
+        with open(compiled_path(path)) as f:
+            data = json.load(f)
+        if (
+            data.get("version") == COMPILED_VERSION
+            and data.get("mtime_ns") == stamp[0]
+            and data.get("size") == stamp[1]
+        ):
+            return data["entries"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None
+
+
+def write_compiled(
+    path: "Path | str", stamp: "tuple[int, int]", entries: dict[str, dict[str, Any]]
+) -> None:
+    """Store ``entries`` as the compiled cache for ``path`` (atomic; failures ignored).
+
+    ``stamp`` is the YAML's ``(mtime_ns, size)`` taken *before* it was parsed, so an
+    edit that lands mid-parse leaves the cache stale rather than stamped as current.
+    """
+    target = compiled_path(path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    payload = {
+        "version": COMPILED_VERSION,
+        "mtime_ns": stamp[0],
+        "size": stamp[1],
+        "entries": entries,
+    }
+    try:
+        with open(tmp, "w") as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp, target)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def parse_registry(path: "Path | str") -> dict[str, dict[str, Any]]:
+    """Every persona entry in ``path``: the compiled cache if fresh, else the YAML.
+
+    Raises:
+        FileNotFoundError: If the registry file does not exist.
+        ImportError: If the cache is stale and PyYAML is not installed.
+        yaml.YAMLError: If the file is not valid YAML.
+    """
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entries = read_compiled(path, stamp)
+    if entries is not None:
+        return entries
+    import yaml
+
+    with open(path) as f:
+        raw = yaml.safe_load(f) or {}
+    entries = {k: v for k, v in raw.items() if isinstance(v, dict)}
+    write_compiled(path, stamp, entries)
+    return entries
+
 
 def load_registry(
     path: "Path | str | None" = None,
@@ -40,10 +122,7 @@ def load_registry(
         yaml.YAMLError: If the file is not valid YAML.
     """
     registry_path = Path(path) if path is not None else _DEFAULT_REGISTRY
-    with open(registry_path) as f:
-        raw = yaml.safe_load(f) or {}
-
-    entries = {k: v for k, v in raw.items() if isinstance(v, dict)}
+    entries = parse_registry(registry_path)
     if active_only:
         entries = {k: v for k, v in entries.items() if v.get("status") == "active"}
     return entries